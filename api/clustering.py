@@ -13,10 +13,14 @@ import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from anthropic import Anthropic
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .database import release_connection
+from .llm_clients import get_llm_client, SONNET
+from .structured_output import create_structured, StructuredOutputError
+from .llm_schemas import ChallengeClustering
+from .concept_dedup import find_duplicates, attach_duplicate, confirm_duplicates, apply_confirmed
 from .models import (
     Challenge, EmergingConcept, EmergingDialectic,
     ChallengeCluster, ChallengeClusterMember,
@@ -34,7 +38,7 @@ def get_anthropic_client():
     """Get Anthropic client."""
     if not ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-    return Anthropic(api_key=ANTHROPIC_API_KEY)
+    return get_llm_client(SONNET)
 
 
 CLUSTERING_SYSTEM_PROMPT = """You are an expert at analyzing theoretical challenges from empirical research.
@@ -119,37 +123,24 @@ Group similar challenges and provide recommendations. Remember to output valid J
 
     start_time = time.time()
 
-    response = client.messages.create(
-        model=CLAUDE_MODEL,
-        max_tokens=4096,
-        system=CLUSTERING_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}]
-    )
-
-    processing_time = time.time() - start_time
-
-    # Parse response
-    response_text = response.content[0].text
-
-    # Extract JSON from response (handle markdown code blocks)
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-
     try:
-        analysis = json.loads(response_text)
-    except json.JSONDecodeError as e:
+        analysis = (await create_structured(
+            client,
+            ChallengeClustering,
+            model=CLAUDE_MODEL,
+            max_tokens=4096,
+            system=CLUSTERING_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": user_prompt}]
+        )).model_dump()
+    except StructuredOutputError as e:
         return {
             "status": "error",
             "error": f"Failed to parse LLM response: {e}",
-            "raw_response": response_text[:500]
+            "raw_response": e.raw[:500]
         }
 
+    processing_time = time.time() - start_time
+
     # Create clusters in database
     created_clusters = []
     clustered_challenge_ids = []
@@ -278,30 +269,20 @@ Output valid JSON."""
 
     start_time = time.time()
 
-    response = client.messages.create(
-        model=CLAUDE_MODEL,
-        max_tokens=4096,
-        system=CLUSTERING_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}]
-    )
-
-    processing_time = time.time() - start_time
-
-    response_text = response.content[0].text
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-
     try:
-        analysis = json.loads(response_text)
-    except json.JSONDecodeError as e:
+        analysis = (await create_structured(
+            client,
+            ChallengeClustering,
+            model=CLAUDE_MODEL,
+            max_tokens=4096,
+            system=CLUSTERING_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": user_prompt}]
+        )).model_dump()
+    except StructuredOutputError as e:
         return {"status": "error", "error": f"Failed to parse: {e}"}
 
+    processing_time = time.time() - start_time
+
     created_clusters = []
     clustered_challenge_ids = []
 
@@ -374,7 +355,12 @@ Output valid JSON."""
 
 async def cluster_emerging_concepts(db: AsyncSession) -> Dict[str, Any]:
     """
-    Cluster similar emerging concepts from multiple projects.
+    Cluster unclustered emerging concepts that duplicate an existing concept
+    or another proposal, clustered or not.
+
+    Proposals are normally deduplicated on arrival (see concept_dedup); this
+    pass catches any that arrived before the index or whose ambiguous pairs
+    were never confirmed. Only ambiguous pairs go to the LLM.
     """
     result = await db.execute(
         select(EmergingConcept).where(
@@ -384,122 +370,43 @@ async def cluster_emerging_concepts(db: AsyncSession) -> Dict[str, Any]:
     )
     emerging = result.scalars().all()
 
-    if len(emerging) < 2:
-        return {"status": "skipped", "reason": "Not enough emerging concepts to cluster"}
-
-    ec_data = []
-    for ec in emerging:
-        ec_data.append({
-            "id": ec.id,
-            "project_id": ec.source_project_id,
-            "project_name": ec.source_project_name or f"Project {ec.source_project_id}",
-            "proposed_name": ec.proposed_name,
-            "proposed_definition": ec.proposed_definition,
-            "emergence_rationale": ec.emergence_rationale,
-            "evidence_strength": ec.evidence_strength,
-            "confidence": ec.confidence
-        })
-
-    client = get_anthropic_client()
-
-    user_prompt = f"""Analyze these {len(ec_data)} proposed emerging concepts from different research projects:
-
-{json.dumps(ec_data, indent=2)}
-
-Identify which emerging concepts are essentially the same idea proposed independently by different projects. Group duplicates together and recommend whether the concept should be promoted to the theory base.
-
-Output JSON with clusters of similar emerging concept IDs."""
+    if not emerging:
+        return {"status": "skipped", "reason": "No unclustered emerging concepts"}
 
     start_time = time.time()
 
-    response = client.messages.create(
-        model=CLAUDE_MODEL,
-        max_tokens=4096,
-        system=CLUSTERING_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}]
-    )
-
-    processing_time = time.time() - start_time
-
-    response_text = response.content[0].text
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-
-    try:
-        analysis = json.loads(response_text)
-    except json.JSONDecodeError as e:
-        return {"status": "error", "error": f"Failed to parse: {e}"}
-
-    created_clusters = []
-    clustered_ec_ids = []
-
-    # Map challenge_ids to emerging concept IDs (LLM uses same field name)
-    for cluster_data in analysis.get("clusters", []):
-        ec_ids = cluster_data.get("challenge_ids", [])  # LLM might use this key
-        if not ec_ids:
-            ec_ids = cluster_data.get("emerging_concept_ids", [])  # Or this
-        if not ec_ids:
-            continue
-
-        rec_str = cluster_data.get("recommendation", "human_review")
-        rec_map = {
-            "accept": RecommendedAction.ACCEPT,
-            "reject": RecommendedAction.REJECT,
-            "human_review": RecommendedAction.HUMAN_REVIEW,
-            "merge": RecommendedAction.MERGE
-        }
-        recommended_action = rec_map.get(rec_str, RecommendedAction.HUMAN_REVIEW)
+    duplicates, ambiguous = await find_duplicates(db, emerging)
+    clusters = []
+    for ec, match in duplicates:
+        if not ec.cluster_group_id:
+            clusters.append(await attach_duplicate(db, ec, match))
 
-        member_ecs = [ec for ec in emerging if ec.id in ec_ids]
-        unique_projects = len(set(ec.source_project_id for ec in member_ecs))
-
-        cluster = ChallengeCluster(
-            cluster_type=ClusterType.EMERGING_CONCEPT,
-            cluster_summary=cluster_data.get("summary"),
-            cluster_recommendation=cluster_data.get("recommendation_rationale"),
-            recommended_action=recommended_action,
-            status=ClusterStatus.PENDING,
-            member_count=len(ec_ids),
-            source_project_count=unique_projects
-        )
-        db.add(cluster)
-        await db.flush()
+    ambiguous = [(ec, match) for ec, match in ambiguous if not ec.cluster_group_id]
+    if ambiguous:
+        await release_connection(db)
+        confirmed = await confirm_duplicates(ambiguous)
+        clusters.extend(await apply_confirmed(db, ambiguous, confirmed))
 
-        for ec_id in ec_ids:
-            member = ChallengeClusterMember(
-                cluster_id=cluster.id,
-                emerging_concept_id=ec_id,
-                similarity_score=0.8
-            )
-            db.add(member)
+    await db.commit()
 
-            for ec in emerging:
-                if ec.id == ec_id:
-                    ec.cluster_group_id = cluster.id
-                    clustered_ec_ids.append(ec_id)
-                    break
+    processing_time = time.time() - start_time
 
-        created_clusters.append({
+    created_clusters = {}
+    for cluster in clusters:
+        created_clusters[cluster.id] = {
             "id": cluster.id,
-            "summary": cluster_data.get("summary"),
-            "member_count": len(ec_ids),
-            "recommendation": rec_str
-        })
-
-    await db.commit()
+            "summary": cluster.cluster_summary,
+            "member_count": cluster.member_count,
+            "recommendation": cluster.recommended_action.value if cluster.recommended_action else None
+        }
 
     return {
         "status": "success",
         "total_emerging_concepts": len(emerging),
-        "clustered": len(clustered_ec_ids),
+        "clustered": sum(1 for ec in emerging if ec.cluster_group_id),
         "clusters_created": len(created_clusters),
-        "clusters": created_clusters,
+        "clusters": list(created_clusters.values()),
+        "ambiguous_pairs_reviewed": len(ambiguous),
         "processing_time_seconds": round(processing_time, 2)
     }
 
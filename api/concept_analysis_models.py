@@ -7,7 +7,7 @@ Each dimension groups related operations; thinkers become metadata references.
 
 from sqlalchemy import (
     Column, Integer, String, Text, Float, Boolean, DateTime,
-    ForeignKey, Enum, JSON, Table, UniqueConstraint
+    ForeignKey, Enum, JSON, Table, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -640,6 +640,11 @@ class ConceptEvidenceFragment(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Keyset order of the pending-decision queue
+        Index('idx_ca_evidence_fragment_status_created', 'analysis_status', 'created_at', 'id'),
+    )
+
 
 class ConceptEvidenceInterpretation(Base):
     """
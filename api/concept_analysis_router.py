@@ -5,17 +5,19 @@ This router provides endpoints for the 8-dimensional concept analysis framework,
 where concepts are analyzed through analytical operations rather than thinker-indexed dimensions.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
 
-from .database import get_db
+from .database import get_read_db
+from .schema_catalogue import schema_catalogue, catalogue_response
 from .concept_analysis_models import (
-    AnalyticalDimension, AnalyticalOperation, TheoreticalInfluence,
+    AnalyticalOperation,
     AnalyzedConcept, ConceptAnalysis, AnalysisItem, ConceptAnalysisHistory,
     ItemReasoningScaffold, ItemRelationship, DimensionType, OutputType, SourceType,
     WebCentrality, InferenceType, ItemRelationType, RelationshipSource, operation_influences
@@ -196,205 +198,72 @@ class FullConceptAnalysisResponse(BaseModel):
     analyses_by_dimension: dict  # dimension_type -> list of analyses
 
 
+_analyses_by_dimension_adapter = TypeAdapter(Dict[str, List[ConceptAnalysisResponse]])
+
+
 # ==================== ENDPOINTS ====================
 
 @router.get("/dimensions", response_model=List[AnalyticalDimensionResponse])
 async def list_dimensions(
+    request: Request,
     include_operations: bool = True,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all analytical dimensions.
 
     Optionally includes operations within each dimension.
+    Served from the schema catalogue with an ETag.
     """
-    query = select(AnalyticalDimension).order_by(AnalyticalDimension.sequence_order)
-
-    if include_operations:
-        query = query.options(
-            selectinload(AnalyticalDimension.operations).selectinload(AnalyticalOperation.influences)
-        )
-
-    result = await db.execute(query)
-    dimensions = result.scalars().all()
-
-    responses = []
-    for dim in dimensions:
-        dim_resp = AnalyticalDimensionResponse(
-            id=dim.id,
-            dimension_type=dim.dimension_type.value,
-            name=dim.name,
-            core_question=dim.core_question,
-            description=dim.description,
-            color_scheme=dim.color_scheme,
-            icon=dim.icon,
-            sequence_order=dim.sequence_order,
-            operations=[]
-        )
-
-        if include_operations and dim.operations:
-            for op in sorted(dim.operations, key=lambda x: x.sequence_order):
-                op_resp = AnalyticalOperationResponse(
-                    id=op.id,
-                    dimension_id=op.dimension_id,
-                    name=op.name,
-                    description=op.description,
-                    key_questions=op.key_questions,
-                    output_type=op.output_type.value if op.output_type else None,
-                    example_prompt=op.example_prompt,
-                    sequence_order=op.sequence_order,
-                    influences=[
-                        TheoreticalInfluenceResponse(
-                            id=inf.id,
-                            short_name=inf.short_name,
-                            full_name=inf.full_name,
-                            years=inf.years,
-                            key_works=inf.key_works,
-                            core_insight=inf.core_insight,
-                            wikipedia_url=inf.wikipedia_url
-                        )
-                        for inf in op.influences
-                    ]
-                )
-                dim_resp.operations.append(op_resp)
-
-        responses.append(dim_resp)
-
-    return responses
+    catalogue = await schema_catalogue.get(db)
+    entry = catalogue.dimensions_entry if include_operations else catalogue.dimensions_no_ops_entry
+    return catalogue_response(request, entry)
 
 
 @router.get("/dimensions/{dimension_type}", response_model=AnalyticalDimensionResponse)
 async def get_dimension(
+    request: Request,
     dimension_type: DimensionType,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific dimension with its operations."""
-    result = await db.execute(
-        select(AnalyticalDimension)
-        .options(selectinload(AnalyticalDimension.operations).selectinload(AnalyticalOperation.influences))
-        .where(AnalyticalDimension.dimension_type == dimension_type)
-    )
-    dim = result.scalar_one_or_none()
+    catalogue = await schema_catalogue.get(db)
+    entry = catalogue.dimension_entries.get(dimension_type.value)
 
-    if not dim:
+    if not entry:
         raise HTTPException(status_code=404, detail=f"Dimension {dimension_type} not found")
 
-    return AnalyticalDimensionResponse(
-        id=dim.id,
-        dimension_type=dim.dimension_type.value,
-        name=dim.name,
-        core_question=dim.core_question,
-        description=dim.description,
-        color_scheme=dim.color_scheme,
-        icon=dim.icon,
-        sequence_order=dim.sequence_order,
-        operations=[
-            AnalyticalOperationResponse(
-                id=op.id,
-                dimension_id=op.dimension_id,
-                name=op.name,
-                description=op.description,
-                key_questions=op.key_questions,
-                output_type=op.output_type.value if op.output_type else None,
-                example_prompt=op.example_prompt,
-                sequence_order=op.sequence_order,
-                influences=[
-                    TheoreticalInfluenceResponse(
-                        id=inf.id,
-                        short_name=inf.short_name,
-                        full_name=inf.full_name,
-                        years=inf.years,
-                        key_works=inf.key_works,
-                        core_insight=inf.core_insight,
-                        wikipedia_url=inf.wikipedia_url
-                    )
-                    for inf in op.influences
-                ]
-            )
-            for op in sorted(dim.operations, key=lambda x: x.sequence_order)
-        ]
-    )
+    return catalogue_response(request, entry)
 
 
 @router.get("/operations", response_model=List[AnalyticalOperationResponse])
 async def list_operations(
+    request: Request,
     dimension_type: Optional[DimensionType] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all analytical operations.
 
     Optionally filter by dimension type.
     """
-    query = select(AnalyticalOperation).options(
-        selectinload(AnalyticalOperation.influences),
-        selectinload(AnalyticalOperation.dimension)
-    )
-
-    if dimension_type:
-        query = query.join(AnalyticalDimension).where(
-            AnalyticalDimension.dimension_type == dimension_type
-        )
-
-    query = query.order_by(AnalyticalOperation.dimension_id, AnalyticalOperation.sequence_order)
-
-    result = await db.execute(query)
-    operations = result.scalars().all()
-
-    return [
-        AnalyticalOperationResponse(
-            id=op.id,
-            dimension_id=op.dimension_id,
-            name=op.name,
-            description=op.description,
-            key_questions=op.key_questions,
-            output_type=op.output_type.value if op.output_type else None,
-            example_prompt=op.example_prompt,
-            sequence_order=op.sequence_order,
-            influences=[
-                TheoreticalInfluenceResponse(
-                    id=inf.id,
-                    short_name=inf.short_name,
-                    full_name=inf.full_name,
-                    years=inf.years,
-                    key_works=inf.key_works,
-                    core_insight=inf.core_insight,
-                    wikipedia_url=inf.wikipedia_url
-                )
-                for inf in op.influences
-            ]
-        )
-        for op in operations
-    ]
+    catalogue = await schema_catalogue.get(db)
+    entry = catalogue.operations_entry_for(dimension_type.value if dimension_type else None)
+    return catalogue_response(request, entry)
 
 
 @router.get("/influences", response_model=List[TheoreticalInfluenceResponse])
-async def list_influences(db: AsyncSession = Depends(get_db)):
+async def list_influences(request: Request, db: AsyncSession = Depends(get_read_db)):
     """List all theoretical influences (thinkers)."""
-    result = await db.execute(
-        select(TheoreticalInfluence).order_by(TheoreticalInfluence.short_name)
-    )
-    influences = result.scalars().all()
-
-    return [
-        TheoreticalInfluenceResponse(
-            id=inf.id,
-            short_name=inf.short_name,
-            full_name=inf.full_name,
-            years=inf.years,
-            key_works=inf.key_works,
-            core_insight=inf.core_insight,
-            wikipedia_url=inf.wikipedia_url
-        )
-        for inf in influences
-    ]
+    catalogue = await schema_catalogue.get(db)
+    return catalogue_response(request, catalogue.influences_entry)
 
 
 @router.get("/concepts", response_model=List[AnalyzedConceptResponse])
 async def list_concepts(
     search: Optional[str] = None,
     paradigm: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all analyzed concepts."""
     query = select(AnalyzedConcept)
@@ -436,7 +305,7 @@ async def list_concepts(
 @router.get("/concepts/{concept_id}", response_model=FullConceptAnalysisResponse)
 async def get_concept_full_analysis(
     concept_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a concept with its full analysis across all dimensions.
@@ -452,13 +321,8 @@ async def get_concept_full_analysis(
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
 
-    # Get all dimensions with operations
-    dims_result = await db.execute(
-        select(AnalyticalDimension)
-        .options(selectinload(AnalyticalDimension.operations).selectinload(AnalyticalOperation.influences))
-        .order_by(AnalyticalDimension.sequence_order)
-    )
-    dimensions = dims_result.scalars().all()
+    # Dimensions/operations/influences come pre-serialised from the catalogue
+    catalogue = await schema_catalogue.get(db)
 
     # Get all analyses for this concept
     analyses_result = await db.execute(
@@ -532,86 +396,47 @@ async def get_concept_full_analysis(
             ]
         ))
 
-    # Build dimension responses
-    dimension_responses = []
-    for dim in dimensions:
-        dim_resp = AnalyticalDimensionResponse(
-            id=dim.id,
-            dimension_type=dim.dimension_type.value,
-            name=dim.name,
-            core_question=dim.core_question,
-            description=dim.description,
-            color_scheme=dim.color_scheme,
-            icon=dim.icon,
-            sequence_order=dim.sequence_order,
-            operations=[
-                AnalyticalOperationResponse(
-                    id=op.id,
-                    dimension_id=op.dimension_id,
-                    name=op.name,
-                    description=op.description,
-                    key_questions=op.key_questions,
-                    output_type=op.output_type.value if op.output_type else None,
-                    example_prompt=op.example_prompt,
-                    sequence_order=op.sequence_order,
-                    influences=[
-                        TheoreticalInfluenceResponse(
-                            id=inf.id,
-                            short_name=inf.short_name,
-                            full_name=inf.full_name,
-                            years=inf.years,
-                            key_works=inf.key_works,
-                            core_insight=inf.core_insight,
-                            wikipedia_url=inf.wikipedia_url
-                        )
-                        for inf in op.influences
-                    ]
-                )
-                for op in sorted(dim.operations, key=lambda x: x.sequence_order)
-            ]
-        )
-        dimension_responses.append(dim_resp)
-
     # Count analyses for concept response
     analysis_count = len(analyses)
 
-    return FullConceptAnalysisResponse(
-        concept=AnalyzedConceptResponse(
-            id=concept.id,
-            term=concept.term,
-            definition=concept.definition,
-            author=concept.author,
-            source_work=concept.source_work,
-            year=concept.year,
-            is_user_concept=concept.is_user_concept,
-            paradigm=concept.paradigm,
-            disciplinary_home=concept.disciplinary_home,
-            analysis_count=analysis_count
-        ),
-        dimensions=dimension_responses,
-        analyses_by_dimension=analyses_by_dimension
+    concept_resp = AnalyzedConceptResponse(
+        id=concept.id,
+        term=concept.term,
+        definition=concept.definition,
+        author=concept.author,
+        source_work=concept.source_work,
+        year=concept.year,
+        is_user_concept=concept.is_user_concept,
+        paradigm=concept.paradigm,
+        disciplinary_home=concept.disciplinary_home,
+        analysis_count=analysis_count
     )
 
+    # Splice the cached dimensions bytes into the FullConceptAnalysisResponse shape
+    body = b"".join([
+        b'{"concept":', concept_resp.model_dump_json().encode("utf-8"),
+        b',"dimensions":', catalogue.dimensions_entry.body,
+        b',"analyses_by_dimension":', _analyses_by_dimension_adapter.dump_json(analyses_by_dimension),
+        b"}",
+    ])
+    return Response(content=body, media_type="application/json")
+
 
 @router.get("/concepts/{concept_id}/dimension/{dimension_type}")
 async def get_concept_dimension_analysis(
     concept_id: int,
     dimension_type: DimensionType,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all analyses for a concept within a specific dimension."""
     # Get dimension
-    dim_result = await db.execute(
-        select(AnalyticalDimension)
-        .options(selectinload(AnalyticalDimension.operations))
-        .where(AnalyticalDimension.dimension_type == dimension_type)
-    )
-    dimension = dim_result.scalar_one_or_none()
+    catalogue = await schema_catalogue.get(db)
+    dimension = catalogue.get_dimension(dimension_type.value)
 
     if not dimension:
         raise HTTPException(status_code=404, detail=f"Dimension {dimension_type} not found")
 
-    operation_ids = [op.id for op in dimension.operations]
+    operation_ids = catalogue.operation_ids_by_dimension[dimension_type.value]
 
     # Get analyses with items, scaffolds, and relationships
     analyses_result = await db.execute(
@@ -668,8 +493,8 @@ async def get_concept_dimension_analysis(
     return {
         "dimension": {
             "type": dimension_type.value,
-            "name": dimension.name,
-            "core_question": dimension.core_question
+            "name": dimension["name"],
+            "core_question": dimension["core_question"]
         },
         "analyses": [
             ConceptAnalysisResponse(
@@ -683,7 +508,7 @@ async def get_concept_dimension_analysis(
                 source_type=a.source_type.value if a.source_type else "llm_generated",
                 notes=a.notes,
                 operation_name=a.operation.name,
-                dimension_name=dimension.name,
+                dimension_name=dimension["name"],
                 dimension_type=dimension_type.value,
                 items=[
                     AnalysisItemResponse(
@@ -732,51 +557,41 @@ async def get_concept_dimension_analysis(
 
 
 @router.get("/schema-overview")
-async def get_schema_overview(db: AsyncSession = Depends(get_db)):
+async def get_schema_overview(db: AsyncSession = Depends(get_read_db)):
     """
     Get a high-level overview of the analytical schema.
 
     Returns counts and summary statistics for dimensions, operations, influences, and concepts.
     """
-    # Count dimensions
-    dims_result = await db.execute(select(AnalyticalDimension))
-    dimensions = dims_result.scalars().all()
+    catalogue = await schema_catalogue.get(db)
 
-    # Count operations
-    ops_result = await db.execute(select(AnalyticalOperation))
-    operations = ops_result.scalars().all()
-
-    # Count influences
-    infs_result = await db.execute(select(TheoreticalInfluence))
-    influences = infs_result.scalars().all()
-
-    # Count concepts
-    concepts_result = await db.execute(select(AnalyzedConcept))
-    concepts = concepts_result.scalars().all()
-
-    # Count analyses
-    analyses_result = await db.execute(select(ConceptAnalysis))
-    analyses = analyses_result.scalars().all()
+    # Count concepts and analyses without loading rows
+    counts = (await db.execute(
+        select(
+            select(func.count(AnalyzedConcept.id)).scalar_subquery(),
+            select(func.count(ConceptAnalysis.id)).scalar_subquery(),
+        )
+    )).one()
 
     return {
-        "dimensions_count": len(dimensions),
-        "operations_count": len(operations),
-        "influences_count": len(influences),
-        "concepts_count": len(concepts),
-        "analyses_count": len(analyses),
+        "dimensions_count": len(catalogue.dimensions),
+        "operations_count": sum(len(ids) for ids in catalogue.operation_ids_by_dimension.values()),
+        "influences_count": len(catalogue.influences),
+        "concepts_count": counts[0],
+        "analyses_count": counts[1],
         "dimensions": [
             {
-                "type": d.dimension_type.value,
-                "name": d.name,
-                "core_question": d.core_question
+                "type": d["dimension_type"],
+                "name": d["name"],
+                "core_question": d["core_question"]
             }
-            for d in sorted(dimensions, key=lambda x: x.sequence_order)
+            for d in catalogue.dimensions
         ],
         "influences": [
             {
-                "short_name": i.short_name,
-                "full_name": i.full_name
+                "short_name": i["short_name"],
+                "full_name": i["full_name"]
             }
-            for i in sorted(influences, key=lambda x: x.short_name)
+            for i in catalogue.influences
         ]
     }
@@ -0,0 +1,517 @@
+"""
+Emerging Concept Deduplication
+
+Emerging concepts used to be deduplicated only by the periodic clustering
+pass, which sent every unclustered proposal to one LLM call and compared them
+only with each other, never with proposals already clustered or with the
+existing Concept terms.
+
+Now every proposal is matched on arrival against a similarity index of
+existing concepts (term / definition) and live emerging concepts
+(proposed_name / proposed_definition):
+
+- Names are shingled into character 3-grams, definitions into 5-grams, and
+  each shingle set gets a one-permutation MinHash signature (NUM_PERM bins,
+  empty bins densified from their neighbours), one hash per shingle. LSH
+  banding (BANDS x ROWS) finds candidates in a few dict lookups; candidates
+  are then scored by exact Jaccard, taking the better of name and definition.
+- score >= CONCEPT_DEDUP_DUPLICATE_THRESHOLD: a duplicate. The proposal joins
+  the cluster of the emerging concept it matches (or a new cluster with it),
+  or a MERGE cluster targeting the concept it matches.
+- CONCEPT_DEDUP_CANDIDATE_THRESHOLD <= score < duplicate: ambiguous. Only
+  these pairs go to the LLM, in one call, after the ingesting request has
+  committed.
+
+The index lives in the process: it's built from the tables on first use (in a
+worker thread), kept current from this process's writes (as a
+write_tracking subscriber), and rebuilt after CONCEPT_INDEX_TTL_SECONDS to pick up other processes'.
+
+Configuration (env):
+    CONCEPT_DEDUP_DUPLICATE_THRESHOLD  similarity treated as a duplicate (default 0.8)
+    CONCEPT_DEDUP_CANDIDATE_THRESHOLD  similarity worth asking the LLM about (default 0.45)
+    CONCEPT_INDEX_TTL_SECONDS          full rebuild interval (default 300)
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .database import session_scope
+from .llm_clients import get_llm_client, SONNET
+from .llm_scheduler import set_llm_priority, BACKGROUND
+from .structured_output import create_structured, StructuredOutputError
+from .llm_schemas import DuplicateConfirmation
+from .write_tracking import WriteSubscriber, subscribe
+from .models import (
+    Concept, EmergingConcept, ChallengeCluster, ChallengeClusterMember,
+    ConceptStatus, EmergingStatus, ClusterType, ClusterStatus, RecommendedAction
+)
+
+logger = logging.getLogger(__name__)
+
+CONCEPT_DEDUP_DUPLICATE_THRESHOLD = float(os.getenv("CONCEPT_DEDUP_DUPLICATE_THRESHOLD", "0.8"))
+CONCEPT_DEDUP_CANDIDATE_THRESHOLD = float(os.getenv("CONCEPT_DEDUP_CANDIDATE_THRESHOLD", "0.45"))
+CONCEPT_INDEX_TTL_SECONDS = float(os.getenv("CONCEPT_INDEX_TTL_SECONDS", "300"))
+
+CLAUDE_MODEL = "claude-sonnet-4-5-20250929"
+
+# MinHash / LSH parameters: 16 bands of 4 rows catch pairs around Jaccard 0.5 and up
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+NAME_SHINGLE = 3
+DEFINITION_SHINGLE = 5
+# Ambiguous candidates sent to the LLM per proposal
+MAX_CANDIDATES = 3
+
+# Emerging concepts still open to matching
+_LIVE_STATUSES = (EmergingStatus.PROPOSED, EmergingStatus.CLUSTERING, EmergingStatus.ACCEPTED)
+
+CONCEPT = "concept"
+EMERGING = "emerging"
+
+_BIN_BITS = NUM_PERM.bit_length() - 1  # NUM_PERM is a power of two
+_HASH_MASK = (1 << 64) - 1
+# Added per bin of distance when an empty bin borrows a neighbour's value
+_DENSIFY_OFFSET = 1 << 58
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+# =============================================================================
+# MINHASH
+# =============================================================================
+
+def shingles(text: Optional[str], size: int) -> FrozenSet[str]:
+    """Character n-grams of the text, lower-cased with punctuation folded to spaces."""
+    normalized = " ".join(_WORD_RE.findall((text or "").lower()))
+    if len(normalized) <= size:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def minhash(shingle_set: FrozenSet[str]) -> Optional[Tuple[int, ...]]:
+    """
+    One-permutation MinHash: each shingle's hash picks a bin (low bits) and
+    competes for that bin's minimum (high bits). Empty bins take the value of
+    the next filled bin, offset by the distance, so similar sets still agree
+    bin for bin. hash() is salted per process, which is fine for an index that
+    lives in one process.
+    """
+    if not shingle_set:
+        return None
+    signature: List[Optional[int]] = [None] * NUM_PERM
+    for shingle in shingle_set:
+        h = hash(shingle) & _HASH_MASK
+        b, value = h & (NUM_PERM - 1), h >> _BIN_BITS
+        current = signature[b]
+        if current is None or value < current:
+            signature[b] = value
+
+    filled = [b for b in range(NUM_PERM) if signature[b] is not None]
+    for b in range(NUM_PERM):
+        if signature[b] is None:
+            distance = next(
+                (f - b for f in filled if f > b), filled[0] + NUM_PERM - b
+            )
+            signature[b] = signature[(b + distance) % NUM_PERM] + distance * _DENSIFY_OFFSET
+    return tuple(signature)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    __slots__ = ("key", "name", "definition", "name_shingles", "definition_shingles", "bands")
+
+    def __init__(self, key: Tuple[str, int], name: str, definition: Optional[str]):
+        self.key = key
+        self.name = name
+        self.definition = definition
+        self.name_shingles = shingles(name, NAME_SHINGLE)
+        self.definition_shingles = shingles(definition, DEFINITION_SHINGLE)
+        self.bands = _bands("n", minhash(self.name_shingles)) + _bands("d", minhash(self.definition_shingles))
+
+    def similarity(self, other: "_Entry") -> float:
+        return max(
+            jaccard(self.name_shingles, other.name_shingles),
+            jaccard(self.definition_shingles, other.definition_shingles),
+        )
+
+
+def _bands(field: str, signature: Optional[Tuple[int, ...]]) -> List[tuple]:
+    if signature is None:
+        return []
+    return [(field, band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class Match:
+    """An indexed concept or emerging concept similar to a query."""
+
+    def __init__(self, kind: str, id: int, name: str, definition: Optional[str], score: float):
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.definition = definition
+        self.score = score
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class SimilarityIndex:
+    """LSH buckets over name and definition signatures."""
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self._entries: Dict[Tuple[str, int], _Entry] = {}
+        self._buckets: Dict[tuple, Set[Tuple[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, kind: str, id: int, name: str, definition: Optional[str]):
+        self.remove(kind, id)
+        entry = _Entry((kind, id), name, definition)
+        self._entries[entry.key] = entry
+        for band in entry.bands:
+            self._buckets.setdefault(band, set()).add(entry.key)
+
+    def remove(self, kind: str, id: int):
+        entry = self._entries.pop((kind, id), None)
+        if entry is None:
+            return
+        for band in entry.bands:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(entry.key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def query(
+        self,
+        name: str,
+        definition: Optional[str],
+        exclude: Optional[Tuple[str, int]] = None,
+        min_score: float = CONCEPT_DEDUP_CANDIDATE_THRESHOLD,
+    ) -> List[Match]:
+        """Indexed entries scoring at least min_score, best first."""
+        probe = self._entries.get(exclude) if exclude else None
+        if probe is None or (probe.name, probe.definition) != (name, definition):
+            probe = _Entry(exclude or ("query", 0), name, definition)
+        candidates = set()
+        for band in probe.bands:
+            candidates |= self._buckets.get(band, set())
+        candidates.discard(exclude)
+
+        matches = []
+        for key in candidates:
+            entry = self._entries[key]
+            score = probe.similarity(entry)
+            if score >= min_score:
+                matches.append(Match(key[0], key[1], entry.name, entry.definition, score))
+        matches.sort(key=lambda m: (-m.score, m.kind != CONCEPT, m.id))
+        return matches
+
+
+def _is_live(status) -> bool:
+    return status is None or status in _LIVE_STATUSES
+
+
+async def _load_index(db: AsyncSession) -> SimilarityIndex:
+    concepts = (await db.execute(
+        select(Concept.id, Concept.term, Concept.definition)
+        .where(Concept.status != ConceptStatus.DEPRECATED)
+    )).all()
+    emerging = (await db.execute(
+        select(EmergingConcept.id, EmergingConcept.proposed_name, EmergingConcept.proposed_definition)
+        .where(EmergingConcept.status.in_(_LIVE_STATUSES))
+    )).all()
+
+    def build():
+        index = SimilarityIndex()
+        for id, name, definition in concepts:
+            index.add(CONCEPT, id, name, definition)
+        for id, name, definition in emerging:
+            index.add(EMERGING, id, name, definition)
+        return index
+
+    index = await asyncio.to_thread(build)
+    logger.info(f"Concept similarity index built: {len(concepts)} concepts, {len(emerging)} emerging")
+    return index
+
+
+class ConceptIndex:
+    """The process's SimilarityIndex, built on first use and rebuilt after the TTL."""
+
+    def __init__(self):
+        self._index: Optional[SimilarityIndex] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._index = None
+
+    async def get(self, db: AsyncSession) -> SimilarityIndex:
+        index = self._index
+        if index is not None and time.monotonic() - index.built_at < CONCEPT_INDEX_TTL_SECONDS:
+            return index
+        async with self._lock:
+            if self._index is not None and self._index is not index:
+                return self._index
+            self._index = await _load_index(db)
+            return self._index
+
+    def apply(self, changes: List[tuple]):
+        """Apply committed (kind, id, name, definition, live) changes to a built index."""
+        index = self._index
+        if index is None:
+            return
+        for kind, id, name, definition, live in changes:
+            if live and name:
+                index.add(kind, id, name, definition)
+            else:
+                index.remove(kind, id)
+
+
+concept_index = ConceptIndex()
+
+
+class _IndexUpdates(WriteSubscriber):
+    """Collects flushed concept changes per session and applies them once committed."""
+
+    def flushed(self, session: Session, obj: Any, deleted: bool):
+        values = obj.__dict__
+        if isinstance(obj, Concept):
+            if not deleted and "term" not in values:
+                return  # expired; nothing to re-index from
+            live = not deleted and values.get("status") != ConceptStatus.DEPRECATED
+            change = (CONCEPT, values.get("id"), values.get("term"), values.get("definition"), live)
+        else:
+            if not deleted and "proposed_name" not in values:
+                return
+            live = not deleted and _is_live(values.get("status"))
+            change = (EMERGING, values.get("id"), values.get("proposed_name"), values.get("proposed_definition"), live)
+        if change[1] is not None:
+            session.info.setdefault("concept_index_changes", []).append(change)
+
+    def bulk_written(self, session: Session, model: type, rows: Optional[List[Dict[str, Any]]]):
+        concept_index.invalidate()
+
+    def ended(self, session: Session, committed: bool):
+        changes = session.info.pop("concept_index_changes", None)
+        if committed and changes:
+            concept_index.apply(changes)
+
+
+subscribe(_IndexUpdates(), Concept, EmergingConcept)
+
+
+# =============================================================================
+# CLUSTER WRITES
+# =============================================================================
+
+async def _refresh_project_count(db: AsyncSession, cluster: ChallengeCluster):
+    await db.flush()
+    cluster.source_project_count = await db.scalar(
+        select(func.count(distinct(EmergingConcept.source_project_id)))
+        .where(EmergingConcept.cluster_group_id == cluster.id)
+    ) or 0
+
+
+def _add_member(db: AsyncSession, cluster: ChallengeCluster, ec: EmergingConcept, score: float):
+    db.add(ChallengeClusterMember(
+        cluster_id=cluster.id,
+        emerging_concept_id=ec.id,
+        similarity_score=round(score, 3),
+    ))
+    ec.cluster_group_id = cluster.id
+    cluster.member_count = (cluster.member_count or 0) + 1
+
+
+async def attach_duplicate(db: AsyncSession, ec: EmergingConcept, match: Match) -> ChallengeCluster:
+    """
+    Cluster ec with what it duplicates: the open cluster of the matched emerging
+    concept (or a new one holding both), or the open MERGE cluster targeting the
+    matched concept.
+    """
+    cluster = None
+    if match.kind == CONCEPT:
+        cluster = (await db.execute(
+            select(ChallengeCluster).where(
+                ChallengeCluster.cluster_type == ClusterType.EMERGING_CONCEPT,
+                ChallengeCluster.target_concept_id == match.id,
+                ChallengeCluster.status == ClusterStatus.PENDING,
+            ).limit(1)
+        )).scalar_one_or_none()
+        if cluster is None:
+            cluster = ChallengeCluster(
+                cluster_type=ClusterType.EMERGING_CONCEPT,
+                cluster_summary=f"Proposals duplicating the existing concept \"{match.name}\"",
+                cluster_recommendation="Merge into the existing concept rather than adding a new one",
+                recommended_action=RecommendedAction.MERGE,
+                target_concept_id=match.id,
+                status=ClusterStatus.PENDING,
+                member_count=0,
+            )
+            db.add(cluster)
+            await db.flush()
+    else:
+        other = await db.get(EmergingConcept, match.id)
+        if other is not None and other.cluster_group_id:
+            cluster = await db.get(ChallengeCluster, other.cluster_group_id)
+            if cluster is not None and cluster.status == ClusterStatus.RESOLVED:
+                cluster = None
+        if cluster is None:
+            cluster = ChallengeCluster(
+                cluster_type=ClusterType.EMERGING_CONCEPT,
+                cluster_summary=f"\"{match.name}\" proposed independently by several projects",
+                cluster_recommendation="Review together; promote at most one",
+                recommended_action=RecommendedAction.HUMAN_REVIEW,
+                status=ClusterStatus.PENDING,
+                member_count=0,
+            )
+            db.add(cluster)
+            await db.flush()
+            if other is not None:
+                _add_member(db, cluster, other, 1.0)
+
+    _add_member(db, cluster, ec, match.score)
+    await _refresh_project_count(db, cluster)
+    return cluster
+
+
+# =============================================================================
+# MATCHING
+# =============================================================================
+
+async def find_duplicates(
+    db: AsyncSession,
+    emerging: List[EmergingConcept],
+) -> Tuple[List[Tuple[EmergingConcept, Match]], List[Tuple[EmergingConcept, Match]]]:
+    """
+    (duplicates, ambiguous) for unclustered proposals: each proposal's best
+    match at or above the duplicate threshold, else its best few candidates.
+    """
+    index = await concept_index.get(db)
+    duplicates, ambiguous = [], []
+    for ec in emerging:
+        if ec.cluster_group_id:
+            continue
+        matches = index.query(ec.proposed_name, ec.proposed_definition, exclude=(EMERGING, ec.id))
+        if not matches:
+            continue
+        if matches[0].score >= CONCEPT_DEDUP_DUPLICATE_THRESHOLD:
+            duplicates.append((ec, matches[0]))
+        else:
+            ambiguous.extend((ec, match) for match in matches[:MAX_CANDIDATES])
+    return duplicates, ambiguous
+
+
+DUPLICATE_CONFIRMATION_PROMPT = """Decide which of these pairs name the same theoretical concept.
+
+A pair is the same concept when a reviewer would merge them: the same idea under a different or
+near-identical name, not merely related or overlapping ideas.
+
+{pairs}
+
+Output JSON: {{"duplicates": [indices of the pairs that are the same concept]}}"""
+
+
+async def confirm_duplicates(pairs: List[Tuple[EmergingConcept, Match]]) -> List[int]:
+    """Indices of the ambiguous pairs the LLM judges to be duplicates (one call)."""
+    if not pairs:
+        return []
+    listing = "\n\n".join(
+        f"[{i}] A: {ec.proposed_name} - {ec.proposed_definition or ''}\n"
+        f"    B ({'existing concept' if match.kind == CONCEPT else 'proposed concept'}): "
+        f"{match.name} - {match.definition or ''}"
+        for i, (ec, match) in enumerate(pairs)
+    )
+    try:
+        result = await create_structured(
+            get_llm_client(SONNET),
+            DuplicateConfirmation,
+            model=CLAUDE_MODEL,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": DUPLICATE_CONFIRMATION_PROMPT.format(pairs=listing)}],
+        )
+    except StructuredOutputError as e:
+        logger.warning(f"Duplicate confirmation unusable: {e}")
+        return []
+    return [i for i in result.duplicates if 0 <= i < len(pairs)]
+
+
+async def apply_confirmed(
+    db: AsyncSession,
+    pairs: List[Tuple[EmergingConcept, Match]],
+    confirmed: List[int],
+) -> List[ChallengeCluster]:
+    """Attach each proposal to its best confirmed match."""
+    clusters = []
+    for i in sorted(set(confirmed), key=lambda i: -pairs[i][1].score):
+        ec, match = pairs[i]
+        if ec is None or ec.cluster_group_id:
+            continue
+        clusters.append(await attach_duplicate(db, ec, match))
+    return clusters
+
+
+async def dedupe_on_ingest(db: AsyncSession, emerging: List[EmergingConcept]) -> int:
+    """
+    Cluster newly committed proposals that duplicate something indexed, and
+    hand ambiguous pairs to a background LLM check. Returns the number clustered.
+    """
+    try:
+        duplicates, ambiguous = await find_duplicates(db, emerging)
+        for ec, match in duplicates:
+            if not ec.cluster_group_id:
+                await attach_duplicate(db, ec, match)
+        if duplicates:
+            await db.commit()
+    except Exception as e:
+        # Dedup is advisory; the proposals are already stored
+        logger.warning(f"Emerging concept dedup failed: {e}", exc_info=True)
+        await db.rollback()
+        return 0
+
+    if ambiguous:
+        pending = [(ec.id, match) for ec, match in ambiguous if not ec.cluster_group_id]
+        if pending:
+            task = asyncio.create_task(_review_ambiguous(pending))
+            _review_tasks.add(task)
+            task.add_done_callback(_review_tasks.discard)
+    return len(duplicates)
+
+
+_review_tasks: Set[asyncio.Task] = set()
+
+
+async def _review_ambiguous(pending: List[Tuple[int, Match]]):
+    """Background LLM check of ambiguous pairs, outside the ingesting request."""
+    set_llm_priority(BACKGROUND, project="dedup")
+    try:
+        async with session_scope() as db:
+            emerging = {
+                ec.id: ec for ec in (await db.execute(
+                    select(EmergingConcept).where(EmergingConcept.id.in_({id for id, _ in pending}))
+                )).scalars()
+            }
+        pairs = [(emerging[id], match) for id, match in pending if id in emerging]
+        confirmed = await confirm_duplicates(pairs)
+        if confirmed:
+            async with session_scope() as db:
+                # Re-read: the proposals may have been clustered meanwhile
+                reloaded = [(await db.get(EmergingConcept, ec.id), match) for ec, match in pairs]
+                await apply_confirmed(db, reloaded, confirmed)
+    except Exception as e:
+        logger.warning(f"Ambiguous duplicate review failed: {e}", exc_info=True)
@@ -11,9 +11,16 @@ Handles LLM calls for:
 import json
 import logging
 from typing import List, Dict, Optional, Tuple
-from anthropic import Anthropic
-import os
 
+from .llm_clients import get_llm_client, SONNET
+from .structured_output import create_structured, StructuredOutputError
+from .llm_schemas import (
+    ConceptFragmentExtraction,
+    ConceptFragmentAnalysis,
+    ConceptInterpretationSet,
+    InterpretationCommitments,
+)
+from .evidence_chunking import SourceChunk, extract_chunked
 from .concept_evidence_prompts import (
     EVIDENCE_EXTRACTION_PROMPT,
     EVIDENCE_ANALYSIS_PROMPT,
@@ -29,17 +36,9 @@ logger = logging.getLogger(__name__)
 MODEL = "claude-sonnet-4-5-20250929"
 MAX_TOKENS = 4000
 
-_client = None
-
 def get_claude_client():
-    """Get Claude client, raising helpful error if API key missing."""
-    global _client
-    if _client is None:
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        _client = Anthropic(api_key=api_key)
-    return _client
+    """Get the shared Claude client, raising helpful error if API key missing."""
+    return get_llm_client(SONNET)
 
 
 async def extract_fragments_from_source(
@@ -58,43 +57,40 @@ async def extract_fragments_from_source(
     - source_location: Where in the document
     - likely_dimension: Which dimension it relates to
     - extraction_note: Why it's relevant
-    """
-    prompt = EVIDENCE_EXTRACTION_PROMPT.format(
-        concept_term=concept_term,
-        concept_definition=concept_definition or "No definition provided",
-        concept_summary=concept_summary or "No summary available",
-        source_name=source_name,
-        source_type=source_type,
-        source_content=source_content[:15000]  # Limit content length
-    )
 
+    Long sources are chunked, extracted concurrently and deduplicated (see
+    evidence_chunking); fragments also carry "chunks", the chunk indexes
+    they were found in.
+
+    A chunk whose output is unusable fails the whole extraction (raises
+    StructuredOutputError), so the source is marked failed, not short.
+    """
     client = get_claude_client()
 
-    try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=MAX_TOKENS,
-            messages=[{"role": "user", "content": prompt}]
+    async def extract_chunk(chunk: SourceChunk) -> List[Dict]:
+        prompt = EVIDENCE_EXTRACTION_PROMPT.format(
+            concept_term=concept_term,
+            concept_definition=concept_definition or "No definition provided",
+            concept_summary=concept_summary or "No summary available",
+            source_name=source_name if chunk.total == 1 else f"{source_name} ({chunk.label})",
+            source_type=source_type,
+            source_content=chunk.text
         )
+        try:
+            result = await create_structured(
+                client,
+                ConceptFragmentExtraction,
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except StructuredOutputError as e:
+            # Fail the whole source (it stays retryable) rather than drop the chunk
+            raise StructuredOutputError(f"Unusable extraction response ({chunk.label}): {e}", e.raw) from e
+        return [fragment.model_dump() for fragment in result.fragments]
 
-        # Extract JSON from response
-        content = response.content[0].text
-
-        # Try to find JSON in response
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            result = json.loads(json_str)
-            return result.get("fragments", [])
-        else:
-            logger.error(f"No JSON found in extraction response: {content[:500]}")
-            return []
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse extraction response: {e}")
-        return []
+    try:
+        return await extract_chunked(source_content, extract_chunk)
     except Exception as e:
         logger.error(f"Extraction failed: {e}")
         raise
@@ -133,31 +129,16 @@ async def analyze_fragment(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            ConceptFragmentAnalysis,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
+        return result.model_dump()
 
-        content = response.content[0].text
-
-        # Extract JSON
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            return json.loads(json_str)
-        else:
-            logger.error(f"No JSON found in analysis response")
-            return {
-                "relationship_type": "illustrates",
-                "confidence": 0.5,
-                "is_ambiguous": True,
-                "why_needs_decision": "Failed to parse LLM response"
-            }
-
-    except json.JSONDecodeError as e:
+    except StructuredOutputError as e:
         logger.error(f"Failed to parse analysis response: {e}")
         return {
             "relationship_type": "illustrates",
@@ -202,24 +183,18 @@ async def generate_interpretations(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            ConceptInterpretationSet,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
+        return [interp.model_dump() for interp in result.interpretations]
 
-        content = response.content[0].text
-
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            result = json.loads(json_str)
-            return result.get("interpretations", [])
-        else:
-            logger.error(f"No JSON found in interpretation response")
-            return []
+    except StructuredOutputError as e:
+        logger.error(f"Unusable interpretation response: {e}")
+        return []
 
     except Exception as e:
         logger.error(f"Interpretation generation failed: {e}")
@@ -247,31 +222,22 @@ async def add_commitment_foreclosure(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            InterpretationCommitments,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        content = response.content[0].text
-
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            result = json.loads(json_str)
-
-            # Convert to dict keyed by interpretation key
-            cf_by_key = {}
-            for interp in result.get("interpretations", []):
-                cf_by_key[interp["key"]] = {
-                    "commitment_statement": interp.get("commitment_statement", ""),
-                    "foreclosure_statements": interp.get("foreclosure_statements", [])
-                }
-            return cf_by_key
-        else:
-            return {}
+        # Convert to dict keyed by interpretation key
+        return {
+            interp.key: {
+                "commitment_statement": interp.commitment_statement,
+                "foreclosure_statements": interp.foreclosure_statements
+            }
+            for interp in result.interpretations
+        }
 
     except Exception as e:
         logger.error(f"Commitment/foreclosure generation failed: {e}")
@@ -8,13 +8,15 @@ including source management, fragment analysis, and decision handling.
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func as sql_func, update
+from sqlalchemy import select, insert, update
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
-from .database import get_db
+from .database import get_db, release_connection
+from .decision_queue import load_decision_page, load_decision_at, count_pending, MAX_DECISION_PAGE
+from .llm_scheduler import llm_priority, BATCH
 from .concept_analysis_models import (
     AnalyzedConcept, AnalyticalOperation, AnalyticalDimension, AnalysisItem, ConceptAnalysis,
     ConceptEvidenceSource, ConceptEvidenceFragment, ConceptEvidenceInterpretation,
@@ -115,6 +117,18 @@ class PendingDecisionResponse(BaseModel):
     total_pending: int
 
 
+class DecisionQueueResponse(BaseModel):
+    decisions: List[PendingDecisionResponse]  # Current decision first, then prefetched ones
+    total_pending: int
+    position: int  # 1-based position of decisions[0]; 0 when empty
+    next_cursor: Optional[int] = None  # Pass as ?after= for the following decisions
+    previous_cursor: Optional[int] = None  # Pass as ?before= for the preceding decisions
+
+
+class PendingDecisionCountResponse(BaseModel):
+    total_pending: int
+
+
 class DecisionSubmit(BaseModel):
     interpretation_id: int
     accepted_change_ids: List[int] = []
@@ -155,48 +169,21 @@ async def get_or_create_progress(db: AsyncSession, concept_id: int) -> ConceptEv
 
 async def update_progress_counts(db: AsyncSession, concept_id: int):
     """Recalculate and update progress counts."""
-    progress = await get_or_create_progress(db, concept_id)
+    # Import here to avoid circular import (project_stats loads the strategizer package)
+    from .project_stats import concept_evidence_stats
 
-    # Count sources
-    sources_result = await db.execute(
-        select(sql_func.count(ConceptEvidenceSource.id))
-        .where(ConceptEvidenceSource.concept_id == concept_id)
-    )
-    progress.total_sources = sources_result.scalar() or 0
+    progress = await get_or_create_progress(db, concept_id)
 
-    # Count all fragments for this concept's sources
-    fragments_result = await db.execute(
-        select(sql_func.count(ConceptEvidenceFragment.id))
-        .join(ConceptEvidenceSource)
-        .where(ConceptEvidenceSource.concept_id == concept_id)
-    )
-    progress.total_fragments = fragments_result.scalar() or 0
-
-    # Count by status
-    for status, attr in [
-        (AnalysisStatus.AUTO_INTEGRATED, 'auto_integrated_count'),
-        (AnalysisStatus.NEEDS_DECISION, 'needs_decision_count'),
-        (AnalysisStatus.RESOLVED, 'resolved_count'),
-    ]:
-        count_result = await db.execute(
-            select(sql_func.count(ConceptEvidenceFragment.id))
-            .join(ConceptEvidenceSource)
-            .where(
-                ConceptEvidenceSource.concept_id == concept_id,
-                ConceptEvidenceFragment.analysis_status == status
-            )
-        )
-        setattr(progress, attr, count_result.scalar() or 0)
+    # Pending writes must be visible to the counts (and bump the stats revision)
+    await db.flush()
+    stats = await concept_evidence_stats(db, concept_id)
 
-    # Count skipped decisions
-    skipped_result = await db.execute(
-        select(sql_func.count(ConceptEvidenceDecision.id))
-        .where(
-            ConceptEvidenceDecision.concept_id == concept_id,
-            ConceptEvidenceDecision.skipped == True
-        )
-    )
-    progress.skipped_count = skipped_result.scalar() or 0
+    progress.total_sources = stats.total_sources
+    progress.total_fragments = stats.total_fragments
+    progress.auto_integrated_count = stats.auto_integrated_count
+    progress.needs_decision_count = stats.needs_decision_count
+    progress.resolved_count = stats.resolved_count
+    progress.skipped_count = stats.skipped_count
 
     await db.flush()
 
@@ -391,48 +378,36 @@ async def list_fragments(
 
 # --- Pending Decisions ---
 
-@router.get("/decisions/pending", response_model=Optional[PendingDecisionResponse])
-async def get_pending_decision(
-    concept_id: int,
-    index: int = Query(0, ge=0, description="Zero-based index into pending decisions"),
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Get a specific pending decision by index.
-
-    Returns the fragment with its interpretations and structural changes.
-    """
-    # Get all pending fragments
-    query = (
+def _pending_decisions_query(concept_id: int):
+    """NEEDS_DECISION fragments for a concept (no ordering, no eager loads)."""
+    return (
         select(ConceptEvidenceFragment)
         .join(ConceptEvidenceSource)
-        .options(
-            selectinload(ConceptEvidenceFragment.source),
-            selectinload(ConceptEvidenceFragment.target_operation).selectinload(AnalyticalOperation.dimension),
-            selectinload(ConceptEvidenceFragment.interpretations).selectinload(
-                ConceptEvidenceInterpretation.structural_changes
-            ).selectinload(ConceptStructuralChange.target_operation)
-        )
         .where(
             ConceptEvidenceSource.concept_id == concept_id,
             ConceptEvidenceFragment.analysis_status == AnalysisStatus.NEEDS_DECISION
         )
-        .order_by(ConceptEvidenceFragment.created_at)
     )
 
-    result = await db.execute(query)
-    pending = result.scalars().all()
-
-    if not pending:
-        return None
 
-    total = len(pending)
-    if index >= total:
-        index = total - 1
+_PENDING_DECISION_LOADS = (
+    selectinload(ConceptEvidenceFragment.source),
+    selectinload(ConceptEvidenceFragment.target_operation).selectinload(AnalyticalOperation.dimension),
+    selectinload(ConceptEvidenceFragment.interpretations).selectinload(
+        ConceptEvidenceInterpretation.target_operation
+    ),
+    selectinload(ConceptEvidenceFragment.interpretations).selectinload(
+        ConceptEvidenceInterpretation.structural_changes
+    ).selectinload(ConceptStructuralChange.target_operation),
+)
 
-    fragment = pending[index]
 
-    # Build response
+def _pending_decision_response(
+    fragment: ConceptEvidenceFragment,
+    decision_index: int,
+    total: int
+) -> PendingDecisionResponse:
+    """Build the decision payload for a fragment loaded with _PENDING_DECISION_LOADS."""
     interpretations = []
     for interp in sorted(fragment.interpretations, key=lambda x: x.display_order):
         changes = []
@@ -450,16 +425,6 @@ async def get_pending_decision(
                 display_order=change.display_order
             ))
 
-        # Get operation name for interpretation
-        op_name = None
-        if interp.target_operation_id:
-            op_result = await db.execute(
-                select(AnalyticalOperation).where(AnalyticalOperation.id == interp.target_operation_id)
-            )
-            op = op_result.scalar_one_or_none()
-            if op:
-                op_name = op.name
-
         interpretations.append(InterpretationResponse(
             id=interp.id,
             fragment_id=interp.fragment_id,
@@ -469,7 +434,7 @@ async def get_pending_decision(
             rationale=interp.rationale,
             relationship_type=interp.relationship_type.value if interp.relationship_type else None,
             target_operation_id=interp.target_operation_id,
-            target_operation_name=op_name,
+            target_operation_name=interp.target_operation.name if interp.target_operation else None,
             is_selected=interp.is_selected,
             is_recommended=interp.is_recommended,
             recommendation_rationale=interp.recommendation_rationale,
@@ -495,11 +460,79 @@ async def get_pending_decision(
             created_at=fragment.created_at
         ),
         interpretations=interpretations,
-        decision_index=index + 1,
+        decision_index=decision_index,
         total_pending=total
     )
 
 
+@router.get("/decisions/pending", response_model=Optional[PendingDecisionResponse])
+async def get_pending_decision(
+    concept_id: int,
+    index: int = Query(0, ge=0, description="Zero-based index into pending decisions"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a specific pending decision by index.
+
+    Returns the fragment with its interpretations and structural changes.
+    Kept for index-based clients; /decisions/queue navigates by cursor and
+    can prefetch upcoming decisions.
+    """
+    page = await load_decision_at(
+        db, ConceptEvidenceFragment, _pending_decisions_query(concept_id),
+        index, options=_PENDING_DECISION_LOADS
+    )
+    if page is None:
+        return None
+    return _pending_decision_response(page.items[0], page.position, page.total)
+
+
+@router.get("/decisions/queue", response_model=DecisionQueueResponse)
+async def get_decision_queue(
+    concept_id: int,
+    after: Optional[int] = Query(None, description="Fragment id; return the decisions after it"),
+    before: Optional[int] = Query(None, description="Fragment id; return the decisions before it"),
+    prefetch: int = Query(2, ge=0, le=MAX_DECISION_PAGE - 1, description="Extra decisions to include after the current one"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cursor-paginated pending decisions, oldest first.
+
+    Returns the current decision plus up to `prefetch` following ones, each
+    with interpretations and structural changes. Use next_cursor as ?after=
+    to continue (including after deciding or skipping the current one) and
+    previous_cursor as ?before= to step back.
+    """
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Pass either 'after' or 'before', not both")
+
+    page = await load_decision_page(
+        db, ConceptEvidenceFragment, _pending_decisions_query(concept_id),
+        after=after, before=before, limit=1 + prefetch, options=_PENDING_DECISION_LOADS
+    )
+    return DecisionQueueResponse(
+        decisions=[
+            _pending_decision_response(f, page.position + i, page.total)
+            for i, f in enumerate(page.items)
+        ],
+        total_pending=page.total,
+        position=page.position,
+        next_cursor=page.items[-1].id if page.has_next else None,
+        previous_cursor=page.items[0].id if page.has_previous else None
+    )
+
+
+@router.get("/decisions/count", response_model=PendingDecisionCountResponse)
+async def get_pending_decision_count(
+    concept_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Number of decisions awaiting review (COUNT only, no rows loaded)."""
+    return PendingDecisionCountResponse(
+        total_pending=await count_pending(db, _pending_decisions_query(concept_id))
+    )
+
+
 @router.post("/decisions")
 async def submit_decision(
     concept_id: int,
@@ -753,40 +786,44 @@ async def extract_from_source(
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
 
-    # Update status to processing
+    # Update status to processing; commit so the connection isn't held
+    # through the (possibly multi-chunk) LLM extraction
     source.extraction_status = ExtractionStatus.PROCESSING
-    await db.flush()
+    await release_connection(db)
 
     try:
         # Call LLM to extract fragments
-        fragments_data = await llm_extract_fragments(
-            concept_term=concept.term,
-            concept_definition=concept.definition or "",
-            concept_summary=get_concept_summary(concept, concept.analyses),
-            source_name=source.source_name,
-            source_type=source.source_type.value,
-            source_content=source.source_content
-        )
+        with llm_priority(BATCH, project=f"concept:{concept_id}"):
+            fragments_data = await llm_extract_fragments(
+                concept_term=concept.term,
+                concept_definition=concept.definition or "",
+                concept_summary=get_concept_summary(concept, concept.analyses),
+                source_name=source.source_name,
+                source_type=source.source_type.value,
+                source_content=source.source_content or ""
+            )
 
-        # Create fragment records
-        created_fragments = []
-        for frag_data in fragments_data:
-            fragment = ConceptEvidenceFragment(
-                source_id=source_id,
-                content=frag_data.get("content", ""),
-                source_location=frag_data.get("source_location"),
-                analysis_status=AnalysisStatus.PENDING,
-                extraction_metadata={
+        # Create fragment records in one bulk INSERT
+        fragment_rows = [
+            {
+                "source_id": source_id,
+                "content": frag_data.get("content", ""),
+                "source_location": frag_data.get("source_location"),
+                "analysis_status": AnalysisStatus.PENDING,
+                "extraction_metadata": {
                     "likely_dimension": frag_data.get("likely_dimension"),
-                    "extraction_note": frag_data.get("extraction_note")
-                }
-            )
-            db.add(fragment)
-            created_fragments.append(fragment)
+                    "extraction_note": frag_data.get("extraction_note"),
+                    "chunks": frag_data.get("chunks"),
+                },
+            }
+            for frag_data in fragments_data
+        ]
+        if fragment_rows:
+            await db.execute(insert(ConceptEvidenceFragment), fragment_rows)
 
         # Update source
         source.extraction_status = ExtractionStatus.COMPLETED
-        source.extracted_count = len(created_fragments)
+        source.extracted_count = len(fragment_rows)
 
         await update_progress_counts(db, concept_id)
         await db.commit()
@@ -794,11 +831,12 @@ async def extract_from_source(
         return {
             "status": "completed",
             "source_id": source_id,
-            "fragments_extracted": len(created_fragments),
-            "message": f"Extracted {len(created_fragments)} fragments. Use POST /fragments/{{id}}/analyze to analyze each."
+            "fragments_extracted": len(fragment_rows),
+            "message": f"Extracted {len(fragment_rows)} fragments. Use POST /fragments/{{id}}/analyze to analyze each."
         }
 
     except Exception as e:
+        await db.rollback()
         source.extraction_status = ExtractionStatus.FAILED
         source.extraction_error = str(e)
         await db.commit()
@@ -1054,7 +1092,8 @@ async def extract_and_analyze_source(
 
     for fragment in fragments:
         try:
-            analysis_result = await analyze_fragment_endpoint(concept_id, fragment.id, db)
+            with llm_priority(BATCH, project=f"concept:{concept_id}"):
+                analysis_result = await analyze_fragment_endpoint(concept_id, fragment.id, db)
             if analysis_result["status"] == "auto_integrated":
                 results["auto_integrated"] += 1
             else:
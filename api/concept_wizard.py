@@ -13,6 +13,7 @@ Design Principles:
 """
 
 import os
+import re
 import json
 import asyncio
 import logging
@@ -30,10 +31,43 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from sqlalchemy.orm import attributes
-from anthropic import Anthropic
 
-from .database import get_db, AsyncSessionLocal
+from .context_packing import (
+    ContextBlock, compact_json, pack_context, pack_json, pack_text,
+    CONTEXT_QUESTION_TOKENS, CONTEXT_NOTES_TOKENS, CONTEXT_SYNTHESIS_TOKENS,
+)
+from .database import get_db, session_scope, release_connection
+from .llm_clients import get_llm_client, OPUS
+from .llm_scheduler import run_llm_call
 from .models import WizardSession
+from .single_flight import coalesce_requests
+from .stream_broker import stream_response
+from .structured_output import (
+    create_structured, parse_structured, extract_json, JsonStreamValidator, JsonItemScanner,
+    StructuredOutputError
+)
+from .llm_schemas import (
+    AnswerTypeCuration, BatchAnswerTypeCuration, GeneratedAnswerOptions,
+    CardAnswerOptions, GenealogyHypotheses, FollowUpQuestions,
+    CuratorAllocation, SharpenedQuestion,
+)
+from .concept_wizard_prompts import (
+    ANALYZE_NOTES_SYSTEM, PROCESS_ANSWERS_SYSTEM,
+    INITIAL_ANALYSIS_PROMPT, INFORMED_HYPOTHESIS_GENERATION_PROMPT, INTERIM_ANALYSIS_PROMPT,
+    STAGE2_GENERATION_PROMPT, STAGE3_REFINEMENT_PROMPT, REGENERATE_UNDERSTANDING_PROMPT,
+    GENERATE_CASE_STUDIES_PROMPT, STAGE3_GENERATION_PROMPT,
+    GENERATE_RECOGNITION_MARKERS_PROMPT, REGENERATE_SECTION_PROMPT,
+    REGENERATE_INSIGHT_PROMPT, GENERATE_TENSIONS_PROMPT,
+    REGENERATE_TENSION_PROMPT, DOCUMENT_ANALYSIS_PROMPT,
+    GENERATE_DEEP_COMMITMENTS_PROMPT, GENERATE_DEEP_COMMITMENTS_SHARD_PROMPT,
+    REFINE_WITH_FEEDBACK_PROMPT, EPISTEMIC_CATEGORIES_REGISTRY, CURATOR_PROMPT,
+    SHARPENER_PROMPT, TRANSFORM_CARD_PROMPT, MODE_INSTRUCTIONS, GENERATE_OPTIONS_PROMPT,
+    GENERATE_GENEALOGY_PROMPT, GENERATE_PHASE2_PROMPT, GENERATE_PHASE3_PROMPT,
+    ANSWER_TYPE_CURATOR_PROMPT, DYNAMIC_ANSWER_OPTIONS_PROMPT,
+    BATCH_ANSWER_TYPE_CURATOR_PROMPT,
+    DYNAMIC_STAGE2_QUESTION_PROMPT, DYNAMIC_STAGE3_QUESTION_PROMPT,
+    DYNAMIC_PHILOSOPHY_QUESTION_PROMPT,
+)
 from enum import Enum
 
 # PDF extraction (optional - graceful fallback)
@@ -46,18 +80,13 @@ except ImportError:
 
 router = APIRouter(prefix="/concepts/wizard", tags=["concept-wizard"])
 
-# Claude client - initialize lazily to handle missing API key gracefully
-_client = None
-
+# Claude client - shared (opus tier), created lazily to handle missing API key gracefully
 def get_claude_client():
     """Get Claude client, raising helpful error if API key missing."""
-    global _client
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY environment variable is not set. Please configure it in Render.")
-    if _client is None:
-        _client = Anthropic(api_key=api_key)
-    return _client
+    return get_llm_client(OPUS)
 
 # Model configuration
 MODEL = "claude-opus-4-5-20251101"  # Correct model ID for Opus 4.5
@@ -313,16 +342,6 @@ class BlindSpotSlot(BaseModel):
     blind_spot_ref: Optional[str] = None  # Reference to identified blind spot
 
 
-class CuratorAllocation(BaseModel):
-    """Curator's analysis and slot allocation plan."""
-    total_slots: int  # Max 16
-    category_weights: Dict[str, float]  # e.g., {"ambiguity": 0.25, "presupposition": 0.3}
-    slot_sequence: List[str]  # Interleaved category order
-    emphasis_rationale: str  # Why this allocation
-    identified_blind_spots: List[EpistemicBlindSpot]  # All detected blind spots
-    slots: List[BlindSpotSlot]  # Pre-generated initial questions
-
-
 class BlindSpotsQueue(BaseModel):
     """The full question queue with dynamic updates."""
     slots: List[BlindSpotSlot]
@@ -388,6 +407,24 @@ class GenerateAnswerOptionsResponse(BaseModel):
     exclusivity_reason: Optional[str] = None  # Why options are/aren't mutually exclusive
 
 
+class BatchAnswerOptionsQuestion(BaseModel):
+    """One question in a batched answer-options request."""
+    question_id: str  # Echoed back on each SSE event (e.g. the blind-spot slot_id)
+    question: str
+    category: str  # One of 7 epistemic categories
+
+
+class GenerateAnswerOptionsBatchRequest(BaseModel):
+    """Request to generate answer options for a whole queue of questions at once."""
+    questions: List[BatchAnswerOptionsQuestion]
+    concept_name: str
+    notes_context: Optional[str] = None
+    previous_answers: Optional[List[Dict[str, Any]]] = None
+    # "concurrent": one curator call per question, each generation starts as its curation lands
+    # "combined": a single curator call covering every question
+    curation_mode: str = "concurrent"
+
+
 class BlindSpotAnswer(BaseModel):
     """A single blind spot question with its answer."""
     slot_id: str
@@ -500,6 +537,7 @@ class DeepCommitmentsRequest(BaseModel):
     stage2_answers: Optional[Any] = None  # Can be list of answers or dict
     dimensional_extraction: Optional[Dict[str, Any]] = None  # From documents/notes
     source_id: Optional[int] = None
+    generation_mode: str = "monolithic"  # "monolithic" (one Opus call) or "sharded" (one call per dimension)
 
 
 class Phase2QuestionsRequest(BaseModel):
@@ -782,11 +820,17 @@ DEFAULT_QUESTIONS = STAGE1_QUESTIONS + STAGE3_QUESTIONS
 # STREAMING HELPERS
 # =============================================================================
 
-async def stream_thinking_response(messages: List[dict], system: str = None):
+async def stream_thinking_response(
+    messages: List[dict],
+    system: str = None,
+    item_types: Optional[Dict[str, str]] = None
+):
     """
     Stream response with extended thinking from Opus 4.5.
-    Yields SSE events for thinking and text blocks.
+    Yields SSE events for thinking and text blocks, plus `item` events for the
+    arrays named in item_types (see StreamedItems).
     """
+    items = StreamedItems(item_types or {})
     try:
         # Get client (will raise if API key missing)
         client = get_claude_client()
@@ -816,6 +860,8 @@ async def stream_thinking_response(messages: List[dict], system: str = None):
                         yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                     elif hasattr(event.delta, 'text'):
                         yield f"data: {json.dumps({'type': 'text', 'content': event.delta.text})}\n\n"
+                        for item_event in items.feed(event.delta.text):
+                            yield item_event
 
             # Get final message for complete data
             final = stream.get_final_message()
@@ -836,960 +882,51 @@ async def stream_thinking_response(messages: List[dict], system: str = None):
     yield "data: [DONE]\n\n"
 
 
-def parse_wizard_response(text: str) -> dict:
-    """Parse JSON from LLM response, handling markdown code blocks."""
-    # Try to find JSON in the response
-    if "```json" in text:
-        start = text.find("```json") + 7
-        end = text.find("```", start)
-        text = text[start:end].strip()
-    elif "```" in text:
-        start = text.find("```") + 3
-        end = text.find("```", start)
-        text = text[start:end].strip()
-
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Return as raw text if not JSON
-        return {"raw_response": text}
-
-
-# =============================================================================
-# PROMPTS
-# =============================================================================
-
-ANALYZE_NOTES_SYSTEM = """You are an expert in conceptual analysis and knowledge elicitation, helping users articulate novel theoretical concepts that don't yet exist in public discourse.
-
-Your task is to analyze the user's notes about their concept and generate adaptive follow-up questions that will help fully articulate the concept.
-
-Design Principles:
-- Staged Adaptive Interrogation: Generate questions that build on what you learn from their notes
-- Precision-Forcing: Ask questions that force definitional clarity
-- Proactive Insufficiency Signaling: Identify gaps in the notes and ask about them
-
-Output Format: Return a JSON object with:
-{
-  "analysis_summary": "Brief summary of what you understood from the notes",
-  "identified_gaps": ["list", "of", "gaps"],
-  "questions": [
-    {
-      "id": "unique_id",
-      "text": "The question to ask",
-      "type": "open_ended|multiple_choice|multi_select|scale",
-      "stage": 1-6,
-      "options": [...] // for choice questions
-      "help": "Help text for the user",
-      "example": "Example answer if helpful",
-      "rationale": "Why this question matters",
-      "min_length": 100, // for open_ended
-      "rows": 4 // textarea rows
-    }
-  ]
-}
-
-Generate 8-12 questions that are tailored to what the user has already told you. Skip questions whose answers are clearly provided in the notes. Focus on gaps and areas needing elaboration."""
-
-
-PROCESS_ANSWERS_SYSTEM = """You are an expert in conceptual analysis, synthesizing user answers into a comprehensive concept definition.
-
-Your task is to take the user's answers to wizard questions and synthesize them into a structured concept definition that populates the "Genesis Dimension" schema.
-
-The user is introducing a NOVEL concept that doesn't exist in public discourse yet. This means:
-- You cannot rely on external knowledge about this concept
-- Everything must come from what the user has provided
-- You should flag areas where more information would be helpful
-
-Output Format: Return a JSON object with:
-{
-  "more_questions": false, // Set to true if critical gaps need addressing
-  "questions": [...], // Only if more_questions is true
-  "concept": {
-    "name": "Concept Name",
-    "definition": "Full synthesized definition (2-3 paragraphs)",
-    "category": "Category if determinable",
-    "genesis": {
-      "type": "theoretical_innovation|empirical_discovery|synthetic_unification|paradigm_shift",
-      "lineage": "Theoretical traditions it builds on",
-      "break_from": "What it breaks from (if applicable)",
-      "novelty_claim": "Why this is genuinely new"
-    },
-    "problem_space": {
-      "gap": "The gap this concept fills",
-      "failed_alternatives": ["concepts", "that", "failed"],
-      "urgency": "Why now"
-    },
-    "differentiations": [
-      {
-        "confused_with": "Other Concept",
-        "confusion_type": "subset|superset|synonym|false_opposition",
-        "difference": "Key distinction",
-        "what_lost": "What's lost in confusion"
-      }
-    ],
-    "paradigmatic_case": {
-      "name": "Case name",
-      "description": "Full description",
-      "why": "Why this is paradigmatic",
-      "features": ["exhibited", "features"]
-    },
-    "implicit_domains": [
-      {
-        "domain": "Domain name",
-        "type": "academic|policy|industry|media|everyday",
-        "proxy_terms": ["terms", "used", "instead"],
-        "manifestation": "How concept appears here"
-      }
-    ],
-    "core_claims": [
-      {
-        "type": "ontological|causal|normative|methodological",
-        "statement": "The claim",
-        "if_false": "Consequence if false"
-      }
-    ],
-    "recognition_markers": [
-      {
-        "type": "linguistic|structural|situational|argumentative",
-        "description": "How to recognize implicit instances",
-        "pattern": "Search pattern if applicable"
-      }
-    ],
-    "schema_gaps": ["Areas", "needing", "more", "data"]
-  }
-}
-
-Be thorough but only include what can be derived from the user's answers. Don't fabricate details."""
-
-
-# =============================================================================
-# STAGED WIZARD PROMPTS
-# =============================================================================
-
-NOTES_PREPROCESSING_PROMPT = """You are an expert in conceptual analysis helping a user articulate a novel theoretical concept.
-
-The user has provided initial notes about a concept they're developing called "{concept_name}". Your task is to:
-1. Extract what can be inferred from these notes
-2. Probe the GENEALOGY of this concept - its intellectual origins and inspirations
-3. Pre-fill answers to Stage 1 questions where possible
-4. Identify what's still unclear and needs direct questioning
-
-## User's Notes:
-{notes}
-
-## GENEALOGY INFERENCE (Critical - Use Your Knowledge!)
-You are Claude Opus 4.5 with extensive knowledge of intellectual history, philosophy, social sciences, and academic traditions.
-USE THIS KNOWLEDGE to HYPOTHESIZE the likely genealogy of this concept.
-
-Based on the concept's:
-- Domain and field (what academic traditions does this touch?)
-- Terminology used (what frameworks use similar language?)
-- Problem framing (what traditions address similar problems?)
-- Adjacent concepts mentioned (who else has worked on related ideas?)
-
-ACTIVELY INFER likely influences even if NOT explicitly stated. The user may not know the intellectual lineage of their own ideas - help them discover it.
-
-For example:
-- If discussing "power dynamics in tech" → likely influenced by Foucault, STS, critical theory
-- If framing "sovereignty" in non-territorial terms → IR theory, Krasner, Ruggie, possibly Agamben
-- If synthesizing economics + politics → political economy tradition, possibly IPE
-- If discussing "recognition" or "identity" → likely Hegel, Taylor, Honneth tradition
-
-## Stage 1 Questions to Pre-fill:
-1. genesis_type: How would you characterize the origin of this concept?
-   Options: theoretical_innovation, empirical_discovery, synthesis, reconceptualization, normative_reframing
-
-2. core_definition: In one paragraph, provide your working definition of this concept.
-
-3. problem_addressed: What problem or gap does this concept address?
-
-4. adjacent_concepts: Which existing concepts come closest to what you're describing?
-   (Can suggest specific concepts mentioned or implied in notes)
-
-5. distinguishing_feature: What most clearly distinguishes this concept from adjacent ones?
-
-Analyze the notes and produce a JSON response:
-{{
-    "notes_analysis": {{
-        "summary": "Brief summary of what the user is trying to articulate (2-3 sentences)",
-        "key_insights": ["Main ideas extracted from the notes"],
-        "preliminary_definition": "A working definition extracted/synthesized from the notes"
-    }},
-    "genealogy": {{
-        "hypothesized_influences": [
-            {{
-                "name": "Thinker/Framework name",
-                "type": "thinker|framework|tradition|concept",
-                "why_hypothesized": "Why you infer this influence (terminology, framing, domain)",
-                "confidence": "high|medium|low",
-                "source_excerpt": "Quote from notes if explicitly mentioned, or null if inferred"
-            }}
-        ],
-        "emergence_context": {{
-            "domain": "academic|professional|personal|mixed",
-            "field": "Specific field (e.g., political theory, STS, IR)",
-            "inferred_trigger": "Best guess at what sparked this concept"
-        }},
-        "genealogy_questions": [
-            {{
-                "id": "primary_tradition",
-                "question": "Which intellectual tradition does this concept most draw from?",
-                "type": "multiple_choice",
-                "options": [
-                    {{"value": "tradition_1", "label": "Tradition Name", "description": "Brief explanation"}},
-                    {{"value": "tradition_2", "label": "Another Tradition", "description": "Why this might fit"}}
-                ],
-                "rationale": "Why you're asking this - what it will clarify"
-            }},
-            {{
-                "id": "key_thinker",
-                "question": "Whose work does this concept most resemble or build on?",
-                "type": "multiple_choice",
-                "options": [
-                    {{"value": "thinker_1", "label": "Thinker Name", "description": "Their relevant contribution"}},
-                    {{"value": "thinker_2", "label": "Another Thinker", "description": "How they relate"}}
-                ],
-                "rationale": "Why identifying the key influence matters"
-            }},
-            {{
-                "id": "genesis_experience",
-                "question": "What type of experience primarily shaped this concept?",
-                "type": "multiple_choice",
-                "options": [
-                    {{"value": "academic_reading", "label": "Academic reading/research", "description": "Scholarly engagement"}},
-                    {{"value": "professional_practice", "label": "Professional practice", "description": "Work experience"}},
-                    {{"value": "personal_observation", "label": "Personal observation", "description": "Life experience"}},
-                    {{"value": "theoretical_gap", "label": "Theoretical gap identified", "description": "Saw what was missing"}}
-                ],
-                "rationale": "Understanding origin helps frame the concept appropriately"
-            }}
-        ],
-        "open_ended_question": {{
-            "question": "One focused question that cannot be answered via MC - only if truly necessary",
-            "why_needed": "Explain why this can't be inferred or offered as options"
-        }}
-    }},
-    "prefilled_answers": [
-        {{
-            "question_id": "genesis_type",
-            "suggested_value": "theoretical_innovation|empirical_discovery|synthesis|reconceptualization|normative_reframing|null",
-            "confidence": "high|medium|low",
-            "reasoning": "Why this seems to be the origin type based on the notes",
-            "source_excerpt": "Quote from notes that supports this"
-        }},
-        {{
-            "question_id": "core_definition",
-            "suggested_value": "Extracted or synthesized definition from notes, or null if unclear",
-            "confidence": "high|medium|low",
-            "reasoning": "How this was derived"
-        }},
-        {{
-            "question_id": "problem_addressed",
-            "suggested_value": "The problem/gap the user seems to be addressing, or null",
-            "confidence": "high|medium|low",
-            "reasoning": "Evidence from notes"
-        }},
-        {{
-            "question_id": "adjacent_concepts",
-            "suggested_values": ["List of concepts mentioned or implied in notes"],
-            "confidence": "high|medium|low",
-            "reasoning": "Why these seem related"
-        }},
-        {{
-            "question_id": "distinguishing_feature",
-            "suggested_value": "What makes this concept unique based on notes, or null",
-            "confidence": "high|medium|low",
-            "reasoning": "Evidence from notes"
-        }}
-    ],
-    "questions_to_prioritize": ["question_ids that need user clarification because notes were unclear"],
-    "epistemic_blind_spots": [
-        {{
-            "category": "ambiguity|presupposition|paradigm_dependency|likely_misreading|gray_zone|unfilled_slot|unconfronted_challenge",
-            "description": "Description of this epistemic gap - what the user hasn't yet made explicit",
-            "what_unclear": "The specific aspect that needs clarification",
-            "what_would_help": "What kind of clarification would help surface the user's positioning",
-            "productive_potential": "Why exploring this would help the user articulate their priors"
-        }}
-    ],
-
-    "hypothesis_cards": [
-        {{
-            "id": "hyp_001",
-            "content": "A specific thesis/claim you detect in the notes - stated as a concrete proposition, not a question",
-            "type": "thesis|assumption|tension|methodological|normative",
-            "source_excerpts": ["Direct quotes from notes that support this inference"],
-            "confidence": "high|medium|low",
-            "rationale": "Why you think this is a central claim (1-2 sentences)"
-        }}
-    ],
-
-    "genealogy_cards": [
-        {{
-            "id": "gen_001",
-            "thinker": "Specific Thinker Name (e.g., Karl Polanyi, not 'political economists')",
-            "tradition": "Specific tradition this thinker belongs to",
-            "connection": "Your concept [X] resembles/extends/builds on [thinker's] idea of [specific concept] because [specific reason]",
-            "source_excerpts": ["Quote from notes if explicitly mentioned, or null if inferred"],
-            "confidence": "high|medium|low",
-            "why_relevant": "Why this genealogical connection matters for the user's project"
-        }}
-    ],
-
-    "differentiation_cards": [
-        {{
-            "id": "diff_001",
-            "your_concept": "The user's concept name",
-            "contrasted_with": "Specific adjacent concept/framework to differentiate from",
-            "thinker_associated": "Who is most associated with the adjacent concept",
-            "difference": "Your concept is NOT [X] because [specific difference in mechanism, scope, or approach]",
-            "source_excerpts": ["Quote from notes that supports this differentiation"],
-            "confidence": "high|medium|low"
-        }}
-    ],
-
-    "dimensional_signals": {{
-        "quinean": {{
-            "inferences_detected": ["Any 'if X then Y' patterns in notes"],
-            "centrality_hint": "core|intermediate|peripheral|unknown",
-            "confidence": "high|medium|low"
-        }},
-        "sellarsian": {{
-            "givenness_markers": ["Phrases like 'obviously', 'naturally', 'clearly' that suggest treating as given"],
-            "hidden_assumptions": ["Assumptions not argued for"],
-            "confidence": "high|medium|low"
-        }},
-        "brandomian": {{
-            "implicit_commitments": ["What using this concept commits one to"],
-            "implicit_entitlements": ["What claims the concept enables"],
-            "confidence": "high|medium|low"
-        }},
-        "deleuzian": {{
-            "problem_addressed": "Core tension/problem the concept navigates",
-            "tension_poles": ["Pole A", "Pole B"],
-            "becomings_enabled": ["Transformations the concept enables"],
-            "becomings_blocked": ["Transformations foreclosed"],
-            "confidence": "high|medium|low"
-        }},
-        "bachelardian": {{
-            "breaking_from": "What framework/concept is being ruptured",
-            "why_inadequate": "What's wrong with the old way",
-            "obstacle_risk": "Could this concept become an obstacle itself?",
-            "confidence": "high|medium|low"
-        }},
-        "canguilhem": {{
-            "values_embedded": ["Values implicit in the concept"],
-            "whose_interests": "Who benefits from this concept",
-            "what_excluded": "What gets marked as abnormal",
-            "confidence": "high|medium|low"
-        }},
-        "davidson": {{
-            "reasoning_style": "quantitative|historical|structural|phenomenological|dialectical|mixed",
-            "makes_visible": ["What this lens reveals"],
-            "makes_invisible": ["What it might obscure"],
-            "confidence": "high|medium|low"
-        }},
-        "blumenberg": {{
-            "root_metaphor": "Any underlying metaphor detected",
-            "source_domain": "Where the metaphor comes from",
-            "metaphor_work": "Conceptual work being done",
-            "confidence": "high|medium|low"
-        }},
-        "carey": {{
-            "component_concepts": ["Simpler concepts this is built from"],
-            "combination_type": "aggregation|interaction|emergence|unknown",
-            "what_emerges": "What's new beyond the components",
-            "confidence": "high|medium|low"
-        }},
-        "kuhnian": {{
-            "paradigm_position": "normal_science|anomaly|crisis|revolutionary|post_revolutionary",
-            "exemplars": ["Paradigmatic cases that define proper use"],
-            "puzzle_solving_rules": ["What counts as legitimate puzzles/solutions"],
-            "incommensurabilities": ["What frameworks cannot communicate with this concept"],
-            "disciplinary_matrix": "What shared commitments enable this concept's use",
-            "confidence": "high|medium|low"
-        }},
-        "foucauldian": {{
-            "power_knowledge_nexus": "What power relations does this concept encode/enable",
-            "governmentality_mode": "discipline|security|sovereign|pastoral|neoliberal|other",
-            "subjectification_effects": ["What kinds of subjects does this concept produce"],
-            "discourse_formation": "What statements become possible/impossible",
-            "resistance_points": ["Where might this power-knowledge be contested"],
-            "confidence": "high|medium|low"
-        }},
-        "pragmatist": {{
-            "practical_consequences": ["What difference does accepting this concept make in practice"],
-            "cash_value": "The concept's practical meaning in experiential terms",
-            "performative_effects": ["What does using this concept DO in the world"],
-            "habit_formations": ["What patterns of action does this concept enable/block"],
-            "inquiry_context": "What problematic situation generated this concept",
-            "confidence": "high|medium|low"
-        }}
-    }}
-}}
-
-Be conservative with pre-fills: only suggest values when you have clear evidence from the notes.
-If the notes don't provide enough information for a question, set suggested_value to null.
-
-## 12-DIMENSIONAL EXTRACTION INSTRUCTIONS:
-Extract preliminary signals for ALL 12 philosophical dimensions. Even if notes are sparse:
-- QUINEAN: Look for logical implications ("if X then Y", "X implies Y")
-- SELLARSIAN: Spot "givenness" language (obviously, naturally, clearly, of course)
-- BRANDOMIAN: What does using this concept commit you to? What does it entitle you to claim?
-- DELEUZIAN: What problem/tension does this navigate? What transformations enabled/blocked?
-- BACHELARDIAN: What is this BREAKING FROM? What's wrong with the old way?
-- CANGUILHEM: What values are embedded? Whose interests served? What excluded?
-- DAVIDSON: What reasoning style does this require? What becomes visible/invisible?
-- BLUMENBERG: Is there a root metaphor underlying the concept?
-- CAREY: What simpler concepts is this built from?
-- KUHNIAN: Is this normal science or paradigm-challenging? What exemplars define it? What's incommensurable?
-- FOUCAULDIAN: What power-knowledge relations does this encode? What subjects does it produce? What discourse rules?
-- PRAGMATIST: What practical difference does this make? What does using it DO? What habits does it form?
-
-Set confidence to "low" if you're inferring without explicit evidence.
-
-## EPISTEMIC BLIND SPOTS INSTRUCTIONS (CRITICAL - Surface User's Positioning):
-These are NOT problems with the concept itself, but places where the USER'S epistemic positioning isn't yet explicit.
-The goal is to help users articulate their priors, confront structural limits of their framing, and grasp conditions of possibility.
-
-Generate 3-6 epistemic blind spots across these 7 categories (use the 9D analysis to inform):
-
-1. **AMBIGUITY** - Terms/phrases with multiple valid readings
-   - Look for key terms that could mean different things in different contexts
-   - Source: Brandomian (perspectival content), Blumenberg (metaphors that do conceptual work)
-   - Example: "The term 'sovereignty' in your notes could mean Westphalian territorial sovereignty OR decisionist authority OR popular sovereignty"
-
-2. **PRESUPPOSITION** - What's being treated as "given" that isn't justified
-   - Look for Sellarsian markers: "obviously," "naturally," "clearly," "of course"
-   - What's assumed without argument? What's the "plane" enabling this thinking?
-   - Source: Sellarsian (givenness), Deleuzian (plane assumptions)
-   - Example: "You seem to assume that digital platforms inherently tend toward monopoly - this requires argument"
-
-3. **PARADIGM_DEPENDENCY** - Where different epistemes would produce different conclusions
-   - What reasoning style is being used? What would a different tradition see?
-   - Source: Hacking (reasoning styles), Bachelardian (regional rationality)
-   - Example: "A Marxist reading would emphasize class dynamics while a Foucauldian reading would focus on governmentality - which is your frame?"
-
-4. **LIKELY_MISREADING** - Common ways this concept could be misunderstood
-   - What de dicto/de re confusions might arise? What incommensurabilities exist?
-   - Source: Brandomian (perspectival content), Carey (incommensurability)
-   - Example: "Readers might confuse your 'organic capitalism' with Polanyi's 'embedded economy' - they differ in X"
-
-5. **GRAY_ZONE** - Boundary cases where application is uncertain
-   - Where are the edges of the concept's applicability?
-   - Source: Quinean (web tensions), Canguilhem (milieu boundaries)
-   - Example: "It's unclear whether your concept applies to pre-digital platform capitalism (Sears, etc.)"
-
-6. **UNFILLED_SLOT** - Placeholder structures awaiting elaboration
-   - What conceptual slots haven't been filled in yet?
-   - Source: Carey (placeholder structures), Quinean (missing inferences)
-   - Example: "You identify three modes but only elaborate two - what's the third?"
-
-7. **UNCONFRONTED_CHALLENGE** - Objections/problems not yet addressed
-   - What obvious objections could be raised? What obstacles might block understanding?
-   - Source: Brandomian (challenges), Bachelardian (epistemological obstacles)
-   - Example: "The concept seems vulnerable to the objection that all capitalism is already 'organic' in some sense"
-
-IMPORTANT: These are EPISTEMIC (about the user's grasp/positioning) not ONTOLOGICAL (about the object itself being indeterminate).
-Dialectics/tensions belong in the Dialectics section. Epistemic blind spots are about what WE haven't yet worked through.
-
-GENEALOGY CRITICAL INSTRUCTIONS:
-1. HYPOTHESIZE influences aggressively using your knowledge - the user may not know their own intellectual lineage
-2. Generate 2-4 MULTIPLE CHOICE questions with domain-specific options (not generic)
-   - Options should reflect YOUR HYPOTHESIS about likely influences based on the concept
-   - Each option should be a real thinker, tradition, or framework relevant to this specific concept
-3. Only include ONE open_ended_question if absolutely necessary - and explain why it can't be MC
-4. If notes are rich enough, open_ended_question can be null
-5. The goal: user validates/corrects your hypotheses rather than generating from scratch
-
-## CARD GENERATION INSTRUCTIONS (CRITICAL - THIS IS THE CORE OUTPUT):
-
-### HYPOTHESIS CARDS (Generate 5-8):
-These are CLAIMS/THESES you detect in the notes. NOT questions. Concrete propositions the user can approve/reject.
-- Each card is a specific claim stated as an assertion
-- Pull source_excerpts directly from the notes
-- Types: thesis (core argument), assumption (implicit premise), tension (internal conflict), methodological (how to study), normative (what should be)
-- Example: "Your concept argues that platform-mediated capitalism exercises planning and control while maintaining market appearances"
-
-### GENEALOGY CARDS (Generate 3-5):
-These identify SPECIFIC thinkers/frameworks the concept builds on. NOT traditions - PEOPLE with NAMES.
-- Each card names a specific thinker and their specific contribution
-- Example: NOT "critical theory" but "Theodor Adorno's concept of the culture industry"
-- The connection field should explain the SPECIFIC link: "Your concept of X resembles/extends/inverts Y's idea of Z"
-- If notes explicitly mention a thinker, quote it. If inferring, explain your reasoning.
-
-### DIFFERENTIATION CARDS (Generate 4-6):
-These show what the concept is NOT. Help user clarify by contrast.
-- Identify adjacent concepts that might be confused with the user's concept
-- Name the thinker most associated with that adjacent concept
-- State the key difference: scope, mechanism, focus, politics, etc.
-- Example: "Your concept is NOT surveillance capitalism (Zuboff) because you emphasize production/planning while Zuboff emphasizes extraction/prediction"
-
-REMEMBER: Cards are for user to APPROVE/REJECT/TRANSFORM - not questions to answer. Generate claims the user can validate."""
-
-
-# =============================================================================
-# INITIAL ANALYSIS PROMPT - Used before blind spots (no hypothesis cards)
-# =============================================================================
-INITIAL_ANALYSIS_PROMPT = """You are an expert in conceptual analysis helping a user articulate a novel theoretical concept.
-
-The user has provided initial notes about a concept they're developing called "{concept_name}". Your task is to:
-1. Extract what can be inferred from these notes
-2. Identify epistemic blind spots - where the user's positioning isn't yet explicit
-3. Prepare the ground for deeper questioning
-
-## User's Notes:
-{notes}
-
-## 9-DIMENSIONAL EXTRACTION INSTRUCTIONS:
-Extract preliminary signals for ALL 9 philosophical dimensions. Even if notes are sparse:
-- QUINEAN: Look for logical implications ("if X then Y", "X implies Y")
-- SELLARSIAN: Spot "givenness" language (obviously, naturally, clearly, of course)
-- BRANDOMIAN: What does using this concept commit you to? What does it entitle you to claim?
-- DELEUZIAN: What problem/tension does this navigate? What transformations enabled/blocked?
-- BACHELARDIAN: What is this BREAKING FROM? What's wrong with the old way?
-- CANGUILHEM: What values are embedded? Whose interests served? What excluded?
-- DAVIDSON: What reasoning style does this require? What becomes visible/invisible?
-- BLUMENBERG: Is there a root metaphor underlying the concept?
-- CAREY: What simpler concepts is this built from?
-
-Set confidence to "low" if you're inferring without explicit evidence.
-
-## EPISTEMIC BLIND SPOTS INSTRUCTIONS (CRITICAL - Surface User's Positioning):
-These are NOT problems with the concept itself, but places where the USER'S epistemic positioning isn't yet explicit.
-The goal is to help users articulate their priors, confront structural limits of their framing, and grasp conditions of possibility.
-
-Generate 3-6 epistemic blind spots across these 7 categories (use the 9D analysis to inform):
-
-1. **AMBIGUITY** - Terms/phrases with multiple valid readings
-   - Look for key terms that could mean different things in different contexts
-   - Source: Brandomian (perspectival content), Blumenberg (metaphors that do conceptual work)
-
-2. **PRESUPPOSITION** - What's being treated as "given" that isn't justified
-   - Look for Sellarsian markers: "obviously," "naturally," "clearly," "of course"
-   - What's assumed without argument? What's the "plane" enabling this thinking?
-   - Source: Sellarsian (givenness), Deleuzian (plane assumptions)
-
-3. **PARADIGM_DEPENDENCY** - Where different epistemes would produce different conclusions
-   - What reasoning style is being used? What would a different tradition see?
-   - Source: Hacking (reasoning styles), Bachelardian (regional rationality)
-
-4. **LIKELY_MISREADING** - Common ways this concept could be misunderstood
-   - What de dicto/de re confusions might arise? What incommensurabilities exist?
-   - Source: Brandomian (perspectival content), Carey (incommensurability)
-
-5. **GRAY_ZONE** - Boundary cases where application is uncertain
-   - Where are the edges of the concept's applicability?
-   - Source: Quinean (web tensions), Canguilhem (milieu boundaries)
-
-6. **UNFILLED_SLOT** - Placeholder structures awaiting elaboration
-   - What conceptual slots haven't been filled in yet?
-   - Source: Carey (placeholder structures), Quinean (missing inferences)
-
-7. **UNCONFRONTED_CHALLENGE** - Objections/problems not yet addressed
-   - What obvious objections could be raised? What obstacles might block understanding?
-   - Source: Brandomian (challenges), Bachelardian (epistemological obstacles)
-
-IMPORTANT: These are EPISTEMIC (about the user's grasp/positioning) not ONTOLOGICAL (about the object itself being indeterminate).
-
-Analyze the notes and produce a JSON response:
-{{
-    "notes_analysis": {{
-        "summary": "Brief summary of what the user is trying to articulate (2-3 sentences)",
-        "key_insights": ["Main ideas extracted from the notes"],
-        "preliminary_definition": "A working definition extracted/synthesized from the notes"
-    }},
-    "epistemic_blind_spots": [
-        {{
-            "category": "ambiguity|presupposition|paradigm_dependency|likely_misreading|gray_zone|unfilled_slot|unconfronted_challenge",
-            "description": "Description of this epistemic gap - what the user hasn't yet made explicit",
-            "what_unclear": "The specific aspect that needs clarification",
-            "what_would_help": "What kind of clarification would help surface the user's positioning",
-            "productive_potential": "Why exploring this would help the user articulate their priors"
-        }}
-    ],
-    "dimensional_signals": {{
-        "quinean": {{
-            "inferences_detected": ["Any 'if X then Y' patterns in notes"],
-            "centrality_hint": "core|intermediate|peripheral|unknown",
-            "confidence": "high|medium|low"
-        }},
-        "sellarsian": {{
-            "givenness_markers": ["Phrases like 'obviously', 'naturally', 'clearly' that suggest treating as given"],
-            "hidden_assumptions": ["Assumptions not argued for"],
-            "confidence": "high|medium|low"
-        }},
-        "brandomian": {{
-            "implicit_commitments": ["What using this concept commits one to"],
-            "implicit_entitlements": ["What claims the concept enables"],
-            "confidence": "high|medium|low"
-        }},
-        "deleuzian": {{
-            "problem_addressed": "Core tension/problem the concept navigates",
-            "tension_poles": ["Pole A", "Pole B"],
-            "becomings_enabled": ["Transformations the concept enables"],
-            "becomings_blocked": ["Transformations foreclosed"],
-            "confidence": "high|medium|low"
-        }},
-        "bachelardian": {{
-            "breaking_from": "What framework/concept is being ruptured",
-            "why_inadequate": "What's wrong with the old way",
-            "obstacle_risk": "Could this concept become an obstacle itself?",
-            "confidence": "high|medium|low"
-        }},
-        "canguilhem": {{
-            "values_embedded": ["Values implicit in the concept"],
-            "whose_interests": "Who benefits from this concept",
-            "what_excluded": "What gets marked as abnormal",
-            "confidence": "high|medium|low"
-        }},
-        "davidson": {{
-            "reasoning_style": "quantitative|historical|structural|phenomenological|dialectical|mixed",
-            "makes_visible": ["What this lens reveals"],
-            "makes_invisible": ["What it might obscure"],
-            "confidence": "high|medium|low"
-        }},
-        "blumenberg": {{
-            "root_metaphor": "Any underlying metaphor detected",
-            "source_domain": "Where the metaphor comes from",
-            "metaphor_work": "Conceptual work being done",
-            "confidence": "high|medium|low"
-        }},
-        "carey": {{
-            "component_concepts": ["Simpler concepts this is built from"],
-            "combination_type": "aggregation|interaction|emergence|unknown",
-            "what_emerges": "What's new beyond the components",
-            "confidence": "high|medium|low"
-        }},
-        "kuhnian": {{
-            "paradigm_position": "normal_science|anomaly|crisis|revolutionary|post_revolutionary",
-            "exemplars": ["Paradigmatic cases that define proper use"],
-            "puzzle_solving_rules": ["What counts as legitimate puzzles/solutions"],
-            "incommensurabilities": ["What frameworks cannot communicate with this concept"],
-            "disciplinary_matrix": "What shared commitments enable this concept's use",
-            "confidence": "high|medium|low"
-        }},
-        "foucauldian": {{
-            "power_knowledge_nexus": "What power relations does this concept encode/enable",
-            "governmentality_mode": "discipline|security|sovereign|pastoral|neoliberal|other",
-            "subjectification_effects": ["What kinds of subjects does this concept produce"],
-            "discourse_formation": "What statements become possible/impossible",
-            "resistance_points": ["Where might this power-knowledge be contested"],
-            "confidence": "high|medium|low"
-        }},
-        "pragmatist": {{
-            "practical_consequences": ["What difference does accepting this concept make in practice"],
-            "cash_value": "The concept's practical meaning in experiential terms",
-            "performative_effects": ["What does using this concept DO in the world"],
-            "habit_formations": ["What patterns of action does this concept enable/block"],
-            "inquiry_context": "What problematic situation generated this concept",
-            "confidence": "high|medium|low"
-        }}
-    }}
-}}
-
-Be thorough with epistemic blind spots - they will inform the questioning phase that follows.
-The goal is to surface what needs to be explored with the user, not to generate hypotheses yet."""
-
-
-# =============================================================================
-# INFORMED HYPOTHESIS GENERATION PROMPT - Used AFTER blind spots questioning
-# =============================================================================
-INFORMED_HYPOTHESIS_GENERATION_PROMPT = """You are an expert in conceptual analysis helping a user articulate a novel theoretical concept.
-
-The user has provided initial notes about their concept "{concept_name}" and has completed a round of epistemic blind spots questioning. Based on their answers to blind spots questions, you now have insight into their actual theoretical agenda.
-
-Your task: Generate POSIT cards (preliminary claims), genealogy cards, and differentiation cards INFORMED by what the user revealed through their blind spots answers.
-
-## User's Original Notes:
-{notes}
-
-## Blind Spots Questions and User's Answers (CRITICAL CONTEXT):
-{blind_spots_context}
-
-## What This Reveals About the User's Theoretical Agenda:
-Based on their answers, pay attention to:
-- Which blind spots they found most relevant (reveals what they care about)
-- Positions they articulated (reveals their actual commitments)
-- Tensions they acknowledged (reveals dialectics they're navigating)
-- Presuppositions they confirmed or rejected (reveals their epistemic stance)
-
-## POSIT CARD TYPOLOGY (12-Dimension Grounded):
-Each posit card has a TYPE grounded in our philosophical framework:
-
-### Core 9 Dimensions:
-
-1. **definitional** (Sellarsian) - What the concept IS in manifest/scientific terms
-   Example: "Organic capitalism synthesizes planning and market forms through platform coordination"
-
-2. **inferential** (Brandomian) - What follows from accepting this concept
-   Example: "If organic capitalism is correct, then the market/plan dichotomy collapses"
-
-3. **incompatibility** (Brandomian) - What the concept rules out
-   Example: "Incompatible with accounts treating platforms as mere intermediaries"
-
-4. **genealogical** (Carey/Blumenberg) - Where the concept comes from
-   Example: "Transforms Hilferding's 'organized capitalism' for the platform age"
-
-5. **transformational** (Deleuzian) - What change/becoming this enables
-   Example: "Deterritorializes the market/plan binary by showing their co-constitution"
-
-6. **epistemological_break** (Bachelardian) - What discontinuity it marks
-   Example: "Marks a break with classical political economy's dichotomies"
-
-7. **methodological** (Hacking) - How to study/apply the concept
-   Example: "Requires tracing both computational and organizational mechanisms"
-
-8. **normative** (Canguilhem) - Evaluative/prescriptive claims
-   Example: "Platform coordination represents a pathological form of economic organization"
-
-9. **positional** (Quinean) - Where it sits in the belief web
-   Example: "Central to understanding contemporary capitalism, peripheral to orthodox Marxism"
-
-### Extended Dimensions (for complex research programs):
-
-10. **paradigmatic** (Kuhnian) - How concept relates to paradigm structure
-    Example: "Paradigm-constitutive for platform studies; anomalous for orthodox Marxist periodization"
-
-11. **performative** (Pragmatist) - What using this concept DOES/enables in practice
-    Example: "Using 'organic capitalism' reframes policy debates from market-vs-state to coordination-vs-autonomy"
-
-12. **power_relational** (Foucauldian) - What power relations it naturalizes or contests
-    Example: "Denaturalizes platform power as 'mere market efficiency'; reveals it as managerial coordination"
-
-## GENEALOGY INFERENCE (Use User's Revealed Positions):
-You are Claude Opus 4.5 with extensive knowledge of intellectual history.
-USE THIS KNOWLEDGE to HYPOTHESIZE the likely genealogy - but now INFORMED by what the user actually cares about.
-
-Based on their blind spots answers, you know more about:
-- What traditions they're drawing from (from their presupposition responses)
-- What distinctions matter to them (from their ambiguity responses)
-- What challenges they recognize (from their unconfronted_challenge responses)
-
-Generate a JSON response:
-{{
-    "posit_cards": [
-        {{
-            "id": "pos_001",
-            "content": "A specific claim that addresses what the user revealed they care about",
-            "type": "definitional|inferential|incompatibility|genealogical|transformational|epistemological_break|methodological|normative|positional|paradigmatic|performative|power_relational",
-            "dimension": "Sellarsian|Brandomian|Carey/Blumenberg|Deleuzian|Bachelardian|Hacking|Canguilhem|Quinean|Kuhnian|Pragmatist|Foucauldian",
-            "source_excerpts": ["Direct quotes from notes that support this"],
-            "informed_by": "Which blind spot answer(s) helped refine this posit",
-            "confidence": "high|medium|low",
-            "rationale": "Why this is a central claim based on both notes AND blind spots answers"
-        }}
-    ],
-
-    "genealogy_cards": [
-        {{
-            "id": "gen_001",
-            "thinker": "Specific Thinker Name (e.g., Karl Polanyi, not 'political economists')",
-            "tradition": "Specific tradition this thinker belongs to",
-            "connection": "Your concept [X] resembles/extends/builds on [thinker's] idea of [specific concept] because [specific reason]",
-            "informed_by": "How user's blind spot answers informed this genealogical connection",
-            "source_excerpts": ["Quote from notes if explicitly mentioned, or null if inferred"],
-            "confidence": "high|medium|low",
-            "why_relevant": "Why this genealogical connection matters for what the user is trying to do"
-        }}
-    ],
-
-    "differentiation_cards": [
-        {{
-            "id": "diff_001",
-            "your_concept": "The user's concept name",
-            "contrasted_with": "Specific adjacent concept/framework to differentiate from",
-            "thinker_associated": "Who is most associated with the adjacent concept",
-            "difference": "Your concept is NOT [X] because [specific difference]",
-            "informed_by": "Which blind spot responses help clarify this distinction",
-            "source_excerpts": ["Quote from notes that supports this differentiation"],
-            "confidence": "high|medium|low"
-        }}
-    ],
-
-    "genealogy_questions": [
-        {{
-            "id": "primary_tradition",
-            "question": "Question about intellectual tradition, refined by what we learned",
-            "type": "multiple_choice",
-            "options": [
-                {{"value": "tradition_1", "label": "Tradition Name", "description": "Brief explanation"}}
-            ],
-            "rationale": "Why you're asking this based on what the user revealed"
-        }}
-    ]
-}}
-
-CRITICAL INSTRUCTIONS:
-1. Generate 10-15 posit cards using the 12-TYPE TYPOLOGY above
-2. ENSURE COVERAGE: Include at least one posit from each of these dimension groups:
-   - Definitional/Inferential/Incompatibility (Sellarsian/Brandomian)
-   - Genealogical/Transformational/Break (Carey/Deleuzian/Bachelardian)
-   - Methodological/Normative/Positional (Hacking/Canguilhem/Quinean)
-   - Paradigmatic/Performative/Power-Relational (Kuhnian/Pragmatist/Foucauldian)
-3. Generate 3-5 genealogy cards linking to SPECIFIC thinkers relevant to user's revealed agenda
-4. Generate 4-6 differentiation cards that clarify distinctions the user is navigating
-5. Each card should reference how blind spots answers informed it
-6. Be SPECIFIC - use the user's actual terminology and concerns from their answers
-7. Don't cluster all cards in one type - spread across dimensions for comprehensive coverage
-
-The cards should feel tailored to this specific user's project, not generic philosophical categories."""
-
-
-INTERIM_ANALYSIS_PROMPT = """You are an expert in conceptual analysis helping a user articulate a novel theoretical concept.
-
-The user has completed Stage 1 questions about their concept "{concept_name}". Your task is to:
-1. Synthesize their answers into an interim understanding
-2. Identify key commitments they've made
-3. Detect NEW epistemic blind spots DIFFERENT from those already identified (see below)
-4. Identify areas that need addressing in Stage 2
-
-## User's Stage 1 Answers:
-{stage1_answers}
-
-## Dialectics Marked by User During Stage 1:
-{marked_dialectics}
-
-## IMPORTANT - Epistemic Blind Spots Already Identified (DO NOT DUPLICATE):
-{already_identified_tensions}
-
-The items listed above were already identified during the initial notes analysis and confirmed by the user.
-You must identify NEW epistemic blind spots that emerged from the Stage 1 answers - different from those already listed.
-Look for blind spots that arise specifically from the ANSWERS provided, not from the original notes.
-
-## The 7 Epistemic Categories:
-1. AMBIGUITY - Terms with multiple valid readings
-2. PRESUPPOSITION - What's treated as "given" without justification
-3. PARADIGM_DEPENDENCY - Where different epistemes produce different conclusions
-4. LIKELY_MISREADING - Common ways this could be misunderstood
-5. GRAY_ZONE - Boundary cases where application is uncertain
-6. UNFILLED_SLOT - Placeholder structures awaiting elaboration
-7. UNCONFRONTED_CHALLENGE - Objections not yet addressed
-
-Produce a JSON response with:
-{{
-    "interim_analysis": {{
-        "understanding_summary": "Based on your answers, I understand that [concept_name] is... (2-3 sentences)",
-        "key_commitments": ["List 3-5 core positions the user has taken"],
-        "epistemic_blind_spots": [
-            {{
-                "category": "ambiguity|presupposition|paradigm_dependency|likely_misreading|gray_zone|unfilled_slot|unconfronted_challenge",
-                "description": "Brief description of this NEW epistemic blind spot",
-                "what_unclear": "The specific aspect that needs clarification",
-                "what_would_help": "What clarification would surface the user's positioning",
-                "source": "Which Stage 1 answer(s) revealed this"
-            }}
-        ],
-        "areas_needing_clarification": ["Aspects that need more exploration in Stage 2"],
-        "preliminary_definition": "A working 1-paragraph definition based on what we know so far"
-    }}
-}}
-
-Be specific to what the user actually said. Don't fabricate or assume beyond their answers.
-Remember: NEW blind spots only - do not repeat items from the "Already Identified" list above.
-These are EPISTEMIC (about user's positioning) not ONTOLOGICAL (about the object being indeterminate).
-The goal is to help users articulate their priors and grasp conditions of possibility for their thinking."""
-
-
-STAGE2_GENERATION_PROMPT = """Based on the user's Stage 1 answers about their novel concept "{concept_name}":
-
-## Stage 1 Responses:
-{stage1_summary}
-
-## Interim Analysis:
-{interim_analysis}
-
-## Adjacent Concepts Selected:
-{adjacent_concepts}
-
-## Confirmed Epistemic Blind Spots to Address:
-{approved_items}
-
-Generate 4-6 Stage 2 questions that:
-1. **Surface presuppositions** - Questions that help make explicit what the user is treating as "given"
-2. **Clarify paradigm positioning** - Questions that help the user articulate which epistemic framework they're operating in
-3. **Address ambiguities** - Questions that force clarification of terms with multiple valid readings
-4. **Anticipate misreadings** - Questions that help the user distinguish their concept from likely confusions
-5. **Sharpen distinctions** from adjacent concepts
-6. **Test commitments** they've made to see if they hold under scrutiny
-
-PRIORITY: Questions should directly address the epistemic blind spots the user has confirmed as relevant.
-The goal is to help the user articulate their priors and positioning, not to resolve uncertainties prematurely.
-
-For each question:
-- Decide if it should be multiple_choice (when there are clear alternatives), multi_select, or open_ended
-- For multiple choice: specify which options are mutually exclusive (same exclusivity_group number)
-- Include "implications" for each option - what that choice means for the concept
-- Set allow_mark_dialectic=true for questions that might reveal productive tensions
-
-Output JSON array of questions:
-{{
-    "stage2_questions": [
-        {{
-            "id": "differentiation_from_X",
-            "text": "How does {concept_name} differ from [adjacent concept]?",
-            "type": "multiple_choice",
-            "stage": 2,
-            "options": [
-                {{
-                    "value": "narrower_scope",
-                    "label": "Narrower scope",
-                    "description": "Applies to a subset of cases",
-                    "exclusivity_group": 1,
-                    "implications": "Will need to specify what's included/excluded"
-                }},
-                {{
-                    "value": "broader_scope",
-                    "label": "Broader scope",
-                    "description": "Encompasses more phenomena",
-                    "exclusivity_group": 1,
-                    "implications": "Must show what's gained by the broader framing"
-                }}
-            ],
-            "help": "This distinction is important because...",
-            "rationale": "Why we're asking this",
-            "allow_custom_response": true,
-            "custom_response_categories": ["Different relationship", "Complex"],
-            "allow_mark_dialectic": true,
-            "dialectic_hint": "Hint for when this might be a dialectic"
-        }}
-    ]
-}}
-
-Generate questions that are specific to THIS concept and what the user has said. Don't ask generic questions."""
-
-
-STAGE3_REFINEMENT_PROMPT = """Based on the user's Stage 2 answers about "{concept_name}":
-
-## Stage 1 + Stage 2 Context:
-{full_context}
+class StreamedItems:
+    """
+    Incremental parsing stage for streamed generations. Feed it the text
+    deltas; it returns an `item` SSE event for each element of the watched
+    top-level arrays as soon as the element's JSON is complete:
 
-## Differentiations Made:
-{differentiations}
+        {"type": "item", "item_type": "case_study", "key": "generated_cases",
+         "index": 0, "data": {...}}
 
-## Gaps, Tensions & Open Questions:
-{dialectics}
+    so the UI can show the first card after one card's generation time. The
+    final `complete` event still carries the full, authoritative payload.
 
-The user will now answer Stage 3 questions about grounding and recognition.
+    item_types maps array keys to item types; prepare(key, item), if given,
+    normalizes each item the way the complete payload does.
+    """
 
-Before they do, generate an "implications preview" that shows them what their Stage 2 choices mean:
+    def __init__(self, item_types: Dict[str, str], prepare=None):
+        self.item_types = item_types
+        self.prepare = prepare
+        self.scanner = JsonItemScanner(*item_types)
+        self.counts: Dict[str, int] = {}
+
+    def feed(self, delta: str) -> List[str]:
+        if not self.item_types:
+            return []
+        events = []
+        for key, item in self.scanner.feed(delta):
+            if not isinstance(item, dict):
+                continue
+            if self.prepare:
+                self.prepare(key, item)
+            index = self.counts.get(key, 0)
+            self.counts[key] = index + 1
+            event = {'type': 'item', 'item_type': self.item_types[key], 'key': key, 'index': index, 'data': item}
+            events.append(f"data: {json.dumps(event)}\n\n")
+        return events
 
-{{
-    "implications_preview": {{
-        "definition_trajectory": "Based on your choices, the concept is moving toward... (summarize the definitional direction)",
-        "key_differentiations": [
-            {{
-                "from_concept": "Adjacent concept",
-                "distinction": "The key distinction",
-                "consequence": "This means..."
-            }}
-        ],
-        "areas_still_developing": ["Gaps, tensions, or questions that are still being explored"],
-        "grounding_focus": "For Stage 3, focus on... (guide for what examples/evidence to provide)"
-    }}
-}}
 
-Be concrete and specific to what the user has actually said."""
+def parse_wizard_response(text: str) -> dict:
+    """Parse JSON from LLM response, wherever it sits (code fences, surrounding prose)."""
+    try:
+        return extract_json(text, objects_only=True)
+    except ValueError:
+        # Return as raw text if not JSON
+        return {"raw_response": text}
 
 
 # =============================================================================
@@ -1952,1213 +1089,28 @@ class WizardSessionListItem(BaseModel):
         from_attributes = True
 
 
-# =============================================================================
-# REGENERATE UNDERSTANDING PROMPT
-# =============================================================================
-
-REGENERATE_UNDERSTANDING_PROMPT = """You are an expert in conceptual analysis helping a user articulate a novel theoretical concept.
-
-The user has provided initial notes about a concept they're developing called "{concept_name}".
-
-Previously, you analyzed these notes and produced an understanding. The user has reviewed this and provided feedback.
-
-## User's Original Notes:
-{notes}
-
-## Your Previous Understanding:
-{previous_understanding}
-
-## User's Rating: {user_rating}/5 stars
-
-## User's Corrections/Clarifications:
-{user_correction}
-
-Your task is to:
-1. Carefully consider the user's feedback and corrections
-2. Revise your understanding to address their concerns
-3. Re-extract what can be inferred from notes WITH their corrections in mind
-4. Generate improved pre-filled answers for Stage 1 questions
-
-## Stage 1 Questions to Pre-fill:
-1. genesis_type: How would you characterize the origin of this concept?
-   Options: theoretical_innovation, empirical_discovery, synthesis, reconceptualization, normative_reframing
-
-2. core_definition: In one paragraph, provide your working definition of this concept.
-
-3. problem_addressed: What problem or gap does this concept address?
-
-4. adjacent_concepts: Which existing concepts come closest to what you're describing?
-
-5. distinguishing_feature: What most clearly distinguishes this concept from adjacent ones?
-
-Analyze the notes with the user's corrections in mind and produce a JSON response:
-{{
-    "notes_analysis": {{
-        "summary": "REVISED summary based on user feedback (2-3 sentences)",
-        "key_insights": ["REVISED key ideas incorporating corrections"],
-        "preliminary_definition": "REVISED working definition"
-    }},
-    "prefilled_answers": [
-        {{
-            "question_id": "genesis_type",
-            "suggested_value": "theoretical_innovation|empirical_discovery|synthesis|reconceptualization|normative_reframing|null",
-            "confidence": "high|medium|low",
-            "reasoning": "How this was derived, noting any user corrections considered",
-            "source_excerpt": "Quote from notes or user correction that supports this"
-        }},
-        {{
-            "question_id": "core_definition",
-            "suggested_value": "REVISED extracted/synthesized definition",
-            "confidence": "high|medium|low",
-            "reasoning": "How user feedback influenced this"
-        }},
-        {{
-            "question_id": "problem_addressed",
-            "suggested_value": "REVISED problem/gap description",
-            "confidence": "high|medium|low",
-            "reasoning": "Evidence from notes and user corrections"
-        }},
-        {{
-            "question_id": "adjacent_concepts",
-            "suggested_values": ["REVISED list of concepts"],
-            "confidence": "high|medium|low",
-            "reasoning": "Why these seem related, considering user feedback"
-        }},
-        {{
-            "question_id": "distinguishing_feature",
-            "suggested_value": "REVISED distinguishing feature",
-            "confidence": "high|medium|low",
-            "reasoning": "Evidence from notes and user corrections"
-        }}
-    ],
-    "questions_to_prioritize": ["question_ids that still need user clarification"],
-    "gaps_tensions_questions": [
-        {{
-            "type": "gap|tension|question",
-            "description": "Description of the gap, tension, or open question detected",
-            "pole_a": "For tensions: one side. For gaps/questions: what's unclear",
-            "pole_b": "For tensions: opposing side. For gaps/questions: what clarification would help",
-            "productive_potential": "Why exploring this would help develop the concept"
-        }}
-    ],
-    "changes_made": ["List of specific changes made based on user feedback"]
-}}
-
-Be responsive to user feedback - if they rated poorly or provided corrections, make significant adjustments."""
-
-
-GENERATE_CASE_STUDIES_PROMPT = """You are an expert in conceptual analysis helping generate paradigmatic case studies.
-
-Given a concept definition and context, generate 3-5 candidate paradigmatic cases that could serve as examples of this concept.
-
-## Concept Name: {concept_name}
-
-## Concept Definition So Far:
-{concept_definition}
-
-## Context from User's Answers:
-{context}
-
-Generate paradigmatic case studies. For each case:
-1. Title - A brief identifying name
-2. Description - 2-3 sentences explaining the case
-3. Relevance - Why this exemplifies the concept
-4. Domain - What field/context this case comes from
-
-Return as JSON:
-{{
-    "generated_cases": [
-        {{
-            "id": "case_1",
-            "title": "Short title for the case",
-            "description": "2-3 sentence description of what happened/what this case involves",
-            "relevance": "Why this is a good example of the concept",
-            "domain": "field/context (e.g., 'Technology Policy', 'International Relations')"
-        }}
-    ],
-    "generation_note": "Brief note about what types of cases were generated and why"
-}}
-
-Generate diverse cases across different domains if possible. Include both well-known public examples and more subtle/implicit cases where the concept operates without being named."""
-
-
-STAGE3_GENERATION_PROMPT = """You are an expert in conceptual analysis generating context-specific Stage 3 questions.
-
-Stage 3 focuses on: Grounding & Recognition - establishing paradigmatic cases, recognition markers, and falsification conditions.
-
-## Concept Name: {concept_name}
-
-## Summary of Stage 1 & 2 (what we know so far):
-{all_stages_summary}
-
-## Key elements to reference in questions:
-- Adjacent concepts mentioned: {adjacent_concepts}
-- Key differentiations established: {differentiations}
-- Dialectics/tensions identified: {dialectics}
-
-Generate 3-4 context-specific Stage 3 questions that:
-1. Reference specific concepts, cases, or tensions already discussed
-2. Ask for paradigmatic examples that illustrate the specific differentiations identified
-3. Probe for recognition markers based on the concept's unique features
-4. Explore falsification conditions specific to the concept's claims
-
-Return as JSON:
-{{
-    "stage3_questions": [
-        {{
-            "id": "paradigmatic_case",
-            "text": "Given [reference specific concept features], what case best exemplifies [specific aspect]?",
-            "type": "open_ended",
-            "help": "Context-specific help text",
-            "example": "Context-specific example",
-            "min_length": 150,
-            "rows": 6,
-            "context_references": ["list of specific concepts/terms from earlier stages that this question references"]
-        }},
-        {{
-            "id": "recognition_markers",
-            "text": "How would you recognize [concept] operating in texts that discuss [specific adjacent domain]?",
-            "type": "open_ended",
-            "help": "Context-specific help",
-            "min_length": 100,
-            "rows": 5,
-            "context_references": []
-        }},
-        {{
-            "id": "implicit_domain",
-            "text": "Where do you see debates about [specific tension/dialectic] without the term '[concept name]' being used?",
-            "type": "open_ended",
-            "help": "Context-specific help",
-            "min_length": 100,
-            "rows": 4,
-            "context_references": []
-        }},
-        {{
-            "id": "core_claim",
-            "text": "Given that you've distinguished [concept] from [adjacent concept] by [key differentiation], what is the fundamental claim about reality?",
-            "type": "open_ended",
-            "help": "Context-specific help",
-            "min_length": 100,
-            "rows": 4,
-            "context_references": []
-        }}
-    ],
-    "generation_note": "Brief note about how questions were tailored to this specific concept"
-}}
-
-Make questions specific and grounded in what the user has already shared. Avoid generic questions that could apply to any concept."""
-
-
-GENERATE_RECOGNITION_MARKERS_PROMPT = """You are an expert in conceptual analysis helping generate recognition markers.
-
-Given a concept definition and paradigmatic cases, generate linguistic patterns and markers that indicate when this concept is operating in a text.
-
-## Concept Name: {concept_name}
-
-## Concept Definition:
-{concept_definition}
-
-## Paradigmatic Cases:
-{paradigmatic_cases}
-
-Generate recognition markers - linguistic patterns that indicate this concept is in play. For each marker:
-1. Pattern - The linguistic pattern or phrase type
-2. Example - A concrete example of this pattern
-3. Reliability - How reliably this indicates the concept (high/medium/low)
-
-Return as JSON:
-{{
-    "generated_markers": [
-        {{
-            "id": "marker_1",
-            "pattern": "Description of the linguistic pattern",
-            "example": "A concrete example phrase or sentence",
-            "reliability": "high|medium|low",
-            "notes": "Additional context about when this marker applies"
-        }}
-    ],
-    "generation_note": "Brief note about the types of markers generated"
-}}
-
-Include different types of markers:
-- Explicit terminology patterns
-- Argument structure patterns
-- Situational description patterns
-- Proxy terms and euphemisms"""
-
-
-REGENERATE_SECTION_PROMPT = """You are an expert in conceptual analysis helping refine a specific section of a 9-dimensional concept definition.
-
-## Concept Name: {concept_name}
-
-## Section to Regenerate: {section}
-
-## Current Value:
-{current_value}
-
-## User's Feedback:
-{feedback}
-
-## Full Context (all answers from wizard):
-{full_context}
-
-Based on the user's feedback, regenerate ONLY the {section} section. Maintain the same structure/format but incorporate the feedback.
-
-Return as JSON with the regenerated value:
-{{
-    "regenerated_value": <the new value for this section, matching the original structure>
-}}
-
-Section formats:
-- genesis: {{"type": "...", "lineage": "...", "break_from": "..."}}
-- problem_space: {{"gap": "...", "failed_alternatives": "..."}}
-- definition: "string"
-- core_claims: {{"ontological": "...", "causal": "..."}}
-
-For list sections (differentiations, paradigmatic_cases, recognition_markers, falsification_conditions, dialectics), return the full regenerated list."""
-
-
-REGENERATE_INSIGHT_PROMPT = """You are an expert in conceptual analysis helping refine a specific key insight.
-
-## Concept Name: {concept_name}
-
-## User's Notes:
-{notes}
-
-## Current Insight Being Refined (Index {insight_index}):
-{current_insight}
-
-## User's Feedback:
-{feedback}
-
-## Other Insights (for context, don't duplicate):
-{other_insights}
-
-Based on the user's feedback, regenerate THIS SPECIFIC insight. The regenerated insight should:
-1. Address the user's feedback directly
-2. Be distinct from the other insights
-3. Accurately reflect what's in the user's notes
-4. Be concise but informative (1-2 sentences)
-
-Return as JSON:
-{{
-    "regenerated_insight": "The improved insight text..."
-}}
-
-Only return the single regenerated insight, not the whole list."""
-
-
-GENERATE_BLIND_SPOTS_PROMPT = """You are an expert in conceptual analysis helping identify EPISTEMIC BLIND SPOTS in a novel concept.
-
-## Concept Name: {concept_name}
-
-## User's Notes:
-{notes}
-
-## Current Understanding Summary:
-{understanding_summary}
-
-## Preliminary Definition:
-{preliminary_definition}
-
-## Existing Blind Spots Already Identified:
-{existing_tensions}
-
-## Blind Spots Already Confirmed by User:
-{approved_tensions}
-
-Generate 2-3 ADDITIONAL epistemic blind spots. These are NOT problems with the concept itself, but places where the USER'S epistemic positioning isn't yet explicit.
-
-## The 7 Epistemic Categories:
-
-1. **AMBIGUITY** - Terms/phrases with multiple valid readings
-   - Key terms that could mean different things in different contexts
-
-2. **PRESUPPOSITION** - What's being treated as "given" that isn't justified
-   - Look for: "obviously," "naturally," "clearly," "of course"
-   - What's assumed without argument?
-
-3. **PARADIGM_DEPENDENCY** - Where different epistemes would produce different conclusions
-   - What reasoning style is being used? What would a different tradition see?
-
-4. **LIKELY_MISREADING** - Common ways this concept could be misunderstood
-   - What confusions might arise? What adjacent concepts might it be conflated with?
-
-5. **GRAY_ZONE** - Boundary cases where application is uncertain
-   - Where are the edges of the concept's applicability?
-
-6. **UNFILLED_SLOT** - Placeholder structures awaiting elaboration
-   - What conceptual slots haven't been filled in yet?
-
-7. **UNCONFRONTED_CHALLENGE** - Objections/problems not yet addressed
-   - What obvious objections could be raised?
-
-DO NOT duplicate items already identified. Generate truly new ones.
-
-Return as JSON:
-{{
-    "generated_blind_spots": [
-        {{
-            "category": "ambiguity|presupposition|paradigm_dependency|likely_misreading|gray_zone|unfilled_slot|unconfronted_challenge",
-            "description": "Description of this epistemic gap - what the user hasn't yet made explicit",
-            "what_unclear": "The specific aspect that needs clarification",
-            "what_would_help": "What kind of clarification would help surface the user's positioning",
-            "productive_potential": "Why exploring this would help the user articulate their priors"
-        }}
-    ],
-    "generation_note": "Brief note about what epistemic gaps were identified"
-}}
-
-IMPORTANT: These are EPISTEMIC (about the user's grasp/positioning) not ONTOLOGICAL (about the object being indeterminate).
-The goal is to help users articulate their priors, confront structural limits, and grasp conditions of possibility."""
-
-# Legacy alias for backward compatibility
-GENERATE_TENSIONS_PROMPT = GENERATE_BLIND_SPOTS_PROMPT
-
-
-REGENERATE_BLIND_SPOT_PROMPT = """You are an expert in conceptual analysis helping refine an epistemic blind spot based on user feedback.
-
-## Concept Name: {concept_name}
-
-## User's Notes:
-{notes}
-
-## Current Blind Spot to Regenerate:
-{current_tension}
-
-## User's Feedback for Regeneration:
-{feedback}
-
-## Other Blind Spots in This Concept (for context, avoid duplication):
-{other_tensions}
-
-Your task is to regenerate this epistemic blind spot based on the user's feedback. The user wants a NEW formulation that incorporates their feedback - not just the original with a comment appended.
-
-## The 7 Epistemic Categories:
-1. AMBIGUITY - Terms with multiple valid readings
-2. PRESUPPOSITION - What's treated as "given" without justification
-3. PARADIGM_DEPENDENCY - Where different epistemes produce different conclusions
-4. LIKELY_MISREADING - Common ways this could be misunderstood
-5. GRAY_ZONE - Boundary cases where application is uncertain
-6. UNFILLED_SLOT - Placeholder structures awaiting elaboration
-7. UNCONFRONTED_CHALLENGE - Objections not yet addressed
-
-Consider:
-1. What aspect does the user want emphasized or changed?
-2. Is this correctly categorized? Should it be a different epistemic category?
-3. Is it at the right level of abstraction?
-4. Does it genuinely help surface the user's epistemic positioning?
-
-Return as JSON:
-{{
-    "regenerated_blind_spot": {{
-        "category": "ambiguity|presupposition|paradigm_dependency|likely_misreading|gray_zone|unfilled_slot|unconfronted_challenge",
-        "description": "Regenerated description based on feedback",
-        "what_unclear": "The specific aspect that needs clarification",
-        "what_would_help": "What kind of clarification would surface the user's positioning",
-        "productive_potential": "Why exploring this helps the user articulate their priors"
-    }},
-    "regeneration_note": "Brief note about what was changed based on feedback"
-}}
-
-Generate an item that reflects the user's feedback while maintaining theoretical rigor.
-Remember: These are EPISTEMIC (about the user's positioning) not ONTOLOGICAL (about the object itself)."""
-
-# Legacy alias for backward compatibility
-REGENERATE_TENSION_PROMPT = REGENERATE_BLIND_SPOT_PROMPT
-
-
-# =============================================================================
-# DOCUMENT ANALYSIS - Full 9-Dimensional Extraction (Uses Sonnet 4.5 1M)
-# =============================================================================
-
-DOCUMENT_ANALYSIS_PROMPT = """You are Claude analyzing materials about a novel concept called "{concept_name}".
-
-Your task is to extract EVERYTHING we can populate in our 9-dimensional concept schema.
-Use your extensive knowledge of intellectual history, philosophy, and social sciences to INFER beyond what's explicit.
-
-## Document Content:
-{document_content}
-
-## Existing Context (if any):
-{existing_context}
-
-## EXTRACTION TARGETS - ALL 9 PHILOSOPHICAL DIMENSIONS:
-
-### 1. QUINEAN (Inferential Web)
-- What can be inferred FROM this concept? ("If X, then...")
-- What can be inferred TO this concept? ("If Y, then X")
-- What would CONTRADICT this concept?
-- How CENTRAL is it to the author's framework? (core/intermediate/peripheral)
-
-### 2. SELLARSIAN (Givenness Analysis)
-- Is this concept treated as "obvious" or self-evident?
-- What phrases suggest givenness? ("obviously", "naturally", "of course")
-- What SHOULD this concept be inferred from (but isn't justified)?
-- What ASSUMPTIONS are embedded without argument?
-
-### 3. BRANDOMIAN (Commitments & Entitlements)
-- What claims does using this concept COMMIT you to?
-- What claims is the concept-user ENTITLED to make?
-- What is INCOMPATIBLE with this concept?
-- Are any commitments violated in the materials?
-
-### 4. DELEUZIAN (Problems, Plane & Becomings)
-- What PROBLEM or tension does this concept address?
-- What are the POLES of this tension?
-- What transformations (becomings) does the concept ENABLE?
-- What transformations does it BLOCK or foreclose?
-- What UNQUESTIONED ASSUMPTIONS form the "plane" (background conditions)?
-- What becomes THINKABLE with this concept?
-- What becomes UNTHINKABLE?
-
-### 5. BACHELARDIAN (Rupture & Obstacles)
-- What existing framework is this concept BREAKING FROM?
-- WHY is the old framework inadequate?
-- Could this concept itself become an OBSTACLE to future understanding?
-- What questions might become UNASKABLE if we adopt this concept?
-- What would TRIGGER abandonment of this concept?
-
-### 6. CANGUILHEM (Life History & Normative Stakes)
-- How has this concept (or precursors) EVOLVED historically?
-- What PROBLEMS drove changes in its meaning?
-- What VALUES are embedded in this concept?
-- Whose INTERESTS does this concept serve?
-- What/who gets marked as "abnormal" or EXCLUDED?
-
-### 7. DAVIDSON (Reasoning Style)
-- What REASONING STYLE does this concept require?
-- What becomes VISIBLE with this lens?
-- What becomes INVISIBLE or systematically hidden?
-- What kinds of EVIDENCE does this concept privilege?
-- What INFERENCE PATTERNS are characteristic?
-
-### 8. BLUMENBERG (Metaphorology)
-- What ROOT METAPHOR underlies this concept?
-- What DOMAIN does the metaphor come from?
-- What does the metaphor ENABLE thinking about?
-- What does it OBSCURE or hide?
-- Is there conceptual WORK being done to transform the concept?
-
-### 9. CAREY (Bootstrapping Hierarchy)
-- What SIMPLER CONCEPTS is this built from?
-- How do they COMBINE? (aggregation, interaction, emergence)
-- What EMERGES that wasn't in the parts?
-- How TRANSPARENT is the construction?
-
-Return as JSON with confidence levels (high/medium/low/speculative):
-{{
-  "document_summary": "Brief summary of the document's relevance to the concept",
-  "key_excerpts": ["Relevant quotes from the document"],
-
-  "quinean": {{
-    "forward_inferences": [{{"statement": "If {concept_name} then...", "confidence": "medium"}}],
-    "backward_inferences": [{{"statement": "If X then {concept_name}...", "confidence": "medium"}}],
-    "contradictions": [{{"statement": "...", "confidence": "low"}}],
-    "centrality": "core|intermediate|peripheral",
-    "web_coherence_note": "How this fits the broader conceptual web"
-  }},
-
-  "sellarsian": {{
-    "treated_as_given": true,
-    "givenness_markers": ["obviously", "naturally"],
-    "should_be_inferred_from": "What justification is missing",
-    "hidden_assumptions": ["Assumption 1", "Assumption 2"],
-    "what_givenness_enables": "What treating as given allows",
-    "what_givenness_blocks": "What questions become unaskable"
-  }},
-
-  "brandomian": {{
-    "commitments": [{{"claim": "...", "type": "ontological|causal|normative", "confidence": "high"}}],
-    "entitlements": [{{"claim": "...", "confidence": "medium"}}],
-    "incompatibilities": [{{"claim": "...", "confidence": "medium"}}],
-    "violations_found": null
-  }},
-
-  "deleuzian": {{
-    "problem_addressed": "The core tension/problem",
-    "tension_poles": ["Pole A", "Pole B"],
-    "becomings_enabled": ["Transformation 1"],
-    "becomings_blocked": ["Foreclosed transformation"],
-    "plane_assumptions": [{{"assumption": "...", "makes_possible": ["..."], "makes_impossible": ["..."]}}],
-    "creative_responses": ["How concept navigates the problem"]
-  }},
-
-  "bachelardian": {{
-    "breaking_from": {{"framework": "...", "why_inadequate": "..."}},
-    "break_rationale": "Detailed reason for rupture",
-    "obstacle_potential": {{
-      "is_obstacle_risk": true,
-      "what_it_might_block": ["Future understanding 1"],
-      "why_persists": "Ideological function",
-      "rupture_trigger": "What would force abandonment"
-    }}
-  }},
-
-  "canguilhem": {{
-    "evolution_stages": [{{"period": "...", "transformation": "...", "problem_driving": "..."}}],
-    "health_status": "healthy|strained|dying|being_born",
-    "values_embedded": ["Value 1"],
-    "whose_interests": "Whose interests served",
-    "what_excluded": "What marked as abnormal"
-  }},
-
-  "davidson": {{
-    "reasoning_style": "quantitative|historical|structural|phenomenological|dialectical",
-    "makes_visible": ["What becomes visible"],
-    "makes_invisible": ["What's systematically hidden"],
-    "evidence_privileged": ["Type of evidence privileged"],
-    "inference_patterns": ["Characteristic reasoning moves"]
-  }},
-
-  "blumenberg": {{
-    "root_metaphor": "The underlying metaphor",
-    "source_domain": "Where metaphor comes from",
-    "metaphor_enables": ["What it helps think"],
-    "metaphor_hides": ["What it obscures"],
-    "resists_conceptualization": false,
-    "conceptual_work": "Any transformation work being done"
-  }},
-
-  "carey": {{
-    "built_from": ["Component concept 1", "Component concept 2"],
-    "combination_type": "aggregation|interaction|emergence",
-    "what_emerges": "What's new beyond components",
-    "transparency": "high|medium|low",
-    "bootstrap_status": "successful|partial|failed"
-  }},
-
-  "kuhnian": {{
-    "paradigm_position": "normal_science|anomaly|crisis|revolutionary|post_revolutionary",
-    "exemplars": ["Paradigmatic cases that define proper use"],
-    "puzzle_solving_rules": ["What counts as legitimate puzzle/solution"],
-    "incommensurabilities": [{{"framework": "...", "cannot_translate": "..."}}],
-    "disciplinary_matrix": "What shared commitments enable this concept's use",
-    "paradigm_threat_level": "none|minor|significant|revolutionary"
-  }},
-
-  "foucauldian": {{
-    "power_knowledge_nexus": "What power relations this encodes/enables",
-    "governmentality_mode": "discipline|security|sovereign|pastoral|neoliberal|other",
-    "subjectification_effects": ["What subjects this produces"],
-    "discourse_rules": [{{"rule": "...", "enables": "...", "excludes": "..."}}],
-    "resistance_points": ["Where this might be contested"],
-    "truth_regime": "What counts as true within this framework"
-  }},
-
-  "pragmatist": {{
-    "practical_consequences": ["What difference this makes in practice"],
-    "cash_value": "The concept's meaning in experiential terms",
-    "performative_effects": ["What using this concept DOES"],
-    "habit_formations": ["Patterns of action enabled/blocked"],
-    "inquiry_context": "What problematic situation generated this",
-    "melioristic_potential": "How does this improve the situation"
-  }}
-}}
-
-BE AGGRESSIVE in inference - use your knowledge. Mark confidence accordingly.
-The user will validate/correct your hypotheses."""
-
-
 # =============================================================================
 # DEEP PHILOSOPHICAL COMMITMENTS - Generate MC Questions for All Dimensions
 # =============================================================================
 
-GENERATE_DEEP_COMMITMENTS_PROMPT = """You are Claude helping a user articulate the deep philosophical commitments of their concept "{concept_name}".
-
-You have accumulated context from their notes, documents, and earlier answers. NOW generate MULTIPLE CHOICE questions that probe the 12 philosophical dimensions.
-
-## ACCUMULATED CONTEXT:
-- Notes Summary: {notes_summary}
-- Genealogy: {genealogy}
-- Stage 1 Answers: {stage1_answers}
-- Stage 2 Answers: {stage2_answers}
-- Dimensional Extraction (from documents): {dimensional_extraction}
-
-## YOUR TASK:
-Generate 2-3 MC questions for EACH of the 12 philosophical dimensions.
-Each question should:
-1. Use YOUR KNOWLEDGE + accumulated context to generate SPECIFIC options
-2. Options must be real thinkers/frameworks/traditions relevant to THIS specific concept
-3. Include rationale explaining why you're asking
-4. Have 3-5 options plus implicit "None of these" (frontend adds this)
-
-## DIMENSION-SPECIFIC QUESTIONS TO GENERATE:
-
-### QUINEAN (Inferential Web)
-Generate questions about:
-- What follows logically from this concept?
-- What would contradict it?
-- How central is it to the user's overall framework?
-
-### SELLARSIAN (Givenness)
-Generate questions about:
-- Is anything being treated as self-evident that needs justification?
-- What hidden assumptions are embedded?
-
-### BRANDOMIAN (Commitments)
-Generate questions about:
-- What other claims must you accept if you adopt this concept?
-- What claims are incompatible with this concept?
-
-### DELEUZIAN (Problems & Becomings)
-Generate questions about:
-- What transformations does this concept enable?
-- What transformations does it foreclose?
-- What unquestioned assumptions underlie it?
-
-### BACHELARDIAN (Rupture & Obstacles)
-Generate questions about:
-- What existing framework is this replacing?
-- What's wrong with the old way of thinking?
-- Could this concept become an obstacle?
-
-### CANGUILHEM (Normative Stakes)
-Generate questions about:
-- Whose interests does this concept serve?
-- What values are embedded?
-- What gets excluded or marked as abnormal?
-
-### DAVIDSON (Reasoning Style)
-Generate questions about:
-- What kind of reasoning does this concept require?
-- What does it make visible?
-- What might it obscure?
-
-### BLUMENBERG (Metaphorology)
-Generate questions about:
-- What's the root metaphor?
-- What does the metaphor reveal vs hide?
-
-### CAREY (Bootstrapping)
-Generate questions about:
-- What simpler concepts is this built from?
-- What emerges from the combination?
-
-### KUHNIAN (Paradigm Structure)
-Generate questions about:
-- What paradigm does this concept belong to?
-- What would count as an anomaly for this concept?
-- What problems does this paradigm make solvable vs invisible?
-- Is this concept normal science or revolutionary?
-- INCOMMENSURABILITY: How does this concept relate to rival paradigms? Can it be translated into their terms or is there fundamental incommensurability?
-- CRISIS INDICATORS: What would trigger a paradigm crisis for this concept? What accumulation of anomalies would force abandonment?
-- DISCIPLINARY MATRIX: What shared commitments, values, and exemplars do practitioners of this concept share?
-
-### PRAGMATIST (Performative Consequences)
-Generate questions about:
-- What does USING this concept enable you to DO?
-- What practical difference does adopting it make?
-- What actions or interventions become possible/impossible?
-- How does it change what you can say or propose?
-- HABITS OF ACTION: What habits of thought and practice does using this concept cultivate? What dispositions does it form?
-- VOCABULARY GAMES (Rorty): What new things can you SAY with this concept that you couldn't say before? What conversations does it open?
-- INQUIRY PROCESS (Dewey): How does this concept structure problem-solving? What does it make into a "problem" and what does it treat as "solved"?
-
-### FOUCAULDIAN (Power-Knowledge Relations)
-Generate questions about:
-- What power relations does this concept naturalize or make invisible?
-- What does it make governable or manageable?
-- Whose authority does it legitimize?
-- What populations or phenomena does it bring under scrutiny?
-- DISCURSIVE FORMATIONS: What statements become possible/impossible within the discourse this concept enables? What are its rules of formation?
-- REGIMES OF TRUTH: What counts as TRUE within the framework this concept establishes? Who gets to speak with authority?
-- ARCHAEOLOGY: How did this concept emerge? What discursive conditions made it possible? What did it replace or displace?
-
-Return as JSON:
-{{
-  "deep_commitment_questions": [
-    {{
-      "id": "quinean_inferences",
-      "dimension": "quinean",
-      "question": "If {concept_name} is valid, which of these claims would also follow?",
-      "options": [
-        {{"value": "inference_1", "label": "Specific claim A", "description": "Why this follows"}},
-        {{"value": "inference_2", "label": "Specific claim B", "description": "Why this follows"}},
-        {{"value": "inference_3", "label": "Specific claim C", "description": "Why this follows"}}
-      ],
-      "rationale": "Understanding what follows helps clarify the concept's implications",
-      "allow_multiple": false
-    }},
-    {{
-      "id": "quinean_contradictions",
-      "dimension": "quinean",
-      "question": "What would CONTRADICT {concept_name}?",
-      "options": [
-        {{"value": "contra_1", "label": "Contradiction A", "description": "Why this contradicts"}},
-        {{"value": "contra_2", "label": "Contradiction B", "description": "Why this contradicts"}}
-      ],
-      "rationale": "Knowing what contradicts helps define boundaries",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "brandomian_commitments",
-      "dimension": "brandomian",
-      "question": "If you adopt {concept_name}, you must ALSO accept:",
-      "options": [
-        {{"value": "commit_1", "label": "Commitment A", "description": "Why this is required"}},
-        {{"value": "commit_2", "label": "Commitment B", "description": "Why this is required"}}
-      ],
-      "rationale": "Concepts carry hidden commitments",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "deleuzian_enables",
-      "dimension": "deleuzian",
-      "question": "What transformation does {concept_name} ENABLE that was previously blocked?",
-      "options": [
-        {{"value": "becoming_1", "label": "Transformation A", "description": "How this becomes possible"}},
-        {{"value": "becoming_2", "label": "Transformation B", "description": "How this becomes possible"}}
-      ],
-      "rationale": "Concepts are tools for change",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "deleuzian_blocks",
-      "dimension": "deleuzian",
-      "question": "What might {concept_name} FORECLOSE or make harder to think?",
-      "options": [
-        {{"value": "block_1", "label": "Foreclosure A", "description": "Why this becomes unthinkable"}},
-        {{"value": "block_2", "label": "Foreclosure B", "description": "Why this becomes unthinkable"}}
-      ],
-      "rationale": "Every lens has blind spots",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "bachelardian_rupture",
-      "dimension": "bachelardian",
-      "question": "What existing framework is {concept_name} BREAKING FROM?",
-      "options": [
-        {{"value": "rupture_1", "label": "Framework A", "description": "What's wrong with it"}},
-        {{"value": "rupture_2", "label": "Framework B", "description": "What's wrong with it"}}
-      ],
-      "rationale": "New concepts replace old ways of thinking",
-      "allow_multiple": false
-    }},
-    {{
-      "id": "canguilhem_interests",
-      "dimension": "canguilhem",
-      "question": "Whose INTERESTS does {concept_name} primarily serve?",
-      "options": [
-        {{"value": "interest_1", "label": "Stakeholder A", "description": "How they benefit"}},
-        {{"value": "interest_2", "label": "Stakeholder B", "description": "How they benefit"}},
-        {{"value": "neutral", "label": "Genuinely neutral", "description": "Serves no particular interest"}}
-      ],
-      "rationale": "Concepts are never politically innocent",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "davidson_visibility",
-      "dimension": "davidson",
-      "question": "What does {concept_name} make VISIBLE that was hidden before?",
-      "options": [
-        {{"value": "visible_1", "label": "Visibility A", "description": "What becomes apparent"}},
-        {{"value": "visible_2", "label": "Visibility B", "description": "What becomes apparent"}}
-      ],
-      "rationale": "Every concept is a lens",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "davidson_invisibility",
-      "dimension": "davidson",
-      "question": "What might {concept_name} make INVISIBLE or harder to see?",
-      "options": [
-        {{"value": "invisible_1", "label": "Hidden A", "description": "Why it's obscured"}},
-        {{"value": "invisible_2", "label": "Hidden B", "description": "Why it's obscured"}}
-      ],
-      "rationale": "Lenses have blind spots",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "blumenberg_metaphor",
-      "dimension": "blumenberg",
-      "question": "What ROOT METAPHOR underlies {concept_name}?",
-      "options": [
-        {{"value": "metaphor_1", "label": "Metaphor A", "description": "From domain X"}},
-        {{"value": "metaphor_2", "label": "Metaphor B", "description": "From domain Y"}}
-      ],
-      "rationale": "Concepts carry hidden metaphorical baggage",
-      "allow_multiple": false
-    }},
-    {{
-      "id": "carey_components",
-      "dimension": "carey",
-      "question": "What simpler concepts COMBINE to make {concept_name}?",
-      "options": [
-        {{"value": "component_1", "label": "Component A + B", "description": "How they combine"}},
-        {{"value": "component_2", "label": "Component C + D", "description": "How they combine"}}
-      ],
-      "rationale": "Complex concepts are bootstrapped from simpler ones",
-      "allow_multiple": false
-    }},
-    {{
-      "id": "kuhnian_paradigm",
-      "dimension": "kuhnian",
-      "question": "What PARADIGM does {concept_name} belong to?",
-      "options": [
-        {{"value": "paradigm_1", "label": "Paradigm A", "description": "What this paradigm assumes"}},
-        {{"value": "paradigm_2", "label": "Paradigm B", "description": "What this paradigm assumes"}}
-      ],
-      "rationale": "Concepts operate within paradigmatic frameworks",
-      "allow_multiple": false
-    }},
-    {{
-      "id": "kuhnian_anomalies",
-      "dimension": "kuhnian",
-      "question": "What would count as an ANOMALY for {concept_name}?",
-      "options": [
-        {{"value": "anomaly_1", "label": "Anomaly A", "description": "Why this would challenge the concept"}},
-        {{"value": "anomaly_2", "label": "Anomaly B", "description": "Why this would challenge the concept"}}
-      ],
-      "rationale": "Understanding anomalies reveals paradigm boundaries",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "pragmatist_enables",
-      "dimension": "pragmatist",
-      "question": "What does USING {concept_name} enable you to DO?",
-      "options": [
-        {{"value": "action_1", "label": "Action/Intervention A", "description": "How this becomes possible"}},
-        {{"value": "action_2", "label": "Action/Intervention B", "description": "How this becomes possible"}}
-      ],
-      "rationale": "Concepts are tools for action",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "pragmatist_practical",
-      "dimension": "pragmatist",
-      "question": "What PRACTICAL DIFFERENCE does adopting {concept_name} make?",
-      "options": [
-        {{"value": "difference_1", "label": "Difference A", "description": "What changes"}},
-        {{"value": "difference_2", "label": "Difference B", "description": "What changes"}}
-      ],
-      "rationale": "The meaning of a concept lies in its practical effects",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "foucauldian_power",
-      "dimension": "foucauldian",
-      "question": "What POWER RELATIONS does {concept_name} naturalize or make invisible?",
-      "options": [
-        {{"value": "power_1", "label": "Power relation A", "description": "How it's naturalized"}},
-        {{"value": "power_2", "label": "Power relation B", "description": "How it's naturalized"}}
-      ],
-      "rationale": "Concepts embed and legitimize power relations",
-      "allow_multiple": true
-    }},
-    {{
-      "id": "foucauldian_governable",
-      "dimension": "foucauldian",
-      "question": "What does {concept_name} make GOVERNABLE or manageable?",
-      "options": [
-        {{"value": "govern_1", "label": "Population/Phenomenon A", "description": "How it becomes manageable"}},
-        {{"value": "govern_2", "label": "Population/Phenomenon B", "description": "How it becomes manageable"}}
-      ],
-      "rationale": "Concepts are tools of governance and management",
-      "allow_multiple": true
-    }}
-  ],
-  "generation_note": "Brief note about what dimensions had strongest signal from context"
-}}
-
-CRITICAL: Generate SPECIFIC options based on THIS concept and accumulated context.
-Do NOT use generic placeholders. Each option should be a real, specific claim/framework/thinker.
-The goal: USER VALIDATES your hypotheses, not generates from scratch."""
-
-
-REFINE_WITH_FEEDBACK_PROMPT = """You are an expert in conceptual analysis helping refine understanding based on user validation feedback.
-
-## Concept Name: {concept_name}
-
-## User's Original Notes:
-{notes}
-
-## Original Understanding Summary:
-{original_summary}
-
-## Original Key Insights:
-{original_insights}
-
-## User's Feedback on Insights:
-{insight_feedback_summary}
-
-## Approved Tensions (to preserve as dialectics):
-{approved_tensions}
-
-## Original Pre-filled Answers:
-{original_prefills}
-
-## INTELLECTUAL GENEALOGY
-The user was asked about the intellectual origins and influences behind their concept.
-
-### Detected Influences (from notes analysis):
-{detected_influences}
-
-### User's Answers to Genealogy Probing Questions:
-{genealogy_answers}
-
-### User-Declared Additional Influences:
-{user_influences}
-
-Your task is to generate REFINED pre-filled answers for Stage 1 questions that:
-1. Incorporate the user's approved insights (give them more weight)
-2. EXCLUDE or de-emphasize rejected insights
-3. Consider the comments/refinements the user provided
-4. Include the approved tensions as productive dialectics to preserve
-5. **CRITICAL**: Integrate the genealogy information - the intellectual lineage should inform:
-   - genesis_type (theoretical_innovation if building on frameworks, synthesis if combining traditions, etc.)
-   - adjacent_concepts (include the thinkers/frameworks mentioned as influences)
-   - The overall definition and framing
-
-## Stage 1 Questions to Pre-fill:
-1. genesis_type: How would you characterize the origin of this concept?
-   Options: theoretical_innovation, empirical_discovery, synthesis, reconceptualization, normative_reframing
-
-2. core_definition: In one paragraph, provide your working definition of this concept.
-
-3. problem_addressed: What problem or gap does this concept address?
-
-4. adjacent_concepts: Which existing concepts come closest to what you're describing?
-
-5. distinguishing_feature: What most clearly distinguishes this concept from adjacent ones?
-
-6. domain_scope: In which domains does this concept apply?
-
-Return your analysis as JSON:
-{{
-    "refined_summary": "Updated summary incorporating user feedback...",
-    "refined_definition": "Updated working definition...",
-    "refined_insights": ["list", "of", "approved/refined", "insights"],
-    "refined_genealogy": {{
-        "key_influences": ["Thinker/framework 1", "Tradition 2"],
-        "lineage_summary": "Brief description of intellectual lineage",
-        "emergence_context": "Context in which this concept emerged"
-    }},
-    "prefilled_answers": [
-        {{
-            "question_id": "genesis_type",
-            "value": "theoretical_innovation",
-            "confidence": "high|medium|low",
-            "reasoning": "Why this answer, considering user feedback and genealogy...",
-            "source_excerpt": "relevant quote from notes if any"
-        }},
-        {{
-            "question_id": "core_definition",
-            "value": "The refined definition incorporating feedback...",
-            "confidence": "high",
-            "reasoning": "How feedback shaped this..."
-        }}
-    ],
-    "validation_note": "Brief note about what feedback was incorporated"
-}}"""
-
-
-# =============================================================================
-# CURATOR-SHARPENER PROMPTS
-# =============================================================================
-
-EPISTEMIC_CATEGORIES_REGISTRY = """
-## The 7 Epistemic Categories
-
-These categories surface gaps in the USER'S epistemic positioning (not the object itself).
-
-### 1. AMBIGUITY
-Terms/phrases with multiple valid readings that the user hasn't explicitly resolved.
-- What to probe: "Do you mean X or Y when you say Z?"
-- Derived from: Brandomian perspectival content, Blumenberg metaphor theory
-- Example: "Sovereignty" could mean territorial, decisionist, or popular - which?
-
-### 2. PRESUPPOSITION
-What's being treated as "given" without justification.
-- What to probe: "You seem to assume X - what's your basis for this?"
-- Derived from: Sellarsian givenness critique, Deleuzian plane assumptions
-- Example: "You assume digital platforms tend toward monopoly - this requires argument"
-
-### 3. PARADIGM_DEPENDENCY
-Where different intellectual traditions would produce different conclusions.
-- What to probe: "A [tradition] reading would see X, but you're implying Y - which frame are you using?"
-- Derived from: Hacking reasoning styles, Bachelardian regional rationality
-- Example: "Marxist vs Foucauldian reading of power dynamics here"
-
-### 4. LIKELY_MISREADING
-Common ways this concept could be misunderstood by others.
-- What to probe: "Readers might confuse this with X - how do you distinguish?"
-- Derived from: Brandomian de dicto/de re, Carey incommensurability
-- Example: "This might be confused with Polanyi's embedded economy"
-
-### 5. GRAY_ZONE
-Boundary cases where application is uncertain.
-- What to probe: "Does this apply to [edge case]? Where does it stop?"
-- Derived from: Quinean web tensions, Canguilhem milieu boundaries
-- Example: "Does your concept apply to pre-digital platform capitalism?"
-
-### 6. UNFILLED_SLOT
-Placeholder structures awaiting elaboration.
-- What to probe: "You mention X modes but only explain two - what's the third?"
-- Derived from: Carey placeholder structures, Quinean missing inferences
-- Example: "You identify causes but not mechanisms"
-
-### 7. UNCONFRONTED_CHALLENGE
-Objections or problems the user hasn't yet addressed.
-- What to probe: "What would [critic] say to this? How would you respond?"
-- Derived from: Bachelardian epistemological obstacles
-- Example: "Critics would say this reduces to mere economics - your response?"
-"""
-
-CURATOR_PROMPT = """You are an epistemic curator analyzing concept notes to identify blind spots and allocate questioning slots.
-
-{categories_registry}
-
-## User's Concept: {concept_name}
-
-## User's Notes:
-{notes}
-
-{notes_understanding_section}
-
-## Your Task
-
-1. **Analyze the notes** against each of the 7 epistemic categories
-2. **Identify specific blind spots** - concrete instances where user positioning is unclear
-3. **Determine category weights** - which categories are most important for THIS concept
-4. **Allocate question slots** (maximum 16 total) based on weights
-5. **Generate initial questions** for each allocated slot
-6. **Design an INTERLEAVED sequence** - distribute categories across the session
-
-## Allocation Guidelines
-
-- Total slots: 8-16 depending on complexity
-- Minimum 1 slot per relevant category
-- Maximum 4 slots per category
-- Categories with more identified blind spots get more slots
-- Weights should sum to 1.0
-
-## Interleaving Rule (CRITICAL)
-
-Questions must be DISTRIBUTED, not clustered by category.
-
-If allocating 3 ambiguity slots and 2 presupposition slots:
-- BAD: [amb, amb, amb, pre, pre]
-- GOOD: [amb, pre, amb, pre, amb]
-
-This prevents user fatigue and allows reflection between similar questions.
 
-## Question Generation Guidelines
-
-For each slot, generate a question that:
-- Is specific to the user's concept (not generic)
-- Can be answered in 2-3 sentences
-- Focuses on ARTICULATION, not RESOLUTION
-- Helps the user make their positioning explicit
-- References specific content from their notes
-
-DO NOT ask questions whose answers are obvious from the notes.
-
-## Output Format
-
-Return valid JSON:
-{{
-    "total_slots": 12,
-    "category_weights": {{
-        "ambiguity": 0.25,
-        "presupposition": 0.2,
-        "paradigm_dependency": 0.15,
-        "likely_misreading": 0.1,
-        "gray_zone": 0.15,
-        "unfilled_slot": 0.1,
-        "unconfronted_challenge": 0.05
-    }},
-    "emphasis_rationale": "Why this allocation - e.g., 'The concept heavily relies on contested terms (ambiguity) and makes strong assumptions about market dynamics (presupposition)'",
-    "identified_blind_spots": [
-        {{
-            "category": "ambiguity",
-            "description": "The term 'sovereignty' appears 12 times but could mean different things",
-            "what_unclear": "Whether sovereignty here is territorial, decisionist, or popular",
-            "what_would_help": "Explicit statement of which sovereignty tradition is being drawn from"
-        }}
-    ],
-    "slots": [
-        {{
-            "slot_id": "slot_01",
-            "category": "ambiguity",
-            "depth": 1,
-            "question": "When you write about 'technological sovereignty', do you mean control over infrastructure (territorial), authority to make technology decisions (decisionist), or collective technological self-determination (popular)?",
-            "status": "pending",
-            "generated_by": "curator",
-            "blind_spot_ref": "The term 'sovereignty' appears 12 times..."
-        }},
-        {{
-            "slot_id": "slot_02",
-            "category": "presupposition",
-            "depth": 1,
-            "question": "You seem to assume that states can meaningfully regulate transnational tech platforms. What's the basis for this assumption given platform mobility?",
-            "status": "pending",
-            "generated_by": "curator",
-            "blind_spot_ref": "Assumes state regulatory capacity..."
-        }}
-    ],
-    "slot_sequence": ["ambiguity", "presupposition", "paradigm_dependency", "ambiguity", "gray_zone", "presupposition", "unfilled_slot", "ambiguity", "likely_misreading", "gray_zone", "unconfronted_challenge", "presupposition"]
-}}
-
-Generate thoughtful, specific questions that will genuinely help the user articulate their epistemic positioning."""
-
-SHARPENER_PROMPT = """You are an epistemic sharpener generating deeper follow-up questions.
-
-{categories_registry}
-
-## Context
-
-**Concept:** {concept_name}
-
-**Original Question (depth {depth}):**
-{original_question}
-
-**User's Answer:**
-{user_answer}
-
-**Category:** {category}
-
-**Original Notes (for grounding):**
-{notes_context}
-
-**Other Answers So Far:**
-{context_answers}
-
-## Your Task
-
-Generate ONE follow-up question that:
-
-1. **Builds directly on their specific answer** - reference their actual words
-2. **Probes ONE level deeper** into this epistemic gap
-3. **Helps them articulate what's still implicit** in their response
-4. **Does NOT repeat** what's already been explored
-5. **Remains within the same category** ({category})
-
-## Depth Guidelines
-
-- Depth 1 (initial): Surface-level clarification
-- Depth 2 (follow-up): Probing assumptions behind their answer
-- Depth 3 (deep-dive): Connecting to broader commitments or implications
-
-You are generating a depth {next_depth} question.
-
-## Question Style
-
-- Be specific to THEIR answer (quote them if relevant)
-- 1-2 sentences maximum
-- Focus on ARTICULATION not RESOLUTION
-- Answerable in 2-3 sentences
-
-## Output Format
-
-Return valid JSON:
-{{
-    "question": "Your follow-up question here",
-    "rationale": "Why this probes deeper - what it will reveal",
-    "connects_to": "What aspect of their answer this builds on"
-}}
+# Sharded mode: one smaller call per dimension, run concurrently, so the first
+# dimension's questions reach the user while the others are still generating.
+# The per-dimension guidance is parsed out of the monolithic prompt above so the
+# two modes can't drift apart.
+_DEEP_COMMITMENT_SECTION_RE = re.compile(
+    r"^### (\w+) \(([^)]*)\)\nGenerate questions about:\n(.*?)(?=\n\n|\Z)",
+    re.MULTILINE | re.DOTALL,
+)
+DEEP_COMMITMENT_DIMENSIONS = [
+    {"dimension": name.lower(), "title": f"{name} ({subtitle})", "guidance": guidance.strip()}
+    for name, subtitle, guidance in _DEEP_COMMITMENT_SECTION_RE.findall(GENERATE_DEEP_COMMITMENTS_PROMPT)
+]
 
-Generate a question that genuinely advances their epistemic self-understanding."""
+DEEP_COMMITMENT_SHARD_MODEL = os.getenv("DEEP_COMMITMENT_SHARD_MODEL", SONNET_MODEL)
+DEEP_COMMITMENT_SHARD_THINKING_BUDGET = int(os.getenv("DEEP_COMMITMENT_SHARD_THINKING_BUDGET", "4000"))
+DEEP_COMMITMENT_SHARD_MAX_OUTPUT = 12000  # Must be > DEEP_COMMITMENT_SHARD_THINKING_BUDGET
+DEEP_COMMITMENT_CONCURRENCY = int(os.getenv("DEEP_COMMITMENT_CONCURRENCY", "12"))
 
 
 # =============================================================================
@@ -3213,9 +1165,10 @@ Please analyze these notes and generate adaptive follow-up questions that will h
         }
     ]
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.analyze-notes",
         stream_thinking_response(messages, ANALYZE_NOTES_SYSTEM),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3230,7 +1183,7 @@ async def regenerate_understanding(request: RegenerateUnderstandingRequest):
             yield f"data: {json.dumps({'type': 'phase', 'phase': 'regenerating_understanding'})}\n\n"
 
             # Format previous understanding for prompt
-            prev_understanding_str = json.dumps(request.previous_understanding, indent=2)
+            prev_understanding_str = compact_json(request.previous_understanding)
 
             prompt = REGENERATE_UNDERSTANDING_PROMPT.format(
                 concept_name=request.concept_name,
@@ -3324,9 +1277,10 @@ async def regenerate_understanding(request: RegenerateUnderstandingRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.regenerate-understanding",
         stream_regenerated_analysis(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3400,9 +1354,10 @@ async def regenerate_insight(request: RegenerateInsightRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.regenerate-insight",
         stream_regenerated_insight(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3435,6 +1390,8 @@ async def generate_tensions(request: GenerateTensionsRequest):
                 approved_tensions=approved_str
             )
 
+            items = StreamedItems({'generated_blind_spots': 'blind_spot', 'generated_tensions': 'blind_spot'})
+
             client = get_claude_client()
 
             with client.messages.stream(
@@ -3456,6 +1413,8 @@ async def generate_tensions(request: GenerateTensionsRequest):
                                     yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                                 elif hasattr(event.delta, 'text'):
                                     response_text += event.delta.text
+                                    for item_event in items.feed(event.delta.text):
+                                        yield item_event
 
                 final_message = stream.get_final_message()
                 for block in final_message.content:
@@ -3485,9 +1444,10 @@ async def generate_tensions(request: GenerateTensionsRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-tensions",
         stream_tensions(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3563,9 +1523,10 @@ async def regenerate_tension(request: RegenerateTensionRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.regenerate-tension",
         stream_regenerated_tension(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3747,9 +1708,10 @@ async def refine_with_feedback(request: RefineWithFeedbackRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.refine-with-feedback",
         stream_refined(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3768,6 +1730,8 @@ async def generate_case_studies(request: GenerateCaseStudiesRequest):
                 context=request.context
             )
 
+            items = StreamedItems({'generated_cases': 'case_study'})
+
             client = get_claude_client()
 
             with client.messages.stream(
@@ -3789,6 +1753,8 @@ async def generate_case_studies(request: GenerateCaseStudiesRequest):
                                     yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                                 elif hasattr(event.delta, 'text'):
                                     response_text += event.delta.text
+                                    for item_event in items.feed(event.delta.text):
+                                        yield item_event
 
                 final_message = stream.get_final_message()
                 for block in final_message.content:
@@ -3816,9 +1782,10 @@ async def generate_case_studies(request: GenerateCaseStudiesRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-case-studies",
         stream_case_studies(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3832,7 +1799,7 @@ async def generate_recognition_markers(request: GenerateRecognitionMarkersReques
             yield f"data: {json.dumps({'type': 'phase', 'phase': 'generating_markers'})}\n\n"
 
             # Format paradigmatic cases for the prompt
-            cases_text = json.dumps(request.paradigmatic_cases, indent=2)
+            cases_text = compact_json(request.paradigmatic_cases)
 
             prompt = GENERATE_RECOGNITION_MARKERS_PROMPT.format(
                 concept_name=request.concept_name,
@@ -3840,6 +1807,8 @@ async def generate_recognition_markers(request: GenerateRecognitionMarkersReques
                 paradigmatic_cases=cases_text
             )
 
+            items = StreamedItems({'generated_markers': 'recognition_marker'})
+
             client = get_claude_client()
 
             with client.messages.stream(
@@ -3861,6 +1830,8 @@ async def generate_recognition_markers(request: GenerateRecognitionMarkersReques
                                     yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                                 elif hasattr(event.delta, 'text'):
                                     response_text += event.delta.text
+                                    for item_event in items.feed(event.delta.text):
+                                        yield item_event
 
                 final_message = stream.get_final_message()
                 for block in final_message.content:
@@ -3888,9 +1859,10 @@ async def generate_recognition_markers(request: GenerateRecognitionMarkersReques
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-recognition-markers",
         stream_markers(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -3920,9 +1892,10 @@ Please synthesize these answers into a comprehensive concept definition. If crit
 
     messages = [{"role": "user", "content": user_content}]
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.process",
         stream_thinking_response(messages, PROCESS_ANSWERS_SYSTEM),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -4081,9 +2054,10 @@ async def get_stage1_questions(request: StartWizardRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.stage1",
         stream_notes_analysis(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -4277,7 +2251,7 @@ async def analyze_stage1(request: Stage1AnswersRequest):
             stage2_prompt = STAGE2_GENERATION_PROMPT.format(
                 concept_name=request.concept_name,
                 stage1_summary=stage1_text,
-                interim_analysis=json.dumps(interim_analysis, indent=2),
+                interim_analysis=compact_json(interim_analysis),
                 adjacent_concepts=adjacent_concepts,
                 approved_items=approved_items_text
             )
@@ -4329,9 +2303,10 @@ async def analyze_stage1(request: Stage1AnswersRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.analyze-stage1",
         stream_analysis_and_questions(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -4367,8 +2342,8 @@ async def analyze_stage2(request: Stage2AnswersRequest):
             implications_prompt = STAGE3_REFINEMENT_PROMPT.format(
                 concept_name=request.concept_name,
                 full_context=full_context,
-                differentiations=json.dumps(differentiations, indent=2),
-                dialectics=json.dumps([d.model_dump() for d in all_dialectics], indent=2)
+                differentiations=compact_json(differentiations),
+                dialectics=compact_json(all_dialectics)
             )
 
             with client.messages.stream(
@@ -4470,13 +2445,15 @@ async def analyze_stage2(request: Stage2AnswersRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.analyze-stage2",
         stream_implications_and_stage3(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
 @router.post("/regenerate-section")
+@coalesce_requests("wizard.regenerate-section")
 async def regenerate_section(request: RegenerateSectionRequest):
     """
     Regenerate a specific section of the 9-dimension draft with user feedback.
@@ -4485,8 +2462,8 @@ async def regenerate_section(request: RegenerateSectionRequest):
         client = get_claude_client()
 
         # Format context
-        full_context_str = json.dumps(request.full_context, indent=2)
-        current_value_str = json.dumps(request.current_value, indent=2) if isinstance(request.current_value, (dict, list)) else str(request.current_value)
+        full_context_str = compact_json(request.full_context)
+        current_value_str = compact_json(request.current_value) if isinstance(request.current_value, (dict, list)) else str(request.current_value)
 
         prompt = REGENERATE_SECTION_PROMPT.format(
             concept_name=request.concept_name,
@@ -4535,6 +2512,7 @@ async def finalize_concept(request: FinalizeRequest):
         all_answers_flat.extend(answers)
 
     full_context = format_answers_for_prompt(all_answers_flat)
+    interim_analysis = request.interim_analysis.model_dump()
 
     # Format validated data for the prompt
     validated_cases_str = ""
@@ -4560,9 +2538,8 @@ async def finalize_concept(request: FinalizeRequest):
         ])
 
     # Format deep commitment answers (9-dimensional probing)
-    deep_commitments_str = ""
+    sections = []
     if request.deep_commitments:
-        sections = []
         for question_id, answer_data in request.deep_commitments.items():
             if isinstance(answer_data, dict):
                 dimension = answer_data.get('dimension', 'unknown')
@@ -4579,7 +2556,6 @@ async def finalize_concept(request: FinalizeRequest):
                 if comment:
                     section += f"   User Comment: {comment}\n"
                 sections.append(section)
-        deep_commitments_str = "\n".join(sections)
 
     # Format dimensional extraction from document analysis
     dimensional_extraction_str = ""
@@ -4593,6 +2569,17 @@ async def finalize_concept(request: FinalizeRequest):
                         dim_sections.append(f"  {key}: {value}")
         dimensional_extraction_str = "\n".join(dim_sections)
 
+    # Fit the session's accumulated material into the synthesis budget; if it
+    # doesn't all fit, keep what bears most on the interim understanding
+    packed = pack_context([
+        ContextBlock.from_json('interim_analysis', interim_analysis, priority=3.0, required=True),
+        ContextBlock.from_text('answers', full_context, priority=2.0),
+        ContextBlock('deep_commitments', sections, priority=2.0, empty=""),
+        ContextBlock.from_json('dialectics', request.dialectics, priority=1.5, empty="[]"),
+        ContextBlock.from_text('dimensional_extraction', dimensional_extraction_str, empty=""),
+        ContextBlock.from_text('notes', request.notes, empty=""),
+    ], CONTEXT_SYNTHESIS_TOKENS, focus=f"{request.concept_name}\n{compact_json(interim_analysis)}")
+
     async def stream_final_synthesis():
         try:
             client = get_claude_client()
@@ -4602,13 +2589,13 @@ async def finalize_concept(request: FinalizeRequest):
             synthesis_prompt = f"""Synthesize all the user's answers into a comprehensive 9-DIMENSIONAL concept definition for "{request.concept_name}".
 
 ## User's Initial Notes:
-{request.notes or "(No initial notes provided)"}
+{packed['notes'] or "(No initial notes provided)"}
 
 ## All Wizard Answers (Stages 1-3):
-{full_context}
+{packed['answers']}
 
 ## Interim Analysis:
-{json.dumps(request.interim_analysis.model_dump(), indent=2)}
+{packed['interim_analysis']}
 
 ## User-Validated Paradigmatic Cases:
 {validated_cases_str or "(User will provide paradigmatic cases)"}
@@ -4620,13 +2607,13 @@ async def finalize_concept(request: FinalizeRequest):
 {approved_tensions_str or "(None specifically approved)"}
 
 ## Additional Dialectics/Tensions Marked During Questions:
-{json.dumps([d.model_dump() for d in request.dialectics], indent=2)}
+{packed['dialectics']}
 
 ## Deep Philosophical Commitments (9-Dimensional Probing):
-{deep_commitments_str or "(No deep commitment answers provided)"}
+{packed['deep_commitments'] or "(No deep commitment answers provided)"}
 
 ## Dimensional Extraction from Documents/Analysis:
-{dimensional_extraction_str or "(No dimensional extraction available)"}
+{packed['dimensional_extraction'] or "(No dimensional extraction available)"}
 
 Create a complete 9-DIMENSIONAL concept definition following the philosophical frameworks:
 1. QUINEAN - Web of belief, inferential connections, centrality
@@ -4961,9 +2948,10 @@ CRITICAL:
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.finalize",
         stream_final_synthesis(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -5036,7 +3024,7 @@ async def analyze_document(
             prompt = DOCUMENT_ANALYSIS_PROMPT.format(
                 concept_name=concept_name,
                 document_content=document_text,
-                existing_context=json.dumps(existing_ctx, indent=2) if existing_ctx else "(No existing context)"
+                existing_context=compact_json(existing_ctx) if existing_ctx else "(No existing context)"
             )
 
             # Use Sonnet 4.5 with 1M context beta
@@ -5065,9 +3053,9 @@ async def analyze_document(
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
-        stream_document_analysis(),
-        media_type="text/event-stream"
+    return await stream_response(
+        "wizard.analyze-document",
+        stream_document_analysis()
     )
 
 
@@ -5075,12 +3063,67 @@ async def analyze_document(
 # DEEP PHILOSOPHICAL COMMITMENTS - Generate MC Questions for All 9 Dimensions
 # =============================================================================
 
+def _deep_commitments_context(request: DeepCommitmentsRequest) -> Dict[str, str]:
+    """Accumulated-context prompt fields, shared by the monolithic and sharded modes."""
+    packed = pack_context([
+        ContextBlock.from_json("stage1_answers", request.stage1_answers, priority=2.0, empty="[]"),
+        ContextBlock.from_json("stage2_answers", request.stage2_answers, priority=2.0, empty="(Not yet answered)"),
+        ContextBlock.from_json("genealogy", request.genealogy, empty="[]"),
+        ContextBlock.from_json("dimensional_extraction", request.dimensional_extraction, empty="(No document analysis yet)"),
+    ], CONTEXT_SYNTHESIS_TOKENS, focus=f"{request.concept_name}\n{request.notes_summary or ''}")
+    return {
+        "concept_name": request.concept_name,
+        "notes_summary": request.notes_summary or "(No notes)",
+        **packed,
+    }
+
+
+async def _generate_dimension_questions(client, context: Dict[str, str], dimension: Dict[str, str]) -> dict:
+    """One shard of the sharded deep-commitments mode: questions for a single dimension."""
+    prompt = GENERATE_DEEP_COMMITMENTS_SHARD_PROMPT.format(
+        dimension=dimension["dimension"],
+        dimension_title=dimension["title"],
+        dimension_guidance=dimension["guidance"],
+        **context
+    )
+    response = await run_llm_call(
+        client.messages.create,
+        model=DEEP_COMMITMENT_SHARD_MODEL,
+        max_tokens=DEEP_COMMITMENT_SHARD_MAX_OUTPUT,
+        thinking={
+            "type": "enabled",
+            "budget_tokens": DEEP_COMMITMENT_SHARD_THINKING_BUDGET
+        },
+        messages=[{"role": "user", "content": prompt}]
+    )
+    response_text = "".join(
+        block.text for block in response.content if getattr(block, "type", None) == "text"
+    )
+    data = parse_wizard_response(response_text)
+
+    # Keep ids unique across shards and the dimension label authoritative
+    questions = []
+    for q in data.get("deep_commitment_questions", []):
+        if not isinstance(q, dict) or not q.get("question"):
+            continue
+        q_id = str(q.get("id") or f"q{len(questions) + 1}")
+        if not q_id.startswith(f"{dimension['dimension']}_"):
+            q_id = f"{dimension['dimension']}_{q_id}"
+        questions.append({**q, "id": q_id, "dimension": dimension["dimension"]})
+
+    return {"questions": questions, "generation_note": data.get("generation_note", "")}
+
+
 @router.post("/generate-deep-commitments")
 async def generate_deep_commitments(request: DeepCommitmentsRequest):
     """
     Generate MC questions probing all 9 philosophical dimensions.
     Uses accumulated context to generate SPECIFIC, informed options.
     This should be called LATE in the wizard after context has accumulated.
+
+    generation_mode="sharded" runs one call per dimension concurrently and
+    streams each dimension's questions as a `dimension_questions` event as
+    soon as it is ready; see stream_deep_commitments_sharded.
     """
     async def stream_deep_commitments():
         try:
@@ -5089,14 +3132,7 @@ async def generate_deep_commitments(request: DeepCommitmentsRequest):
             yield f"data: {json.dumps({'type': 'phase', 'phase': 'deep_commitments'})}\n\n"
             yield f"data: {json.dumps({'type': 'status', 'message': 'Generating philosophical dimension questions...'})}\n\n"
 
-            prompt = GENERATE_DEEP_COMMITMENTS_PROMPT.format(
-                concept_name=request.concept_name,
-                notes_summary=request.notes_summary or "(No notes)",
-                genealogy=json.dumps(request.genealogy, indent=2),
-                stage1_answers=json.dumps(request.stage1_answers, indent=2),
-                stage2_answers=json.dumps(request.stage2_answers, indent=2) if request.stage2_answers else "(Not yet answered)",
-                dimensional_extraction=json.dumps(request.dimensional_extraction, indent=2) if request.dimensional_extraction else "(No document analysis yet)"
-            )
+            prompt = GENERATE_DEEP_COMMITMENTS_PROMPT.format(**_deep_commitments_context(request))
 
             # Use Opus with extended thinking for sophisticated question generation
             with client.messages.stream(
@@ -5138,9 +3174,75 @@ async def generate_deep_commitments(request: DeepCommitmentsRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
-        stream_deep_commitments(),
-        media_type="text/event-stream"
+    async def stream_deep_commitments_sharded():
+        """
+        Events, in order:
+          phase               {mode: "sharded", dimensions: [...]}
+          dimension_questions {dimension, title, questions, generation_note, completed, total}
+                              - one per dimension, in completion order
+          dimension_error     {dimension, title, message, completed, total} - shard failed
+          complete            same shape as the monolithic mode, questions in dimension
+                              order, plus failed_dimensions
+        """
+        try:
+            client = get_claude_client()
+            context = _deep_commitments_context(request)
+            semaphore = asyncio.Semaphore(max(1, DEEP_COMMITMENT_CONCURRENCY))
+            total = len(DEEP_COMMITMENT_DIMENSIONS)
+
+            yield f"data: {json.dumps({'type': 'phase', 'phase': 'deep_commitments', 'mode': 'sharded', 'dimensions': [d['dimension'] for d in DEEP_COMMITMENT_DIMENSIONS]})}\n\n"
+            yield f"data: {json.dumps({'type': 'status', 'message': f'Generating questions for {total} philosophical dimensions...'})}\n\n"
+
+            async def one(dimension: Dict[str, str]):
+                try:
+                    async with semaphore:
+                        return dimension, await _generate_dimension_questions(client, context, dimension), None
+                except Exception as e:
+                    logger.error(f"[generate-deep-commitments] Dimension {dimension['dimension']} failed: {e}", exc_info=True)
+                    return dimension, None, e
+
+            results: Dict[str, dict] = {}
+            failed = []
+            tasks = [asyncio.create_task(one(d)) for d in DEEP_COMMITMENT_DIMENSIONS]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    dimension, shard, error = await next_done
+                    completed = len(results) + len(failed) + 1
+                    if error is not None:
+                        failed.append(dimension["dimension"])
+                        yield f"data: {json.dumps({'type': 'dimension_error', 'dimension': dimension['dimension'], 'title': dimension['title'], 'message': str(error), 'completed': completed, 'total': total})}\n\n"
+                        continue
+                    results[dimension["dimension"]] = shard
+                    yield f"data: {json.dumps({'type': 'dimension_questions', 'dimension': dimension['dimension'], 'title': dimension['title'], 'questions': shard['questions'], 'generation_note': shard['generation_note'], 'completed': completed, 'total': total})}\n\n"
+            finally:
+                # Client went away mid-stream: don't keep paying for LLM calls
+                for task in tasks:
+                    task.cancel()
+
+            if not results:
+                yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to generate questions for any dimension'})}\n\n"
+            else:
+                ordered = [d["dimension"] for d in DEEP_COMMITMENT_DIMENSIONS if d["dimension"] in results]
+                result = {
+                    "deep_commitment_questions": [q for dim in ordered for q in results[dim]["questions"]],
+                    "generation_note": " ".join(
+                        results[dim]["generation_note"] for dim in ordered if results[dim]["generation_note"]
+                    ),
+                    "dimensions_covered": [dim for dim in ordered if results[dim]["questions"]],
+                    "failed_dimensions": failed,
+                }
+                yield f"data: {json.dumps({'type': 'complete', 'data': result})}\n\n"
+
+        except Exception as e:
+            logger.error(f"Error generating sharded deep commitments: {e}", exc_info=True)
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+
+        yield "data: [DONE]\n\n"
+
+    return await stream_response(
+        "wizard.generate-deep-commitments",
+        stream_deep_commitments_sharded() if request.generation_mode == "sharded" else stream_deep_commitments(),
+        key=request
     )
 
 
@@ -5148,63 +3250,6 @@ async def generate_deep_commitments(request: DeepCommitmentsRequest):
 # CARD TRANSFORMATION - Sharpen/Generalize/Radicalize/Historicize/Deepen
 # =============================================================================
 
-TRANSFORM_CARD_PROMPT = """You are an expert in conceptual analysis helping refine a hypothesis card.
-
-## Transformation Mode: {mode}
-
-{mode_instructions}
-
-## Card to Transform
-Type: {card_type}
-Current Content: {card_content}
-
-{notes_context_section}
-
-{guidance_section}
-
-## Instructions
-Transform the card content according to the mode above.
-Maintain the same general subject matter but apply the transformation.
-Output ONLY the transformed content as a single paragraph or sentence - no JSON, no explanation, just the new card content.
-The result should be a direct replacement for the original card content."""
-
-MODE_INSTRUCTIONS = {
-    'sharpen': """Make the claim MORE SPECIFIC and PRECISE:
-- Add concrete details and specifics
-- Narrow to a clearer, more pointed claim
-- Replace vague or abstract terms with precise ones
-- Name specific mechanisms, actors, or processes
-- If referencing the user's notes, pull in specific quotes or examples""",
-
-    'generalize': """Make the claim MORE GENERAL and ABSTRACT:
-- Broaden to a wider pattern, principle, or phenomenon
-- Remove overly specific details that limit applicability
-- Connect to larger theoretical frameworks or traditions
-- Identify the underlying logic that could apply to other cases
-- Move from specific instance to general category""",
-
-    'radicalize': """Push the claim to a MORE PROVOCATIVE position:
-- Strengthen to its logical extreme
-- Challenge implicit assumptions or unstated premises
-- Make the stakes clearer and higher
-- Remove hedging language and qualifications
-- State the most challenging version of the claim""",
-
-    'historicize': """Ground the claim in HISTORICAL PROCESS and CONTINGENCY:
-- Situate in longer historical trajectory
-- Identify conditions of emergence (when/why did this become thinkable?)
-- Show contingency rather than naturalness
-- Connect to specific historical developments or transformations
-- Denaturalize what might seem obvious or inevitable""",
-
-    'deepen': """Dig into UNDERLYING MECHANISMS and EXPLANATIONS:
-- Identify the actual mechanisms at play
-- Expose transmission channels and causal pathways
-- Move from description/observation to explanation
-- Ask "how does this actually work?"
-- Uncover the infrastructure behind the phenomenon"""
-}
-
 
 @router.post("/transform-card")
 async def transform_card(request: TransformCardRequest):
@@ -5230,7 +3275,7 @@ async def transform_card(request: TransformCardRequest):
             notes_context_section = ""
             if request.notes_context:
                 notes_context_section = f"""## Relevant Context from Notes
-{request.notes_context[:2000]}  # Truncate to avoid context overflow
+{pack_text(request.notes_context, CONTEXT_QUESTION_TOKENS, focus=request.card_content)}
 """
 
             guidance_section = ""
@@ -5280,9 +3325,10 @@ async def transform_card(request: TransformCardRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.transform-card",
         stream_transformation(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -5290,48 +3336,6 @@ async def transform_card(request: TransformCardRequest):
 # GENERATE OPTIONS FOR OPEN-ENDED QUESTIONS
 # =============================================================================
 
-GENERATE_OPTIONS_PROMPT = """You are helping a user develop a novel concept called "{concept_name}".
-
-They are now answering this question:
-## Question
-{question_text}
-
-Based on their notes and earlier responses, generate 4-5 SPECIFIC answer options they can choose from.
-
-## Context from User's Notes
-{notes_context}
-
-## Validated Hypothesis Cards (things they've confirmed about their concept)
-{hypothesis_context}
-
-## Differentiation Cards (how their concept differs from others)
-{differentiation_context}
-
-## Previous Answers
-{previous_answers_context}
-
-## Your Task
-Generate 4-5 distinct answer options that:
-1. Are SPECIFIC to their concept (not generic answers that could apply to any concept)
-2. Draw directly from their notes and validated cards
-3. Represent meaningfully different positions/approaches
-4. Are written as complete, articulate answers (not just labels)
-5. Include a brief rationale for each option
-
-Output JSON:
-{{
-  "options": [
-    {{
-      "id": "opt_1",
-      "content": "The specific answer text that addresses the question based on their notes...",
-      "rationale": "Why this option makes sense given their notes and validated cards...",
-      "confidence": "high" | "medium" | "low"
-    }}
-  ]
-}}
-
-Be specific. Use their exact terminology from the notes. Reference concrete ideas they've already articulated."""
-
 
 @router.post("/generate-options")
 async def generate_options(request: GenerateOptionsRequest):
@@ -5351,8 +3355,8 @@ async def generate_options(request: GenerateOptionsRequest):
             # Build context sections
             notes_context = "No notes provided."
             if request.notes:
-                # Truncate to reasonable size
-                notes_context = request.notes[:8000]
+                # The passages most relevant to the question, within budget
+                notes_context = pack_text(request.notes, CONTEXT_NOTES_TOKENS, focus=request.question_text)
 
             hypothesis_context = "No hypothesis cards validated yet."
             if request.hypothesis_cards:
@@ -5400,29 +3404,23 @@ async def generate_options(request: GenerateOptionsRequest):
                 max_tokens=4096,
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
-                response_text = ""
+                validator = JsonStreamValidator(CardAnswerOptions)
                 for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, 'text'):
-                            response_text += event.delta.text
+                            if validator.feed(event.delta.text):
+                                break  # JSON complete (and validated); skip any trailing prose
 
-            # Parse the JSON response
+            # Validated as it streamed; repaired here if invalid
             try:
-                # Extract JSON from response (handle markdown code blocks)
-                json_text = response_text
-                if "```json" in json_text:
-                    json_text = json_text.split("```json")[1].split("```")[0]
-                elif "```" in json_text:
-                    json_text = json_text.split("```")[1].split("```")[0]
-
-                result = json.loads(json_text.strip())
+                result = (await validator.result()).model_dump()
                 options = result.get("options", [])
 
                 yield f"data: {json.dumps({'type': 'options', 'data': options})}\n\n"
 
-            except json.JSONDecodeError as e:
+            except StructuredOutputError as e:
                 logger.error(f"Failed to parse options JSON: {e}")
-                logger.error(f"Raw response: {response_text[:500]}")
+                logger.error(f"Raw response: {e.raw[:500]}")
                 yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to parse generated options'})}\n\n"
 
         except Exception as e:
@@ -5431,9 +3429,10 @@ async def generate_options(request: GenerateOptionsRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-options",
         stream_options(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -5441,68 +3440,6 @@ async def generate_options(request: GenerateOptionsRequest):
 # GENERATE INTELLECTUAL GENEALOGY
 # =============================================================================
 
-GENERATE_GENEALOGY_PROMPT = """You are helping a user develop a novel concept called "{concept_name}".
-
-They have now completed several stages of concept development. Based on everything they've told you,
-generate hypotheses about the INTELLECTUAL GENEALOGY of their concept.
-
-## User's Notes
-{notes_context}
-
-## Validated Theses About Their Concept
-{hypothesis_context}
-
-## How They Differentiate Their Concept
-{differentiation_context}
-
-## Their Answers to Stage 1-3 Questions
-{answers_context}
-
-## Your Task: Generate Genealogy Hypotheses
-
-For each hypothesis, identify:
-1. **Type**: One of:
-   - "thinker" - A specific thinker/philosopher/theorist
-   - "concept" - A specific concept their idea descends from or responds to
-   - "framework" - A theoretical framework they're working within or against
-   - "debate" - An intellectual debate their concept intervenes in
-   - "failed_alternative" - A concept/framework that failed, prompting theirs
-
-2. **Name**: The specific thinker, concept, framework, or debate
-
-3. **Connection**: HOW it relates to their concept (2-3 sentences, specific)
-
-4. **Confidence**: high/medium/low based on explicit mentions vs inference
-
-5. **Source Evidence**: Quote or reference from their notes if available
-
-Generate 6-10 genealogy hypotheses. Be SPECIFIC:
-- Not "critical theory" but "Adorno's concept of the culture industry"
-- Not "Marxism" but "Marx's concept of commodity fetishism" or "Polanyi's embeddedness"
-- Not "platform studies" but "Srnicek's platform capitalism" or "Zuboff's surveillance capitalism"
-
-Think about:
-- What thinkers do they explicitly or implicitly reference?
-- What concepts does their concept seem to descend from or critique?
-- What frameworks are they working within?
-- What debates does their concept intervene in?
-- What alternatives failed, creating the need for their concept?
-
-Output JSON:
-{{
-  "genealogy_hypotheses": [
-    {{
-      "id": "gen_001",
-      "type": "thinker",
-      "name": "Karl Polanyi",
-      "connection": "Your concept of 'organic capitalism' extends Polanyi's idea of embedded/disembedded economies. You're arguing platforms re-embed economic relations while appearing disembedded.",
-      "confidence": "high",
-      "source_evidence": "User explicitly mentions embeddedness...",
-      "why_relevant": "Central to understanding the 'organic' dimension"
-    }}
-  ]
-}}"""
-
 
 @router.post("/generate-genealogy")
 async def generate_genealogy(request: GenerateGenealogyRequest):
@@ -5523,7 +3460,9 @@ async def generate_genealogy(request: GenerateGenealogyRequest):
             yield f"data: {json.dumps({'type': 'status', 'message': 'Analyzing your concept development for intellectual genealogy...'})}\n\n"
 
             # Build context from all inputs
-            notes_context = request.notes[:12000] if request.notes else "No notes provided."
+            # Genealogy hinges on names, sources and influences, which have no
+            # obvious focus text, so notes keep their leading passages
+            notes_context = pack_text(request.notes, CONTEXT_NOTES_TOKENS) if request.notes else "No notes provided."
 
             hypothesis_context = "No hypothesis cards."
             if request.hypothesis_cards:
@@ -5579,28 +3518,23 @@ async def generate_genealogy(request: GenerateGenealogyRequest):
                 max_tokens=8192,
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
-                response_text = ""
+                validator = JsonStreamValidator(GenealogyHypotheses)
                 for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, 'text'):
-                            response_text += event.delta.text
+                            if validator.feed(event.delta.text):
+                                break  # JSON complete (and validated); skip any trailing prose
 
-            # Parse JSON response
+            # Validated as it streamed; repaired here if invalid
             try:
-                json_text = response_text
-                if "```json" in json_text:
-                    json_text = json_text.split("```json")[1].split("```")[0]
-                elif "```" in json_text:
-                    json_text = json_text.split("```")[1].split("```")[0]
-
-                result = json.loads(json_text.strip())
+                result = (await validator.result()).model_dump()
                 hypotheses = result.get("genealogy_hypotheses", [])
 
                 yield f"data: {json.dumps({'type': 'genealogy', 'data': hypotheses})}\n\n"
 
-            except json.JSONDecodeError as e:
+            except StructuredOutputError as e:
                 logger.error(f"Failed to parse genealogy JSON: {e}")
-                logger.error(f"Raw response: {response_text[:500]}")
+                logger.error(f"Raw response: {e.raw[:500]}")
                 yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to parse genealogy hypotheses'})}\n\n"
 
         except Exception as e:
@@ -5609,9 +3543,10 @@ async def generate_genealogy(request: GenerateGenealogyRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-genealogy",
         stream_genealogy(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -5619,56 +3554,6 @@ async def generate_genealogy(request: GenerateGenealogyRequest):
 # PHASE 2: TARGETED FOLLOW-UP QUESTIONS
 # =============================================================================
 
-GENERATE_PHASE2_PROMPT = """You are Claude helping a user sharpen their philosophical commitments for the concept "{concept_name}".
-
-The user just completed Phase 1 of the philosophical interrogation. You have their answers.
-Your job: Generate TARGETED FOLLOW-UP questions based on their Phase 1 answers.
-
-## ACCUMULATED CONTEXT:
-Notes Summary: {notes_summary}
-Genealogy (approved influences): {genealogy}
-Earlier Stage Answers: {stage_answers}
-
-## PHASE 1 QUESTIONS AND ANSWERS:
-{phase1_qa}
-
-## YOUR TASK:
-Analyze each Phase 1 answer and identify:
-1. Answers that need clarification or sharpening
-2. Answers that reveal tensions with other commitments
-3. Answers where "None of these" was selected (need custom exploration)
-4. Implicit commitments that deserve explicit questioning
-5. Gaps in the dimensional coverage
-
-Generate 4-8 FOLLOW-UP questions that:
-- Explicitly reference and build on their Phase 1 answers
-- Are SHARPER and more SPECIFIC than Phase 1
-- Probe tensions, clarify ambiguities, fill gaps
-- Use concrete options derived from the user's context
-
-For each question include:
-- `follow_up_to`: Brief description of which Phase 1 answer this follows up on
-- `rationale`: Why this follow-up is needed
-
-Return as JSON:
-{{
-  "questions": [
-    {{
-      "id": "p2_q1",
-      "dimension": "quinean",
-      "follow_up_to": "They said X about inferential commitments, but...",
-      "question": "Specific follow-up question text?",
-      "rationale": "This matters because...",
-      "options": [
-        {{"value": "opt_a", "label": "Sharp option A", "description": "What this means"}},
-        {{"value": "opt_b", "label": "Sharp option B", "description": "What this means"}},
-        {{"value": "opt_c", "label": "Sharp option C", "description": "What this means"}}
-      ]
-    }}
-  ],
-  "generation_note": "Summary of what Phase 2 is probing"
-}}"""
-
 
 @router.post("/generate-phase2-questions")
 async def generate_phase2_questions(request: Phase2QuestionsRequest):
@@ -5711,7 +3596,7 @@ async def generate_phase2_questions(request: Phase2QuestionsRequest):
             prompt = GENERATE_PHASE2_PROMPT.format(
                 concept_name=request.concept_name,
                 notes_summary=request.notes_summary or "(No notes)",
-                genealogy=json.dumps(request.genealogy or [], indent=2),
+                genealogy=compact_json(request.genealogy or []),
                 stage_answers="\\n".join(stage_answers) if stage_answers else "(No earlier answers)",
                 phase1_qa="\\n".join(phase1_qa_lines)
             )
@@ -5726,29 +3611,24 @@ async def generate_phase2_questions(request: Phase2QuestionsRequest):
                 },
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
-                response_text = ""
+                validator = JsonStreamValidator(FollowUpQuestions)
                 for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, 'thinking'):
                             yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                         elif hasattr(event.delta, 'text'):
-                            response_text += event.delta.text
+                            if validator.feed(event.delta.text):
+                                break  # JSON complete (and validated); skip any trailing prose
 
-            # Parse JSON response
+            # Validated as it streamed; repaired here if invalid
             try:
-                json_text = response_text
-                if "```json" in json_text:
-                    json_text = json_text.split("```json")[1].split("```")[0]
-                elif "```" in json_text:
-                    json_text = json_text.split("```")[1].split("```")[0]
-
-                result = json.loads(json_text.strip())
+                result = (await validator.result()).model_dump()
 
                 yield f"data: {json.dumps({'type': 'complete', 'data': result})}\n\n"
 
-            except json.JSONDecodeError as e:
+            except StructuredOutputError as e:
                 logger.error(f"Failed to parse Phase 2 JSON: {e}")
-                logger.error(f"Raw response: {response_text[:500]}")
+                logger.error(f"Raw response: {e.raw[:500]}")
                 yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to parse follow-up questions'})}\n\n"
 
         except Exception as e:
@@ -5757,9 +3637,10 @@ async def generate_phase2_questions(request: Phase2QuestionsRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-phase2-questions",
         stream_phase2(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -5767,56 +3648,6 @@ async def generate_phase2_questions(request: Phase2QuestionsRequest):
 # PHASE 3: SYNTHESIS AND VERIFICATION QUESTIONS
 # =============================================================================
 
-GENERATE_PHASE3_PROMPT = """You are Claude helping a user finalize the philosophical commitments of their concept "{concept_name}".
-
-The user has completed Phases 1 and 2 of the philosophical interrogation. You have all their answers.
-Your job: Generate FINAL SYNTHESIS questions that verify coherence and resolve any remaining tensions.
-
-## ACCUMULATED CONTEXT:
-Notes Summary: {notes_summary}
-Genealogy (approved influences): {genealogy}
-
-## PHASE 1 QUESTIONS AND ANSWERS:
-{phase1_qa}
-
-## PHASE 2 QUESTIONS AND ANSWERS:
-{phase2_qa}
-
-## YOUR TASK:
-Generate 3-5 FINAL questions that:
-1. VERIFY key commitments by presenting them back for confirmation
-2. RESOLVE any remaining tensions between different answers
-3. SYNTHESIZE across dimensions to check for coherence
-4. Ask about edge cases or limiting conditions
-5. Confirm the user's overall philosophical stance
-
-Each question should:
-- Reference specific answers from P1/P2
-- Present a synthesis or verification check
-- Have 2-4 sharp options that crystallize different stances
-
-Include for each question:
-- `synthesis_context`: What aspects of their answers this synthesizes or verifies
-
-Return as JSON:
-{{
-  "questions": [
-    {{
-      "id": "p3_q1",
-      "dimension": "synthesis",
-      "synthesis_context": "Your answers suggest X (from Quinean) but also Y (from Deleuzian)...",
-      "question": "Which better captures your overall position?",
-      "rationale": "Resolving this tension will clarify...",
-      "options": [
-        {{"value": "synthesis_a", "label": "Position A (emphasizing X)", "description": "This means..."}},
-        {{"value": "synthesis_b", "label": "Position B (emphasizing Y)", "description": "This means..."}},
-        {{"value": "synthesis_c", "label": "Both can coexist because...", "description": "Explain how"}}
-      ]
-    }}
-  ],
-  "generation_note": "Summary of what Phase 3 synthesizes"
-}}"""
-
 
 @router.post("/generate-phase3-questions")
 async def generate_phase3_questions(request: Phase3QuestionsRequest):
@@ -5866,7 +3697,7 @@ async def generate_phase3_questions(request: Phase3QuestionsRequest):
             prompt = GENERATE_PHASE3_PROMPT.format(
                 concept_name=request.concept_name,
                 notes_summary=request.notes_summary or "(No notes)",
-                genealogy=json.dumps(request.genealogy or [], indent=2),
+                genealogy=compact_json(request.genealogy or []),
                 phase1_qa="\\n".join(phase1_qa_lines),
                 phase2_qa="\\n".join(phase2_qa_lines)
             )
@@ -5881,29 +3712,24 @@ async def generate_phase3_questions(request: Phase3QuestionsRequest):
                 },
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
-                response_text = ""
+                validator = JsonStreamValidator(FollowUpQuestions)
                 for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, 'thinking'):
                             yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                         elif hasattr(event.delta, 'text'):
-                            response_text += event.delta.text
+                            if validator.feed(event.delta.text):
+                                break  # JSON complete (and validated); skip any trailing prose
 
-            # Parse JSON response
+            # Validated as it streamed; repaired here if invalid
             try:
-                json_text = response_text
-                if "```json" in json_text:
-                    json_text = json_text.split("```json")[1].split("```")[0]
-                elif "```" in json_text:
-                    json_text = json_text.split("```")[1].split("```")[0]
-
-                result = json.loads(json_text.strip())
+                result = (await validator.result()).model_dump()
 
                 yield f"data: {json.dumps({'type': 'complete', 'data': result})}\n\n"
 
-            except json.JSONDecodeError as e:
+            except StructuredOutputError as e:
                 logger.error(f"Failed to parse Phase 3 JSON: {e}")
-                logger.error(f"Raw response: {response_text[:500]}")
+                logger.error(f"Raw response: {e.raw[:500]}")
                 yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to parse synthesis questions'})}\n\n"
 
         except Exception as e:
@@ -5912,9 +3738,10 @@ async def generate_phase3_questions(request: Phase3QuestionsRequest):
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-phase3-questions",
         stream_phase3(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -6150,7 +3977,7 @@ _sharpener_tasks: Dict[str, Dict[str, Any]] = {}
 
 
 @router.post("/curate-blind-spots")
-async def curate_blind_spots(request: CurateBlindSpotsRequest, db: AsyncSession = Depends(get_db)):
+async def curate_blind_spots(request: CurateBlindSpotsRequest):
     """
     Curator Service: Analyzes notes against 7-category registry.
     Returns allocation plan with initial questions.
@@ -6164,7 +3991,7 @@ async def curate_blind_spots(request: CurateBlindSpotsRequest, db: AsyncSession
             if request.notes_understanding:
                 notes_understanding_section = f"""
 ## Notes Understanding (from previous analysis):
-{json.dumps(request.notes_understanding, indent=2)}
+{compact_json(request.notes_understanding)}
 """
 
             # Format the prompt
@@ -6201,14 +4028,12 @@ async def curate_blind_spots(request: CurateBlindSpotsRequest, db: AsyncSession
                             elif hasattr(event.delta, 'text'):
                                 full_text += event.delta.text
 
-                # Parse JSON from response
-                if full_text:
-                    # Find JSON in response
-                    json_start = full_text.find('{')
-                    json_end = full_text.rfind('}') + 1
-                    if json_start >= 0 and json_end > json_start:
-                        json_str = full_text[json_start:json_end]
-                        allocation_data = json.loads(json_str)
+            # Validate the allocation (repaired if malformed)
+            if full_text:
+                try:
+                    allocation_data = (await parse_structured(full_text, CuratorAllocation)).model_dump()
+                except StructuredOutputError as e:
+                    logger.error(f"Curator allocation unusable: {e}")
 
             if not allocation_data:
                 raise ValueError("Failed to parse curator response")
@@ -6275,10 +4100,10 @@ async def curate_blind_spots(request: CurateBlindSpotsRequest, db: AsyncSession
             }
 
             # If session_id provided, save to database
-            # Use fresh session inside generator (db from Depends may be closed)
+            # Short-lived session so no connection is held during the LLM call
             if request.session_id:
                 try:
-                    async with AsyncSessionLocal() as db_session:
+                    async with session_scope() as db_session:
                         result = await db_session.execute(
                             select(WizardSession).where(WizardSession.session_key == request.session_id)
                         )
@@ -6310,9 +4135,10 @@ async def curate_blind_spots(request: CurateBlindSpotsRequest, db: AsyncSession
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
             yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.curate-blind-spots",
         stream_curator_response(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -6413,22 +4239,25 @@ async def submit_blind_spot_answer(request: SubmitBlindSpotAnswerRequest, db: As
 
 
 @router.post("/sharpen-question")
-async def sharpen_question(request: SharpenQuestionRequest, db: AsyncSession = Depends(get_db)):
+async def sharpen_question(request: SharpenQuestionRequest):
     """
     Sharpener Service: Generates a deeper follow-up question.
     Called asynchronously while user answers other questions.
     """
     async def stream_sharpener_response():
+        # The brokered producer outlives the request (and a request-scoped
+        # session), so it opens short-lived sessions of its own
         try:
             yield f"data: {json.dumps({'type': 'phase', 'phase': 'sharpening'})}\n\n"
 
             # Load session for context
-            result = await db.execute(
-                select(WizardSession).where(WizardSession.session_key == request.session_id)
-            )
-            session = result.scalar_one_or_none()
+            async with session_scope() as db:
+                result = await db.execute(
+                    select(WizardSession).where(WizardSession.session_key == request.session_id)
+                )
+                session = result.scalar_one_or_none()
 
-            session_state = session.session_state if session else {}
+            session_state = (session.session_state or {}) if session else {}
             # Handle both camelCase (frontend) and snake_case naming
             queue = session_state.get('blind_spots_queue') or session_state.get('blindSpotsQueue', {})
             slots = queue.get('slots', [])
@@ -6455,14 +4284,18 @@ async def sharpen_question(request: SharpenQuestionRequest, db: AsyncSession = D
                         'answer': slot.get('answer')
                     })
 
-            context_answers_str = json.dumps(context_answers, indent=2) if context_answers else "No other answers yet."
-
             # Get notes context
             notes_context = request.notes_context or session_state.get('notes', '') or "Notes not available."
 
             current_depth = original_slot.get('depth', 1)
             next_depth = current_depth + 1
 
+            # Notes passages and other answers that bear on this exchange
+            packed = pack_context([
+                ContextBlock.from_text('notes', notes_context, required=True),
+                ContextBlock.from_json('answers', context_answers, empty="No other answers yet."),
+            ], CONTEXT_QUESTION_TOKENS, focus=f"{original_slot.get('question', '')}\n{request.answer}")
+
             # Format the sharpener prompt
             prompt = SHARPENER_PROMPT.format(
                 categories_registry=EPISTEMIC_CATEGORIES_REGISTRY,
@@ -6472,8 +4305,8 @@ async def sharpen_question(request: SharpenQuestionRequest, db: AsyncSession = D
                 category=original_slot.get('category', 'ambiguity'),
                 depth=current_depth,
                 next_depth=next_depth,
-                notes_context=notes_context[:2000],  # Truncate if too long
-                context_answers=context_answers_str[:3000]  # Truncate if too long
+                notes_context=packed['notes'],
+                context_answers=packed['answers']
             )
 
             yield f"data: {json.dumps({'type': 'phase', 'phase': 'calling_claude'})}\n\n"
@@ -6495,44 +4328,56 @@ async def sharpen_question(request: SharpenQuestionRequest, db: AsyncSession = D
                             if hasattr(event.delta, 'text'):
                                 full_text += event.delta.text
 
-                # Parse JSON from response
-                if full_text:
-                    json_start = full_text.find('{')
-                    json_end = full_text.rfind('}') + 1
-                    if json_start >= 0 and json_end > json_start:
-                        json_str = full_text[json_start:json_end]
-                        sharpener_result = json.loads(json_str)
+            # Validate the follow-up question (repaired if malformed)
+            if full_text:
+                try:
+                    sharpener_result = (await parse_structured(full_text, SharpenedQuestion)).model_dump()
+                except StructuredOutputError as e:
+                    logger.error(f"Sharpener response unusable: {e}")
 
             if not sharpener_result:
                 yield f"data: {json.dumps({'type': 'error', 'error': 'Failed to parse sharpener response'})}\n\n"
                 yield "data: [DONE]\n\n"
                 return
 
-            # Create new slot for the follow-up question
-            new_slot_id = f"slot_{len(slots) + 1:02d}"
-            new_slot = {
-                'slot_id': new_slot_id,
-                'category': original_slot.get('category', 'ambiguity'),
-                'depth': next_depth,
-                'question': sharpener_result.get('question', ''),
-                'status': 'pending',
-                'generated_by': 'sharpener',
-                'parent_slot_id': request.slot_id,
-                'blind_spot_ref': sharpener_result.get('connects_to', '')
-            }
+            # Insert into the session's current queue, re-read under a row lock
+            # so answers saved during the LLM call aren't overwritten
+            async with session_scope() as db:
+                session = (await db.execute(
+                    select(WizardSession)
+                    .where(WizardSession.session_key == request.session_id)
+                    .with_for_update()
+                )).scalar_one_or_none()
+                if session:
+                    session_state = dict(session.session_state or {})
+                    queue = dict(session_state.get('blind_spots_queue') or session_state.get('blindSpotsQueue', {}))
+                    slots = list(queue.get('slots', []))
+
+                # Create new slot for the follow-up question
+                new_slot_id = f"slot_{len(slots) + 1:02d}"
+                new_slot = {
+                    'slot_id': new_slot_id,
+                    'category': original_slot.get('category', 'ambiguity'),
+                    'depth': next_depth,
+                    'question': sharpener_result.get('question', ''),
+                    'status': 'pending',
+                    'generated_by': 'sharpener',
+                    'parent_slot_id': request.slot_id,
+                    'blind_spot_ref': sharpener_result.get('connects_to', '')
+                }
 
-            # Determine insert position (after current position but not immediately)
-            current_index = queue.get('current_index', 0)
-            # Insert 2-3 slots ahead to give user variety
-            insert_position = min(current_index + 2, len(slots))
+                # Determine insert position (after current position but not immediately)
+                current_index = queue.get('current_index', 0)
+                # Insert 2-3 slots ahead to give user variety
+                insert_position = min(current_index + 2, len(slots))
 
-            # Update session state with new slot
-            if session:
-                slots.insert(insert_position, new_slot)
-                queue['slots'] = slots
-                session_state['blind_spots_queue'] = queue
-                session.session_state = session_state
-                await db.commit()
+                # Update session state with new slot
+                if session:
+                    slots.insert(insert_position, new_slot)
+                    queue['slots'] = slots
+                    session_state['blind_spots_queue'] = queue
+                    session.session_state = session_state
+                    attributes.flag_modified(session, 'session_state')
 
             yield f"data: {json.dumps({'type': 'sharpener_complete', 'data': {'new_slot': new_slot, 'insert_position': insert_position, 'queue_length': len(slots), 'rationale': sharpener_result.get('rationale', '')}})}\n\n"
             yield "data: [DONE]\n\n"
@@ -6546,9 +4391,10 @@ async def sharpen_question(request: SharpenQuestionRequest, db: AsyncSession = D
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
             yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.sharpen-question",
         stream_sharpener_response(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -6603,6 +4449,22 @@ async def finish_blind_spots(request: FinishBlindSpotsRequest, db: AsyncSession
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def prepare_generated_card(card: dict, posit: bool = False) -> dict:
+    """Mark a generated card pending review; posits also get their type metadata."""
+    card["status"] = "pending"
+    card["transformation_history"] = []
+    # Add posit type metadata if present
+    if posit and card.get("type"):
+        posit_type = card["type"]
+        for pt, metadata in POSIT_TYPE_METADATA.items():
+            if pt.value == posit_type:
+                card["type_label"] = metadata["label"]
+                card["type_color"] = metadata["color"]
+                card["type_dimension"] = metadata["dimension"]
+                break
+    return card
+
+
 def format_blind_spots_for_prompt(answers: List[BlindSpotAnswer]) -> str:
     """Format blind spots answers for the informed hypothesis generation prompt."""
     if not answers:
@@ -6640,13 +4502,27 @@ async def generate_informed_hypotheses(request: GenerateInformedHypothesesReques
             # Format blind spots context
             blind_spots_context = format_blind_spots_for_prompt(request.blind_spots_answers)
 
+            # The cards should answer to the blind spots, so notes passages
+            # are ranked by how much they bear on those answers
+            packed = pack_context([
+                ContextBlock.from_text('blind_spots_context', blind_spots_context, priority=2.0, required=True),
+                ContextBlock.from_text('notes', request.notes, required=True),
+            ], CONTEXT_SYNTHESIS_TOKENS, focus=blind_spots_context)
+
             # Build the prompt
             prompt = INFORMED_HYPOTHESIS_GENERATION_PROMPT.format(
                 concept_name=request.concept_name,
-                notes=request.notes,
-                blind_spots_context=blind_spots_context
+                notes=packed['notes'],
+                blind_spots_context=packed['blind_spots_context']
             )
 
+            items = StreamedItems({
+                'posit_cards': 'posit',
+                'hypothesis_cards': 'posit',
+                'genealogy_cards': 'genealogy',
+                'differentiation_cards': 'differentiation',
+            }, prepare=lambda key, card: prepare_generated_card(card, posit=key in ('posit_cards', 'hypothesis_cards')))
+
             # Call Claude with extended thinking
             client = get_claude_client()
 
@@ -6669,6 +4545,8 @@ async def generate_informed_hypotheses(request: GenerateInformedHypothesesReques
                                     yield f"data: {json.dumps({'type': 'thinking', 'content': event.delta.thinking})}\n\n"
                                 elif hasattr(event.delta, 'text'):
                                     response_text += event.delta.text
+                                    for item_event in items.feed(event.delta.text):
+                                        yield item_event
 
                 # Get final message
                 final_message = stream.get_final_message()
@@ -6691,27 +4569,11 @@ async def generate_informed_hypotheses(request: GenerateInformedHypothesesReques
             differentiation_cards = analysis_data.get("differentiation_cards", [])
             genealogy_questions = analysis_data.get("genealogy_questions", [])
 
-            # Ensure primary cards have proper status and metadata
+            # Ensure cards have proper status and metadata
             for card in primary_cards:
-                card["status"] = "pending"
-                card["transformation_history"] = []
-                # Add posit type metadata if present
-                if card.get("type"):
-                    posit_type = card["type"]
-                    for pt, metadata in POSIT_TYPE_METADATA.items():
-                        if pt.value == posit_type:
-                            card["type_label"] = metadata["label"]
-                            card["type_color"] = metadata["color"]
-                            card["type_dimension"] = metadata["dimension"]
-                            break
-
-            for card in genealogy_cards:
-                card["status"] = "pending"
-                card["transformation_history"] = []
-
-            for card in differentiation_cards:
-                card["status"] = "pending"
-                card["transformation_history"] = []
+                prepare_generated_card(card, posit=True)
+            for card in genealogy_cards + differentiation_cards:
+                prepare_generated_card(card)
 
             # Return complete response - use posit_cards AND hypothesis_cards for backward compat
             complete_data = {
@@ -6745,9 +4607,10 @@ async def generate_informed_hypotheses(request: GenerateInformedHypothesesReques
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.generate-informed-hypotheses",
         stream_hypothesis_generation(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -6859,137 +4722,19 @@ ANSWER_TYPOLOGY_BANK = {
     }
 }
 
-# Curator prompt: selects 4 best types for this question
-ANSWER_TYPE_CURATOR_PROMPT = """You are an epistemic curator helping select the most appropriate answer TYPES for a specific question.
 
-## The Question
-Concept: {concept_name}
-Category: {category}
-Question: {question}
+ANSWER_CURATOR_MODEL = "claude-haiku-4-5-20251001"
+ANSWER_GENERATOR_MODEL = "claude-sonnet-4-5-20250929"
 
-## User's Context
-{notes_context}
-
-{previous_answers_context}
-
-## Available Answer Types (pick 4)
-{typology_descriptions}
-
-## Your Task
-Analyze the question and context, then select the 4 answer types that would be MOST USEFUL for this specific question.
-
-Consider:
-1. What kind of epistemic move does this question call for?
-2. What stances would reveal the user's actual position most clearly?
-3. What would be genuinely distinct and helpful (not just variety for variety's sake)?
-4. Does the question suggest a particular domain (empirical vs theoretical, historical vs prescriptive)?
-
-You may also define up to 2 CUSTOM types if the standard types don't fit well.
-
-## Output Format
-Return valid JSON:
-{{
-  "selected_types": [
-    {{
-      "type_key": "assertive|exploratory|...|wildcard_1",
-      "label": "ASSERTIVE" or custom label,
-      "tailored_description": "How this type applies to THIS question specifically",
-      "why_selected": "Why this type is valuable for this question"
-    }},
-    ... (4 types total)
-  ],
-  "curation_rationale": "Brief explanation of why these 4 types form a useful set for this question"
-}}"""
-
-# Dynamic answer generation prompt (uses curated types)
-DYNAMIC_ANSWER_OPTIONS_PROMPT = """You are helping a user articulate their response to a question about their concept.
-
-## Context
-Concept: {concept_name}
-Category: {category}
-Question: {question}
-
-{notes_context}
-{previous_answers_context}
-
-## Curated Answer Types for This Question
-{curated_types_description}
-
-## Task
-Generate 4 answer options, one for each curated type above. Each option should:
-1. Be 2-3 sentences long
-2. Embody the specified stance/type authentically
-3. Be specific to THIS question and THIS concept (not generic)
-4. Help the user discover and articulate their actual position
-
-## Mutual Exclusivity
-Determine whether these options are mutually exclusive or can be combined.
-Default to mutually_exclusive: false unless the options are logically contradictory.
-
-## Output Format
-Return valid JSON:
-{{
-  "options": [
-    {{"id": "opt_1", "text": "...", "stance": "{type_1_key}", "label": "{type_1_label}"}},
-    {{"id": "opt_2", "text": "...", "stance": "{type_2_key}", "label": "{type_2_label}"}},
-    {{"id": "opt_3", "text": "...", "stance": "{type_3_key}", "label": "{type_3_label}"}},
-    {{"id": "opt_4", "text": "...", "stance": "{type_4_key}", "label": "{type_4_label}"}}
-  ],
-  "guidance": "Brief note on how these options differ and what choosing each would signal.",
-  "mutually_exclusive": false,
-  "exclusivity_reason": "Brief explanation"
-}}"""
-
-# Legacy prompt (kept for fallback)
-GENERATE_ANSWER_OPTIONS_PROMPT = """You are helping a user articulate their response to a question about their concept's epistemic blind spots.
-
-## Context
-Concept: {concept_name}
-Category: {category}
-Question: {question}
-
-{notes_context}
-{previous_answers_context}
-
-## Task
-Generate 4 distinct answer options that the user might choose from. Each option should:
-1. Be 2-3 sentences long
-2. Take a different STANCE toward the question
-3. Help the user discover and articulate their actual position
-
-## The 4 Stances
-1. **Assertive**: A confident, definitive position. "I believe X because Y."
-2. **Exploratory**: An open, questioning stance. "I'm uncertain about X, but I'm drawn to Y..."
-3. **Qualified**: A nuanced position with caveats. "In some contexts X, but in others Y..."
-4. **Provocative**: A counterintuitive or challenging take. "Against common intuition, I think X..."
-
-## Mutual Exclusivity Analysis
-Determine whether these options are MUTUALLY EXCLUSIVE or can be combined:
-- **mutually_exclusive: true** = Options represent incompatible positions (e.g., "X is true" vs "X is false")
-- **mutually_exclusive: false** = Options can be held together, user might select multiple to give richer context
-
-For blind spots questions, options are often NOT mutually exclusive because:
-- User might hold multiple partial views
-- User might see merit in several framings
-- Selecting multiple gives us richer epistemic context
-
-Default to mutually_exclusive: false unless the options are logically contradictory.
-
-## Output Format
-Return valid JSON:
-{{
-  "options": [
-    {{"id": "opt_1", "text": "...", "stance": "assertive"}},
-    {{"id": "opt_2", "text": "...", "stance": "exploratory"}},
-    {{"id": "opt_3", "text": "...", "stance": "qualified"}},
-    {{"id": "opt_4", "text": "...", "stance": "provocative"}}
-  ],
-  "guidance": "Brief note on how these options differ and what choosing each would signal about the user's position.",
-  "mutually_exclusive": false,
-  "exclusivity_reason": "Brief explanation of why options can/cannot be combined"
-}}
+# Max questions curated/generated at once in the batch endpoint
+ANSWER_OPTIONS_CONCURRENCY = int(os.getenv("ANSWER_OPTIONS_CONCURRENCY", "12"))
 
-Generate options that are genuinely distinct and would help the user discover which resonates with their actual thinking."""
+DEFAULT_CURATED_TYPES = (
+    {"type_key": "assertive", "label": "ASSERTIVE", "tailored_description": "A confident position"},
+    {"type_key": "exploratory", "label": "EXPLORATORY", "tailored_description": "An open exploration"},
+    {"type_key": "qualified", "label": "QUALIFIED", "tailored_description": "A nuanced stance"},
+    {"type_key": "provocative", "label": "PROVOCATIVE", "tailored_description": "A challenging take"},
+)
 
 
 def _build_typology_descriptions() -> str:
@@ -7029,28 +4774,19 @@ async def _curate_answer_types(
     )
 
     # Use Haiku for fast curation (it's just selecting types, not generating content)
-    response = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=1000,
-        messages=[{"role": "user", "content": curator_prompt}]
-    )
-
-    response_text = response.content[0].text.strip()
-
-    # Parse curator response
-    import re
-    json_match = re.search(r'\{[\s\S]*\}', response_text)
-    if json_match:
-        parsed = json.loads(json_match.group())
-        return parsed.get('selected_types', [])
-
-    # Fallback to default types if parsing fails
-    return [
-        {"type_key": "assertive", "label": "ASSERTIVE", "tailored_description": "A confident position"},
-        {"type_key": "exploratory", "label": "EXPLORATORY", "tailored_description": "An open exploration"},
-        {"type_key": "qualified", "label": "QUALIFIED", "tailored_description": "A nuanced stance"},
-        {"type_key": "provocative", "label": "PROVOCATIVE", "tailored_description": "A challenging take"}
-    ]
+    try:
+        curation = await create_structured(
+            client,
+            AnswerTypeCuration,
+            model=ANSWER_CURATOR_MODEL,
+            max_tokens=1000,
+            messages=[{"role": "user", "content": curator_prompt}]
+        )
+        return [t.model_dump() for t in curation.selected_types]
+    except StructuredOutputError as e:
+        # Fallback to default types if the curation is unusable
+        logger.warning(f"[generate-answer-options] Curation unusable, using default types: {e}")
+        return list(DEFAULT_CURATED_TYPES)
 
 
 async def _generate_options_for_curated_types(
@@ -7094,24 +4830,191 @@ async def _generate_options_for_curated_types(
     )
 
     # Use Sonnet for the actual content generation
-    response = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=1500,
-        messages=[{"role": "user", "content": generation_prompt}]
+    try:
+        generated = await create_structured(
+            client,
+            GeneratedAnswerOptions,
+            model=ANSWER_GENERATOR_MODEL,
+            max_tokens=1500,
+            messages=[{"role": "user", "content": generation_prompt}]
+        )
+        return generated.model_dump()
+    except StructuredOutputError as e:
+        logger.warning(f"[generate-answer-options] Generated options unusable: {e}")
+        return None
+
+
+def _answer_options_context(notes_context: Optional[str], previous_answers: Optional[List[Dict[str, Any]]], focus: str = ""):
+    """Build the notes / previous-answers prompt sections shared by both steps."""
+    notes_section = ""
+    if notes_context:
+        notes_section = f"## User's Notes (context)\n{pack_text(notes_context, CONTEXT_QUESTION_TOKENS, focus)}"
+
+    previous_answers_section = ""
+    if previous_answers:
+        answers_text = "\n".join([
+            f"- {a.get('question', 'Q')}: {a.get('answer', 'A')[:200]}"
+            for a in previous_answers[-5:]  # Last 5 answers for richer context
+        ])
+        previous_answers_section = f"## Previous Answers\n{answers_text}"
+
+    return notes_section, previous_answers_section
+
+
+def _build_answer_options_response(generated: Optional[dict], curated_types: List[dict]) -> GenerateAnswerOptionsResponse:
+    """Turn the generator's JSON into a response, falling back to generic stances."""
+    if generated:
+        # Ensure each option has a label (from curated types if not in response)
+        options = generated.get('options', [])
+        for i, opt in enumerate(options):
+            if 'label' not in opt and i < len(curated_types):
+                opt['label'] = curated_types[i].get('label', opt.get('stance', 'TYPE').upper())
+
+        return GenerateAnswerOptionsResponse(
+            options=[AnswerOption(**opt) for opt in options],
+            guidance=generated.get('guidance', 'Choose the option that best resonates with your thinking.'),
+            mutually_exclusive=generated.get('mutually_exclusive', False),
+            exclusivity_reason=generated.get('exclusivity_reason', None)
+        )
+
+    # Fallback if generation fails
+    logger.warning("[generate-answer-options] Generation failed, using fallback")
+    return GenerateAnswerOptionsResponse(
+        options=[
+            AnswerOption(id="opt_1", text="I have a clear position on this that I can articulate.", stance="assertive", label="ASSERTIVE"),
+            AnswerOption(id="opt_2", text="I'm still exploring this area and don't have a fixed view yet.", stance="exploratory", label="EXPLORATORY"),
+            AnswerOption(id="opt_3", text="My position depends on the specific context or framing.", stance="qualified", label="QUALIFIED"),
+            AnswerOption(id="opt_4", text="I want to challenge the premise of this question.", stance="provocative", label="PROVOCATIVE")
+        ],
+        guidance="Select the stance that feels closest to your position, then refine the text.",
+        mutually_exclusive=False,
+        exclusivity_reason="These stances can be combined for a richer response."
     )
 
-    response_text = response.content[0].text.strip()
 
-    # Parse response
-    import re
-    json_match = re.search(r'\{[\s\S]*\}', response_text)
-    if json_match:
-        return json.loads(json_match.group())
+async def _curate_answer_types_combined(
+    client,
+    concept_name: str,
+    questions: List[BatchAnswerOptionsQuestion],
+    notes_context: str,
+    previous_answers_context: str
+) -> Dict[str, List[dict]]:
+    """
+    Curate answer types for every question in one Haiku call.
+    Returns {question_id: selected_types}; questions missing from the reply are omitted.
+    """
+    questions_block = "\n\n".join(
+        f"### question_id: {q.question_id}\nCategory: {q.category}\nQuestion: {q.question}"
+        for q in questions
+    )
+    curator_prompt = BATCH_ANSWER_TYPE_CURATOR_PROMPT.format(
+        concept_name=concept_name,
+        questions_block=questions_block,
+        notes_context=notes_context,
+        previous_answers_context=previous_answers_context,
+        typology_descriptions=_build_typology_descriptions()
+    )
+
+    try:
+        curation = await create_structured(
+            client,
+            BatchAnswerTypeCuration,
+            model=ANSWER_CURATOR_MODEL,
+            max_tokens=min(600 * len(questions) + 400, 8000),
+            messages=[{"role": "user", "content": curator_prompt}]
+        )
+    except StructuredOutputError as e:
+        logger.warning(f"[generate-answer-options-batch] Combined curation unusable: {e}")
+        return {}
+    return {
+        str(c.question_id): [t.model_dump() for t in c.selected_types]
+        for c in curation.curations
+        if c.selected_types
+    }
+
+
+@router.post("/generate-answer-options-batch")
+async def generate_answer_options_batch(request: GenerateAnswerOptionsBatchRequest):
+    """
+    Generate answer options for a whole blind-spots queue in one request.
+
+    Same two-step curation -> generation as /generate-answer-options, but every
+    question runs concurrently (bounded by ANSWER_OPTIONS_CONCURRENCY) and each
+    question's generation starts as soon as its curation is done, so the queue
+    is ready in roughly one question's latency. Options stream back per
+    question as `answer_options` events, in completion order.
+
+    A question whose curation or generation fails gets the generic fallback
+    options (with `fallback: true`) rather than failing the batch.
+    """
+    async def stream_batch():
+        try:
+            client = get_claude_client()
+            notes_context, previous_answers_context = _answer_options_context(
+                request.notes_context, request.previous_answers
+            )
+            semaphore = asyncio.Semaphore(max(1, ANSWER_OPTIONS_CONCURRENCY))
+
+            yield f"data: {json.dumps({'type': 'phase', 'phase': 'curating_answer_types', 'count': len(request.questions)})}\n\n"
+
+            precurated: Dict[str, List[dict]] = {}
+            if request.curation_mode == "combined" and request.questions:
+                try:
+                    precurated = await _curate_answer_types_combined(
+                        client, request.concept_name, request.questions,
+                        notes_context, previous_answers_context
+                    )
+                except Exception as e:
+                    logger.warning(f"[generate-answer-options-batch] Combined curation failed, curating per question: {e}")
+
+            async def one(q: BatchAnswerOptionsQuestion) -> dict:
+                try:
+                    async with semaphore:
+                        curated_types = precurated.get(q.question_id)
+                        if not curated_types:
+                            curated_types = await _curate_answer_types(
+                                client, request.concept_name, q.category, q.question,
+                                notes_context, previous_answers_context
+                            )
+                        generated = await _generate_options_for_curated_types(
+                            client, request.concept_name, q.category, q.question,
+                            notes_context, previous_answers_context, curated_types
+                        )
+                    response = _build_answer_options_response(generated, curated_types)
+                    return {'type': 'answer_options', 'question_id': q.question_id,
+                            'fallback': not generated, 'data': response.model_dump()}
+                except Exception as e:
+                    logger.error(f"[generate-answer-options-batch] Question {q.question_id} failed: {e}", exc_info=True)
+                    response = _build_answer_options_response(None, [])
+                    return {'type': 'answer_options', 'question_id': q.question_id,
+                            'fallback': True, 'error': str(e), 'data': response.model_dump()}
+
+            tasks = [asyncio.create_task(one(q)) for q in request.questions]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield f"data: {json.dumps(await next_done)}\n\n"
+            finally:
+                # Client went away mid-stream: don't keep paying for LLM calls
+                for task in tasks:
+                    task.cancel()
+
+            yield f"data: {json.dumps({'type': 'batch_complete', 'count': len(tasks)})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        except Exception as e:
+            logger.error(f"Error generating batched answer options: {e}", exc_info=True)
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield "data: [DONE]\n\n"
 
-    return None
+    return await stream_response(
+        "wizard.generate-answer-options-batch",
+        stream_batch(),
+        key=request
+    )
 
 
 @router.post("/generate-answer-options")
+@coalesce_requests("wizard.generate-answer-options")
 async def generate_answer_options(request: GenerateAnswerOptionsRequest):
     """
     Generate multiple choice answer options for a blind spot question.
@@ -7126,17 +5029,9 @@ async def generate_answer_options(request: GenerateAnswerOptionsRequest):
         client = get_claude_client()
 
         # Build context sections
-        notes_context = ""
-        if request.notes_context:
-            notes_context = f"## User's Notes (context)\n{request.notes_context[:3000]}..."
-
-        previous_answers_context = ""
-        if request.previous_answers:
-            answers_text = "\n".join([
-                f"- {a.get('question', 'Q')}: {a.get('answer', 'A')[:200]}"
-                for a in request.previous_answers[-5:]  # Last 5 answers for richer context
-            ])
-            previous_answers_context = f"## Previous Answers\n{answers_text}"
+        notes_context, previous_answers_context = _answer_options_context(
+            request.notes_context, request.previous_answers, focus=request.question
+        )
 
         # Step 1: Curate answer types for this question
         logger.info(f"[generate-answer-options] Step 1: Curating types for question in category '{request.category}'")
@@ -7162,33 +5057,7 @@ async def generate_answer_options(request: GenerateAnswerOptionsRequest):
             curated_types
         )
 
-        if generated:
-            # Ensure each option has a label (from curated types if not in response)
-            options = generated.get('options', [])
-            for i, opt in enumerate(options):
-                if 'label' not in opt and i < len(curated_types):
-                    opt['label'] = curated_types[i].get('label', opt.get('stance', 'TYPE').upper())
-
-            return GenerateAnswerOptionsResponse(
-                options=[AnswerOption(**opt) for opt in options],
-                guidance=generated.get('guidance', 'Choose the option that best resonates with your thinking.'),
-                mutually_exclusive=generated.get('mutually_exclusive', False),
-                exclusivity_reason=generated.get('exclusivity_reason', None)
-            )
-
-        # Fallback if generation fails
-        logger.warning("[generate-answer-options] Generation failed, using fallback")
-        return GenerateAnswerOptionsResponse(
-            options=[
-                AnswerOption(id="opt_1", text="I have a clear position on this that I can articulate.", stance="assertive", label="ASSERTIVE"),
-                AnswerOption(id="opt_2", text="I'm still exploring this area and don't have a fixed view yet.", stance="exploratory", label="EXPLORATORY"),
-                AnswerOption(id="opt_3", text="My position depends on the specific context or framing.", stance="qualified", label="QUALIFIED"),
-                AnswerOption(id="opt_4", text="I want to challenge the premise of this question.", stance="provocative", label="PROVOCATIVE")
-            ],
-            guidance="Select the stance that feels closest to your position, then refine the text.",
-            mutually_exclusive=False,
-            exclusivity_reason="These stances can be combined for a richer response."
-        )
+        return _build_answer_options_response(generated, curated_types)
 
     except Exception as e:
         logger.error(f"Error generating answer options: {e}", exc_info=True)
@@ -7556,176 +5425,6 @@ class GenerateNextQuestionRequest(BaseModel):
     philosophy_p2_answers: Optional[Dict[str, Any]] = None
 
 
-# =============================================================================
-# PROMPTS FOR SINGLE-QUESTION DYNAMIC GENERATION
-# =============================================================================
-
-DYNAMIC_STAGE2_QUESTION_PROMPT = """You are Claude generating a SINGLE differentiation question for the concept "{concept_name}".
-
-## ACCUMULATED CONTEXT:
-Notes Summary: {notes_summary}
-Interim Analysis: {interim_analysis}
-Adjacent Concepts: {adjacent_concepts}
-Blind Spots Explored: {blind_spots_summary}
-
-## QUESTIONS ALREADY ASKED IN THIS SECTION:
-{previous_questions_summary}
-
-## ANSWERS SO FAR IN THIS SECTION:
-{section_answers_summary}
-
-## YOUR TASK:
-Generate ONE NEW differentiation question that:
-1. Is DIFFERENT from questions already asked (see list above)
-2. BUILDS ON the answers already given (see answers above)
-3. Addresses one of: presuppositions, paradigm positioning, ambiguities, anticipated misreadings, or adjacent concept distinctions
-4. Uses the accumulated context to make it SPECIFIC to this concept
-
-If {questions_asked} questions have been asked and answers are converging well, you may set "section_complete": true.
-
-Return JSON:
-{{
-  "question": {{
-    "id": "stage2_q{next_question_num}",
-    "text": "The specific question text referencing their prior answers...",
-    "type": "multiple_choice",
-    "options": [
-      {{"value": "opt_a", "label": "Option A", "description": "What this means...", "implications": "Choosing this implies..."}},
-      {{"value": "opt_b", "label": "Option B", "description": "What this means...", "implications": "Choosing this implies..."}},
-      {{"value": "opt_c", "label": "Option C", "description": "What this means...", "implications": "Choosing this implies..."}}
-    ],
-    "rationale": "Why this question matters given their prior answers",
-    "allow_custom_response": true,
-    "allow_comment": true
-  }},
-  "section_complete": false,
-  "completion_reason": null
-}}"""
-
-
-DYNAMIC_STAGE3_QUESTION_PROMPT = """You are Claude generating a SINGLE methodology/grounding question for the concept "{concept_name}".
-
-## ACCUMULATED CONTEXT:
-Notes Summary: {notes_summary}
-Differentiation Answers (Stage 2): {stage2_summary}
-Implications Preview: {implications_preview}
-
-## QUESTIONS ALREADY ASKED IN THIS SECTION:
-{previous_questions_summary}
-
-## ANSWERS SO FAR IN THIS SECTION:
-{section_answers_summary}
-
-## YOUR TASK:
-Generate ONE NEW methodology question that:
-1. Is DIFFERENT from questions already asked
-2. BUILDS ON the answers already given
-3. Addresses one of: paradigmatic cases, implicit domains, recognition markers, core claims, or falsification conditions
-4. Makes it SPECIFIC to this concept and their prior differentiation choices
-
-CRITICAL: You MUST generate MULTIPLE-CHOICE questions with PRE-POPULATED OPTIONS derived from context.
-DO NOT generate open-ended questions requiring free-text typing.
-
-For paradigmatic cases: Generate 3-4 specific candidate cases inferred from the notes and context.
-For recognition markers: Generate 4-5 specific linguistic/structural patterns inferred from the concept.
-For core claims: Generate 3-4 specific claims the concept makes, derived from context.
-For falsification conditions: Generate 3-4 specific conditions that would disprove the concept.
-For implicit domains: Generate 3-4 specific domains where the concept could apply.
-
-Each option should be DETAILED and SPECIFIC to this concept - not generic placeholders.
-The user should be able to select the best-fitting option without typing anything.
-Always include allow_custom_response: true so user CAN type if none fit.
-
-Return JSON:
-{{
-  "question": {{
-    "id": "stage3_q{next_question_num}",
-    "text": "The specific question...",
-    "type": "multiple_choice",
-    "options": [
-      {{
-        "value": "opt_a",
-        "label": "Short descriptive label",
-        "description": "Detailed 2-3 sentence description of this specific answer derived from the concept context"
-      }},
-      {{
-        "value": "opt_b",
-        "label": "Another specific option",
-        "description": "Detailed description showing you understand the concept..."
-      }},
-      {{
-        "value": "opt_c",
-        "label": "Third distinct option",
-        "description": "Another detailed, context-specific answer..."
-      }}
-    ],
-    "allow_multiple": false,  // true for recognition markers
-    "allow_custom_response": true,
-    "allow_comment": true,
-    "rationale": "Why this matters..."
-  }},
-  "section_complete": false,
-  "completion_reason": null
-}}"""
-
-
-DYNAMIC_PHILOSOPHY_QUESTION_PROMPT = """You are Claude generating a SINGLE philosophical dimension question for the concept "{concept_name}".
-
-## THE 12 PHILOSOPHICAL DIMENSIONS:
-1. QUINEAN (Inferential Web) - What follows logically? What contradicts?
-2. SELLARSIAN (Givenness) - What's treated as self-evident?
-3. BRANDOMIAN (Commitments) - What must you accept if you adopt this?
-4. DELEUZIAN (Problems & Becomings) - What transformations enabled/foreclosed?
-5. BACHELARDIAN (Rupture) - What framework is being replaced?
-6. CANGUILHEM (Normative Stakes) - Whose interests served?
-7. DAVIDSON (Reasoning Style) - What made visible/obscured?
-8. BLUMENBERG (Metaphorology) - What's the root metaphor?
-9. CAREY (Bootstrapping) - What simpler concepts is this built from?
-10. KUHNIAN (Paradigm Structure) - What paradigm? What anomalies?
-11. PRAGMATIST (Performative) - What can you DO with this concept?
-12. FOUCAULDIAN (Power-Knowledge) - What power relations naturalized?
-
-## ACCUMULATED CONTEXT:
-Notes Summary: {notes_summary}
-Genealogy: {genealogy_summary}
-Stage 1-3 Synthesis: {stages_summary}
-
-## DIMENSIONS ALREADY COVERED:
-{dimensions_covered}
-
-## QUESTIONS ALREADY ASKED:
-{previous_questions_summary}
-
-## ANSWERS SO FAR:
-{section_answers_summary}
-
-## YOUR TASK:
-Generate ONE NEW philosophical dimension question that:
-1. Covers a dimension NOT YET covered (see list above)
-2. Is SPECIFIC to this concept using accumulated context
-3. Has 3-5 distinct options representing real philosophical positions
-4. Builds on their prior answers where relevant
-
-Return JSON:
-{{
-  "question": {{
-    "id": "phil_q{next_question_num}",
-    "dimension": "quinean",  // the dimension being probed
-    "text": "If {concept_name} is valid, which of these claims would also follow?",
-    "options": [
-      {{"value": "opt_a", "label": "Position A", "description": "Why this follows..."}},
-      {{"value": "opt_b", "label": "Position B", "description": "Why this follows..."}},
-      {{"value": "opt_c", "label": "Position C", "description": "Why this follows..."}}
-    ],
-    "rationale": "Understanding what follows helps clarify...",
-    "allow_multiple": false,
-    "allow_comment": true
-  }},
-  "section_complete": false,
-  "completion_reason": null
-}}"""
-
-
 # =============================================================================
 # HELPER FUNCTIONS FOR DYNAMIC GENERATION
 # =============================================================================
@@ -7789,14 +5488,23 @@ async def _generate_single_question(
     section_answers_summary = _build_section_answers_summary(section_answers)
     previous_questions_summary = _build_previous_questions_summary(previous_questions)
 
+    # Accumulated context is packed into the question budget, keeping what
+    # bears on this section's answers so far
+    focus = f"{section_answers_summary}\n{previous_questions_summary}"
+
     # Select prompt based on section
     if section_id == 'stage2':
+        packed = pack_context([
+            ContextBlock.from_json('interim_analysis', context.get('interim_analysis', {}), priority=2.0, required=True, empty="{}"),
+            ContextBlock.from_json('blind_spots', context.get('blind_spots_answers', []), empty="[]"),
+            ContextBlock.from_json('adjacent_concepts', context.get('adjacent_concepts', []), priority=0.5, empty="[]"),
+        ], CONTEXT_QUESTION_TOKENS, focus)
         prompt = DYNAMIC_STAGE2_QUESTION_PROMPT.format(
             concept_name=concept_name,
             notes_summary=context.get('notes_summary', '(No notes)'),
-            interim_analysis=json.dumps(context.get('interim_analysis', {}), indent=2)[:2000],
-            adjacent_concepts=json.dumps(context.get('adjacent_concepts', []))[:500],
-            blind_spots_summary=json.dumps(context.get('blind_spots_answers', []))[:1500],
+            interim_analysis=packed['interim_analysis'],
+            adjacent_concepts=packed['adjacent_concepts'],
+            blind_spots_summary=packed['blind_spots'],
             previous_questions_summary=previous_questions_summary,
             section_answers_summary=section_answers_summary,
             questions_asked=questions_asked,
@@ -7806,7 +5514,7 @@ async def _generate_single_question(
         prompt = DYNAMIC_STAGE3_QUESTION_PROMPT.format(
             concept_name=concept_name,
             notes_summary=context.get('notes_summary', '(No notes)'),
-            stage2_summary=json.dumps(context.get('stage2_answers', []))[:2000],
+            stage2_summary=pack_json(context.get('stage2_answers', []), CONTEXT_QUESTION_TOKENS, focus, empty="[]"),
             implications_preview=context.get('implications_preview', '(No preview)'),
             previous_questions_summary=previous_questions_summary,
             section_answers_summary=section_answers_summary,
@@ -7814,15 +5522,21 @@ async def _generate_single_question(
         )
     elif section_id in ['philosophy_p1', 'philosophy_p2', 'philosophy_p3']:
         dimensions_covered = _get_dimensions_covered(dict(enumerate(section_answers)))
+        packed = pack_context([
+            ContextBlock.from_json('stage1', context.get('stage1_answers', []), empty="[]"),
+            ContextBlock.from_json('stage2', context.get('stage2_answers', []), empty="[]"),
+            ContextBlock.from_json('stage3', context.get('stage3_answers', []), empty="[]"),
+            ContextBlock.from_json('genealogy', context.get('genealogy', []), priority=0.8, empty="[]"),
+        ], CONTEXT_QUESTION_TOKENS, focus)
         stages_summary = f"""
-Stage 1: {json.dumps(context.get('stage1_answers', []))[:800]}
-Stage 2: {json.dumps(context.get('stage2_answers', []))[:800]}
-Stage 3: {json.dumps(context.get('stage3_answers', []))[:800]}
+Stage 1: {packed['stage1']}
+Stage 2: {packed['stage2']}
+Stage 3: {packed['stage3']}
 """
         prompt = DYNAMIC_PHILOSOPHY_QUESTION_PROMPT.format(
             concept_name=concept_name,
             notes_summary=context.get('notes_summary', '(No notes)'),
-            genealogy_summary=json.dumps(context.get('genealogy', []))[:1000],
+            genealogy_summary=packed['genealogy'],
             stages_summary=stages_summary,
             dimensions_covered=", ".join(dimensions_covered) if dimensions_covered else "(None yet)",
             previous_questions_summary=previous_questions_summary,
@@ -7837,7 +5551,8 @@ Previous answers: {section_answers_summary}
 Return JSON with 'question' and 'section_complete' fields."""
 
     # Use Sonnet 4.5 for speed
-    response = client.messages.create(
+    response = await run_llm_call(
+        client.messages.create,
         model=SONNET_MODEL,
         max_tokens=2000,
         messages=[{"role": "user", "content": prompt}]
@@ -7845,13 +5560,10 @@ Return JSON with 'question' and 'section_complete' fields."""
 
     response_text = response.content[0].text.strip()
 
-    # Parse JSON from response
-    json_start = response_text.find('{')
-    json_end = response_text.rfind('}') + 1
-    if json_start >= 0 and json_end > json_start:
-        return json.loads(response_text[json_start:json_end])
-
-    raise ValueError(f"Failed to parse question generation response: {response_text[:200]}")
+    try:
+        return extract_json(response_text, objects_only=True)
+    except ValueError:
+        raise ValueError(f"Failed to parse question generation response: {response_text[:200]}")
 
 
 # =============================================================================
@@ -7859,7 +5571,7 @@ Return JSON with 'question' and 'section_complete' fields."""
 # =============================================================================
 
 @router.post("/init-dynamic-section")
-async def init_dynamic_section(request: InitDynamicSectionRequest, db: AsyncSession = Depends(get_db)):
+async def init_dynamic_section(request: InitDynamicSectionRequest):
     """
     Initialize a dynamic section with the first 2 questions.
     This allows immediate display while more questions are pre-generated.
@@ -7949,7 +5661,7 @@ async def init_dynamic_section(request: InitDynamicSectionRequest, db: AsyncSess
             # Save to database
             try:
                 print(f"[init-dynamic-section] Saving queue for session_id={request.session_id}, section={section_id}", flush=True)
-                async with AsyncSessionLocal() as db_session:
+                async with session_scope() as db_session:
                     result = await db_session.execute(
                         select(WizardSession).where(WizardSession.session_key == request.session_id)
                     )
@@ -7995,9 +5707,10 @@ async def init_dynamic_section(request: InitDynamicSectionRequest, db: AsyncSess
             yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
             yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
+    return await stream_response(
+        "wizard.init-dynamic-section",
         stream_init(),
-        media_type="text/event-stream"
+        key=request
     )
 
 
@@ -8093,6 +5806,7 @@ async def submit_dynamic_answer(request: SubmitDynamicAnswerRequest, db: AsyncSe
 
 
 @router.post("/generate-next-question")
+@coalesce_requests("wizard.generate-next-question")
 async def generate_next_question(request: GenerateNextQuestionRequest, db: AsyncSession = Depends(get_db)):
     """
     Pre-generate the next question for a dynamic section.
@@ -8142,6 +5856,9 @@ async def generate_next_question(request: GenerateNextQuestionRequest, db: Async
         # Get previous questions from queue
         previous_questions = [s['question'] for s in queue['slots'] if s.get('question')]
 
+        # Don't hold a pooled connection while the LLM generates
+        await release_connection(db)
+
         # Generate next question
         client = get_claude_client()
         result = await _generate_single_question(
@@ -0,0 +1,262 @@
+"""
+Context Packing - Token-Budgeted Prompt Context
+
+Wizard prompts used to embed whole answer sets, analyses and genealogies as
+indented JSON, and cut notes and summaries with fixed character slices
+([:2000], [:800]). Long sessions sent bloated prompts, and the slices kept
+whatever happened to come first rather than what the step needed.
+
+Prompt context is now assembled here:
+
+1. count_tokens() estimates tokens locally (no tokenizer is installed). It
+   counts word pieces and punctuation, so JSON-heavy text isn't undercounted
+   the way a characters-per-token ratio would.
+2. compact_json() serialises without indentation and drops empty fields.
+3. A ContextBlock is one prompt field split into items: answers, list
+   elements, object members, or paragraphs (sentences, for long ones).
+4. pack_context() fills a token budget across blocks. When everything fits,
+   blocks are returned whole. Otherwise items are ranked by block priority
+   and lexical relevance to the step's focus text (a question, a dimension,
+   the latest answers). The best items are kept, in their original order,
+   and the block notes how many it left out.
+
+Configuration (env):
+    CONTEXT_QUESTION_TOKENS   context per single-question / sharpening prompt (default 1200)
+    CONTEXT_NOTES_TOKENS      notes context for option and genealogy generation (default 3000)
+    CONTEXT_SYNTHESIS_TOKENS  context per synthesis prompt: finalize, deep commitments,
+                              informed hypotheses (default 12000)
+"""
+
+import os
+import re
+import json
+import math
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_QUESTION_TOKENS = int(os.getenv("CONTEXT_QUESTION_TOKENS", "1200"))
+CONTEXT_NOTES_TOKENS = int(os.getenv("CONTEXT_NOTES_TOKENS", "3000"))
+CONTEXT_SYNTHESIS_TOKENS = int(os.getenv("CONTEXT_SYNTHESIS_TOKENS", "12000"))
+
+# Items longer than this are split further (paragraphs into sentences)
+MAX_ITEM_TOKENS = 400
+
+# Roughly how BPE tokenizers cut English: common words are one token, long
+# words several, digits in groups of up to three, each punctuation mark one,
+# and a line break with its indentation one.
+_PIECE_RE = re.compile(r"[A-Za-z]{1,8}|\d{1,3}|\n[ \t]*|[^\sA-Za-z\d]")
+_TERM_RE = re.compile(r"[a-z][a-z'-]{2,}")
+_PARAGRAPH_RE = re.compile(r"\S.*?(?=\n[ \t]*\n|\Z)", re.DOTALL)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|\n|$)\s*")
+
+_STOPWORDS = frozenset("""
+    the and for that this with from are was were but not have has had its it's
+    they them their there then than which what when where who whom whose will
+    would could should can may might into onto about also been being such very
+    more most some any each other these those only just over under between
+    your you our we his her she him how why all one two out
+""".split())
+
+
+# =============================================================================
+# TOKENS AND SERIALISATION
+# =============================================================================
+
+def count_tokens(text: str) -> int:
+    """Estimated token count of text."""
+    if not text:
+        return 0
+    return len(_PIECE_RE.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of text within max_tokens, cut at a piece boundary."""
+    if max_tokens <= 0:
+        return ""
+    for count, match in enumerate(_PIECE_RE.finditer(text), 1):
+        if count == max_tokens:
+            return text[:match.end()].rstrip() + "…"
+    return text
+
+
+def _prune(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [_prune(v) for v in value]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """JSON for a prompt: no indentation, no empty fields, unicode as-is."""
+    return json.dumps(_prune(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+# =============================================================================
+# RELEVANCE
+# =============================================================================
+
+def _terms(text: str) -> set:
+    return {t for t in _TERM_RE.findall(text.lower()) if t not in _STOPWORDS}
+
+
+def relevance(text: str, focus_terms: set) -> float:
+    """Overlap of text's terms with the focus terms, 0..1 (cosine over term sets)."""
+    if not focus_terms:
+        return 0.0
+    terms = _terms(text)
+    if not terms:
+        return 0.0
+    return len(terms & focus_terms) / math.sqrt(len(terms) * len(focus_terms))
+
+
+# =============================================================================
+# BLOCKS AND PACKING
+# =============================================================================
+
+class ContextBlock:
+    """
+    One prompt field, as items that can be kept or dropped individually.
+
+    Rendered as prefix + separator.join(kept items) + suffix. priority scales
+    the block's items against other blocks'; a required block always keeps
+    at least its best item, truncated if nothing else fits.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        items: Iterable[str],
+        *,
+        priority: float = 1.0,
+        required: bool = False,
+        separator: str = "\n",
+        prefix: str = "",
+        suffix: str = "",
+        empty: str = "(none)",
+    ):
+        self.name = name
+        self.items = [item for item in items if item]
+        self.priority = priority
+        self.required = required
+        self.separator = separator
+        self.prefix = prefix
+        self.suffix = suffix
+        self.empty = empty
+
+    @classmethod
+    def from_json(cls, name: str, value: Any, **kwargs) -> "ContextBlock":
+        """A list by element or an object by member, each compacted."""
+        value = _prune(value)
+        if isinstance(value, list):
+            items = [compact_json(v) for v in value]
+            kwargs.setdefault("prefix", "[")
+            kwargs.setdefault("suffix", "]")
+        elif isinstance(value, dict):
+            items = [f"{json.dumps(k, ensure_ascii=False)}:{compact_json(v)}" for k, v in value.items()]
+            kwargs.setdefault("prefix", "{")
+            kwargs.setdefault("suffix", "}")
+        else:
+            items = [compact_json(value)] if value not in (None, "") else []
+        kwargs.setdefault("separator", ",")
+        return cls(name, items, **kwargs)
+
+    @classmethod
+    def from_text(cls, name: str, text: Optional[str], **kwargs) -> "ContextBlock":
+        """Paragraphs of text; paragraphs over MAX_ITEM_TOKENS become sentence runs."""
+        items = []
+        for paragraph in _PARAGRAPH_RE.findall(text or ""):
+            paragraph = paragraph.strip()
+            if count_tokens(paragraph) <= MAX_ITEM_TOKENS:
+                items.append(paragraph)
+                continue
+            run, run_tokens = "", 0
+            for sentence in _SENTENCE_RE.findall(paragraph):
+                tokens = count_tokens(sentence)
+                if run and run_tokens + tokens > MAX_ITEM_TOKENS:
+                    items.append(run.strip())
+                    run, run_tokens = "", 0
+                run += sentence
+                run_tokens += tokens
+            if run.strip():
+                items.append(run.strip())
+        kwargs.setdefault("separator", "\n\n")
+        return cls(name, items, **kwargs)
+
+    def render(self, kept: Optional[List[int]] = None) -> str:
+        if not self.items:
+            return self.empty
+        if kept is None:
+            return self.prefix + self.separator.join(self.items) + self.suffix
+        text = self.prefix + self.separator.join(self.items[i] for i in kept) + self.suffix
+        omitted = len(self.items) - len(kept)
+        if omitted:
+            text += f"\n(+{omitted} more omitted for length)"
+        return text
+
+
+def pack_context(blocks: List[ContextBlock], budget: int, focus: str = "") -> Dict[str, str]:
+    """
+    Render blocks within about budget tokens, keeping the items most relevant
+    to focus. Returns {block.name: text}.
+    """
+    full = {block.name: block.render() for block in blocks}
+    total = sum(count_tokens(text) for text in full.values())
+    if total <= budget:
+        return full
+
+    focus_terms = _terms(focus)
+    separator_tokens = {id(block): count_tokens(block.separator) for block in blocks}
+    remaining = budget - sum(
+        count_tokens(block.prefix + block.suffix) + 8 if block.items else count_tokens(block.empty)
+        for block in blocks
+    )
+
+    candidates = []
+    for block in blocks:
+        for index, item in enumerate(block.items):
+            tokens = count_tokens(item) + separator_tokens[id(block)]
+            score = block.priority * (0.5 + relevance(item, focus_terms))
+            candidates.append((score, -index, block, index, tokens))
+    candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+
+    kept: Dict[int, List[int]] = {id(block): [] for block in blocks}
+    for score, _, block, index, tokens in candidates:
+        if tokens <= remaining:
+            kept[id(block)].append(index)
+            remaining -= tokens
+
+    packed = {}
+    for block in blocks:
+        indices = sorted(kept[id(block)])
+        if not indices and block.items and block.required:
+            best = max(
+                range(len(block.items)),
+                key=lambda i: (relevance(block.items[i], focus_terms), -i),
+            )
+            item = truncate_tokens(block.items[best], max(remaining, MAX_ITEM_TOKENS // 4))
+            remaining -= count_tokens(item)
+            packed[block.name] = block.prefix + item + block.suffix
+            continue
+        packed[block.name] = block.render(indices)
+
+    logger.debug(
+        f"Packed context {total} -> ~{budget - max(remaining, 0)} tokens "
+        f"(budget {budget}): " + ", ".join(f"{b.name} {len(kept[id(b)])}/{len(b.items)}" for b in blocks)
+    )
+    return packed
+
+
+def pack_text(text: Optional[str], budget: int, focus: str = "", empty: str = "") -> str:
+    """One text field (e.g. notes) within budget: the most relevant paragraphs, in order."""
+    return pack_context([ContextBlock.from_text("text", text, required=True, empty=empty)], budget, focus)["text"]
+
+
+def pack_json(value: Any, budget: int, focus: str = "", empty: str = "(none)") -> str:
+    """One JSON value within budget: its most relevant elements or members."""
+    return pack_context([ContextBlock.from_json("value", value, required=True, empty=empty)], budget, focus)["value"]
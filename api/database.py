@@ -1,30 +1,122 @@
 """
 Theory Service - Database Configuration
+
+Pool settings (all optional, via environment):
+    DB_POOL_SIZE        persistent connections kept open (default 5)
+    DB_MAX_OVERFLOW     extra connections opened under burst load (default 5)
+    DB_POOL_TIMEOUT     seconds to wait for a free connection before erroring (default 10)
+    DB_POOL_RECYCLE     seconds after which a connection is replaced (default 1800)
+    DB_POOL_PRE_PING    test connections on checkout (default true)
+    DB_CONNECT_TIMEOUT  seconds to establish a new connection (default 10)
+    DB_COMMAND_TIMEOUT  per-statement timeout in seconds (default 0 = none)
+
+The defaults keep size + overflow at 10, well under the connection limit of a
+Render starter Postgres, so one web process can't exhaust it.
+
+Session lifecycle: a session only holds a connection while a transaction is
+open. Long SSE endpoints should not keep one open across an LLM call; call
+release_connection(db) before the LLM phase, and use session_scope() for
+short writes afterwards.
+
+Read replicas: DATABASE_REPLICA_URL (comma-separated for several replicas)
+enables get_read_db, the dependency for pure-read GET handlers. Reads are
+spread round-robin over healthy replicas and fall back to the primary when:
+    - the client wrote recently (read-your-writes; see ReadYourWritesMiddleware)
+    - a replica lags more than DB_REPLICA_MAX_LAG_SECONDS (default 5)
+    - a replica is unreachable (re-checked every DB_REPLICA_CHECK_SECONDS, default 5)
+Without DATABASE_REPLICA_URL, get_read_db behaves exactly like get_db.
+
+Schema creation: init_db runs create_all (one existence query per table) only
+when the fingerprint of the ORM metadata differs from the one stored after the
+last successful run, or when one of its tables no longer exists (dropped by
+hand or by a reset). SCHEMA_FINGERPRINT_CHECK=false runs it on every boot.
 """
 
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+import time
+import asyncio
+import hashlib
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine, async_sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from .models import Base
 from .concept_analysis_models import Base as ConceptAnalysisBase
+from .instrumentation import InstrumentedAsyncQueuePool, DB_READ_ROUTING, DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_url(url: str) -> str:
+    """Render/Heroku hand out postgres:// URLs; SQLAlchemy wants postgresql://."""
+    url = url.strip()
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def _async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 
 # Database URL from environment
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql:///essay_genre_db")
+DATABASE_URL = _normalize_url(os.getenv("DATABASE_URL", "postgresql:///essay_genre_db"))
+
+# Convert to async URL
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
+
+# Read replicas (comma-separated); empty means every read goes to the primary
+DATABASE_REPLICA_URLS = [
+    _normalize_url(url) for url in os.getenv("DATABASE_REPLICA_URL", "").split(",") if url.strip()
+]
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "5"))
+# How long after a write a client keeps reading from the primary
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "10"))
+
+DEBUG_SQL = os.getenv("DEBUG", "false").lower() == "true"
+
+SCHEMA_FINGERPRINT_CHECK = os.getenv("SCHEMA_FINGERPRINT_CHECK", "true").lower() == "true"
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "0") or 0)
+
+_connect_args = {"timeout": DB_CONNECT_TIMEOUT}
+if DB_COMMAND_TIMEOUT:
+    _connect_args["command_timeout"] = DB_COMMAND_TIMEOUT
 
-# Convert to async URL if needed
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+def _create_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        _async_url(url),
+        echo=DEBUG_SQL,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=_connect_args,
+    )
+
 
 # Async engine for FastAPI
-async_engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=os.getenv("DEBUG", "false").lower() == "true",
-    pool_pre_ping=True,
-)
+async_engine = _create_async_engine(DATABASE_URL)
 
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -33,11 +125,22 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
-# Sync engine for migrations
-sync_engine = create_engine(
-    DATABASE_URL,
-    echo=os.getenv("DEBUG", "false").lower() == "true",
-)
+# Sync engine for scripts/migrations, created on first use
+_sync_engine: Optional[Engine] = None
+
+
+def get_sync_engine() -> Engine:
+    """Return the (lazily created) synchronous engine."""
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            DATABASE_URL,
+            echo=DEBUG_SQL,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=True,
+        )
+    return _sync_engine
 
 
 async def get_db():
@@ -49,17 +152,270 @@ async def get_db():
             await session.close()
 
 
-async def init_db():
-    """Initialize database tables."""
+@asynccontextmanager
+async def session_scope():
+    """
+    Short-lived session for a unit of work: commits on success, rolls back on
+    error, and returns the connection to the pool on exit.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def release_connection(session: AsyncSession):
+    """
+    Commit the session's open transaction so its connection goes back to the
+    pool, e.g. before a long LLM streaming phase. Loaded objects stay usable
+    (expire_on_commit=False) and the next query checks out a fresh connection.
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+# =============================================================================
+# READ REPLICAS
+# =============================================================================
+
+# Zero when the server is not in recovery (e.g. the "replica" is a primary) or
+# has replayed everything it received, so an idle primary doesn't read as lag.
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReadReplica:
+    """One replica engine plus its cached health/lag state."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = _create_async_engine(url)
+        self.sessionmaker = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+        @event.listens_for(self.engine.sync_engine, "handle_error")
+        def _on_error(exception_context):
+            if exception_context.is_disconnect:
+                self.mark_down("connection lost")
+
+    def mark_down(self, reason: str):
+        if self.healthy:
+            logger.warning(f"Read replica {self.name} unavailable ({reason}); reads fall back to primary")
+        self.healthy = False
+        self.lag = None
+        self.checked_at = time.monotonic()
+        DB_REPLICA_LAG.set((self.name,), -1)
+
+    async def is_usable(self) -> bool:
+        """Cached health check; at most one lag query per replica per interval."""
+        if time.monotonic() - self.checked_at < DB_REPLICA_CHECK_SECONDS or self._lock.locked():
+            return self.healthy
+
+        async with self._lock:
+            try:
+                async with self.engine.connect() as conn:
+                    lag = float(await conn.scalar(_REPLICA_LAG_SQL) or 0)
+            except Exception as e:
+                self.mark_down(str(e) or type(e).__name__)
+                return False
+
+            self.lag = lag
+            self.checked_at = time.monotonic()
+            DB_REPLICA_LAG.set((self.name,), lag)
+            healthy = lag <= DB_REPLICA_MAX_LAG_SECONDS
+            if healthy != self.healthy:
+                if healthy:
+                    logger.info(f"Read replica {self.name} back in rotation (lag {lag:.1f}s)")
+                else:
+                    logger.warning(f"Read replica {self.name} lagging {lag:.1f}s; reads fall back to primary")
+            self.healthy = healthy
+            return healthy
+
+
+READ_REPLICAS: List[ReadReplica] = [
+    ReadReplica(f"replica{i + 1}", url) for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+_replica_cycle = itertools.cycle(READ_REPLICAS) if READ_REPLICAS else None
+
+# Cookie carrying "read from the primary until <unix time>" (works across processes)
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+# Same, keyed by client address, for API clients that don't keep cookies
+_recent_writers: Dict[str, float] = {}
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _client_key(headers: Dict[str, str], client) -> str:
+    forwarded = headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return client[0] if client else ""
+
+
+def _wrote_recently(request: Request) -> bool:
+    now = time.time()
+    try:
+        if float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > now:
+            return True
+    except ValueError:
+        pass
+    until = _recent_writers.get(_client_key(request.headers, request.client))
+    return until is not None and until > now
+
+
+async def _pick_replica() -> Optional[ReadReplica]:
+    for _ in range(len(READ_REPLICAS)):
+        replica = next(_replica_cycle)
+        if await replica.is_usable():
+            return replica
+    return None
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency for read-only handlers. Yields a replica session when one is
+    healthy and the client has no recent writes, otherwise a primary session.
+    Handlers using it must not write.
+    """
+    factory = AsyncSessionLocal
+    if not READ_REPLICAS:
+        target = "primary"
+    elif _wrote_recently(request):
+        target = "primary_sticky"
+    else:
+        replica = await _pick_replica()
+        if replica is not None:
+            factory, target = replica.sessionmaker, "replica"
+        else:
+            target = "primary_fallback"
+    DB_READ_ROUTING.inc((target,))
+
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: after a successful non-GET request, pin the client's
+    reads to the primary for DB_READ_YOUR_WRITES_SECONDS (cookie + client address).
+    No-op when no replica is configured.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not READ_REPLICAS or scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + DB_READ_YOUR_WRITES_SECONDS
+                headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+                _remember_writer(_client_key(headers, scope.get("client")), until)
+
+                cookie = SimpleCookie()
+                cookie[READ_YOUR_WRITES_COOKIE] = f"{until:.3f}"
+                cookie[READ_YOUR_WRITES_COOKIE]["max-age"] = int(DB_READ_YOUR_WRITES_SECONDS) + 1
+                cookie[READ_YOUR_WRITES_COOKIE]["path"] = "/"
+                cookie[READ_YOUR_WRITES_COOKIE]["httponly"] = True
+                cookie[READ_YOUR_WRITES_COOKIE]["samesite"] = "Lax"
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"set-cookie", cookie.output(header="").strip().encode("latin-1")),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _remember_writer(key: str, until: float):
+    if len(_recent_writers) > 10000:
+        now = time.time()
+        for stale in [k for k, v in _recent_writers.items() if v <= now]:
+            del _recent_writers[stale]
+    _recent_writers[key] = until
+
+
+def schema_fingerprint(*metadatas) -> str:
+    """Hash of the DDL the metadata would create (tables and indexes)."""
+    dialect = postgresql.dialect()
+    statements = []
+    for metadata in metadatas:
+        for table in metadata.sorted_tables:
+            statements.append(str(CreateTable(table).compile(dialect=dialect)))
+            statements.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes)
+    return hashlib.sha256("\n".join(sorted(statements)).encode()).hexdigest()
+
+
+async def init_db() -> bool:
+    """Initialize database tables. Returns False if the schema was current and creation skipped."""
     # Import strategizer models here to avoid circular import
     from .strategizer.models import Base as StrategizerBase
 
+    metadatas = (Base.metadata, ConceptAnalysisBase.metadata, StrategizerBase.metadata)
+    fingerprint = schema_fingerprint(*metadatas)
+
     async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        await conn.run_sync(ConceptAnalysisBase.metadata.create_all)
-        await conn.run_sync(StrategizerBase.metadata.create_all)
+        if SCHEMA_FINGERPRINT_CHECK:
+            stored = None
+            if (await conn.execute(text("SELECT to_regclass('schema_fingerprints')"))).scalar() is not None:
+                stored = (await conn.execute(
+                    text("SELECT fingerprint FROM schema_fingerprints WHERE name = 'orm'")
+                )).scalar()
+            if stored == fingerprint:
+                # The fingerprint survives drop_all, so check the tables are still there
+                names = [table.fullname for metadata in metadatas for table in metadata.sorted_tables]
+                missing = (await conn.execute(
+                    text("SELECT count(*) FROM unnest(CAST(:names AS text[])) AS t(name) WHERE to_regclass(name) IS NULL"),
+                    {"names": names},
+                )).scalar()
+                if not missing:
+                    return False
+                logger.info(f"Schema fingerprint current but {missing} table(s) missing, running create_all")
+
+        for metadata in metadatas:
+            await conn.run_sync(metadata.create_all)
+
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_fingerprints (
+                name VARCHAR(50) PRIMARY KEY,
+                fingerprint VARCHAR(64) NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """))
+        await conn.execute(
+            text("""
+                INSERT INTO schema_fingerprints (name, fingerprint) VALUES ('orm', :fingerprint)
+                ON CONFLICT (name) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, updated_at = now()
+            """),
+            {"fingerprint": fingerprint},
+        )
+    logger.info(f"Database schema created/updated (fingerprint {fingerprint[:12]})")
+    return True
 
 
 async def close_db():
     """Close database connections."""
     await async_engine.dispose()
+    for replica in READ_REPLICAS:
+        await replica.engine.dispose()
+    if _sync_engine is not None:
+        _sync_engine.dispose()
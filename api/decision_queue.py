@@ -0,0 +1,123 @@
+"""
+Decision Queue - Keyset Pagination for Pending Evidence Decisions
+
+Both evidence subsystems (strategizer projects and concept analysis) present
+NEEDS_DECISION fragments one at a time, oldest first. Instead of loading the
+whole pending set to pick one by index, pages are addressed by cursor: the id
+of a fragment, resolved to its (created_at, id) sort key. The anchor fragment
+doesn't have to still be pending, so "after=<the fragment just decided>"
+returns the next one.
+
+Each page costs one anchor lookup, one LIMIT query (with whatever eager loads
+the caller passes) and one COUNT ... FILTER statement for the total and the
+page's position.
+"""
+
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Select, select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Upper bound on decisions returned by one queue request (current + prefetched)
+MAX_DECISION_PAGE = 25
+
+
+class DecisionPage:
+    """One window of the pending-decision queue."""
+
+    def __init__(self, items: List[Any], total: int, position: int):
+        self.items = items
+        self.total = total
+        self.position = position  # 1-based position of items[0] (0 when empty)
+
+    @property
+    def has_previous(self) -> bool:
+        return self.position > 1
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.items) and self.position + len(self.items) - 1 < self.total
+
+
+def _sort_key(model):
+    return tuple_(model.created_at, model.id)
+
+
+async def count_pending(db: AsyncSession, pending_stmt: Select) -> int:
+    """COUNT of a pending-fragment query (joins and filters kept, no rows loaded)."""
+    return await db.scalar(pending_stmt.with_only_columns(func.count()).order_by(None)) or 0
+
+
+async def load_decision_page(
+    db: AsyncSession,
+    model,
+    pending_stmt: Select,
+    after: Optional[Any] = None,
+    before: Optional[Any] = None,
+    limit: int = 1,
+    options: Sequence = (),
+) -> DecisionPage:
+    """
+    Fetch up to `limit` pending fragments in (created_at, id) order.
+
+    pending_stmt selects `model` with the scope and NEEDS_DECISION filters
+    applied. `after` / `before` are fragment ids; with neither, the page starts
+    at the oldest pending decision. An unknown cursor also starts from the top.
+    """
+    limit = max(1, min(limit, MAX_DECISION_PAGE))
+    key = _sort_key(model)
+
+    anchor = None
+    cursor = after if after is not None else before
+    if cursor is not None:
+        anchor = (await db.execute(
+            select(model.created_at, model.id).where(model.id == cursor)
+        )).first()
+
+    stmt = pending_stmt.options(*options)
+    if anchor is not None and after is not None:
+        stmt = stmt.where(key > tuple(anchor)).order_by(model.created_at, model.id)
+    elif anchor is not None:
+        stmt = stmt.where(key < tuple(anchor)).order_by(model.created_at.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(model.created_at, model.id)
+
+    items = list((await db.execute(stmt.limit(limit))).scalars().all())
+    if anchor is not None and after is None:
+        items.reverse()
+
+    if items:
+        first_key = tuple_(items[0].created_at, items[0].id)
+        total, before_count = (await db.execute(
+            pending_stmt.with_only_columns(
+                func.count(),
+                func.count().filter(key < first_key),
+            ).order_by(None)
+        )).one()
+        return DecisionPage(items, total, before_count + 1)
+
+    return DecisionPage([], await count_pending(db, pending_stmt), 0)
+
+
+async def load_decision_at(
+    db: AsyncSession,
+    model,
+    pending_stmt: Select,
+    index: int,
+    options: Sequence = (),
+) -> Optional[DecisionPage]:
+    """Single decision by 0-based index (clamped to the last), for index-based clients."""
+    total = await count_pending(db, pending_stmt)
+    if not total:
+        return None
+    index = min(index, total - 1)
+
+    fragment = (await db.execute(
+        pending_stmt.options(*options)
+        .order_by(model.created_at, model.id)
+        .offset(index)
+        .limit(1)
+    )).scalar_one_or_none()
+    if fragment is None:
+        return None
+    return DecisionPage([fragment], total, index + 1)
@@ -0,0 +1,313 @@
+"""
+Evidence Chunking - Map-Reduce Extraction for Long Sources
+
+Both evidence subsystems (strategizer projects and concept analysis) extract
+fragments from pasted sources with one LLM call per source. Sources longer
+than a single prompt's worth of text are split here instead of truncated:
+
+1. chunk_source() cuts the text into token-bounded chunks along section
+   headings and paragraph breaks, with a small overlap so a claim straddling
+   a boundary is seen whole by at least one call.
+2. map_chunks() runs the per-chunk extraction concurrently (bounded).
+3. dedupe_fragments() collapses near-identical fragments from overlapping
+   chunks by hashing their normalised text, merging source_location values.
+
+Token counts are estimated from characters (no tokenizer is installed);
+EVIDENCE_CHARS_PER_TOKEN is deliberately conservative for English prose.
+
+Configuration (env):
+    EVIDENCE_CHUNK_TOKENS            max tokens of source text per chunk (default 3500)
+    EVIDENCE_CHUNK_OVERLAP_TOKENS    overlap carried into the next chunk (default 200)
+    EVIDENCE_EXTRACTION_CONCURRENCY  parallel chunk extractions per source (default 4)
+"""
+
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import unicodedata
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVIDENCE_CHARS_PER_TOKEN = 4
+EVIDENCE_CHUNK_TOKENS = int(os.getenv("EVIDENCE_CHUNK_TOKENS", "3500"))
+EVIDENCE_CHUNK_OVERLAP_TOKENS = int(os.getenv("EVIDENCE_CHUNK_OVERLAP_TOKENS", "200"))
+EVIDENCE_EXTRACTION_CONCURRENCY = int(os.getenv("EVIDENCE_EXTRACTION_CONCURRENCY", "4"))
+
+# Both fragment tables store source_location as String(200)
+SOURCE_LOCATION_MAX_LENGTH = 200
+
+# Markdown headings, "Chapter 3" / "Section 2.1", numbered titles ("4.2 Findings")
+# and short ALL-CAPS lines start a new section.
+_HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S.*"
+    r"|(?:chapter|section|part|appendix)\s+[\w.]+.*"
+    r"|\d+(?:\.\d+)*\.?\s+[A-Z][^.!?]{0,80}"
+    r"|[A-Z][A-Z0-9 ,:&'\-]{2,80})$",
+    re.IGNORECASE,
+)
+_PARAGRAPH_RE = re.compile(r"\S.*?(?=\n[ \t]*\n|\Z)", re.DOTALL)
+_SENTENCE_RE = re.compile(r"[^.!?]+(?:[.!?]+[\"')\]]*\s*|$)")
+
+
+class SourceChunk:
+    """A contiguous slice of a source document, sent to the LLM on its own."""
+
+    def __init__(self, index: int, total: int, start: int, end: int, text: str, section: Optional[str]):
+        self.index = index      # 0-based
+        self.total = total
+        self.start = start      # character offsets into the original source
+        self.end = end
+        self.text = text
+        self.section = section  # heading in force where the chunk's new text begins
+
+    @property
+    def label(self) -> str:
+        """Human-readable position, used in prompts and source_location prefixes."""
+        if self.section:
+            return f"Part {self.index + 1}/{self.total}, {self.section}"
+        return f"Part {self.index + 1}/{self.total}"
+
+
+# =============================================================================
+# CHUNKING
+# =============================================================================
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + EVIDENCE_CHARS_PER_TOKEN - 1) // EVIDENCE_CHARS_PER_TOKEN
+
+
+def _heading_text(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line or len(line) > 100 or not _HEADING_RE.match(line):
+        return None
+    return line.lstrip("#").strip() or None
+
+
+def _split_oversized(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Split one paragraph longer than a chunk on sentence, then whitespace, boundaries."""
+    spans: List[Tuple[int, int]] = []
+    piece_start = start
+    for match in _SENTENCE_RE.finditer(text, start, end):
+        s_start, s_end = match.span()
+        if s_end - piece_start <= max_chars:
+            continue
+        if s_start > piece_start:
+            spans.append((piece_start, s_start))
+            piece_start = s_start
+        # A single sentence longer than a chunk: hard-cut at the last space
+        while s_end - piece_start > max_chars:
+            cut = text.rfind(" ", piece_start + max_chars // 2, piece_start + max_chars)
+            cut = cut + 1 if cut > 0 else piece_start + max_chars
+            spans.append((piece_start, cut))
+            piece_start = cut
+    if piece_start < end:
+        spans.append((piece_start, end))
+    return spans
+
+
+def _blocks(text: str, max_chars: int) -> List[Tuple[int, int, Optional[str], bool]]:
+    """Paragraph blocks as (start, end, section, starts_section)."""
+    blocks = []
+    section = None
+    for match in _PARAGRAPH_RE.finditer(text):
+        start, end = match.span()
+        heading = _heading_text(text[start:end].split("\n", 1)[0])
+        if heading:
+            section = heading
+        spans = [(start, end)] if end - start <= max_chars else _split_oversized(text, start, end, max_chars)
+        for i, (s, e) in enumerate(spans):
+            blocks.append((s, e, section, bool(heading) and i == 0))
+    return blocks
+
+
+def chunk_source(
+    text: str,
+    max_tokens: int = EVIDENCE_CHUNK_TOKENS,
+    overlap_tokens: int = EVIDENCE_CHUNK_OVERLAP_TOKENS,
+) -> List[SourceChunk]:
+    """
+    Split a source into section-aware, overlapping chunks of at most max_tokens.
+
+    Paragraphs are packed greedily. A heading closes the current chunk early
+    once it is half full, so sections aren't split near their start, and a
+    chunk that opens on a heading carries no overlap from the previous one.
+    A source that fits in one chunk comes back as a single chunk, unchanged.
+    """
+    text = text or ""
+    max_chars = max(200, max_tokens * EVIDENCE_CHARS_PER_TOKEN)
+    overlap_chars = min(max(0, overlap_tokens * EVIDENCE_CHARS_PER_TOKEN), max_chars // 4)
+
+    if len(text) <= max_chars:
+        return [SourceChunk(0, 1, 0, len(text), text, None)] if text.strip() else []
+
+    spans: List[Tuple[int, int, Optional[str]]] = []
+    chunk_start = None
+    chunk_end = 0
+    chunk_section = None
+
+    for start, end, section, starts_section in _blocks(text, max_chars):
+        if chunk_start is None:
+            chunk_start, chunk_end, chunk_section = start, end, section
+            continue
+
+        too_big = end - chunk_start > max_chars
+        section_break = starts_section and (chunk_end - chunk_start) >= max_chars // 2
+        if not (too_big or section_break):
+            chunk_end = end
+            continue
+
+        spans.append((chunk_start, chunk_end, chunk_section))
+        next_start = start
+        if not starts_section and overlap_chars:
+            # Back up into the previous chunk, snapped to a word boundary
+            back = max(chunk_start, chunk_end - overlap_chars)
+            space = text.find(" ", back, chunk_end)
+            back = space + 1 if space >= 0 else back
+            if end - back <= max_chars:
+                next_start = back
+        chunk_start, chunk_end, chunk_section = next_start, end, section
+
+    if chunk_start is not None:
+        spans.append((chunk_start, chunk_end, chunk_section))
+
+    return [
+        SourceChunk(i, len(spans), s, e, text[s:e], section)
+        for i, (s, e, section) in enumerate(spans)
+    ]
+
+
+# =============================================================================
+# MAP
+# =============================================================================
+
+async def map_chunks(
+    chunks: List[SourceChunk],
+    extract_chunk: Callable[[SourceChunk], Awaitable[List[Dict]]],
+    concurrency: int = EVIDENCE_EXTRACTION_CONCURRENCY,
+) -> List[Dict]:
+    """
+    Run extract_chunk over every chunk, at most `concurrency` at a time.
+
+    Fragments come back in document order, each tagged with "chunk_index" and,
+    for multi-chunk sources, a source_location prefixed with the chunk label.
+    The first failing chunk cancels the rest and its exception propagates, so
+    a source is never marked extracted with part of its evidence missing.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: SourceChunk) -> List[Dict]:
+        async with semaphore:
+            return await extract_chunk(chunk) or []
+
+    tasks = [asyncio.create_task(run(chunk)) for chunk in chunks]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    fragments = []
+    for chunk, chunk_fragments in zip(chunks, results):
+        for fragment in chunk_fragments:
+            if not isinstance(fragment, dict):
+                continue
+            fragment = dict(fragment)
+            fragment["chunk_index"] = chunk.index
+            if chunk.total > 1:
+                location = fragment.get("source_location")
+                fragment["source_location"] = f"{chunk.label}: {location}" if location else chunk.label
+            fragments.append(fragment)
+
+    if len(chunks) > 1:
+        logger.info(f"Extracted {len(fragments)} raw fragments from {len(chunks)} chunks")
+    return fragments
+
+
+# =============================================================================
+# REDUCE
+# =============================================================================
+
+def normalize_fragment_text(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a fragment's content."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def fragment_fingerprint(text: str) -> str:
+    return hashlib.sha1(normalize_fragment_text(text).encode("utf-8")).hexdigest()
+
+
+def _join_locations(locations: List[str], max_length: int) -> Optional[str]:
+    """'; '-joined locations, cut to max_length with a count of those left out."""
+    joined = ""
+    for i, location in enumerate(locations):
+        candidate = f"{joined}; {location}" if joined else location
+        remaining = len(locations) - i - 1
+        suffix = f" (+{remaining} more)" if remaining else ""
+        if len(candidate) + len(suffix) > max_length:
+            if not joined:
+                return location[:max_length - 1] + "…"
+            return f"{joined} (+{len(locations) - i} more)"
+        joined = candidate
+    return joined or None
+
+
+def dedupe_fragments(fragments: List[Dict], max_location_length: int = SOURCE_LOCATION_MAX_LENGTH) -> List[Dict]:
+    """
+    Collapse fragments whose normalised content is identical.
+
+    The first occurrence wins; later duplicates (typically from chunk overlap,
+    or the same claim repeated in a summary) contribute their source_location,
+    joined with "; " (capped at max_location_length), and their chunk index
+    to "chunks". Empty fragments are dropped.
+    """
+    by_key: Dict[str, Dict] = {}
+    for fragment in fragments:
+        content = (fragment.get("content") or "").strip()
+        key = fragment_fingerprint(content)
+        if not content or key == fragment_fingerprint(""):
+            continue
+
+        existing = by_key.get(key)
+        location = fragment.get("source_location")
+        chunk_index = fragment.pop("chunk_index", None)
+
+        if existing is None:
+            fragment["content"] = content
+            fragment["chunks"] = [chunk_index] if chunk_index is not None else []
+            fragment["_locations"] = [location] if location else []
+            by_key[key] = fragment
+            continue
+
+        if location and location not in existing["_locations"]:
+            existing["_locations"].append(location)
+        if chunk_index is not None and chunk_index not in existing["chunks"]:
+            existing["chunks"].append(chunk_index)
+        for field, value in fragment.items():
+            if value and not existing.get(field):
+                existing[field] = value
+
+    deduped = []
+    for fragment in by_key.values():
+        locations = fragment.pop("_locations")
+        fragment["source_location"] = _join_locations(locations, max_location_length)
+        deduped.append(fragment)
+
+    if len(deduped) < len(fragments):
+        logger.info(f"Deduplicated {len(fragments)} fragments to {len(deduped)}")
+    return deduped
+
+
+async def extract_chunked(
+    source_content: str,
+    extract_chunk: Callable[[SourceChunk], Awaitable[List[Dict]]],
+) -> List[Dict]:
+    """chunk_source -> map_chunks -> dedupe_fragments, for one source."""
+    chunks = chunk_source(source_content)
+    if not chunks:
+        return []
+    return dedupe_fragments(await map_chunks(chunks, extract_chunk))
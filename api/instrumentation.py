@@ -0,0 +1,529 @@
+"""
+Theory Service - Request, DB and LLM Instrumentation
+
+Three sources feed one in-process metrics registry:
+1. InstrumentationMiddleware (ASGI) times every HTTP request per route template.
+2. SQLAlchemy before/after_cursor_execute hooks count and time every statement,
+   attributed to the request that issued it via a context variable. The
+   connection pool reports checkout wait time and saturation.
+3. instrument_llm_client() wraps an Anthropic client so every messages.create /
+   messages.stream call records model, token usage and latency.
+
+Everything is exposed in Prometheus text format on GET /metrics. Requests slower
+than SLOW_REQUEST_SECONDS (disabled when unset) are logged with their query count
+and DB / LLM time breakdown.
+"""
+
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Log requests slower than this many seconds (0 / unset disables the slow log)
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "0") or 0)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LLM_LATENCY_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+# =============================================================================
+# METRICS REGISTRY
+# =============================================================================
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return "\n".join(lines)
+
+
+class Gauge:
+    """Point-in-time value with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, labels: Tuple[str, ...] = (), value: float = 0.0):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        self.inc(labels, -amount)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[labels] = series
+            series[index] += 1
+            series[-1] += value
+
+    def totals(self) -> Tuple[int, float]:
+        """(observation count, sum) across every label set."""
+        with self._lock:
+            count = sum(sum(series[:-1]) for series in self._series.values())
+            total = sum(series[-1] for series in self._series.values())
+        return count, total
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                cumulative += series[len(self.buckets)]
+                inf = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, inf)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """Holds every metric the service exposes on /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency (streaming responses measured to the last byte)",
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_QUERIES = registry.register(Histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+))
+HTTP_REQUEST_DB_SECONDS = registry.register(Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ("method", "route"),
+))
+HTTP_REQUEST_LLM_SECONDS = registry.register(Histogram(
+    "http_request_llm_seconds",
+    "Time spent in LLM calls per HTTP request",
+    ("method", "route"),
+    LLM_LATENCY_BUCKETS,
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+))
+DB_QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Latency of individual SQL statements",
+))
+DB_POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to check out a pooled connection (queueing, connecting and pre-ping)",
+    ("pool",),
+    POOL_WAIT_BUCKETS,
+))
+DB_POOL_CHECKOUT_TIMEOUTS = registry.register(Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT seconds",
+    ("pool",),
+))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "db_pool_connections",
+    "Pool connections by state (checked_out, idle, capacity)",
+    ("pool", "state"),
+))
+DB_POOL_SATURATION = registry.register(Gauge(
+    "db_pool_saturation_ratio",
+    "Checked-out connections as a fraction of pool_size + max_overflow",
+    ("pool",),
+))
+DB_READ_ROUTING = registry.register(Counter(
+    "db_read_sessions_total",
+    "Read-only sessions by target (replica, primary, primary_sticky, primary_fallback)",
+    ("target",),
+))
+DB_REPLICA_LAG = registry.register(Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag at the last health check (-1 when unreachable)",
+    ("replica",),
+))
+LLM_REQUEST_DURATION = registry.register(Histogram(
+    "llm_request_duration_seconds",
+    "Latency of LLM calls",
+    ("model", "call", "status"),
+    LLM_LATENCY_BUCKETS,
+))
+LLM_TOKENS = registry.register(Counter(
+    "llm_tokens_total",
+    "LLM tokens consumed",
+    ("model", "kind"),
+))
+LLM_SCHEDULER_WAIT = registry.register(Histogram(
+    "llm_scheduler_wait_seconds",
+    "Time LLM calls queued for admission (see llm_scheduler)",
+    ("model", "priority"),
+    POOL_WAIT_BUCKETS + (60.0, 120.0, 300.0, 600.0),
+))
+LLM_SCHEDULER_QUEUED = registry.register(Gauge(
+    "llm_scheduler_queued",
+    "LLM calls waiting for admission",
+    ("model", "priority"),
+))
+LLM_RATE_LIMITED = registry.register(Counter(
+    "llm_rate_limited_total",
+    "LLM calls rejected with 429",
+    ("model",),
+))
+LLM_RATE_SCALE = registry.register(Gauge(
+    "llm_rate_scale",
+    "Share of the configured budget the scheduler currently admits (lowered after 429s)",
+    ("model",),
+))
+SINGLE_FLIGHT_COALESCED = registry.register(Counter(
+    "single_flight_coalesced_total",
+    "Calls that joined an identical call already in flight instead of running (see single_flight)",
+    ("scope",),
+))
+
+
+# =============================================================================
+# PER-REQUEST STATS
+# =============================================================================
+
+class RequestStats:
+    """Mutable per-request accumulator shared through a context variable."""
+
+    __slots__ = ("query_count", "db_seconds", "pool_wait_seconds", "llm_calls", "llm_seconds")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats for the request being served in this context, if any."""
+    return _current_stats.get()
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware (safe for SSE / StreamingResponse)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            _current_stats.reset(token)
+            self._record(scope, status_code, elapsed, stats)
+
+    def _record(self, scope, status_code: int, elapsed: float, stats: RequestStats):
+        # Starlette stores the matched route on the scope; use its template so
+        # /projects/1 and /projects/2 share a series.
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        method = scope.get("method", "GET")
+
+        HTTP_REQUEST_DURATION.observe((method, route, str(status_code)), elapsed)
+        HTTP_REQUEST_QUERIES.observe((method, route), stats.query_count)
+        HTTP_REQUEST_DB_SECONDS.observe((method, route), stats.db_seconds)
+        if stats.llm_calls:
+            HTTP_REQUEST_LLM_SECONDS.observe((method, route), stats.llm_seconds)
+
+        if SLOW_REQUEST_SECONDS and elapsed >= SLOW_REQUEST_SECONDS:
+            logger.warning(
+                f"Slow request: {method} {scope.get('path')} (route {route}) -> {status_code} "
+                f"in {elapsed:.3f}s; {stats.query_count} queries / {stats.db_seconds:.3f}s DB "
+                f"({stats.pool_wait_seconds:.3f}s waiting for a connection); "
+                f"{stats.llm_calls} LLM calls / {stats.llm_seconds:.3f}s LLM"
+            )
+
+
+# =============================================================================
+# SQLALCHEMY HOOKS
+# =============================================================================
+
+def instrument_engine(engine, name: str = "primary"):
+    """Count and time every statement executed through an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.observe((), elapsed)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.query_count += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    pool = sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        pool.metrics_name = name
+
+        # Listeners survive engine.dispose() (which recreates the pool), so
+        # always read the engine's current pool.
+        @event.listens_for(pool, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            _record_pool_state(sync_engine.pool)
+
+        @event.listens_for(pool, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            # Fires before the pool's own counters are updated
+            _record_pool_state(sync_engine.pool, returning=1)
+
+        _record_pool_state(pool)
+
+
+def _record_pool_state(pool, returning: int = 0):
+    """Refresh the pool gauges from a QueuePool's counters."""
+    name = getattr(pool, "metrics_name", "primary")
+    checked_out = max(pool.checkedout() - returning, 0)
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    DB_POOL_CONNECTIONS.set((name, "checked_out"), checked_out)
+    DB_POOL_CONNECTIONS.set((name, "idle"), pool.checkedin() + returning)
+    DB_POOL_CONNECTIONS.set((name, "capacity"), capacity)
+    DB_POOL_SATURATION.set((name,), checked_out / capacity if capacity else 0.0)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits."""
+
+    metrics_name = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc((self.metrics_name,))
+            logger.warning(
+                f"Connection pool '{self.metrics_name}' exhausted: {self.checkedout()} checked out, "
+                f"size {self.size()} + overflow {self._max_overflow}"
+            )
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_POOL_CHECKOUT_WAIT.observe((self.metrics_name,), elapsed)
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += elapsed
+
+
+# =============================================================================
+# LLM CLIENT WRAPPING
+# =============================================================================
+
+def record_llm_call(model: str, call: str, status: str, elapsed: float, usage=None):
+    """Record one LLM call's latency and token usage."""
+    LLM_REQUEST_DURATION.observe((model, call, status), elapsed)
+    if usage is not None:
+        for kind in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+            value = getattr(usage, kind, None)
+            if value:
+                LLM_TOKENS.inc((model, kind.replace("_tokens", "")), value)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.llm_calls += 1
+        stats.llm_seconds += elapsed
+
+
+class _InstrumentedStreamManager:
+    """Wraps MessageStreamManager so the whole `with` block is timed."""
+
+    def __init__(self, manager, model: str):
+        self._manager = manager
+        self._model = model
+        self._stream = None
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._stream = self._manager.__enter__()
+        return self._stream
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return self._manager.__exit__(exc_type, exc, tb)
+        finally:
+            usage = None
+            try:
+                usage = self._stream.current_message_snapshot.usage
+            except Exception:
+                pass
+            record_llm_call(
+                self._model, "stream", "error" if exc_type else "ok",
+                time.perf_counter() - self._start, usage
+            )
+
+
+class _InstrumentedMessages:
+    """Proxy for client.messages that records metrics for create() and stream()."""
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    def create(self, *args, **kwargs):
+        model = kwargs.get("model", "unknown")
+        start = time.perf_counter()
+        try:
+            response = self._messages.create(*args, **kwargs)
+        except Exception:
+            record_llm_call(model, "create", "error", time.perf_counter() - start)
+            raise
+        # stream=True returns an iterator without usage; latency is time-to-headers
+        record_llm_call(model, "create", "ok", time.perf_counter() - start, getattr(response, "usage", None))
+        return response
+
+    def stream(self, *args, **kwargs):
+        return _InstrumentedStreamManager(
+            self._messages.stream(*args, **kwargs),
+            kwargs.get("model", "unknown")
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+def instrument_llm_client(client):
+    """Wrap an Anthropic client's messages resource with metrics. Returns the client."""
+    if not isinstance(client.messages, _InstrumentedMessages):
+        client.messages = _InstrumentedMessages(client.messages)
+    return client
+
+
+# =============================================================================
+# /metrics
+# =============================================================================
+
+async def metrics_endpoint(request: Request):
+    """Prometheus text exposition of all registered metrics."""
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,178 @@
+"""
+Process-wide Anthropic Clients
+
+Every LLM caller used to build its own Anthropic client (CoherenceMonitor and
+StrategizerLLM once per request or background task), each with a fresh httpx
+pool, so TLS handshakes and connection setup were paid again and again.
+
+Clients now come from one registry, one client per model tier:
+
+- "sonnet": request-path calls (Q&A, grids, quick scans, evidence extraction)
+- "opus":   long extended-thinking runs (deep coherence, the concept wizard)
+
+Each tier has its own keep-alive pool, so minutes-long Opus streams can't hold
+the connections Sonnet calls are waiting on. Pools speak HTTP/2 when the h2
+package is installed (httpx[http2]), multiplexing concurrent calls over one
+connection; otherwise HTTP/1.1 keep-alive.
+
+The registry is opened in the app lifespan, which can warm each tier's pool
+(one cheap request, in the background, so startup doesn't wait on the
+network), and closed at shutdown next to close_db(). Outside the app (scripts,
+workers) get_llm_client() creates clients on first use.
+
+Every client's calls go through the LLM scheduler (rate-limit budgets and
+priority classes, see llm_scheduler).
+
+The anthropic SDK takes over a second to import, so it's imported when the
+first client is built rather than with this module; with STARTUP_MODE=fast
+the lifespan builds the clients in the background too.
+
+Configuration (env):
+    LLM_HTTP2                    use HTTP/2 if h2 is installed (default true)
+    LLM_POOL_SIZE_SONNET         max connections, sonnet tier (default 20)
+    LLM_POOL_SIZE_OPUS           max connections, opus tier (default 8)
+    LLM_KEEPALIVE_SECONDS        idle connection lifetime (default 120)
+    LLM_WARMUP                   warm the pools at startup (default true)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+import httpx
+
+from .instrumentation import instrument_llm_client
+from .startup import FAST_STARTUP
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() in ("1", "true", "yes")
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "120"))
+LLM_WARMUP = os.getenv("LLM_WARMUP", "true").lower() in ("1", "true", "yes")
+WARMUP_TIMEOUT_SECONDS = 10.0
+
+SONNET = "sonnet"
+OPUS = "opus"
+
+# tier -> max connections
+LLM_POOL_SIZES = {
+    SONNET: int(os.getenv("LLM_POOL_SIZE_SONNET", "20")),
+    OPUS: int(os.getenv("LLM_POOL_SIZE_OPUS", "8")),
+}
+
+
+def tier_for_model(model: str) -> str:
+    """The client tier serving a model id."""
+    return OPUS if "opus" in (model or "").lower() else SONNET
+
+
+class LLMClientRegistry:
+    """One instrumented Anthropic client per tier, created on first use."""
+
+    def __init__(self):
+        self._clients: Dict[str, "Anthropic"] = {}
+        self._http_clients: Dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()  # clients are also requested from worker threads
+
+    def _build(self, tier: str, api_key: str) -> "Anthropic":
+        # Deferred: importing anthropic dominates this module's import time
+        from anthropic import Anthropic, DefaultHttpxClient
+        # Deferred: llm_scheduler imports this module
+        from .llm_scheduler import schedule_llm_client
+
+        max_connections = LLM_POOL_SIZES.get(tier, LLM_POOL_SIZES[SONNET])
+        http_client = DefaultHttpxClient(
+            http2=LLM_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+            ),
+        )
+        self._http_clients[tier] = http_client
+        # Instrumentation inside the scheduler, so latency excludes queueing
+        return schedule_llm_client(instrument_llm_client(Anthropic(api_key=api_key, http_client=http_client)))
+
+    def get(self, tier: str = SONNET) -> "Anthropic":
+        """The tier's shared client. Raises ValueError if ANTHROPIC_API_KEY is unset."""
+        client = self._clients.get(tier)
+        if client is not None:
+            return client
+
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        with self._lock:
+            if tier not in self._clients:
+                self._clients[tier] = self._build(tier, api_key)
+            return self._clients[tier]
+
+    def _warm(self, tier: str):
+        """Open the tier's connection (DNS, TCP, TLS, HTTP/2 preface) with one HEAD."""
+        client = self.get(tier)
+        try:
+            self._http_clients[tier].head(str(client.base_url), timeout=WARMUP_TIMEOUT_SECONDS)
+            logger.info(f"LLM {tier} pool warmed")
+        except httpx.HTTPError as e:
+            logger.warning(f"LLM {tier} pool warm-up failed: {e}")
+
+    async def warm_up(self):
+        await asyncio.gather(*(asyncio.to_thread(self._warm, tier) for tier in LLM_POOL_SIZES))
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            self._http_clients = {}
+        for client in clients.values():
+            client.close()
+
+
+llm_clients = LLMClientRegistry()
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def get_llm_client(tier: str = SONNET) -> "Anthropic":
+    """Shared Anthropic client for a tier (SONNET or OPUS)."""
+    return llm_clients.get(tier)
+
+
+async def _build_in_background():
+    await asyncio.to_thread(lambda: [llm_clients.get(tier) for tier in LLM_POOL_SIZES])
+    if LLM_WARMUP:
+        await llm_clients.warm_up()
+
+
+async def init_llm_clients():
+    """Create the clients at startup and warm their pools in the background."""
+    global _warmup_task
+    if not os.environ.get("ANTHROPIC_API_KEY"):
+        logger.warning("ANTHROPIC_API_KEY not set - LLM clients not initialised")
+        return
+    if not (LLM_HTTP2 and HTTP2_AVAILABLE):
+        logger.info("LLM clients using HTTP/1.1 keep-alive (install httpx[http2] for HTTP/2)")
+    if FAST_STARTUP:
+        # Build the clients (importing anthropic) off the startup path as well
+        _warmup_task = asyncio.create_task(_build_in_background())
+        return
+    for tier in LLM_POOL_SIZES:
+        llm_clients.get(tier)
+    if LLM_WARMUP:
+        _warmup_task = asyncio.create_task(llm_clients.warm_up())
+
+
+async def close_llm_clients():
+    """Close every pooled client connection."""
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    llm_clients.close()
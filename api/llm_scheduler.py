@@ -0,0 +1,599 @@
+"""
+LLM Scheduler - Rate-Limit Budgets and Priority Admission
+
+Background coherence scans, wizard streams, clustering runs and evidence
+extraction all called Anthropic as soon as they were ready. A clustering run
+or a large evidence batch could use up the organisation's per-minute limits,
+and the interactive wizard calls behind it failed with 429s.
+
+Every client from llm_clients is wrapped here, so each messages.create /
+messages.stream call is admitted by the scheduler first:
+
+- Budgets are per model: requests per minute and tokens per minute, as token
+  buckets refilling continuously. A call is charged one request plus an
+  estimate of its input tokens, and reconciled against the usage the API
+  reports once it completes.
+- Calls have a priority class, taken from the caller's context (see
+  llm_priority()): INTERACTIVE (a user waiting on the response, the
+  default), BATCH (user-triggered bulk work: clustering, evidence
+  extraction, deep coherence runs) or BACKGROUND (coherence re-checks,
+  dedup review). Lower classes may only use the part of each bucket above
+  their reserve, so bulk work soaks up spare capacity but leaves headroom for
+  interactive calls.
+- Calls that don't fit queue in priority order. Within a class, the
+  project that has recently used the fewest tokens goes first, so one
+  project's batch can't starve another's.
+- A 429 halves the model's refill rate and pauses admissions for the
+  Retry-After period. Each successful call restores some of the rate. Calls
+  that were rate limited are retried after the pause (the SDK's own retries
+  have already run by then).
+
+Identical messages.create calls in flight at the same time (same model,
+messages and parameters, same priority class) are coalesced by fingerprint
+(see single_flight): the duplicates wait for the first call's response
+instead of being admitted and sent. Streaming calls aren't coalesced here;
+stream_broker attaches duplicate SSE requests to the running stream instead.
+
+The scheduler shapes traffic, it doesn't refuse it: a call that has waited
+its class's maximum is admitted anyway. Calls made on the event-loop thread
+itself (blocking streams iterated in async handlers) can't wait without
+stalling the server, so they are admitted at once and only charged. Async
+code running a call in a thread should use run_llm_call(), which queues on
+the event loop instead of in one of the executor's threads.
+
+Configuration (env):
+    LLM_SCHEDULER_ENABLED             admission control on (default true)
+    LLM_RPM_SONNET / LLM_TPM_SONNET   per-model budgets for sonnet-tier models (default 1000 / 500000)
+    LLM_RPM_OPUS / LLM_TPM_OPUS       per-model budgets for opus-tier models (default 1000 / 500000)
+    LLM_RATE_LIMITS                   per-model overrides, "model=rpm/tpm,..." (default none)
+    LLM_RESERVE_BATCH                 share of each budget batch calls leave free (default 0.2)
+    LLM_RESERVE_BACKGROUND            share of each budget background calls leave free (default 0.4)
+    LLM_INTERACTIVE_MAX_WAIT_SECONDS  longest an interactive call queues (default 15)
+    LLM_BULK_MAX_WAIT_SECONDS         longest a batch or background call queues (default 600)
+    LLM_RATE_LIMIT_RETRIES            retries of a call that got a 429 (default 2)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from .context_packing import count_tokens
+from .instrumentation import LLM_SCHEDULER_WAIT, LLM_SCHEDULER_QUEUED, LLM_RATE_LIMITED, LLM_RATE_SCALE
+from .llm_clients import SONNET, OPUS, tier_for_model
+from .single_flight import SingleFlight, fingerprint
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+
+# Queue order: lower first
+PRIORITY_RANKS = {INTERACTIVE: 0, BATCH: 1, BACKGROUND: 2}
+
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# tier -> (requests per minute, tokens per minute)
+TIER_LIMITS = {
+    SONNET: (int(os.getenv("LLM_RPM_SONNET", "1000")), int(os.getenv("LLM_TPM_SONNET", "500000"))),
+    OPUS: (int(os.getenv("LLM_RPM_OPUS", "1000")), int(os.getenv("LLM_TPM_OPUS", "500000"))),
+}
+
+RESERVES = {
+    INTERACTIVE: 0.0,
+    BATCH: float(os.getenv("LLM_RESERVE_BATCH", "0.2")),
+    BACKGROUND: float(os.getenv("LLM_RESERVE_BACKGROUND", "0.4")),
+}
+
+MAX_WAIT_SECONDS = {
+    INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_MAX_WAIT_SECONDS", "15")),
+    BATCH: float(os.getenv("LLM_BULK_MAX_WAIT_SECONDS", "600")),
+    BACKGROUND: float(os.getenv("LLM_BULK_MAX_WAIT_SECONDS", "600")),
+}
+
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+
+# Adaptive rate after 429s: halve per 429, recover this much per successful call
+MIN_RATE_SCALE = 0.1
+RATE_RECOVERY_STEP = 0.05
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+
+# Per-project token usage halves every this many seconds (fair-share memory)
+USAGE_HALF_LIFE_SECONDS = 60.0
+
+# Async waiters re-check this often (threads are woken by notify instead)
+ASYNC_POLL_SECONDS = 0.25
+
+# Strings longer than this are estimated from their length (count_tokens is a regex pass)
+ESTIMATE_EXACT_CHARS = 50000
+
+
+def _parse_rate_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    limits = {}
+    for entry in value.split(","):
+        if "=" not in entry:
+            continue
+        model, _, budget = entry.partition("=")
+        try:
+            rpm, tpm = (int(part) for part in budget.split("/"))
+        except ValueError:
+            logger.warning(f"Ignoring malformed LLM_RATE_LIMITS entry: {entry!r}")
+            continue
+        limits[model.strip()] = (rpm, tpm)
+    return limits
+
+
+MODEL_LIMITS = _parse_rate_limits(os.getenv("LLM_RATE_LIMITS", ""))
+
+
+# =============================================================================
+# CALLER CONTEXT
+# =============================================================================
+
+# (priority, project) of the calls made in this context; threads started with
+# asyncio.to_thread inherit it
+_llm_context: ContextVar[Tuple[str, Optional[str]]] = ContextVar("llm_context", default=(INTERACTIVE, None))
+
+
+@contextmanager
+def llm_priority(priority: str, project: Optional[str] = None):
+    """
+    Run the LLM calls made inside the block at priority, attributed to project
+    for fair sharing (None keeps the enclosing project).
+    """
+    if priority not in PRIORITY_RANKS:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = _llm_context.set((priority, project if project is not None else _llm_context.get()[1]))
+    try:
+        yield
+    finally:
+        _llm_context.reset(token)
+
+
+def set_llm_priority(priority: str, project: Optional[str] = None):
+    """llm_priority() for the rest of the current task, e.g. at the top of a background task."""
+    if priority not in PRIORITY_RANKS:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    _llm_context.set((priority, project if project is not None else _llm_context.get()[1]))
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _collect_text(value: Any, parts: List[str]):
+    if isinstance(value, str):
+        parts.append(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in ("data", "source"):  # base64 images and documents
+                _collect_text(item, parts)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_text(item, parts)
+
+
+def estimate_input_tokens(kwargs: Dict[str, Any]) -> int:
+    """Estimated input tokens of a messages call (system, messages, tools)."""
+    parts: List[str] = []
+    for key in ("system", "messages", "tools"):
+        _collect_text(kwargs.get(key), parts)
+    return sum(count_tokens(part) if len(part) <= ESTIMATE_EXACT_CHARS else len(part) // 3 for part in parts)
+
+
+def _usage_tokens(usage) -> Optional[int]:
+    if usage is None:
+        return None
+    total = 0
+    for kind in ("input_tokens", "cache_creation_input_tokens", "output_tokens"):
+        total += getattr(usage, kind, None) or 0
+    return total
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a 429's Retry-After header, or None if error isn't a 429."""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+# =============================================================================
+# PER-MODEL LIMITER
+# =============================================================================
+
+class _Bucket:
+    """Token bucket holding up to capacity, refilling at capacity per minute (times scale)."""
+
+    def __init__(self, capacity: int):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+
+    def refill(self, seconds: float, scale: float):
+        self.level = min(self.capacity, self.level + self.capacity / 60.0 * scale * seconds)
+
+    def seconds_until(self, level: float, scale: float) -> float:
+        if self.level >= level:
+            return 0.0
+        return (level - self.level) / (self.capacity / 60.0 * scale)
+
+
+class _Waiter:
+    __slots__ = ("priority", "rank", "project", "cost", "seq")
+
+    def __init__(self, priority: str, project: str, cost: int, seq: int):
+        self.priority = priority
+        self.rank = PRIORITY_RANKS[priority]
+        self.project = project
+        self.cost = cost
+        self.seq = seq
+
+
+class ModelLimiter:
+    """Request and token buckets, queue and adaptive rate for one model."""
+
+    def __init__(self, model: str, rpm: int, tpm: int):
+        self.model = model
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.rate_scale = 1.0
+        self.paused_until = 0.0
+        self.waiters: List[_Waiter] = []
+        self.project_usage: Dict[str, float] = {}
+        self.cond = threading.Condition()
+        self._refilled_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled_at
+        if elapsed <= 0:
+            return
+        self._refilled_at = now
+        self.requests.refill(elapsed, self.rate_scale)
+        self.tokens.refill(elapsed, self.rate_scale)
+        decay = 0.5 ** (elapsed / USAGE_HALF_LIFE_SECONDS)
+        for project, used in list(self.project_usage.items()):
+            if used * decay < 1:
+                del self.project_usage[project]
+            else:
+                self.project_usage[project] = used * decay
+
+    def _head(self) -> _Waiter:
+        return min(self.waiters, key=lambda w: (w.rank, self.project_usage.get(w.project, 0.0), w.seq))
+
+    def _needs(self, waiter: _Waiter) -> Tuple[float, float]:
+        """Bucket levels at which waiter fits, leaving its class's reserve free."""
+        reserve = RESERVES[waiter.priority]
+        # A call larger than the usable share waits for a full bucket instead of forever
+        cost = min(waiter.cost, self.tokens.capacity * (1 - reserve))
+        return 1 + reserve * self.requests.capacity, cost + reserve * self.tokens.capacity
+
+    def _wait_seconds(self, waiter: _Waiter, now: float) -> float:
+        """0 if waiter fits now, else roughly how long until it might."""
+        requests_needed, tokens_needed = self._needs(waiter)
+        return max(
+            self.paused_until - now,
+            self.requests.seconds_until(requests_needed, self.rate_scale),
+            self.tokens.seconds_until(tokens_needed, self.rate_scale),
+            0.0,
+        )
+
+    def _admit(self, waiter: _Waiter):
+        self.requests.level -= 1
+        self.tokens.level = max(self.tokens.level - waiter.cost, -self.tokens.capacity)
+
+
+class Admission:
+    """One admitted call; finish() reconciles its token charge with actual usage."""
+
+    def __init__(self, limiter: Optional[ModelLimiter], project: str, cost: int):
+        self.limiter = limiter
+        self.project = project
+        self.cost = cost
+        self.used = False
+
+    def finish(self, usage=None, error: Optional[Exception] = None) -> Optional[float]:
+        """Record the outcome. Returns the Retry-After pause if the call was rate limited."""
+        limiter = self.limiter
+        if limiter is None:
+            return None
+        retry_after = _retry_after(error) if error is not None else None
+        actual = _usage_tokens(usage)
+        with limiter.cond:
+            if actual is not None:
+                limiter.tokens.level = max(
+                    min(limiter.tokens.level - (actual - self.cost), limiter.tokens.capacity),
+                    -limiter.tokens.capacity,
+                )
+                limiter.project_usage[self.project] = limiter.project_usage.get(self.project, 0.0) + actual
+            if retry_after is not None:
+                limiter.rate_scale = max(MIN_RATE_SCALE, limiter.rate_scale / 2)
+                limiter.paused_until = max(limiter.paused_until, time.monotonic() + retry_after)
+                limiter.requests.level = min(limiter.requests.level, 0.0)
+                limiter.tokens.level = min(limiter.tokens.level, 0.0)
+                LLM_RATE_LIMITED.inc((limiter.model,))
+                logger.warning(
+                    f"LLM rate limited on {limiter.model}: pausing {retry_after:.1f}s, "
+                    f"rate now {limiter.rate_scale:.0%} of budget"
+                )
+            elif error is None and limiter.rate_scale < 1.0:
+                limiter.rate_scale = min(1.0, limiter.rate_scale + RATE_RECOVERY_STEP)
+            LLM_RATE_SCALE.set((limiter.model,), limiter.rate_scale)
+            limiter.cond.notify_all()
+        return retry_after
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class LLMScheduler:
+    """Admission control for every model, created on first use per model."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def limiter(self, model: str) -> ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(model)
+                if limiter is None:
+                    rpm, tpm = MODEL_LIMITS.get(model) or TIER_LIMITS[tier_for_model(model)]
+                    limiter = self._limiters[model] = ModelLimiter(model, rpm, tpm)
+        return limiter
+
+    def _enqueue(self, model: str, cost: int):
+        priority, project = _llm_context.get()
+        project = project or "default"
+        if not LLM_SCHEDULER_ENABLED:
+            return None, _Waiter(priority, project, cost, 0)
+        limiter = self.limiter(model)
+        waiter = _Waiter(priority, project, cost, next(self._seq))
+        with limiter.cond:
+            limiter.waiters.append(waiter)
+        LLM_SCHEDULER_QUEUED.inc((model, priority))
+        return limiter, waiter
+
+    def _poll(self, limiter: ModelLimiter, waiter: _Waiter, force: bool) -> float:
+        """Admit waiter if it's first in line and fits (or force); else seconds to wait. Holds cond."""
+        now = time.monotonic()
+        limiter._refill(now)
+        wait = limiter._wait_seconds(waiter, now) if limiter._head() is waiter else 1.0
+        if wait > 0 and not force:
+            return wait
+        limiter._admit(waiter)
+        return 0.0
+
+    def _dequeue(self, limiter: ModelLimiter, waiter: _Waiter, start: float) -> Admission:
+        with limiter.cond:
+            limiter.waiters.remove(waiter)
+            limiter.cond.notify_all()
+        LLM_SCHEDULER_QUEUED.dec((limiter.model, waiter.priority))
+        waited = time.monotonic() - start
+        LLM_SCHEDULER_WAIT.observe((limiter.model, waiter.priority), waited)
+        if waited >= MAX_WAIT_SECONDS[waiter.priority]:
+            logger.warning(
+                f"{waiter.priority} LLM call on {limiter.model} admitted over budget after {waited:.0f}s"
+            )
+        elif waited >= 1.0:
+            logger.info(
+                f"{waiter.priority} LLM call on {limiter.model} (project {waiter.project}) queued {waited:.1f}s"
+            )
+        return Admission(limiter, waiter.project, waiter.cost)
+
+    def admit(self, model: str, cost: int) -> Admission:
+        """Block the calling thread until a call of cost estimated tokens may start."""
+        limiter, waiter = self._enqueue(model, cost)
+        if limiter is None:
+            return Admission(None, waiter.project, cost)
+        # On the event-loop thread any wait would stall the server: charge and go
+        on_loop = _on_event_loop()
+        start = time.monotonic()
+        deadline = start + MAX_WAIT_SECONDS[waiter.priority]
+        try:
+            with limiter.cond:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    wait = self._poll(limiter, waiter, force=on_loop or remaining <= 0)
+                    if wait <= 0:
+                        break
+                    limiter.cond.wait(min(wait, remaining, 1.0))
+        finally:
+            admission = self._dequeue(limiter, waiter, start)
+        return admission
+
+    async def admit_async(self, model: str, cost: int) -> Admission:
+        """admit() for async callers: queues on the event loop, not in a worker thread."""
+        limiter, waiter = self._enqueue(model, cost)
+        if limiter is None:
+            return Admission(None, waiter.project, cost)
+        start = time.monotonic()
+        deadline = start + MAX_WAIT_SECONDS[waiter.priority]
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                with limiter.cond:
+                    wait = self._poll(limiter, waiter, force=remaining <= 0)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(min(wait, remaining, ASYNC_POLL_SECONDS))
+        finally:
+            admission = self._dequeue(limiter, waiter, start)
+        return admission
+
+    def status(self) -> Dict[str, Any]:
+        """Current budgets, queue lengths and rate scale per model."""
+        status = {}
+        for model, limiter in list(self._limiters.items()):
+            with limiter.cond:
+                limiter._refill(time.monotonic())
+                status[model] = {
+                    "requests_available": round(limiter.requests.level, 1),
+                    "requests_per_minute": int(limiter.requests.capacity),
+                    "tokens_available": int(limiter.tokens.level),
+                    "tokens_per_minute": int(limiter.tokens.capacity),
+                    "rate_scale": round(limiter.rate_scale, 2),
+                    "paused_seconds": round(max(0.0, limiter.paused_until - time.monotonic()), 1),
+                    "queued": {
+                        priority: sum(1 for w in limiter.waiters if w.priority == priority)
+                        for priority in PRIORITY_RANKS
+                    },
+                }
+        return status
+
+
+llm_scheduler = LLMScheduler()
+
+
+# =============================================================================
+# CLIENT WRAPPING
+# =============================================================================
+
+# An admission obtained on the event loop by run_llm_call(), for the call it
+# then makes in a worker thread
+_preadmitted: ContextVar[Optional[Admission]] = ContextVar("llm_preadmitted", default=None)
+
+
+# Coalesces identical non-streaming calls
+llm_flights = SingleFlight("llm")
+
+
+def _flight_key(kwargs: Dict[str, Any]) -> Optional[str]:
+    """Fingerprint of a messages.create call, or None if it can't be shared (streaming)."""
+    if kwargs.get("stream"):
+        return None
+    return fingerprint("messages.create", _llm_context.get()[0], kwargs)
+
+
+def _admit(model: str, cost: int) -> Admission:
+    admission = _preadmitted.get()
+    if admission is not None and not admission.used:
+        admission.used = True
+        return admission
+    return llm_scheduler.admit(model, cost)
+
+
+async def run_llm_call(call, **kwargs):
+    """
+    Run a blocking client call (e.g. client.messages.create) in a worker
+    thread, queueing for admission on the event loop first so a waiting call
+    doesn't hold one of the executor's threads. An identical call already in
+    flight is awaited instead of making another; its response is shared, so
+    treat it as read-only.
+    """
+    async def admitted_call():
+        admission = await llm_scheduler.admit_async(kwargs.get("model", "unknown"), estimate_input_tokens(kwargs))
+        token = _preadmitted.set(admission)
+        try:
+            return await asyncio.to_thread(call, **kwargs)
+        finally:
+            _preadmitted.reset(token)
+
+    key = _flight_key(kwargs)
+    if key is None:
+        return await admitted_call()
+    return await llm_flights.run(key, admitted_call)
+
+
+def _can_retry(attempt: int) -> bool:
+    # Sleeping on the event loop would stall every request
+    return attempt < LLM_RATE_LIMIT_RETRIES and not _on_event_loop()
+
+
+class _ScheduledStreamManager:
+    """Admits the stream when its `with` block is entered (when the request is sent)."""
+
+    def __init__(self, open_manager, model: str, cost: int):
+        self._open_manager = open_manager
+        self._model = model
+        self._cost = cost
+        self._manager = None
+        self._stream = None
+        self._admission: Optional[Admission] = None
+
+    def __enter__(self):
+        for attempt in itertools.count():
+            self._admission = _admit(self._model, self._cost)
+            self._manager = self._open_manager()
+            try:
+                self._stream = self._manager.__enter__()
+                return self._stream
+            except Exception as e:
+                if self._admission.finish(error=e) is None or not _can_retry(attempt):
+                    raise
+                logger.info(f"Retrying rate-limited stream on {self._model}")
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return self._manager.__exit__(exc_type, exc, tb)
+        finally:
+            usage = None
+            try:
+                usage = self._stream.current_message_snapshot.usage
+            except Exception:
+                pass
+            self._admission.finish(usage=usage, error=exc)
+
+
+class _ScheduledMessages:
+    """Proxy for client.messages (and client.beta.messages) admitting each call."""
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    def create(self, *args, **kwargs):
+        key = _flight_key(kwargs)
+        if key is None or args or _preadmitted.get() is not None:
+            # Calls from run_llm_call() were coalesced before admission
+            return self._create(*args, **kwargs)
+        return llm_flights.run_sync(key, lambda: self._create(**kwargs))
+
+    def _create(self, *args, **kwargs):
+        model = kwargs.get("model", "unknown")
+        cost = estimate_input_tokens(kwargs)
+        for attempt in itertools.count():
+            admission = _admit(model, cost)
+            try:
+                response = self._messages.create(*args, **kwargs)
+            except Exception as e:
+                if admission.finish(error=e) is None or not _can_retry(attempt):
+                    raise
+                logger.info(f"Retrying rate-limited call on {model}")
+                continue
+            # stream=True returns an iterator without usage; the estimate stands
+            admission.finish(usage=getattr(response, "usage", None))
+            return response
+
+    def stream(self, *args, **kwargs):
+        return _ScheduledStreamManager(
+            lambda: self._messages.stream(*args, **kwargs),
+            kwargs.get("model", "unknown"),
+            estimate_input_tokens(kwargs),
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+def schedule_llm_client(client):
+    """Put an Anthropic client's messages calls (and beta ones) behind the scheduler. Returns the client."""
+    if not isinstance(client.messages, _ScheduledMessages):
+        client.messages = _ScheduledMessages(client.messages)
+    beta = client.beta
+    if not isinstance(beta.messages, _ScheduledMessages):
+        beta.messages = _ScheduledMessages(beta.messages)
+    return client
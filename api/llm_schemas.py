@@ -0,0 +1,350 @@
+"""
+LLM Output Schemas
+
+Pydantic models for the JSON each LLM operation returns, used by
+structured_output to request (as tool input schemas) and validate it.
+
+Models mirror the structures in the operations' prompts. They require the
+fields consumers rely on, default the rest, and allow extra fields, so prompt
+tweaks that add output keys pass straight through to the UI. Consumers keep
+working with dicts (model_dump()).
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class LLMOutput(BaseModel):
+    """Base for LLM outputs: unknown fields are kept."""
+    model_config = ConfigDict(extra="allow")
+
+
+# =============================================================================
+# STRATEGIZER DOMAIN AND GRIDS (StrategizerLLM)
+# =============================================================================
+
+class SeedConcept(LLMOutput):
+    name: str
+    definition: str = ""
+    why_fundamental: str = ""
+
+
+class SeedDialectic(LLMOutput):
+    name: str
+    pole_a: str = ""
+    pole_b: str = ""
+    why_fundamental: str = ""
+
+
+class DomainBootstrap(LLMOutput):
+    """Submit the proposed domain structure and seed content."""
+    domain_name: str
+    core_question: str
+    success_looks_like: str = ""
+    vocabulary: Dict[str, str] = {}
+    template_base: Optional[str] = None
+    seed_concepts: List[SeedConcept] = []
+    seed_dialectics: List[SeedDialectic] = []
+
+
+class GridSlotFill(LLMOutput):
+    content: str
+    confidence: float = 0.5
+    evidence_notes: Optional[str] = None
+
+
+class GridFill(LLMOutput):
+    """Submit the analysis for each grid slot."""
+    slots: Dict[str, GridSlotFill]
+
+
+class FrictionEvent(LLMOutput):
+    type: str = Field(description="contradiction|gap|uncaptured|tension")
+    description: str
+    slots_involved: List[str] = []
+    severity: str = Field("medium", description="low|medium|high")
+    suggested_resolution: Optional[str] = None
+
+
+class GridFriction(LLMOutput):
+    """Submit the friction found across the grids and the overall coherence."""
+    friction_events: List[FrictionEvent]
+    overall_coherence: float = Field(0.5, ge=0.0, le=1.0)
+    summary: str = ""
+
+
+class GridCompatibility(LLMOutput):
+    """Submit the grid compatibility assessment."""
+    compatible: bool
+    compatibility_score: float = Field(ge=0.0, le=1.0)
+    rationale: str
+    applicable_slots: List[str] = []
+    inapplicable_slots: List[str] = []
+    alternative_grids: List[str] = []
+
+
+class GridToApply(LLMOutput):
+    grid_type: str
+    tier: str = Field("flexible", description="required|flexible")
+    rationale: str = ""
+    auto_fill: bool = False
+
+
+class GridToSkip(LLMOutput):
+    grid_type: str
+    reason: str = ""
+
+
+class GridSelection(LLMOutput):
+    """Submit the grids to apply to the unit and the grids to skip."""
+    grids_to_apply: List[GridToApply]
+    grids_to_skip: List[GridToSkip] = []
+
+
+# =============================================================================
+# STRATEGIZER EVIDENCE (evidence_llm)
+# =============================================================================
+
+class EvidenceFragment(LLMOutput):
+    content: str
+    source_location: Optional[str] = None
+    likely_unit_type: Optional[str] = None
+    likely_unit_name: Optional[str] = None
+    extraction_note: Optional[str] = None
+
+
+class FragmentExtraction(LLMOutput):
+    """Submit the strategic insights extracted from the document."""
+    fragments: List[EvidenceFragment]
+    extraction_summary: Optional[str] = None
+
+
+class FragmentAnalysis(LLMOutput):
+    """Submit how the fragment relates to the unit."""
+    relationship_type: str = Field(description="supports|contradicts|extends|qualifies|new_insight")
+    target_grid_slot: Optional[str] = None
+    confidence: float = Field(ge=0.0, le=1.0)
+    is_ambiguous: bool = False
+    why_needs_decision: Optional[str] = None
+    integration_suggestion: Optional[str] = None
+    alternative_slots: List[str] = []
+
+
+class Interpretation(LLMOutput):
+    key: str
+    title: str
+    strategy: str
+    rationale: str = ""
+    relationship_type: str = "new_insight"
+    target_grid_slot: Optional[str] = None
+    is_recommended: bool = False
+    recommendation_rationale: Optional[str] = None
+
+
+class InterpretationSet(LLMOutput):
+    """Submit the interpretation options for the ambiguous fragment."""
+    interpretations: List[Interpretation]
+    decision_context: str = ""
+
+
+class CommitmentForeclosure(LLMOutput):
+    """Submit what accepting the interpretation commits to and forecloses."""
+    commitment_statement: str
+    foreclosure_statements: List[str] = []
+    risk_level: str = Field("medium", description="low|medium|high")
+    reversibility: str = ""
+
+
+class UnitSuggestion(LLMOutput):
+    """Submit the unit the fragment best matches."""
+    unit_name: Optional[str]
+    confidence: float = Field(ge=0.0, le=1.0)
+    rationale: str = ""
+    alternative_units: List[str] = []
+    should_create_new: bool = False
+    new_unit_suggestion: Optional[Any] = None
+
+
+# =============================================================================
+# CHALLENGE CLUSTERING (clustering)
+# =============================================================================
+
+class ChallengeClusterProposal(LLMOutput):
+    summary: str
+    challenge_ids: List[int]
+    consensus_strength: str = Field("moderate", description="strong|moderate|weak")
+    recommendation: str = Field("human_review", description="accept|reject|human_review")
+    recommendation_rationale: str = ""
+    contradictions_noted: List[str] = []
+
+
+class ChallengeClustering(LLMOutput):
+    """Submit the challenge clusters and overall assessment."""
+    clusters: List[ChallengeClusterProposal]
+    overall_assessment: str = ""
+
+
+class DuplicateConfirmation(LLMOutput):
+    """Submit the indices of the pairs that are the same concept."""
+    duplicates: List[int]
+
+
+# =============================================================================
+# CONCEPT WIZARD
+# =============================================================================
+
+class CuratedAnswerType(LLMOutput):
+    type_key: str
+    label: Optional[str] = None
+    tailored_description: str = ""
+    why_selected: Optional[str] = None
+
+
+class AnswerTypeCuration(LLMOutput):
+    """Submit the answer types selected for the question."""
+    selected_types: List[CuratedAnswerType] = Field(min_length=1)
+    curation_rationale: Optional[str] = None
+
+
+class QuestionCuration(LLMOutput):
+    question_id: Union[str, int]
+    selected_types: List[CuratedAnswerType]
+
+
+class BatchAnswerTypeCuration(LLMOutput):
+    """Submit the answer types selected for each question."""
+    curations: List[QuestionCuration]
+
+
+class GeneratedAnswerOption(LLMOutput):
+    id: str
+    text: str
+    stance: str = ""
+    label: Optional[str] = None
+
+
+class GeneratedAnswerOptions(LLMOutput):
+    """Submit the answer options for the question."""
+    options: List[GeneratedAnswerOption] = Field(min_length=1)
+    guidance: str = "Choose the option that best resonates with your thinking."
+    mutually_exclusive: bool = False
+    exclusivity_reason: Optional[str] = None
+
+
+class CardAnswerOption(LLMOutput):
+    id: str
+    content: str
+    rationale: str = ""
+    confidence: str = Field("medium", description="high|medium|low")
+
+
+class CardAnswerOptions(LLMOutput):
+    """Submit the answer options grounded in the user's notes."""
+    options: List[CardAnswerOption]
+
+
+class GenealogyHypothesis(LLMOutput):
+    id: str
+    type: str
+    name: str
+    connection: str = ""
+    confidence: str = "medium"
+
+
+class GenealogyHypotheses(LLMOutput):
+    """Submit the intellectual genealogy hypotheses."""
+    genealogy_hypotheses: List[GenealogyHypothesis]
+
+
+class QuestionOption(LLMOutput):
+    value: str
+    label: str
+    description: str = ""
+
+
+class FollowUpQuestion(LLMOutput):
+    id: str
+    question: str
+    dimension: str = ""
+    rationale: str = ""
+    options: List[QuestionOption] = []
+
+
+class FollowUpQuestions(LLMOutput):
+    """Submit the follow-up questions."""
+    questions: List[FollowUpQuestion]
+    generation_note: Optional[str] = None
+
+
+class CuratorAllocation(LLMOutput):
+    """Submit the blind-spot analysis and question slot allocation."""
+    total_slots: int = 12
+    category_weights: Dict[str, float] = {}
+    emphasis_rationale: str = ""
+    identified_blind_spots: List[Dict[str, Any]] = []
+    slots: List[Dict[str, Any]]
+    slot_sequence: List[str] = []
+
+
+class SharpenedQuestion(LLMOutput):
+    """Submit the follow-up question."""
+    question: str
+    rationale: str = ""
+    connects_to: str = ""
+
+
+# =============================================================================
+# CONCEPT EVIDENCE (concept_evidence_llm)
+# =============================================================================
+
+class ConceptEvidenceFragment(LLMOutput):
+    content: str
+    source_location: Optional[str] = None
+    likely_dimension: Optional[str] = None
+    extraction_note: Optional[str] = None
+
+
+class ConceptFragmentExtraction(LLMOutput):
+    """Submit the claims and insights extracted from the source."""
+    fragments: List[ConceptEvidenceFragment]
+
+
+class ConceptFragmentAnalysis(LLMOutput):
+    """Submit how the fragment relates to the concept analysis."""
+    relationship_type: str = Field(description="illustrates|deepens|challenges|limits|bridges|inverts")
+    target_operation_name: Optional[str] = None
+    target_item_id: Optional[Union[int, str]] = None
+    confidence: float = Field(ge=0.0, le=1.0)
+    is_ambiguous: bool = False
+    why_needs_decision: Optional[str] = None
+    auto_integration_content: Optional[str] = None
+    auto_integration_item_type: Optional[str] = None
+
+
+class ConceptInterpretation(LLMOutput):
+    key: str
+    title: str
+    strategy: str
+    rationale: str = ""
+    relationship_type: str = "illustrates"
+    target_operation_name: Optional[str] = None
+    is_recommended: bool = False
+    recommendation_rationale: Optional[str] = None
+    structural_changes: List[Dict[str, Any]] = []
+
+
+class ConceptInterpretationSet(LLMOutput):
+    """Submit the interpretations of the ambiguous evidence."""
+    interpretations: List[ConceptInterpretation]
+
+
+class InterpretationCommitment(LLMOutput):
+    key: str
+    commitment_statement: str = ""
+    foreclosure_statements: List[str] = []
+
+
+class InterpretationCommitments(LLMOutput):
+    """Submit the commitment and foreclosure statements for each interpretation."""
+    interpretations: List[InterpretationCommitment]
@@ -0,0 +1,180 @@
+"""
+Request-Scoped Batch Loaders
+
+List endpoints used to hydrate related names one row at a time (a db.get or a
+COUNT per row), so their query count grew with the page size. Loaders coalesce
+those lookups in the spirit of DataLoader:
+
+    async def enrich(ch):
+        resp.concept_term = await loaders.field(Concept.term).load(ch.concept_id)
+        ...
+    responses = await asyncio.gather(*(enrich(ch) for ch in challenges))
+
+Every load() issued while the handler's coroutines run up to their next await
+is collected, then each loader runs one `IN (...)` query for all of its keys.
+Results are memoised for the rest of the request, so repeated ids cost
+nothing. An endpoint that gathers its rows' lookups therefore runs a constant
+number of queries, whatever the page size.
+
+Loaders share the request's session, so batches run one after another (an
+AsyncSession can't run two statements at once); handlers should not query the
+session themselves while loads are outstanding.
+
+Usage: depend on get_loaders (read handlers) and ask it for a loader:
+    loaders.entity(Model)        key -> instance
+    loaders.field(Model.column)  key -> that column's value
+    loaders.count(Model.fk)      key -> number of rows with fk == key (0 if none)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import select, func, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import get_read_db
+
+logger = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """Base loader: memoised futures per key, resolved a batch at a time."""
+
+    default: Any = None
+
+    def __init__(self, loaders: "Loaders"):
+        self._loaders = loaders
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    async def load(self, key: Optional[Hashable]) -> Any:
+        """The value for key (None for a None key, without a query)."""
+        if key is None:
+            return None
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+            self._queue.append(key)
+            self._loaders._schedule()
+        return await future
+
+    async def load_many(self, keys: Iterable[Optional[Hashable]]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def fetch(self, db: AsyncSession, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """One query for all keys; keys missing from the result get `default`."""
+        raise NotImplementedError
+
+    async def _dispatch(self, db: AsyncSession):
+        keys, self._queue = self._queue, []
+        try:
+            values = await self.fetch(db, keys)
+        except Exception as e:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key, self.default))
+
+
+class EntityLoader(BatchLoader):
+    """Instances of a model by primary key."""
+
+    def __init__(self, loaders: "Loaders", model):
+        super().__init__(loaders)
+        self.model = model
+        self.pk = inspect(model).primary_key[0]
+
+    async def fetch(self, db, keys):
+        result = await db.execute(select(self.model).where(self.pk.in_(keys)))
+        return {getattr(obj, self.pk.key): obj for obj in result.scalars()}
+
+
+class FieldLoader(BatchLoader):
+    """One column of a model by primary key, without loading whole rows."""
+
+    def __init__(self, loaders: "Loaders", column):
+        super().__init__(loaders)
+        self.column = column
+        self.pk = inspect(column.class_).primary_key[0]
+
+    async def fetch(self, db, keys):
+        result = await db.execute(select(self.pk, self.column).where(self.pk.in_(keys)))
+        return dict(result.all())
+
+
+class CountLoader(BatchLoader):
+    """Number of rows referencing each key through a foreign-key column."""
+
+    default = 0
+
+    def __init__(self, loaders: "Loaders", column):
+        super().__init__(loaders)
+        self.column = column
+
+    async def fetch(self, db, keys):
+        result = await db.execute(
+            select(self.column, func.count())
+            .where(self.column.in_(keys))
+            .group_by(self.column)
+        )
+        return dict(result.all())
+
+
+class Loaders:
+    """A request's loaders, created on first use and sharing its session."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._loaders: Dict[tuple, BatchLoader] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def entity(self, model) -> EntityLoader:
+        return self._get(("entity", model), lambda: EntityLoader(self, model))
+
+    def field(self, column) -> FieldLoader:
+        return self._get(("field", column.class_, column.key), lambda: FieldLoader(self, column))
+
+    def count(self, column) -> CountLoader:
+        return self._get(("count", column.class_, column.key), lambda: CountLoader(self, column))
+
+    def _get(self, key: tuple, factory) -> BatchLoader:
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = factory()
+        return loader
+
+    def _pending(self) -> int:
+        return sum(len(loader._queue) for loader in self._loaders.values())
+
+    def _schedule(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        try:
+            while True:
+                # Yield until every ready coroutine has reached its load()
+                pending = -1
+                while pending != self._pending():
+                    pending = self._pending()
+                    await asyncio.sleep(0)
+                ready = [loader for loader in self._loaders.values() if loader._queue]
+                if not ready:
+                    return
+                for loader in ready:
+                    await loader._dispatch(self.db)
+        finally:
+            self._task = None
+
+
+async def get_loaders(db: AsyncSession = Depends(get_read_db)) -> Loaders:
+    """Dependency: the request's loaders, on the same session as its get_read_db."""
+    return Loaders(db)
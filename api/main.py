@@ -5,19 +5,39 @@ Provides API for essay-flow to query theory and post challenges.
 """
 
 import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 from contextlib import asynccontextmanager
 
+# First, so the startup profile covers the imports below
+from .startup import (
+    IMPORT_STARTED, include_lazy_router, record_phase, startup_phase, log_startup_report,
+    start_router_preload, stop_router_preload,
+)
+
 from pathlib import Path
 from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, text
+from sqlalchemy import select, func, or_
 from sqlalchemy.orm import selectinload
 
-from .database import get_db, init_db, close_db
+from .database import (
+    get_db, get_read_db, init_db, close_db, async_engine, READ_REPLICAS, DATABASE_URL,
+    ReadYourWritesMiddleware,
+)
+from .instrumentation import InstrumentationMiddleware, instrument_engine, metrics_endpoint
+from .schema_catalogue import init_schema_catalogue
+from .migrations import MigrationError, apply_migrations, migration_status
+from .llm_clients import init_llm_clients, close_llm_clients
+from .llm_scheduler import llm_priority, llm_scheduler, BATCH
+from .loaders import Loaders, get_loaders
+from .concept_dedup import dedupe_on_ingest
+from .stream_broker import router as streams_router, close_stream_broker
 from .models import (
     TheorySource, Concept, Dialectic, Claim, Challenge, Refinement,
     EmergingConcept, EmergingDialectic, ChallengeCluster, ChallengeClusterMember
@@ -45,23 +65,31 @@ from .schemas import (
     ClusterType as ClusterTypeSchema
 )
 
-# Import concept wizard router
-from .concept_wizard import router as wizard_router
-# Import concept relationships router
-from .concept_relationships import router as relationships_router
-# Import concept analysis router (operation-indexed schema)
-from .concept_analysis_router import router as concept_analysis_router
-# Import concept evidence router (evidence integration)
-from .concept_evidence_router import router as concept_evidence_router
-# Import strategizer router
-from .strategizer import router as strategizer_router
+# Blocking Anthropic calls fanned out with asyncio.to_thread (answer options,
+# deep-commitment shards, evidence chunks) share the default executor, whose
+# stock size - min(32, CPUs + 4) - would allow only 5 at once on one CPU.
+LLM_THREAD_POOL_SIZE = int(os.getenv("LLM_THREAD_POOL_SIZE", "32"))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup resources."""
-    await init_db()
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=LLM_THREAD_POOL_SIZE, thread_name_prefix="llm")
+    )
+    with startup_phase("init_db") as phase:
+        if not await init_db():
+            phase["note"] = "schema fingerprint unchanged, create_all skipped"
+    with startup_phase("init_schema_catalogue"):
+        await init_schema_catalogue()
+    with startup_phase("init_llm_clients"):
+        await init_llm_clients()
+    start_router_preload(app)
+    log_startup_report()
     yield
+    await stop_router_preload()
+    await close_stream_broker()
+    await close_llm_clients()
     await close_db()
 
 
@@ -79,18 +107,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Stream-Id"],  # brokered SSE streams, resumable via /streams/{id}
 )
 
-# Include concept wizard router
-app.include_router(wizard_router)
-# Include concept relationships router
-app.include_router(relationships_router)
-# Include concept analysis router (operation-indexed 8D schema)
-app.include_router(concept_analysis_router)
-# Include concept evidence router (evidence integration for 8D analysis)
-app.include_router(concept_evidence_router)
-# Include strategizer router
-app.include_router(strategizer_router)
+# Per-route latency, per-request SQL counts and LLM timings (exposed on /metrics)
+app.add_middleware(InstrumentationMiddleware)
+instrument_engine(async_engine)
+for replica in READ_REPLICAS:
+    instrument_engine(replica.engine, replica.name)
+app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+# Pin a client's reads to the primary briefly after its own writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Routers with heavy imports: included now, or with STARTUP_MODE=fast on the
+# first request under their prefix (see startup.py)
+# Concept wizard
+include_lazy_router(app, ".concept_wizard", "/concepts/wizard")
+# Concept relationships
+include_lazy_router(app, ".concept_relationships", "/concept-relationships")
+# Concept analysis (operation-indexed 8D schema)
+include_lazy_router(app, ".concept_analysis_router", "/concept-analysis")
+# Concept evidence (evidence integration for 8D analysis)
+include_lazy_router(app, ".concept_evidence_router", "/concepts/{concept_id}/evidence")
+# Strategizer
+include_lazy_router(app, ".strategizer", "/api/strategizer")
+# Include brokered SSE streams router (resume/follow from any worker)
+app.include_router(streams_router)
 
 # Mount static files for strategizer UI
 STATIC_DIR = Path(__file__).parent / "strategizer" / "static"
@@ -113,201 +156,64 @@ async def health_check():
 # =============================================================================
 
 @app.post("/admin/migrate")
-async def run_migrations(db: AsyncSession = Depends(get_db)):
-    """Run pending database migrations (adds new columns to existing tables)."""
-    migrations_run = []
-
-    # =========================================================================
-    # EXTERNAL CONCEPTS TABLE
-    # =========================================================================
-    result = await db.execute(text("""
-        SELECT table_name FROM information_schema.tables
-        WHERE table_name = 'external_concepts'
-    """))
-    if not result.fetchone():
-        await db.execute(text("""
-            CREATE TABLE external_concepts (
-                id SERIAL PRIMARY KEY,
-                term VARCHAR(255) NOT NULL,
-                author VARCHAR(255),
-                source_work VARCHAR(500),
-                year INTEGER,
-                brief_definition TEXT,
-                extended_definition TEXT,
-                paradigm VARCHAR(255),
-                research_program VARCHAR(255),
-                disciplinary_home VARCHAR(255),
-                key_claims JSONB,
-                dimensional_analysis JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
-        await db.execute(text("CREATE INDEX idx_external_concepts_term ON external_concepts(term)"))
-        await db.execute(text("CREATE INDEX idx_external_concepts_author ON external_concepts(author)"))
-        await db.execute(text("CREATE INDEX idx_external_concepts_paradigm ON external_concepts(paradigm)"))
-        migrations_run.append("Created external_concepts table")
-
-    # =========================================================================
-    # CONCEPT RELATIONSHIPS TABLE
-    # =========================================================================
-    result = await db.execute(text("""
-        SELECT table_name FROM information_schema.tables
-        WHERE table_name = 'concept_relationships'
-    """))
-    if not result.fetchone():
-        await db.execute(text("""
-            CREATE TABLE concept_relationships (
-                id SERIAL PRIMARY KEY,
-                concept_id INTEGER REFERENCES concepts(id) ON DELETE CASCADE,
-                external_concept_id INTEGER REFERENCES external_concepts(id) ON DELETE CASCADE,
-                related_concept_id INTEGER REFERENCES concepts(id) ON DELETE CASCADE,
-                related_external_concept_id INTEGER REFERENCES external_concepts(id) ON DELETE CASCADE,
-                relationship_type VARCHAR(50) NOT NULL,
-                description TEXT,
-                strength VARCHAR(20),
-                bidirectional BOOLEAN DEFAULT FALSE,
-                sellarsian JSONB,
-                brandomian JSONB,
-                deleuzian JSONB,
-                hacking JSONB,
-                bachelardian JSONB,
-                quinean JSONB,
-                carey JSONB,
-                blumenberg JSONB,
-                canguilhem JSONB,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                CONSTRAINT chk_source_concept CHECK (
-                    (concept_id IS NOT NULL AND external_concept_id IS NULL) OR
-                    (concept_id IS NULL AND external_concept_id IS NOT NULL)
-                ),
-                CONSTRAINT chk_target_concept CHECK (
-                    (related_concept_id IS NOT NULL AND related_external_concept_id IS NULL) OR
-                    (related_concept_id IS NULL AND related_external_concept_id IS NOT NULL)
-                )
-            )
-        """))
-        await db.execute(text("CREATE INDEX idx_concept_relationships_concept ON concept_relationships(concept_id)"))
-        await db.execute(text("CREATE INDEX idx_concept_relationships_external ON concept_relationships(external_concept_id)"))
-        await db.execute(text("CREATE INDEX idx_concept_relationships_related ON concept_relationships(related_concept_id)"))
-        await db.execute(text("CREATE INDEX idx_concept_relationships_related_ext ON concept_relationships(related_external_concept_id)"))
-        await db.execute(text("CREATE INDEX idx_concept_relationships_type ON concept_relationships(relationship_type)"))
-        migrations_run.append("Created concept_relationships table")
-
-    # =========================================================================
-    # LEGACY MIGRATIONS
-    # =========================================================================
-
-    # Check and add source_project_name to challenges
-    result = await db.execute(text("""
-        SELECT column_name FROM information_schema.columns
-        WHERE table_name = 'challenges' AND column_name = 'source_project_name'
-    """))
-    if not result.fetchone():
-        await db.execute(text("ALTER TABLE challenges ADD COLUMN source_project_name VARCHAR(200)"))
-        migrations_run.append("Added source_project_name to challenges")
-
-    # Check and add cluster_group_id to challenges
-    result = await db.execute(text("""
-        SELECT column_name FROM information_schema.columns
-        WHERE table_name = 'challenges' AND column_name = 'cluster_group_id'
-    """))
-    if not result.fetchone():
-        await db.execute(text("ALTER TABLE challenges ADD COLUMN cluster_group_id INTEGER"))
-        migrations_run.append("Added cluster_group_id to challenges")
-
-    # Create index if not exists
-    await db.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_challenges_cluster_group ON challenges(cluster_group_id)
-    """))
-    migrations_run.append("Ensured idx_challenges_cluster_group index exists")
-
-    # Fix evidence_strength column type (VARCHAR -> TEXT for unlimited length)
-    result = await db.execute(text("""
-        SELECT data_type FROM information_schema.columns
-        WHERE table_name = 'emerging_concepts' AND column_name = 'evidence_strength'
-    """))
-    row = result.fetchone()
-    if row and row[0] and row[0] != 'text':
-        await db.execute(text("ALTER TABLE emerging_concepts ALTER COLUMN evidence_strength TYPE TEXT"))
-        await db.execute(text("ALTER TABLE emerging_dialectics ALTER COLUMN evidence_strength TYPE TEXT"))
-        migrations_run.append("Changed evidence_strength column to TEXT")
-
-    # Mark mock data projects with [MOCK] prefix for clarity
-    # Projects 3 and 4 are synthetic test data
-    result = await db.execute(text("""
-        UPDATE challenges
-        SET source_project_name = '[MOCK] ' || source_project_name
-        WHERE source_project_id IN (3, 4)
-          AND source_project_name IS NOT NULL
-          AND source_project_name NOT LIKE '[MOCK]%'
-    """))
-    if result.rowcount > 0:
-        migrations_run.append(f"Marked {result.rowcount} challenges as [MOCK]")
-
-    result = await db.execute(text("""
-        UPDATE emerging_concepts
-        SET source_project_name = '[MOCK] ' || source_project_name
-        WHERE source_project_id IN (3, 4)
-          AND source_project_name IS NOT NULL
-          AND source_project_name NOT LIKE '[MOCK]%'
-    """))
-    if result.rowcount > 0:
-        migrations_run.append(f"Marked {result.rowcount} emerging_concepts as [MOCK]")
-
-    result = await db.execute(text("""
-        UPDATE emerging_dialectics
-        SET source_project_name = '[MOCK] ' || source_project_name
-        WHERE source_project_id IN (3, 4)
-          AND source_project_name IS NOT NULL
-          AND source_project_name NOT LIKE '[MOCK]%'
-    """))
-    if result.rowcount > 0:
-        migrations_run.append(f"Marked {result.rowcount} emerging_dialectics as [MOCK]")
-
-    await db.commit()
+async def run_migrations():
+    """Apply pending db/migrations files and rerun the repeatable steps (the same runner as db/migrate.py at deploy)."""
+    try:
+        run = await asyncio.to_thread(apply_migrations, DATABASE_URL)
+    except MigrationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
     return {
         "status": "success",
-        "migrations_run": migrations_run if migrations_run else ["No migrations needed"]
+        "migrations_run": run.applied if run.applied else ["No migrations needed"],
+        "deferred": run.deferred,
+        "repeated": run.repeated,
     }
 
 
+@app.get("/admin/migrations")
+async def list_migrations():
+    """Every migration with its state: applied, pending, changed or missing."""
+    return await asyncio.to_thread(migration_status, DATABASE_URL)
+
+
+# =============================================================================
+# ADMIN - LLM SCHEDULER
+# =============================================================================
+
+@app.get("/admin/llm-scheduler")
+async def llm_scheduler_status():
+    """Per-model LLM budgets, queued calls by priority and the current rate scale."""
+    return llm_scheduler.status()
+
+
 # =============================================================================
 # THEORY SOURCES
 # =============================================================================
 
 @app.get("/sources", response_model=List[TheorySourceResponse])
-async def list_sources(db: AsyncSession = Depends(get_db)):
+async def list_sources(
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
+):
     """List all theory sources."""
     result = await db.execute(select(TheorySource).order_by(TheorySource.title))
     sources = result.scalars().all()
 
-    responses = []
-    for s in sources:
-        concept_count = await db.scalar(
-            select(func.count(Concept.id)).where(Concept.source_id == s.id)
-        )
-        dialectic_count = await db.scalar(
-            select(func.count(Dialectic.id)).where(Dialectic.source_id == s.id)
-        )
-        claim_count = await db.scalar(
-            select(func.count(Claim.id)).where(Claim.source_id == s.id)
-        )
-
+    async def enrich(s):
         resp = TheorySourceResponse.model_validate(s)
-        resp.concept_count = concept_count or 0
-        resp.dialectic_count = dialectic_count or 0
-        resp.claim_count = claim_count or 0
-        responses.append(resp)
+        resp.concept_count = await loaders.count(Concept.source_id).load(s.id)
+        resp.dialectic_count = await loaders.count(Dialectic.source_id).load(s.id)
+        resp.claim_count = await loaders.count(Claim.source_id).load(s.id)
+        return resp
+
+    responses = await asyncio.gather(*(enrich(s) for s in sources))
 
     return responses
 
 
 @app.get("/sources/{source_id}", response_model=TheorySourceResponse)
-async def get_source(source_id: int, db: AsyncSession = Depends(get_db)):
+async def get_source(source_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific theory source."""
     result = await db.execute(select(TheorySource).where(TheorySource.id == source_id))
     source = result.scalar_one_or_none()
@@ -351,7 +257,8 @@ async def list_concepts(
     category: Optional[str] = None,
     source_id: Optional[int] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """List all concepts, optionally filtered by status, category, source, or search term."""
     query = select(Concept)
@@ -374,32 +281,19 @@ async def list_concepts(
     result = await db.execute(query)
     concepts = result.scalars().all()
 
-    # Build source title cache
-    source_titles = {}
-    source_ids = set(c.source_id for c in concepts if c.source_id)
-    if source_ids:
-        source_result = await db.execute(
-            select(TheorySource).where(TheorySource.id.in_(source_ids))
-        )
-        for s in source_result.scalars():
-            source_titles[s.id] = s.short_name or s.title
-
     # Add challenge counts and source titles
-    responses = []
-    for c in concepts:
-        challenge_count = await db.scalar(
-            select(func.count(Challenge.id)).where(Challenge.concept_id == c.id)
-        )
+    async def enrich(c):
         resp = ConceptResponse.model_validate(c)
-        resp.challenge_count = challenge_count or 0
-        resp.source_title = source_titles.get(c.source_id)
-        responses.append(resp)
+        resp.challenge_count = await loaders.count(Challenge.concept_id).load(c.id)
+        source = await loaders.entity(TheorySource).load(c.source_id)
+        resp.source_title = (source.short_name or source.title) if source else None
+        return resp
 
-    return responses
+    return await asyncio.gather(*(enrich(c) for c in concepts))
 
 
 @app.get("/concepts/{concept_id}", response_model=ConceptResponse)
-async def get_concept(concept_id: int, db: AsyncSession = Depends(get_db)):
+async def get_concept(concept_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific concept."""
     result = await db.execute(select(Concept).where(Concept.id == concept_id))
     concept = result.scalar_one_or_none()
@@ -465,7 +359,8 @@ async def list_dialectics(
     status: Optional[DialecticStatus] = None,
     category: Optional[str] = None,
     source_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """List all dialectics, optionally filtered by status, category, or source."""
     query = select(Dialectic)
@@ -481,31 +376,18 @@ async def list_dialectics(
     result = await db.execute(query)
     dialectics = result.scalars().all()
 
-    # Build source title cache
-    source_titles = {}
-    source_ids = set(d.source_id for d in dialectics if d.source_id)
-    if source_ids:
-        source_result = await db.execute(
-            select(TheorySource).where(TheorySource.id.in_(source_ids))
-        )
-        for s in source_result.scalars():
-            source_titles[s.id] = s.short_name or s.title
-
-    responses = []
-    for d in dialectics:
-        challenge_count = await db.scalar(
-            select(func.count(Challenge.id)).where(Challenge.dialectic_id == d.id)
-        )
+    async def enrich(d):
         resp = DialecticResponse.model_validate(d)
-        resp.challenge_count = challenge_count or 0
-        resp.source_title = source_titles.get(d.source_id)
-        responses.append(resp)
+        resp.challenge_count = await loaders.count(Challenge.dialectic_id).load(d.id)
+        source = await loaders.entity(TheorySource).load(d.source_id)
+        resp.source_title = (source.short_name or source.title) if source else None
+        return resp
 
-    return responses
+    return await asyncio.gather(*(enrich(d) for d in dialectics))
 
 
 @app.get("/dialectics/{dialectic_id}", response_model=DialecticResponse)
-async def get_dialectic(dialectic_id: int, db: AsyncSession = Depends(get_db)):
+async def get_dialectic(dialectic_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific dialectic."""
     result = await db.execute(select(Dialectic).where(Dialectic.id == dialectic_id))
     dialectic = result.scalar_one_or_none()
@@ -559,7 +441,7 @@ async def list_claims(
     active_only: bool = True,
     category: Optional[str] = None,
     source_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all claims, optionally filtered by active status, category, or source."""
     query = select(Claim)
@@ -635,7 +517,8 @@ async def list_challenges(
     concept_id: Optional[int] = None,
     dialectic_id: Optional[int] = None,
     limit: int = Query(default=50, le=200),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """List challenges, optionally filtered."""
     query = select(Challenge)
@@ -654,28 +537,16 @@ async def list_challenges(
     challenges = result.scalars().all()
 
     # Enrich with related entity names
-    responses = []
-    for ch in challenges:
+    async def enrich(ch):
         resp = ChallengeResponse.model_validate(ch)
+        resp.concept_term = await loaders.field(Concept.term).load(ch.concept_id)
+        resp.dialectic_name = await loaders.field(Dialectic.name).load(ch.dialectic_id)
+        statement = await loaders.field(Claim.statement).load(ch.claim_id)
+        if statement:
+            resp.claim_statement = statement[:100] + "..." if len(statement) > 100 else statement
+        return resp
 
-        if ch.concept_id:
-            concept = await db.get(Concept, ch.concept_id)
-            if concept:
-                resp.concept_term = concept.term
-
-        if ch.dialectic_id:
-            dialectic = await db.get(Dialectic, ch.dialectic_id)
-            if dialectic:
-                resp.dialectic_name = dialectic.name
-
-        if ch.claim_id:
-            claim = await db.get(Claim, ch.claim_id)
-            if claim:
-                resp.claim_statement = claim.statement[:100] + "..." if len(claim.statement) > 100 else claim.statement
-
-        responses.append(resp)
-
-    return responses
+    return await asyncio.gather(*(enrich(ch) for ch in challenges))
 
 
 @app.post("/challenges", response_model=ChallengeResponse, status_code=201)
@@ -773,7 +644,7 @@ async def review_challenge(
 async def sync_theory(
     include_inactive: bool = False,
     source_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get complete theory state for essay-flow to sync.
@@ -856,7 +727,7 @@ async def sync_theory(
 # =============================================================================
 
 @app.get("/stats")
-async def get_stats(db: AsyncSession = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
     """Get theory statistics."""
     concept_count = await db.scalar(select(func.count(Concept.id)))
     dialectic_count = await db.scalar(select(func.count(Dialectic.id)))
@@ -883,7 +754,7 @@ async def list_emerging_concepts(
     source_project_id: Optional[int] = None,
     cluster_group_id: Optional[int] = None,
     limit: int = Query(default=50, le=200),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List emerging concepts, optionally filtered."""
     query = select(EmergingConcept)
@@ -917,7 +788,7 @@ async def list_emerging_concepts(
 
 
 @app.get("/emerging-concepts/{ec_id}", response_model=EmergingConceptResponse)
-async def get_emerging_concept(ec_id: int, db: AsyncSession = Depends(get_db)):
+async def get_emerging_concept(ec_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific emerging concept."""
     result = await db.execute(select(EmergingConcept).where(EmergingConcept.id == ec_id))
     ec = result.scalar_one_or_none()
@@ -945,6 +816,8 @@ async def create_emerging_concept(
     db.add(ec)
     await db.commit()
     await db.refresh(ec)
+    # Cluster it now if it duplicates an existing or proposed concept
+    await dedupe_on_ingest(db, [ec])
     return EmergingConceptResponse.model_validate(ec)
 
 
@@ -954,19 +827,15 @@ async def create_emerging_concepts_bulk(
     db: AsyncSession = Depends(get_db)
 ):
     """Bulk create emerging concepts."""
-    created_ids = []
-
-    for ec_data in data.emerging_concepts:
-        ec = EmergingConcept(**ec_data.model_dump())
-        db.add(ec)
-        await db.flush()
-        created_ids.append(ec.id)
-
+    created = [EmergingConcept(**ec_data.model_dump()) for ec_data in data.emerging_concepts]
+    db.add_all(created)
     await db.commit()
 
+    await dedupe_on_ingest(db, created)
+
     return BulkEmergingConceptResponse(
-        created_count=len(created_ids),
-        emerging_concept_ids=created_ids
+        created_count=len(created),
+        emerging_concept_ids=[ec.id for ec in created]
     )
 
 
@@ -1020,7 +889,8 @@ async def list_emerging_dialectics(
     source_project_id: Optional[int] = None,
     cluster_group_id: Optional[int] = None,
     limit: int = Query(default=50, le=200),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """List emerging dialectics, optionally filtered."""
     query = select(EmergingDialectic)
@@ -1037,23 +907,18 @@ async def list_emerging_dialectics(
     emerging = result.scalars().all()
 
     # Enrich with related dialectic names
-    responses = []
-    for ed in emerging:
+    async def enrich(ed):
         resp = EmergingDialecticResponse.model_validate(ed)
-
         if ed.related_dialectic_ids:
-            related_result = await db.execute(
-                select(Dialectic.name).where(Dialectic.id.in_(ed.related_dialectic_ids))
-            )
-            resp.related_dialectic_names = [r[0] for r in related_result.fetchall()]
+            names = await loaders.field(Dialectic.name).load_many(ed.related_dialectic_ids)
+            resp.related_dialectic_names = [name for name in names if name is not None]
+        return resp
 
-        responses.append(resp)
-
-    return responses
+    return await asyncio.gather(*(enrich(ed) for ed in emerging))
 
 
 @app.get("/emerging-dialectics/{ed_id}", response_model=EmergingDialecticResponse)
-async def get_emerging_dialectic(ed_id: int, db: AsyncSession = Depends(get_db)):
+async def get_emerging_dialectic(ed_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific emerging dialectic."""
     result = await db.execute(select(EmergingDialectic).where(EmergingDialectic.id == ed_id))
     ed = result.scalar_one_or_none()
@@ -1160,7 +1025,8 @@ async def list_challenge_clusters(
     target_concept_id: Optional[int] = None,
     target_dialectic_id: Optional[int] = None,
     limit: int = Query(default=50, le=200),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """List challenge clusters, optionally filtered."""
     # Eagerly load members and their nested relationships
@@ -1183,31 +1049,22 @@ async def list_challenge_clusters(
     result = await db.execute(query)
     clusters = result.scalars().all()
 
-    responses = []
-    for cluster in clusters:
+    async def enrich(cluster):
         resp = ChallengeClusterResponse.model_validate(cluster)
-
         # Get target entity names
-        if cluster.target_concept_id:
-            concept = await db.get(Concept, cluster.target_concept_id)
-            if concept:
-                resp.target_concept_term = concept.term
-
-        if cluster.target_dialectic_id:
-            dialectic = await db.get(Dialectic, cluster.target_dialectic_id)
-            if dialectic:
-                resp.target_dialectic_name = dialectic.name
+        resp.target_concept_term = await loaders.field(Concept.term).load(cluster.target_concept_id)
+        resp.target_dialectic_name = await loaders.field(Dialectic.name).load(cluster.target_dialectic_id)
+        return resp
 
-        responses.append(resp)
-
-    return responses
+    return await asyncio.gather(*(enrich(cluster) for cluster in clusters))
 
 
 @app.get("/challenge-clusters/{cluster_id}", response_model=ChallengeClusterResponse)
 async def get_challenge_cluster(
     cluster_id: int,
     include_members: bool = True,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Get a specific challenge cluster with optional members."""
     result = await db.execute(
@@ -1226,45 +1083,20 @@ async def get_challenge_cluster(
     resp = ChallengeClusterResponse.model_validate(cluster)
 
     # Get target entity names
-    if cluster.target_concept_id:
-        concept = await db.get(Concept, cluster.target_concept_id)
-        if concept:
-            resp.target_concept_term = concept.term
-
-    if cluster.target_dialectic_id:
-        dialectic = await db.get(Dialectic, cluster.target_dialectic_id)
-        if dialectic:
-            resp.target_dialectic_name = dialectic.name
+    resp.target_concept_term = await loaders.field(Concept.term).load(cluster.target_concept_id)
+    resp.target_dialectic_name = await loaders.field(Dialectic.name).load(cluster.target_dialectic_id)
 
-    # Load members if requested
+    # Members and their referenced entities were loaded with the cluster
     if include_members:
-        members_result = await db.execute(
-            select(ChallengeClusterMember).where(
-                ChallengeClusterMember.cluster_id == cluster_id
-            )
-        )
-        members = members_result.scalars().all()
-
         member_responses = []
-        for member in members:
+        for member in cluster.members:
             member_resp = ChallengeClusterMemberResponse.model_validate(member)
-
-            # Load the referenced entity
-            if member.challenge_id:
-                challenge = await db.get(Challenge, member.challenge_id)
-                if challenge:
-                    member_resp.challenge = ChallengeResponse.model_validate(challenge)
-
-            if member.emerging_concept_id:
-                ec = await db.get(EmergingConcept, member.emerging_concept_id)
-                if ec:
-                    member_resp.emerging_concept = EmergingConceptResponse.model_validate(ec)
-
-            if member.emerging_dialectic_id:
-                ed = await db.get(EmergingDialectic, member.emerging_dialectic_id)
-                if ed:
-                    member_resp.emerging_dialectic = EmergingDialecticResponse.model_validate(ed)
-
+            if member.challenge:
+                member_resp.challenge = ChallengeResponse.model_validate(member.challenge)
+            if member.emerging_concept:
+                member_resp.emerging_concept = EmergingConceptResponse.model_validate(member.emerging_concept)
+            if member.emerging_dialectic:
+                member_resp.emerging_dialectic = EmergingDialecticResponse.model_validate(member.emerging_dialectic)
             member_responses.append(member_resp)
 
         resp.members = member_responses
@@ -1369,7 +1201,8 @@ async def trigger_clustering(
 
     start_time = datetime.utcnow()
 
-    result = await run_full_clustering(db)
+    with llm_priority(BATCH, project="clustering"):
+        result = await run_full_clustering(db)
 
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -1384,7 +1217,7 @@ async def trigger_clustering(
 
 
 @app.get("/challenges/dashboard", response_model=ChallengeDashboardStats)
-async def get_challenge_dashboard(db: AsyncSession = Depends(get_db)):
+async def get_challenge_dashboard(db: AsyncSession = Depends(get_read_db)):
     """Get challenge dashboard statistics."""
     # Count challenges by type (concept vs dialectic)
     concept_impacts = await db.scalar(
@@ -1439,3 +1272,7 @@ async def get_challenge_dashboard(db: AsyncSession = Depends(get_db)):
         resolved_this_week=resolved_this_week or 0,
         source_projects=source_projects
     )
+
+
+# Everything above is module import time; reported once startup completes
+record_phase("import api.main", time.perf_counter() - IMPORT_STARTED)
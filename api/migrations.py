@@ -0,0 +1,486 @@
+"""
+Migrations - Versioned SQL Migrations with a Ledger
+
+db/migrate.py used to execute every file in db/migrations on each deploy,
+relying on each one to be idempotent, and /admin/migrate probed
+information_schema table by table and column by column before issuing its
+own DDL. Every deploy paid for the whole history, and two deployers starting
+at once could run the same DDL concurrently.
+
+Migrations are now applied once and recorded:
+
+- The schema_migrations ledger holds each applied migration's version (the
+  numeric filename prefix), name, checksum and timing. Only files without a
+  ledger row run. Editing a file that has already been applied is an error
+  rather than a silent divergence (--accept-checksums records the new
+  checksum without running it again).
+- A session-level advisory lock serialises runners: a second deployer waits
+  for the first and then finds nothing pending.
+- Each migration runs in its own transaction together with its ledger row,
+  with lock_timeout set so DDL waiting behind a long query fails instead of
+  queueing every write behind it.
+
+Directives, as comment lines anywhere in a migration file:
+
+    -- migrate:no-transaction
+        Run statement by statement in autocommit, for CREATE INDEX CONCURRENTLY
+        (and DROP INDEX CONCURRENTLY), which Postgres refuses inside a
+        transaction. An index left INVALID by an interrupted concurrent build
+        is dropped before the build is retried. Statements have to be safe to
+        re-run (IF NOT EXISTS), since a failure leaves the earlier ones applied.
+    -- migrate:requires-table <table> [<table> ...]
+        Defer the migration while any of the tables doesn't exist yet. Tables
+        the app creates itself (create_all) don't exist on a fresh database
+        before the first boot; the migration then runs on the next deploy.
+
+Repeatable steps, db/migrations/repeatable/<name>.sql, are idempotent data
+fixes that have to keep applying to rows written after a deploy (e.g. the
+[MOCK] labels on items from the synthetic projects). They aren't ledgered:
+every run executes them, each in one transaction, after the pending
+migrations. Only the requires-table directive applies to them.
+
+Configuration (env):
+    MIGRATION_LOCK_WAIT_SECONDS  how long to wait for another runner's advisory lock (default 300)
+    MIGRATION_LOCK_TIMEOUT       Postgres lock_timeout for migration statements, "0" = none (default 30s)
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_WAIT_SECONDS = float(os.getenv("MIGRATION_LOCK_WAIT_SECONDS", "300"))
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "30s")
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "db" / "migrations"
+REPEATABLE_SUBDIR = "repeatable"
+
+# pg_advisory_lock key shared by every runner (any fixed bigint would do)
+MIGRATION_LOCK_KEY = 0x7468656F72790001
+
+_FILENAME_RE = re.compile(r"^(\d+)_[\w-]+\.sql$")
+_DIRECTIVE_RE = re.compile(r"^--\s*migrate:([\w-]+)[ \t]*(.*)$", re.MULTILINE)
+_CONCURRENT_INDEX_RE = re.compile(
+    r"^(?:\s|--[^\n]*(?:\n|$)|/\*.*?\*/)*"  # leading whitespace and comments
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\"[^\"]+\"|[\w.]+)",
+    re.IGNORECASE | re.DOTALL,
+)
+_DOLLAR_TAG_RE = re.compile(r"\$(?:[A-Za-z_]\w*)?\$")
+
+LEDGER_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(50) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    execution_ms INTEGER
+)
+"""
+
+
+class MigrationError(Exception):
+    """A migration failed, or the files and the ledger disagree."""
+
+
+# =============================================================================
+# MIGRATION FILES
+# =============================================================================
+
+class Migration:
+    """One db/migrations/NNN_name.sql file."""
+
+    def __init__(self, path: Path):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise MigrationError(f"{path.name}: migration files are named NNN_description.sql")
+        self.path = path
+        self.name = path.name
+        self.version = match.group(1)
+        # Line endings depend on the checkout; the checksum shouldn't
+        self.sql = path.read_bytes().decode("utf-8").replace("\r\n", "\n")
+        self.checksum = hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+        self.transactional, self.required_tables = _parse_directives(self.name, self.sql)
+
+    def __repr__(self):
+        return f"<Migration {self.name}>"
+
+
+class RepeatableStep:
+    """One db/migrations/repeatable/name.sql file, run on every apply."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = f"{REPEATABLE_SUBDIR}/{path.name}"
+        self.sql = path.read_bytes().decode("utf-8").replace("\r\n", "\n")
+        transactional, self.required_tables = _parse_directives(self.name, self.sql)
+        if not transactional:
+            raise MigrationError(f"{self.name}: repeatable steps always run in a transaction")
+
+    def __repr__(self):
+        return f"<RepeatableStep {self.name}>"
+
+
+def _parse_directives(name: str, sql: str) -> Tuple[bool, List[str]]:
+    """(transactional, required tables) from a file's migrate: directives."""
+    transactional = True
+    required_tables: List[str] = []
+    for directive, args in _DIRECTIVE_RE.findall(sql):
+        if directive == "no-transaction":
+            transactional = False
+        elif directive == "requires-table":
+            required_tables.extend(args.split())
+        else:
+            raise MigrationError(f"{name}: unknown directive migrate:{directive}")
+    return transactional, required_tables
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migration files in version order; versions must be unique."""
+    migrations = sorted(
+        (Migration(path) for path in directory.glob("*.sql")),
+        key=lambda m: (int(m.version), m.name),
+    )
+    seen: Dict[str, str] = {}
+    for migration in migrations:
+        if migration.version in seen:
+            raise MigrationError(
+                f"{migration.name} and {seen[migration.version]} share version {migration.version}"
+            )
+        seen[migration.version] = migration.name
+    return migrations
+
+
+def discover_repeatable_steps(directory: Path = MIGRATIONS_DIR) -> List[RepeatableStep]:
+    """Repeatable steps in name order."""
+    return [RepeatableStep(path) for path in sorted((directory / REPEATABLE_SUBDIR).glob("*.sql"))]
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Split a script into statements at top-level semicolons, skipping those in
+    quotes, dollar-quoted bodies and comments. Comment-only chunks are dropped.
+    """
+    statements = []
+    start = i = 0
+    has_code = False
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch == "-" and sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end < 0 else end + 1
+            continue
+        if ch == "/" and sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if ch in ("'", '"'):
+            # A doubled quote is an escaped quote; scanning on handles it
+            end = sql.find(ch, i + 1)
+            i = n if end < 0 else end + 1
+            has_code = True
+            continue
+        if ch == "$":
+            tag = _DOLLAR_TAG_RE.match(sql, i)
+            if tag:
+                end = sql.find(tag.group(0), tag.end())
+                i = n if end < 0 else end + len(tag.group(0))
+                has_code = True
+                continue
+        if ch == ";":
+            if has_code:
+                statements.append(sql[start:i].strip())
+            start = i + 1
+            has_code = False
+        elif not ch.isspace():
+            has_code = True
+        i += 1
+    if has_code:
+        statements.append(sql[start:].strip())
+    return statements
+
+
+# =============================================================================
+# LEDGER AND LOCKING
+# =============================================================================
+
+def _connect(database_url: str) -> "psycopg2.extensions.connection":
+    # Lazy: the web process only needs psycopg2 when /admin/migrate is called
+    import psycopg2
+
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
+    return conn
+
+
+def _acquire_lock(cur):
+    deadline = time.monotonic() + MIGRATION_LOCK_WAIT_SECONDS
+    waiting_logged = False
+    while True:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        if cur.fetchone()[0]:
+            return
+        if time.monotonic() >= deadline:
+            raise MigrationError(
+                f"Another migration runner held the lock for over {MIGRATION_LOCK_WAIT_SECONDS:.0f}s"
+            )
+        if not waiting_logged:
+            logger.info("Waiting for another migration runner to finish")
+            waiting_logged = True
+        time.sleep(1)
+
+
+def _release_lock(cur):
+    cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+
+
+def _applied(cur) -> Dict[str, dict]:
+    cur.execute("SELECT version, name, checksum, applied_at, execution_ms FROM schema_migrations")
+    return {
+        row[0]: {"name": row[1], "checksum": row[2], "applied_at": row[3], "execution_ms": row[4]}
+        for row in cur.fetchall()
+    }
+
+
+def _missing_tables(cur, tables: List[str]) -> List[str]:
+    missing = []
+    for table in tables:
+        cur.execute("SELECT to_regclass(%s)", (table,))
+        if cur.fetchone()[0] is None:
+            missing.append(table)
+    return missing
+
+
+def _set_lock_timeout(cur, local: bool):
+    if MIGRATION_LOCK_TIMEOUT not in ("", "0"):
+        cur.execute(f"SET {'LOCAL ' if local else ''}lock_timeout = %s", (MIGRATION_LOCK_TIMEOUT,))
+
+
+def _record(cur, migration: Migration, elapsed_ms: int):
+    cur.execute(
+        """
+        INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+        VALUES (%s, %s, %s, %s)
+        """,
+        (migration.version, migration.name, migration.checksum, elapsed_ms),
+    )
+
+
+# =============================================================================
+# APPLYING
+# =============================================================================
+
+def _apply_transactional(conn, migration: Migration):
+    start = time.perf_counter()
+    conn.autocommit = False
+    try:
+        with conn.cursor() as cur:
+            _set_lock_timeout(cur, local=True)
+            cur.execute(migration.sql)
+            _record(cur, migration, int((time.perf_counter() - start) * 1000))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.autocommit = True
+
+
+def _drop_invalid_index(cur, index: str):
+    """A failed CREATE INDEX CONCURRENTLY leaves an INVALID index that IF NOT EXISTS would keep."""
+    cur.execute(
+        "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (index,)
+    )
+    row = cur.fetchone()
+    if row and row[0]:
+        logger.warning(f"Dropping invalid index {index} left by an interrupted build")
+        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+
+
+def _apply_statements(conn, migration: Migration):
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        _set_lock_timeout(cur, local=False)
+        try:
+            for statement in split_statements(migration.sql):
+                index = _CONCURRENT_INDEX_RE.match(statement)
+                if index:
+                    _drop_invalid_index(cur, index.group(1))
+                cur.execute(statement)
+            _record(cur, migration, int((time.perf_counter() - start) * 1000))
+        finally:
+            cur.execute("RESET lock_timeout")
+
+
+def _apply_repeatable(conn, step: RepeatableStep) -> int:
+    """Run a repeatable step in one transaction; returns the rows its statements changed."""
+    rows = 0
+    conn.autocommit = False
+    try:
+        with conn.cursor() as cur:
+            _set_lock_timeout(cur, local=True)
+            for statement in split_statements(step.sql):
+                cur.execute(statement)
+                rows += max(cur.rowcount, 0)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.autocommit = True
+    return rows
+
+
+class MigrationRun:
+    """What apply_migrations did: migrations applied, deferred and accepted, repeatable steps run."""
+
+    def __init__(self):
+        self.applied: List[str] = []
+        self.deferred: Dict[str, List[str]] = {}  # name -> missing tables
+        self.accepted: List[str] = []
+        self.repeated: Dict[str, int] = {}  # repeatable step -> rows changed
+
+    def to_dict(self) -> dict:
+        return {
+            "applied": self.applied, "deferred": self.deferred,
+            "accepted": self.accepted, "repeated": self.repeated,
+        }
+
+
+def apply_migrations(
+    database_url: str,
+    directory: Path = MIGRATIONS_DIR,
+    accept_checksums: bool = False,
+) -> MigrationRun:
+    """
+    Apply pending migrations in version order under the advisory lock, then
+    the repeatable steps. Raises MigrationError if an applied file has changed
+    (unless accept_checksums) or a migration fails; migrations applied before
+    the failure stay applied.
+    """
+    migrations = discover_migrations(directory)
+    repeatable = discover_repeatable_steps(directory)
+    run = MigrationRun()
+    conn = _connect(database_url)
+    try:
+        with conn.cursor() as cur:
+            _acquire_lock(cur)
+            try:
+                cur.execute(LEDGER_DDL)
+                applied = _applied(cur)
+
+                changed = [
+                    m for m in migrations
+                    if m.version in applied and applied[m.version]["checksum"] != m.checksum
+                ]
+                if changed and not accept_checksums:
+                    raise MigrationError(
+                        "Applied migrations were modified: " + ", ".join(m.name for m in changed)
+                        + ". Add a new migration instead, or rerun with --accept-checksums"
+                        " if the change doesn't need to be applied."
+                    )
+                for migration in changed:
+                    cur.execute(
+                        "UPDATE schema_migrations SET name = %s, checksum = %s WHERE version = %s",
+                        (migration.name, migration.checksum, migration.version),
+                    )
+                    run.accepted.append(migration.name)
+
+                on_disk = {m.version for m in migrations}
+                for version, row in sorted(applied.items()):
+                    if version not in on_disk:
+                        logger.warning(f"Applied migration {row['name']} is no longer in {directory}")
+
+                for migration in migrations:
+                    if migration.version in applied:
+                        continue
+                    missing = _missing_tables(cur, migration.required_tables)
+                    if missing:
+                        run.deferred[migration.name] = missing
+                        logger.info(f"Deferred {migration.name}: waiting for {', '.join(missing)}")
+                        continue
+
+                    logger.info(f"Applying {migration.name}")
+                    start = time.perf_counter()
+                    try:
+                        if migration.transactional:
+                            _apply_transactional(conn, migration)
+                        else:
+                            _apply_statements(conn, migration)
+                    except Exception as e:
+                        raise MigrationError(f"{migration.name} failed: {e}") from e
+                    run.applied.append(migration.name)
+                    logger.info(f"Applied {migration.name} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+                for step in repeatable:
+                    missing = _missing_tables(cur, step.required_tables)
+                    if missing:
+                        run.deferred[step.name] = missing
+                        continue
+                    try:
+                        run.repeated[step.name] = _apply_repeatable(conn, step)
+                    except Exception as e:
+                        raise MigrationError(f"{step.name} failed: {e}") from e
+                    if run.repeated[step.name]:
+                        logger.info(f"Ran {step.name}: {run.repeated[step.name]} row(s) changed")
+            finally:
+                if not conn.closed:
+                    _release_lock(cur)
+    finally:
+        conn.close()
+    return run
+
+
+def migration_status(database_url: str, directory: Path = MIGRATIONS_DIR) -> List[dict]:
+    """
+    Every migration on disk or in the ledger with its state: applied, pending,
+    changed (applied, file modified since) or missing (applied, file gone).
+    Repeatable steps are listed last with state "repeat".
+    """
+    migrations = discover_migrations(directory)
+    conn = _connect(database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_migrations')")
+            applied = _applied(cur) if cur.fetchone()[0] is not None else {}
+    finally:
+        conn.close()
+
+    status = []
+    for migration in migrations:
+        row = applied.pop(migration.version, None)
+        if row is None:
+            state = "pending"
+        elif row["checksum"] != migration.checksum:
+            state = "changed"
+        else:
+            state = "applied"
+        status.append({
+            "version": migration.version,
+            "name": migration.name,
+            "state": state,
+            "applied_at": row["applied_at"].isoformat() if row and row["applied_at"] else None,
+            "execution_ms": row["execution_ms"] if row else None,
+        })
+    for version, row in sorted(applied.items()):
+        status.append({
+            "version": version,
+            "name": row["name"],
+            "state": "missing",
+            "applied_at": row["applied_at"].isoformat() if row["applied_at"] else None,
+            "execution_ms": row["execution_ms"],
+        })
+    for step in discover_repeatable_steps(directory):
+        status.append({
+            "version": None, "name": step.name, "state": "repeat", "applied_at": None, "execution_ms": None,
+        })
+    return status
@@ -730,3 +730,45 @@ class ConceptRelationship(Base):
     external_concept = relationship("ExternalConcept", foreign_keys=[external_concept_id], back_populates="relationships_as_source")
     related_concept = relationship("Concept", foreign_keys=[related_concept_id])
     related_external_concept = relationship("ExternalConcept", foreign_keys=[related_external_concept_id])
+
+
+# =============================================================================
+# EVENT STREAMS - SSE event logs shared across workers
+# =============================================================================
+
+class EventStreamStatus(str, enum.Enum):
+    """Status for brokered SSE streams."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class EventStream(Base):
+    """
+    A server-sent event stream produced in the background (e.g. a wizard LLM
+    generation) and readable from any worker via GET /streams/{id}.
+    """
+    __tablename__ = "event_streams"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(100), nullable=False)  # producing endpoint, e.g. "wizard.generate-tensions"
+    status = Column(String(20), nullable=False, default=EventStreamStatus.RUNNING.value)
+    # Fingerprint of kind + request while running, so duplicate requests attach (see stream_broker)
+    flight_key = Column(String(64), index=True)
+
+    # Retained events are first_event_id..last_event_id (older ones are trimmed)
+    first_event_id = Column(Integer, nullable=False, default=1)
+    last_event_id = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now())  # producer liveness
+    finished_at = Column(DateTime(timezone=True), index=True)
+
+
+class EventStreamEvent(Base):
+    """One SSE event (its data payload) in a stream's log."""
+    __tablename__ = "event_stream_events"
+
+    stream_id = Column(String(36), ForeignKey("event_streams.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, primary_key=True)
+    data = Column(Text, nullable=False)
@@ -0,0 +1,302 @@
+"""
+Project Statistics - Aggregate Counts Cached per Project Revision
+
+Progress bars and badges (evidence progress, pending decisions, coherence
+health) used to cost one COUNT per status, repeated by every page and JSON
+endpoint that showed them. Here each entity is counted once, with a single
+GROUP BY / COUNT(*) FILTER (WHERE ...) statement, and the result is cached
+until the project changes:
+
+    evidence_stats(db, project_id)          sources + fragments   (2 statements)
+    coherence_stats(db, project_id)         predicaments          (1 statement)
+    concept_evidence_stats(db, concept_id)  sources + fragments + decisions (3)
+
+Revisions:
+- Every scope (a strategizer project, an analyzed concept) has an in-process
+  revision per kind of statistic, kept by write_tracking.ScopeRevisions:
+  flushing a source, fragment, decision or predicament bumps its scope's
+  revision, both at flush time and again when the transaction ends, so counts
+  read mid-transaction are never served after it commits or rolls back.
+- Bulk UPDATE / DELETE statements, and fragments whose source isn't in the
+  session, can't be attributed to a scope; they bump every scope of that kind.
+- Writes from other processes are picked up after PROJECT_STATS_TTL_SECONDS.
+"""
+
+import os
+import time
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .strategizer.models import (
+    StrategizerEvidenceSource, StrategizerEvidenceFragment, StrategizerPredicament,
+    ExtractionStatus, AnalysisStatus, PredicamentStatus, PredicamentSeverity, PredicamentType,
+)
+from .concept_analysis_models import (
+    ConceptEvidenceSource, ConceptEvidenceFragment, ConceptEvidenceDecision,
+    AnalysisStatus as ConceptAnalysisStatus,
+)
+from .write_tracking import ScopeRevisions
+
+logger = logging.getLogger(__name__)
+
+PROJECT_STATS_TTL_SECONDS = float(os.getenv("PROJECT_STATS_TTL_SECONDS", "30"))
+PROJECT_STATS_CACHE_SIZE = int(os.getenv("PROJECT_STATS_CACHE_SIZE", "1024"))
+
+EVIDENCE = "evidence"
+COHERENCE = "coherence"
+CONCEPT_EVIDENCE = "concept_evidence"
+
+ACTIVE_PREDICAMENT_STATUSES = (PredicamentStatus.DETECTED, PredicamentStatus.ANALYZING)
+
+
+class ProjectStatsCache:
+    """Process-wide cache of statistics, keyed by (kind, scope) and revision."""
+
+    def __init__(self, max_entries: int = PROJECT_STATS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.revisions = ScopeRevisions("project_stats")
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[tuple, float, Any]]" = OrderedDict()
+
+    def revision(self, kind: str, scope: Any) -> tuple:
+        return self.revisions.revision(kind, scope)
+
+    def bump(self, kind: str, scope: Any = None):
+        """Invalidate one scope's statistics, or every scope's when scope is None."""
+        self.revisions.bump(kind, scope)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get(self, kind: str, scope: Any, load: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for this revision, or load() it."""
+        key = (kind, scope)
+        revision = self.revision(kind, scope)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == revision and time.monotonic() - entry[1] < PROJECT_STATS_TTL_SECONDS:
+            self._entries.move_to_end(key)
+            return entry[2]
+
+        value = await load()
+        # Only cache if nothing was written while we were counting
+        if self.revision(kind, scope) == revision:
+            self._entries[key] = (revision, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+project_stats_cache = ProjectStatsCache()
+
+
+# =============================================================================
+# STRATEGIZER EVIDENCE
+# =============================================================================
+
+class EvidenceStats:
+    """Evidence sources and fragments of one strategizer project."""
+
+    def __init__(self, sources_count: int, pending_extraction: int, fragments_by_source: Dict[str, Dict[str, int]]):
+        self.sources_count = sources_count
+        self.pending_extraction = pending_extraction
+        # source_id -> {analysis status value: count}
+        self.fragments_by_source = fragments_by_source
+
+        self.by_status: Counter = Counter()
+        for counts in fragments_by_source.values():
+            self.by_status.update(counts)
+
+    @property
+    def fragments_count(self) -> int:
+        return sum(self.by_status.values())
+
+    @property
+    def pending_analysis(self) -> int:
+        return self.by_status[AnalysisStatus.PENDING.value]
+
+    @property
+    def pending_decisions(self) -> int:
+        return self.by_status[AnalysisStatus.NEEDS_DECISION.value]
+
+    @property
+    def integrated_count(self) -> int:
+        return self.by_status[AnalysisStatus.INTEGRATED.value]
+
+
+async def _load_evidence_stats(db: AsyncSession, project_id: str) -> EvidenceStats:
+    sources_count, pending_extraction = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(StrategizerEvidenceSource.extraction_status == ExtractionStatus.PENDING),
+        ).where(StrategizerEvidenceSource.project_id == project_id)
+    )).one()
+
+    rows = (await db.execute(
+        select(
+            StrategizerEvidenceFragment.source_id,
+            StrategizerEvidenceFragment.analysis_status,
+            func.count(),
+        )
+        .join(StrategizerEvidenceSource)
+        .where(StrategizerEvidenceSource.project_id == project_id)
+        .group_by(StrategizerEvidenceFragment.source_id, StrategizerEvidenceFragment.analysis_status)
+    )).all()
+
+    fragments_by_source: Dict[str, Dict[str, int]] = {}
+    for source_id, status, count in rows:
+        if status is not None:
+            fragments_by_source.setdefault(source_id, {})[status.value] = count
+
+    return EvidenceStats(sources_count, pending_extraction, fragments_by_source)
+
+
+async def evidence_stats(db: AsyncSession, project_id: str) -> EvidenceStats:
+    return await project_stats_cache.get(EVIDENCE, project_id, lambda: _load_evidence_stats(db, project_id))
+
+
+# =============================================================================
+# STRATEGIZER COHERENCE
+# =============================================================================
+
+class CoherenceStats:
+    """Predicament counts of one strategizer project."""
+
+    def __init__(self, counts: Dict[Tuple[str, str, str], int]):
+        # (status, severity, type) values -> count
+        self.by_status = {status.value: 0 for status in PredicamentStatus}
+        self.by_type = {pred_type.value: 0 for pred_type in PredicamentType}
+        # Severity counts cover active predicaments only
+        self.by_severity = {severity.value: 0 for severity in PredicamentSeverity}
+
+        active_statuses = {status.value for status in ACTIVE_PREDICAMENT_STATUSES}
+        for (status, severity, pred_type), count in counts.items():
+            self.by_status[status] = self.by_status.get(status, 0) + count
+            self.by_type[pred_type] = self.by_type.get(pred_type, 0) + count
+            if status in active_statuses and severity is not None:
+                self.by_severity[severity] = self.by_severity.get(severity, 0) + count
+
+    @property
+    def total_predicaments(self) -> int:
+        return sum(self.by_status.values())
+
+    @property
+    def active_predicaments(self) -> int:
+        return sum(self.by_status[status.value] for status in ACTIVE_PREDICAMENT_STATUSES)
+
+    @property
+    def health_indicator(self) -> str:
+        if self.active_predicaments == 0:
+            return "healthy"
+        return "attention" if self.by_severity.get("critical", 0) == 0 else "critical"
+
+
+async def _load_coherence_stats(db: AsyncSession, project_id: str) -> CoherenceStats:
+    rows = (await db.execute(
+        select(
+            StrategizerPredicament.status,
+            StrategizerPredicament.severity,
+            StrategizerPredicament.predicament_type,
+            func.count(),
+        )
+        .where(StrategizerPredicament.project_id == project_id)
+        .group_by(
+            StrategizerPredicament.status,
+            StrategizerPredicament.severity,
+            StrategizerPredicament.predicament_type,
+        )
+    )).all()
+
+    return CoherenceStats({
+        (
+            status.value if status else None,
+            severity.value if severity else None,
+            pred_type.value if pred_type else None,
+        ): count
+        for status, severity, pred_type, count in rows
+    })
+
+
+async def coherence_stats(db: AsyncSession, project_id: str) -> CoherenceStats:
+    return await project_stats_cache.get(COHERENCE, project_id, lambda: _load_coherence_stats(db, project_id))
+
+
+# =============================================================================
+# CONCEPT EVIDENCE
+# =============================================================================
+
+class ConceptEvidenceStats:
+    """Evidence sources, fragments and decisions of one analyzed concept."""
+
+    def __init__(self, total_sources: int, by_status: Dict[str, int], skipped_count: int):
+        self.total_sources = total_sources
+        self.by_status = Counter(by_status)
+        self.skipped_count = skipped_count
+
+    @property
+    def total_fragments(self) -> int:
+        return sum(self.by_status.values())
+
+    @property
+    def auto_integrated_count(self) -> int:
+        return self.by_status[ConceptAnalysisStatus.AUTO_INTEGRATED.value]
+
+    @property
+    def needs_decision_count(self) -> int:
+        return self.by_status[ConceptAnalysisStatus.NEEDS_DECISION.value]
+
+    @property
+    def resolved_count(self) -> int:
+        return self.by_status[ConceptAnalysisStatus.RESOLVED.value]
+
+
+async def _load_concept_evidence_stats(db: AsyncSession, concept_id: int) -> ConceptEvidenceStats:
+    total_sources = await db.scalar(
+        select(func.count()).where(ConceptEvidenceSource.concept_id == concept_id)
+    ) or 0
+
+    rows = (await db.execute(
+        select(ConceptEvidenceFragment.analysis_status, func.count())
+        .join(ConceptEvidenceSource)
+        .where(ConceptEvidenceSource.concept_id == concept_id)
+        .group_by(ConceptEvidenceFragment.analysis_status)
+    )).all()
+
+    skipped_count = await db.scalar(
+        select(func.count()).where(
+            ConceptEvidenceDecision.concept_id == concept_id,
+            ConceptEvidenceDecision.skipped == True
+        )
+    ) or 0
+
+    return ConceptEvidenceStats(
+        total_sources,
+        {status.value if status else None: count for status, count in rows},
+        skipped_count,
+    )
+
+
+async def concept_evidence_stats(db: AsyncSession, concept_id: int) -> ConceptEvidenceStats:
+    return await project_stats_cache.get(
+        CONCEPT_EVIDENCE, concept_id, lambda: _load_concept_evidence_stats(db, concept_id)
+    )
+
+
+# =============================================================================
+# INVALIDATION
+# =============================================================================
+
+# (model, kind, path from the row to its scope id)
+_TRACKED = (
+    (StrategizerEvidenceSource, EVIDENCE, ("project_id",)),
+    (StrategizerEvidenceFragment, EVIDENCE, ("source_id", StrategizerEvidenceSource, "project_id")),
+    (StrategizerPredicament, COHERENCE, ("project_id",)),
+    (ConceptEvidenceSource, CONCEPT_EVIDENCE, ("concept_id",)),
+    (ConceptEvidenceFragment, CONCEPT_EVIDENCE, ("source_id", ConceptEvidenceSource, "concept_id")),
+    (ConceptEvidenceDecision, CONCEPT_EVIDENCE, ("concept_id",)),
+)
+for _model, _kind, _path in _TRACKED:
+    project_stats_cache.revisions.track(_model, _kind, _path)
@@ -0,0 +1,262 @@
+"""
+Schema Catalogue - Cached Reference Data for the Operation-Indexed Schema
+
+Dimensions, operations and theoretical influences are reference data: they are
+seeded by scripts/seed_concept_analysis.py and almost never change afterwards.
+Rather than re-querying AnalyticalDimension -> operations -> influences and
+rebuilding identical Pydantic trees on every request, this module loads them
+once (at startup, or lazily on first use) and keeps pre-serialised JSON bytes
+plus an ETag for each payload the concept analysis router serves.
+
+Invalidation:
+- Any ORM flush that touches a dimension, operation or influence in this
+  process drops the cache (see _invalidate_on_reference_writes).
+- Writes made by other processes (seed scripts, psql) are picked up by a cheap
+  fingerprint query (row counts + max(updated_at)) run at most once every
+  SCHEMA_CATALOGUE_RECHECK_SECONDS.
+- Bumping SCHEMA_CATALOGUE_VERSION changes every ETag, forcing clients to refetch.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Optional, Any
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import select, func, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from .concept_analysis_models import (
+    AnalyticalDimension, AnalyticalOperation, TheoreticalInfluence
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every client-side cached copy (part of every ETag)
+SCHEMA_CATALOGUE_VERSION = os.getenv("SCHEMA_CATALOGUE_VERSION", "1")
+
+# How often (seconds) to re-check the DB fingerprint for out-of-process writes
+SCHEMA_CATALOGUE_RECHECK_SECONDS = float(os.getenv("SCHEMA_CATALOGUE_RECHECK_SECONDS", "60"))
+
+_REFERENCE_MODELS = (AnalyticalDimension, AnalyticalOperation, TheoreticalInfluence)
+
+
+class CatalogueEntry:
+    """A pre-serialised JSON payload with its ETag."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, payload: Any):
+        self.body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha1(self.body).hexdigest()[:20]
+        self.etag = f'"{SCHEMA_CATALOGUE_VERSION}-{digest}"'
+
+
+class SchemaCatalogueSnapshot:
+    """Immutable view of the reference data at one point in time."""
+
+    def __init__(self, dimensions: List[dict], influences: List[dict], fingerprint: tuple):
+        self.fingerprint = fingerprint
+        self.loaded_at = time.monotonic()
+
+        # Plain dicts (response-model shaped) for callers that embed them
+        self.dimensions = dimensions
+        self.influences = influences
+
+        dimensions_no_ops = [{**d, "operations": []} for d in dimensions]
+        all_operations = sorted(
+            (op for d in dimensions for op in d["operations"]),
+            key=lambda op: (op["dimension_id"], op["sequence_order"])
+        )
+
+        self.dimensions_entry = CatalogueEntry(dimensions)
+        self.dimensions_no_ops_entry = CatalogueEntry(dimensions_no_ops)
+        self.operations_entry = CatalogueEntry(all_operations)
+        self.influences_entry = CatalogueEntry(influences)
+
+        self.dimension_entries: Dict[str, CatalogueEntry] = {
+            d["dimension_type"]: CatalogueEntry(d) for d in dimensions
+        }
+        self.operations_by_dimension_entries: Dict[str, CatalogueEntry] = {
+            d["dimension_type"]: CatalogueEntry(d["operations"]) for d in dimensions
+        }
+        self.operation_ids_by_dimension: Dict[str, List[int]] = {
+            d["dimension_type"]: [op["id"] for op in d["operations"]] for d in dimensions
+        }
+
+    def operations_entry_for(self, dimension_type: Optional[str]) -> CatalogueEntry:
+        if dimension_type is None:
+            return self.operations_entry
+        return self.operations_by_dimension_entries.get(dimension_type) or CatalogueEntry([])
+
+    def get_dimension(self, dimension_type: str) -> Optional[dict]:
+        for d in self.dimensions:
+            if d["dimension_type"] == dimension_type:
+                return d
+        return None
+
+
+class SchemaCatalogue:
+    """Process-wide cache of dimensions, operations and influences."""
+
+    def __init__(self):
+        self._snapshot: Optional[SchemaCatalogueSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Drop the cached snapshot; the next request reloads it."""
+        if self._snapshot is not None:
+            logger.info("Schema catalogue invalidated")
+        self._snapshot = None
+
+    async def get(self, db: AsyncSession) -> SchemaCatalogueSnapshot:
+        """Return the current snapshot, loading or re-validating it as needed."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            if time.monotonic() - snapshot.loaded_at < SCHEMA_CATALOGUE_RECHECK_SECONDS:
+                return snapshot
+            if await _fetch_fingerprint(db) == snapshot.fingerprint:
+                snapshot.loaded_at = time.monotonic()
+                return snapshot
+
+        async with self._lock:
+            # Another request may have reloaded while we waited
+            if self._snapshot is not None and self._snapshot is not snapshot:
+                return self._snapshot
+            self._snapshot = await _load_snapshot(db)
+            return self._snapshot
+
+    async def refresh(self, db: AsyncSession) -> SchemaCatalogueSnapshot:
+        """Force a reload (used at startup)."""
+        async with self._lock:
+            self._snapshot = await _load_snapshot(db)
+            return self._snapshot
+
+
+schema_catalogue = SchemaCatalogue()
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+async def _fetch_fingerprint(db: AsyncSession) -> tuple:
+    """Cheap single-statement fingerprint of the reference tables."""
+    stmt = select(
+        select(func.count(AnalyticalDimension.id)).scalar_subquery(),
+        select(func.max(AnalyticalDimension.updated_at)).scalar_subquery(),
+        select(func.count(AnalyticalOperation.id)).scalar_subquery(),
+        select(func.max(AnalyticalOperation.updated_at)).scalar_subquery(),
+        select(func.count(TheoreticalInfluence.id)).scalar_subquery(),
+        select(func.max(TheoreticalInfluence.updated_at)).scalar_subquery(),
+    )
+    row = (await db.execute(stmt)).one()
+    return tuple(row)
+
+
+def _influence_dict(inf: TheoreticalInfluence) -> dict:
+    return {
+        "id": inf.id,
+        "short_name": inf.short_name,
+        "full_name": inf.full_name,
+        "years": inf.years,
+        "key_works": inf.key_works,
+        "core_insight": inf.core_insight,
+        "wikipedia_url": inf.wikipedia_url,
+        "contribution_note": None,
+    }
+
+
+def _operation_dict(op: AnalyticalOperation) -> dict:
+    return {
+        "id": op.id,
+        "dimension_id": op.dimension_id,
+        "name": op.name,
+        "description": op.description,
+        "key_questions": op.key_questions,
+        "output_type": op.output_type.value if op.output_type else None,
+        "example_prompt": op.example_prompt,
+        "sequence_order": op.sequence_order or 0,
+        "influences": [_influence_dict(inf) for inf in op.influences],
+    }
+
+
+def _dimension_dict(dim: AnalyticalDimension) -> dict:
+    return {
+        "id": dim.id,
+        "dimension_type": dim.dimension_type.value,
+        "name": dim.name,
+        "core_question": dim.core_question,
+        "description": dim.description,
+        "color_scheme": dim.color_scheme,
+        "icon": dim.icon,
+        "sequence_order": dim.sequence_order or 0,
+        "operations": [
+            _operation_dict(op)
+            for op in sorted(dim.operations, key=lambda x: x.sequence_order or 0)
+        ],
+    }
+
+
+async def _load_snapshot(db: AsyncSession) -> SchemaCatalogueSnapshot:
+    """Load all reference data in three statements and pre-serialise it."""
+    fingerprint = await _fetch_fingerprint(db)
+
+    dims_result = await db.execute(
+        select(AnalyticalDimension)
+        .options(selectinload(AnalyticalDimension.operations).selectinload(AnalyticalOperation.influences))
+        .order_by(AnalyticalDimension.sequence_order)
+    )
+    dimensions = [_dimension_dict(dim) for dim in dims_result.scalars().all()]
+
+    infs_result = await db.execute(
+        select(TheoreticalInfluence).order_by(TheoreticalInfluence.short_name)
+    )
+    influences = [_influence_dict(inf) for inf in infs_result.scalars().all()]
+
+    snapshot = SchemaCatalogueSnapshot(dimensions, influences, fingerprint)
+    logger.info(
+        f"Schema catalogue loaded: {len(dimensions)} dimensions, "
+        f"{sum(len(d['operations']) for d in dimensions)} operations, {len(influences)} influences"
+    )
+    return snapshot
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_reference_writes(session, flush_context):
+    """Drop the catalogue when this process writes reference data."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _REFERENCE_MODELS):
+            schema_catalogue.invalidate()
+            return
+
+
+# =============================================================================
+# HTTP HELPERS
+# =============================================================================
+
+def catalogue_response(request: Request, entry: CatalogueEntry) -> Response:
+    """Serve a pre-serialised entry, honouring If-None-Match."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if entry.etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def init_schema_catalogue():
+    """Warm the catalogue at startup. Failures are logged, not fatal."""
+    from .database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as session:
+            await schema_catalogue.refresh(session)
+    except Exception as e:
+        logger.warning(f"Schema catalogue warm-up failed, will load lazily: {e}")
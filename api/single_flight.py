@@ -0,0 +1,184 @@
+"""
+Single-Flight - Coalescing Identical In-Flight Work
+
+Double-clicks, re-renders and client retries in the concept wizard send the
+same request twice while the first is still running, and background coherence
+checks triggered by several edits in a row run the same quick scan
+concurrently. Each duplicate used to be a full, paid LLM call (and, for
+generate-next-question, a second slot appended to the queue).
+
+Work is keyed by a fingerprint of everything that determines its result. The
+first caller with a key starts the work; callers arriving with the same key
+while it runs wait for that same execution and get its result (or its
+exception). Once it finishes the key is free again: this only merges
+concurrent duplicates, it is not a cache.
+
+- SingleFlight.run() coalesces coroutines on the event loop. The work runs as
+  its own task, so a caller that disconnects doesn't cancel it for the others;
+  it is cancelled only when every caller has gone.
+- SingleFlight.run_sync() does the same for blocking calls in worker threads.
+  On the event-loop thread it just makes the call, since waiting there for
+  another thread would stall the server.
+- coalesce_requests() applies run() to a FastAPI endpoint, keyed by its
+  request body models.
+
+Used by llm_scheduler (identical messages.create calls), the wizard's JSON
+generation endpoints, the coherence quick scan and stream_broker, which
+attaches duplicate SSE requests to the running stream.
+
+Configuration (env):
+    SINGLE_FLIGHT_ENABLED  coalesce identical concurrent work (default true)
+"""
+
+import os
+import json
+import hashlib
+import asyncio
+import logging
+import threading
+import functools
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from .instrumentation import SINGLE_FLIGHT_COALESCED
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hex key for JSON-like parts (pydantic models are dumped, anything else str()'d)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=_canonical)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# =============================================================================
+# FLIGHTS
+# =============================================================================
+
+class _Flight:
+    """An execution in progress and the callers waiting on it."""
+
+    def __init__(self):
+        self.callers = 1
+        self.task: Optional[asyncio.Task] = None
+        # Thread flights
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution. `name` labels its metrics."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self._thread_flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights or key in self._thread_flights
+
+    async def run(self, key: str, make_coro: Callable[[], Awaitable[Any]]) -> Any:
+        """Await make_coro(), or the execution already running under key."""
+        if not SINGLE_FLIGHT_ENABLED:
+            return await make_coro()
+
+        flight = self._flights.get(key)
+        if flight is None or flight.callers == 0 or flight.task.done():
+            flight = _Flight()
+            # The task copies this caller's context (LLM priority, request stats)
+            flight.task = asyncio.ensure_future(make_coro())
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._release(self._flights, key, flight))
+        else:
+            flight.callers += 1
+            SINGLE_FLIGHT_COALESCED.inc((self.name,))
+            logger.info(f"Coalesced {self.name} call into the one in flight ({key[:12]})")
+
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.callers -= 1
+            if flight.callers == 0 and not flight.task.done():
+                flight.task.cancel()
+            raise
+
+    def run_sync(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Call fn(), or wait in this thread for the call already running under key."""
+        if not SINGLE_FLIGHT_ENABLED or _on_event_loop():
+            return fn()
+
+        with self._lock:
+            flight = self._thread_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._thread_flights[key] = flight
+            else:
+                flight.callers += 1
+
+        if not leader:
+            SINGLE_FLIGHT_COALESCED.inc((self.name,))
+            logger.info(f"Coalesced {self.name} call into the one in flight ({key[:12]})")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._release(self._thread_flights, key, flight)
+            flight.done.set()
+
+    @staticmethod
+    def _release(flights: Dict[str, _Flight], key: str, flight: _Flight):
+        if flights.get(key) is flight:
+            del flights[key]
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+# =============================================================================
+# ENDPOINTS
+# =============================================================================
+
+endpoint_flights = SingleFlight("endpoint")
+
+
+def coalesce_requests(name: str):
+    """
+    Decorate an async endpoint so concurrent calls with equal request bodies
+    share one execution. The key is name plus the pydantic model arguments;
+    dependencies such as the db session are left out, so the first caller's
+    are the ones used.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            bodies = [value for value in (*args, *kwargs.values()) if isinstance(value, BaseModel)]
+            key = fingerprint(name, bodies)
+            return await endpoint_flights.run(key, lambda: endpoint(*args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,274 @@
+"""
+Startup - Lazy Routers and the Startup Profile
+
+Importing api.main used to import every router module up front: the concept
+wizard (thousands of lines of handlers and prompts), the evidence and analysis
+routers and the whole strategizer, plus the anthropic SDK. The lifespan then
+ran create_all for three metadata sets. On Render deploys and autoscaling
+events all of that happened before the first health check could pass.
+
+With STARTUP_MODE=fast:
+
+- Heavy routers are registered with include_lazy_router() as LazyRouter
+  placeholders, at the position the router would have had. The first request
+  under a router's prefix imports its module (in a worker thread), puts the
+  router in the placeholder's place and re-dispatches. Shortly after startup
+  the remaining routers are preloaded in the background, so normally no
+  request waits. /openapi.json loads them all first.
+- LLM clients are created in the background (see llm_clients).
+
+In either mode init_db skips create_all while the stored schema fingerprint
+matches (see database), and once startup completes the startup profile is
+logged: the import time of api.main, each lifespan phase and each router
+import. With STARTUP_PROFILE=true it also lists the slowest module imports.
+
+Configuration (env):
+    STARTUP_MODE                   "fast" or "eager" (default eager)
+    STARTUP_PRELOAD_DELAY_SECONDS  fast mode: wait before preloading routers, negative disables (default 5)
+    STARTUP_PROFILE                time every module import and report the slowest (default false)
+"""
+
+import os
+import re
+import sys
+import time
+import asyncio
+import logging
+import importlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+
+logger = logging.getLogger(__name__)
+
+# api.main imports this module first; its import time is measured from here
+IMPORT_STARTED = time.perf_counter()
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+FAST_STARTUP = STARTUP_MODE == "fast"
+STARTUP_PRELOAD_DELAY_SECONDS = float(os.getenv("STARTUP_PRELOAD_DELAY_SECONDS", "5"))
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() in ("1", "true", "yes")
+
+# Slowest imports listed in the report
+PROFILE_TOP_IMPORTS = 15
+
+
+# =============================================================================
+# STARTUP PROFILE
+# =============================================================================
+
+_phases: List[Tuple[str, float, str]] = []  # (name, seconds, note)
+
+
+def record_phase(name: str, seconds: float, note: str = ""):
+    _phases.append((name, seconds, note))
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Time a block as a named startup phase. Yields a dict; set ["note"] to annotate."""
+    info = {"note": ""}
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        record_phase(name, time.perf_counter() - start, info["note"])
+
+
+class _ImportProfiler:
+    """
+    Meta path hook timing each module's execution (STARTUP_PROFILE only).
+    Self time excludes the imports a module triggers itself.
+    """
+
+    def __init__(self):
+        self.self_times: Dict[str, float] = {}
+        self._stack: List[list] = []  # [name, started, child_seconds]
+        self._finding = False
+
+    def find_spec(self, name, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        loader = spec.loader
+        # Class loaders (builtins, frozen) are shared; only time instance loaders
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self._timed(name, loader.exec_module)
+        return spec
+
+    def _timed(self, name, exec_module):
+        def timed_exec_module(module):
+            frame = [name, time.perf_counter(), 0.0]
+            self._stack.append(frame)
+            try:
+                exec_module(module)
+            finally:
+                self._stack.pop()
+                elapsed = time.perf_counter() - frame[1]
+                self.self_times[name] = elapsed - frame[2]
+                if self._stack:
+                    self._stack[-1][2] += elapsed
+        return timed_exec_module
+
+    def slowest(self, n: int) -> List[Tuple[str, float]]:
+        return sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+_import_profiler: Optional[_ImportProfiler] = None
+if STARTUP_PROFILE:
+    _import_profiler = _ImportProfiler()
+    sys.meta_path.insert(0, _import_profiler)
+
+
+def startup_report() -> str:
+    lines = [f"Startup profile ({STARTUP_MODE} mode):"]
+    for name, seconds, note in _phases:
+        lines.append(f"  {name:<40} {seconds * 1000:8.1f} ms" + (f"  ({note})" if note else ""))
+    if _import_profiler is not None:
+        lines.append("  slowest imports (self time):")
+        for name, seconds in _import_profiler.slowest(PROFILE_TOP_IMPORTS):
+            lines.append(f"    {name:<38} {seconds * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+
+def log_startup_report():
+    logger.info(startup_report())
+    if _import_profiler is not None:
+        sys.meta_path.remove(_import_profiler)
+
+
+# =============================================================================
+# LAZY ROUTERS
+# =============================================================================
+
+def _prefix_pattern(prefix: str) -> "re.Pattern":
+    """'/concepts/{concept_id}/evidence' -> paths under it, any concept_id."""
+    parts = re.split(r"\{[^}]+\}", prefix)
+    return re.compile("^" + "[^/]+".join(re.escape(part) for part in parts) + "(?:/|$)")
+
+
+class LazyRouter(BaseRoute):
+    """
+    Stands in for a router that hasn't been imported yet. Matches every path
+    under the router's prefix; handling one loads the router into this
+    placeholder's position and dispatches the request again.
+    """
+
+    def __init__(self, app, module: str, prefix: str, attr: str = "router"):
+        self.app = app
+        self.module = module
+        self.prefix = prefix
+        self.attr = attr
+        self._pattern = _prefix_pattern(prefix)
+        self._lock = asyncio.Lock()
+        self.loaded = False
+
+    def matches(self, scope) -> Tuple[Match, dict]:
+        if scope["type"] in ("http", "websocket") and self._pattern.match(get_route_path(scope)):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    async def handle(self, scope, receive, send):
+        await self.load()
+        await scope["router"].app(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        # Placeholders are searched in order like any route, so don't load on a miss
+        raise NoMatchFound(name, path_params)
+
+    async def load(self):
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            start = time.perf_counter()
+            module = await asyncio.to_thread(importlib.import_module, self.module, __package__)
+            self._install(getattr(module, self.attr), time.perf_counter() - start)
+
+    def load_sync(self):
+        if not self.loaded:
+            start = time.perf_counter()
+            module = importlib.import_module(self.module, __package__)
+            self._install(getattr(module, self.attr), time.perf_counter() - start)
+
+    def _install(self, router, seconds: float):
+        if self.loaded:
+            return
+        routes = self.app.router.routes
+        count = len(routes)
+        self.app.include_router(router)
+        # Move what include_router appended (one route per endpoint, or one
+        # wrapper route on newer FastAPI) into the placeholder's slot
+        included = routes[count:]
+        del routes[count:]
+        index = routes.index(self)
+        routes[index:index + 1] = included
+        self.app.openapi_schema = None
+        self.loaded = True
+        record_phase(f"load router {self.module}", seconds)
+        logger.info(f"Loaded router {self.module} ({seconds * 1000:.0f} ms)")
+
+
+def lazy_routers(app) -> List[LazyRouter]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouter) and not route.loaded]
+
+
+def include_lazy_router(app, module: str, prefix: str, attr: str = "router"):
+    """
+    Include module's router (relative to this package) now, or in fast mode
+    on the first request under prefix.
+    """
+    if not FAST_STARTUP:
+        with startup_phase(f"import {module}"):
+            router = getattr(importlib.import_module(module, __package__), attr)
+        app.include_router(router)
+        return
+
+    if not any(isinstance(route, LazyRouter) for route in app.router.routes):
+        # The schema has to include routers nobody has requested yet
+        openapi = app.openapi
+
+        def openapi_with_lazy_routers():
+            for route in lazy_routers(app):
+                route.load_sync()
+            return openapi()
+
+        app.openapi = openapi_with_lazy_routers
+    app.router.routes.append(LazyRouter(app, module, prefix, attr))
+
+
+_preload_task: Optional[asyncio.Task] = None
+
+
+async def _preload(app):
+    await asyncio.sleep(STARTUP_PRELOAD_DELAY_SECONDS)
+    for route in lazy_routers(app):
+        try:
+            await route.load()
+        except Exception as e:
+            logger.error(f"Preloading router {route.module} failed: {e}", exc_info=True)
+
+
+def start_router_preload(app):
+    """Fast mode: load the remaining routers in the background after startup."""
+    global _preload_task
+    if FAST_STARTUP and STARTUP_PRELOAD_DELAY_SECONDS >= 0 and lazy_routers(app):
+        _preload_task = asyncio.create_task(_preload(app))
+
+
+async def stop_router_preload():
+    if _preload_task is not None and not _preload_task.done():
+        _preload_task.cancel()
@@ -7,15 +7,18 @@ Endpoints for coherence monitoring, predicament detection, and resolution.
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
 import json
 
 from ..database import get_db
+from ..project_stats import coherence_stats
 from .models import (
+    StrategizerProject,
     StrategizerPredicament,
     StrategizerUnit,
     StrategizerGridInstance,
@@ -32,6 +35,7 @@ from .schemas import (
     PredicamentWithContext,
     CoherenceCheckRequest,
     CoherenceCheckResponse,
+    DeepAnalysisRunResponse,
     PredicamentResolveRequest,
     PredicamentResolveResponse,
     GenerateGridRequest,
@@ -41,6 +45,7 @@ from .schemas import (
     EvidenceFragmentResponse,
 )
 from .services.coherence_monitor import CoherenceMonitor
+from .services.coherence_runs import start_deep_analysis, get_run, latest_run, DeepAnalysisRun
 
 
 router = APIRouter(tags=["strategizer-coherence"])
@@ -141,6 +146,107 @@ async def deep_coherence_analysis(
     )
 
 
+# =============================================================================
+# BACKGROUND DEEP ANALYSIS (resumable over SSE)
+# =============================================================================
+
+def _run_response(run: DeepAnalysisRun) -> DeepAnalysisRunResponse:
+    return DeepAnalysisRunResponse(
+        run_id=run.run_id,
+        project_id=run.project_id,
+        status=run.status.value,
+        event_count=len(run.events),
+        events_url=f"/api/strategizer/projects/{run.project_id}/coherence/deep-analysis/runs/{run.run_id}/events",
+        started_at=run.started_at,
+        completed_at=run.completed_at,
+        error=run.error,
+        result=run.result,
+    )
+
+
+@router.post(
+    "/projects/{project_id}/coherence/deep-analysis/runs",
+    response_model=DeepAnalysisRunResponse,
+    status_code=202
+)
+async def start_deep_analysis_run(
+    project_id: str,
+    request: CoherenceCheckRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start deep coherence analysis in the background and return immediately.
+
+    Only one run per project is active at a time; starting again while one is
+    running returns that run. Follow progress on the run's events_url.
+    """
+    exists = await db.scalar(select(StrategizerProject.id).where(StrategizerProject.id == project_id))
+    if not exists:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    run = await start_deep_analysis(project_id, request.focus_unit_ids or None)
+    return _run_response(run)
+
+
+@router.get(
+    "/projects/{project_id}/coherence/deep-analysis/runs/latest",
+    response_model=DeepAnalysisRunResponse
+)
+async def get_latest_deep_analysis_run(project_id: str):
+    """The project's most recent deep analysis run, e.g. to reattach after a reload."""
+    run = await latest_run(project_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="No deep analysis runs for this project")
+    return _run_response(run)
+
+
+@router.get(
+    "/projects/{project_id}/coherence/deep-analysis/runs/{run_id}",
+    response_model=DeepAnalysisRunResponse
+)
+async def get_deep_analysis_run(project_id: str, run_id: str):
+    """Status (and, once complete, the result) of a deep analysis run."""
+    run = await get_run(project_id, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return _run_response(run)
+
+
+@router.get("/projects/{project_id}/coherence/deep-analysis/runs/{run_id}/events")
+async def stream_deep_analysis_run(
+    project_id: str,
+    run_id: str,
+    last_event_id: Optional[int] = Query(None, ge=0, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    SSE stream of a run's events: status, thinking, predicament, then complete
+    or error, followed by [DONE].
+
+    Every event carries an `id:` line. Reconnect with ?last_event_id=N (or the
+    Last-Event-ID header EventSource sends automatically) to resume after
+    event N; already-finished runs replay from their checkpoint.
+    """
+    run = await get_run(project_id, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    after = last_event_id
+    if after is None and last_event_id_header and last_event_id_header.isdigit():
+        after = int(last_event_id_header)
+
+    async def event_stream():
+        async for event in run.iter_events(after or 0):
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            payload = {"type": event["type"], "id": event["id"], **event["data"]}
+            yield f"id: {event['id']}\ndata: {json.dumps(payload)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 # =============================================================================
 # PREDICAMENT CRUD ENDPOINTS
 # =============================================================================
@@ -1145,56 +1251,13 @@ async def get_coherence_stats(
     db: AsyncSession = Depends(get_db)
 ):
     """Get coherence statistics for a project."""
-    # Count predicaments by status
-    status_counts = {}
-    for status in PredicamentStatus:
-        result = await db.execute(
-            select(func.count(StrategizerPredicament.id))
-            .where(
-                StrategizerPredicament.project_id == project_id,
-                StrategizerPredicament.status == status
-            )
-        )
-        status_counts[status.value] = result.scalar() or 0
-
-    # Count by type
-    type_counts = {}
-    for pred_type in PredicamentType:
-        result = await db.execute(
-            select(func.count(StrategizerPredicament.id))
-            .where(
-                StrategizerPredicament.project_id == project_id,
-                StrategizerPredicament.predicament_type == pred_type
-            )
-        )
-        type_counts[pred_type.value] = result.scalar() or 0
-
-    # Count by severity (for active predicaments)
-    severity_counts = {}
-    for severity in PredicamentSeverity:
-        result = await db.execute(
-            select(func.count(StrategizerPredicament.id))
-            .where(
-                StrategizerPredicament.project_id == project_id,
-                StrategizerPredicament.severity == severity,
-                StrategizerPredicament.status.in_([
-                    PredicamentStatus.DETECTED,
-                    PredicamentStatus.ANALYZING
-                ])
-            )
-        )
-        severity_counts[severity.value] = result.scalar() or 0
-
-    total = sum(status_counts.values())
-    active = status_counts.get("detected", 0) + status_counts.get("analyzing", 0)
+    stats = await coherence_stats(db, project_id)
 
     return {
-        "total_predicaments": total,
-        "active_predicaments": active,
-        "by_status": status_counts,
-        "by_type": type_counts,
-        "by_severity": severity_counts,
-        "health_indicator": "healthy" if active == 0 else (
-            "attention" if severity_counts.get("critical", 0) == 0 else "critical"
-        )
+        "total_predicaments": stats.total_predicaments,
+        "active_predicaments": stats.active_predicaments,
+        "by_status": stats.by_status,
+        "by_type": stats.by_type,
+        "by_severity": stats.by_severity,
+        "health_indicator": stats.health_indicator
     }
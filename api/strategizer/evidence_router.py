@@ -12,10 +12,10 @@ from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func as sql_func
+from sqlalchemy import select, insert, delete
 from sqlalchemy.orm import selectinload
 
-from ..database import get_db
+from ..database import get_db, release_connection
 from .models import (
     StrategizerProject, StrategizerDomain, StrategizerUnit, StrategizerGridInstance,
     StrategizerEvidenceSource, StrategizerEvidenceFragment,
@@ -26,8 +26,12 @@ from .schemas import (
     EvidenceSourceCreate, EvidenceSourceResponse,
     EvidenceFragmentResponse, InterpretationResponse,
     PendingDecisionResponse, DecisionRequest, DecisionResponse,
-    EvidenceProgressResponse, ExtractRequest
+    EvidenceProgressResponse, ExtractRequest,
+    DecisionQueueResponse, PendingDecisionCountResponse
 )
+from ..decision_queue import load_decision_page, load_decision_at, count_pending, MAX_DECISION_PAGE
+from ..project_stats import evidence_stats
+from ..llm_scheduler import llm_priority, BATCH
 from .services.evidence_llm import (
     extract_fragments_from_source,
     analyze_fragment,
@@ -260,54 +264,56 @@ async def extract_from_source(
     # Get existing units for context
     units = await get_units_as_dicts(db, project_id)
 
-    # Update status to processing
+    # Update status to processing; commit so the connection isn't held
+    # through the (possibly multi-chunk) LLM extraction
     source.extraction_status = ExtractionStatus.PROCESSING
-    await db.flush()
+    await release_connection(db)
 
     try:
         # Call LLM to extract fragments
         domain_name = project.domain.name if project.domain else None
         core_question = project.domain.core_question if project.domain else project.brief
 
-        fragments_data = await extract_fragments_from_source(
-            domain_name=domain_name,
-            core_question=core_question,
-            units=units,
-            source_name=source.source_name,
-            source_type=source.source_type.value,
-            source_content=source.source_content or ""
-        )
+        with llm_priority(BATCH, project=project_id):
+            fragments_data = await extract_fragments_from_source(
+                domain_name=domain_name,
+                core_question=core_question,
+                units=units,
+                source_name=source.source_name,
+                source_type=source.source_type.value,
+                source_content=source.source_content or ""
+            )
 
-        # Delete old fragments if re-extracting
+        # Delete old fragments if re-extracting (interpretations cascade in the DB)
         if request.force:
-            old_fragments = await db.execute(
-                select(StrategizerEvidenceFragment).where(
+            await db.execute(
+                delete(StrategizerEvidenceFragment).where(
                     StrategizerEvidenceFragment.source_id == source_id
                 )
             )
-            for frag in old_fragments.scalars().all():
-                await db.delete(frag)
-
-        # Create fragment records
-        created_fragments = []
-        for frag_data in fragments_data:
-            fragment = StrategizerEvidenceFragment(
-                source_id=source_id,
-                content=frag_data.get("content", ""),
-                source_location=frag_data.get("source_location"),
-                analysis_status=AnalysisStatus.PENDING,
-                extraction_metadata={
+
+        # Create fragment records in one bulk INSERT
+        fragment_rows = [
+            {
+                "source_id": source_id,
+                "content": frag_data.get("content", ""),
+                "source_location": frag_data.get("source_location"),
+                "analysis_status": AnalysisStatus.PENDING,
+                "extraction_metadata": {
                     "likely_unit_type": frag_data.get("likely_unit_type"),
                     "likely_unit_name": frag_data.get("likely_unit_name"),
-                    "extraction_note": frag_data.get("extraction_note")
-                }
-            )
-            db.add(fragment)
-            created_fragments.append(fragment)
+                    "extraction_note": frag_data.get("extraction_note"),
+                    "chunks": frag_data.get("chunks"),
+                },
+            }
+            for frag_data in fragments_data
+        ]
+        if fragment_rows:
+            await db.execute(insert(StrategizerEvidenceFragment), fragment_rows)
 
         # Update source
         source.extraction_status = ExtractionStatus.COMPLETED
-        source.extracted_count = len(created_fragments)
+        source.extracted_count = len(fragment_rows)
         source.extraction_error = None
 
         await db.commit()
@@ -315,11 +321,12 @@ async def extract_from_source(
         return {
             "status": "completed",
             "source_id": source_id,
-            "fragments_extracted": len(created_fragments),
-            "message": f"Extracted {len(created_fragments)} fragments. Use POST /fragments/{{id}}/analyze to analyze each."
+            "fragments_extracted": len(fragment_rows),
+            "message": f"Extracted {len(fragment_rows)} fragments. Use POST /fragments/{{id}}/analyze to analyze each."
         }
 
     except Exception as e:
+        await db.rollback()
         source.extraction_status = ExtractionStatus.FAILED
         source.extraction_error = str(e)
         await db.commit()
@@ -568,41 +575,26 @@ async def analyze_fragment_endpoint(
 # DECISION HANDLING
 # =============================================================================
 
-@router.get("/decisions/pending", response_model=Optional[PendingDecisionResponse])
-async def get_pending_decision(
-    project_id: str,
-    index: int = Query(0, ge=0, description="Index of pending decision (0-based)"),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get a pending decision for review."""
-    # Get all pending fragments for this project
-    query = (
+def _pending_decisions_query(project_id: str):
+    """NEEDS_DECISION fragments for a project (no ordering, no eager loads)."""
+    return (
         select(StrategizerEvidenceFragment)
         .join(StrategizerEvidenceSource)
-        .options(
-            selectinload(StrategizerEvidenceFragment.source),
-            selectinload(StrategizerEvidenceFragment.interpretations)
-        )
         .where(
             StrategizerEvidenceSource.project_id == project_id,
             StrategizerEvidenceFragment.analysis_status == AnalysisStatus.NEEDS_DECISION
         )
-        .order_by(StrategizerEvidenceFragment.created_at)
     )
 
-    result = await db.execute(query)
-    pending = result.scalars().all()
 
-    if not pending:
-        return None
-
-    total = len(pending)
-    if index >= total:
-        index = total - 1
+_PENDING_DECISION_LOADS = (
+    selectinload(StrategizerEvidenceFragment.source),
+    selectinload(StrategizerEvidenceFragment.interpretations),
+)
 
-    fragment = pending[index]
 
-    # Build interpretations response
+def _pending_decision_response(fragment: StrategizerEvidenceFragment) -> PendingDecisionResponse:
+    """Build the decision payload for a fragment loaded with _PENDING_DECISION_LOADS."""
     interpretations = []
     for interp in sorted(fragment.interpretations, key=lambda x: x.interpretation_key or "z"):
         interpretations.append(InterpretationResponse(
@@ -640,6 +632,70 @@ async def get_pending_decision(
     )
 
 
+@router.get("/decisions/pending", response_model=Optional[PendingDecisionResponse])
+async def get_pending_decision(
+    project_id: str,
+    index: int = Query(0, ge=0, description="Index of pending decision (0-based)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a pending decision for review by index.
+
+    Kept for index-based clients; /decisions/queue navigates by cursor and can
+    prefetch upcoming decisions.
+    """
+    page = await load_decision_at(
+        db, StrategizerEvidenceFragment, _pending_decisions_query(project_id),
+        index, options=_PENDING_DECISION_LOADS
+    )
+    if page is None:
+        return None
+    return _pending_decision_response(page.items[0])
+
+
+@router.get("/decisions/queue", response_model=DecisionQueueResponse)
+async def get_decision_queue(
+    project_id: str,
+    after: Optional[str] = Query(None, description="Fragment id; return the decisions after it"),
+    before: Optional[str] = Query(None, description="Fragment id; return the decisions before it"),
+    prefetch: int = Query(2, ge=0, le=MAX_DECISION_PAGE - 1, description="Extra decisions to include after the current one"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cursor-paginated pending decisions, oldest first.
+
+    Returns the current decision plus up to `prefetch` following ones with
+    their interpretations, so a reviewer can step forward without a round-trip.
+    Use next_cursor as ?after= to continue (including after resolving the
+    current decision) and previous_cursor as ?before= to step back.
+    """
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Pass either 'after' or 'before', not both")
+
+    page = await load_decision_page(
+        db, StrategizerEvidenceFragment, _pending_decisions_query(project_id),
+        after=after, before=before, limit=1 + prefetch, options=_PENDING_DECISION_LOADS
+    )
+    return DecisionQueueResponse(
+        decisions=[_pending_decision_response(f) for f in page.items],
+        total_pending=page.total,
+        position=page.position,
+        next_cursor=page.items[-1].id if page.has_next else None,
+        previous_cursor=page.items[0].id if page.has_previous else None
+    )
+
+
+@router.get("/decisions/count", response_model=PendingDecisionCountResponse)
+async def get_pending_decision_count(
+    project_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Number of decisions awaiting review (COUNT only, no rows loaded)."""
+    return PendingDecisionCountResponse(
+        total_pending=await count_pending(db, _pending_decisions_query(project_id))
+    )
+
+
 # =============================================================================
 # GRID INTEGRATION HELPERS
 # =============================================================================
@@ -794,62 +850,13 @@ async def get_evidence_progress(
     # Verify project exists
     await get_project_with_domain(db, project_id)
 
-    # Count sources
-    sources_result = await db.execute(
-        select(sql_func.count(StrategizerEvidenceSource.id))
-        .where(StrategizerEvidenceSource.project_id == project_id)
-    )
-    sources_count = sources_result.scalar() or 0
-
-    # Count fragments (via sources)
-    fragments_result = await db.execute(
-        select(sql_func.count(StrategizerEvidenceFragment.id))
-        .join(StrategizerEvidenceSource)
-        .where(StrategizerEvidenceSource.project_id == project_id)
-    )
-    fragments_count = fragments_result.scalar() or 0
-
-    # Count by status
-    pending_extraction = await db.execute(
-        select(sql_func.count(StrategizerEvidenceSource.id))
-        .where(
-            StrategizerEvidenceSource.project_id == project_id,
-            StrategizerEvidenceSource.extraction_status == ExtractionStatus.PENDING
-        )
-    )
-
-    pending_analysis = await db.execute(
-        select(sql_func.count(StrategizerEvidenceFragment.id))
-        .join(StrategizerEvidenceSource)
-        .where(
-            StrategizerEvidenceSource.project_id == project_id,
-            StrategizerEvidenceFragment.analysis_status == AnalysisStatus.PENDING
-        )
-    )
-
-    pending_decisions = await db.execute(
-        select(sql_func.count(StrategizerEvidenceFragment.id))
-        .join(StrategizerEvidenceSource)
-        .where(
-            StrategizerEvidenceSource.project_id == project_id,
-            StrategizerEvidenceFragment.analysis_status == AnalysisStatus.NEEDS_DECISION
-        )
-    )
-
-    integrated = await db.execute(
-        select(sql_func.count(StrategizerEvidenceFragment.id))
-        .join(StrategizerEvidenceSource)
-        .where(
-            StrategizerEvidenceSource.project_id == project_id,
-            StrategizerEvidenceFragment.analysis_status == AnalysisStatus.INTEGRATED
-        )
-    )
+    stats = await evidence_stats(db, project_id)
 
     return EvidenceProgressResponse(
-        sources_count=sources_count,
-        fragments_count=fragments_count,
-        pending_extraction=pending_extraction.scalar() or 0,
-        pending_analysis=pending_analysis.scalar() or 0,
-        pending_decisions=pending_decisions.scalar() or 0,
-        integrated_count=integrated.scalar() or 0
+        sources_count=stats.sources_count,
+        fragments_count=stats.fragments_count,
+        pending_extraction=stats.pending_extraction,
+        pending_analysis=stats.pending_analysis,
+        pending_decisions=stats.pending_decisions,
+        integrated_count=stats.integrated_count
     )
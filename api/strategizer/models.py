@@ -16,7 +16,7 @@ from enum import Enum as PyEnum
 
 from sqlalchemy import (
     Column, String, Text, DateTime, Boolean, Integer,
-    ForeignKey, JSON, Enum, Index
+    ForeignKey, JSON, Enum, Index, func, text
 )
 from sqlalchemy.orm import relationship, declarative_base
 
@@ -279,7 +279,7 @@ class StrategizerDialogueTurn(Base):
 
     # Indices
     __table_args__ = (
-        Index("idx_strategizer_dialogue_project", "project_id"),
+        Index("idx_strategizer_dialogue_project_created", "project_id", "created_at", "id"),
     )
 
 
@@ -353,6 +353,8 @@ class StrategizerEvidenceFragment(Base):
     __table_args__ = (
         Index("idx_strategizer_fragment_source", "source_id"),
         Index("idx_strategizer_fragment_status", "analysis_status"),
+        # Keyset order of the pending-decision queue
+        Index("idx_strategizer_fragment_status_created", "analysis_status", "created_at", "id"),
     )
 
 
@@ -500,3 +502,56 @@ class StrategizerPredicament(Base):
         Index("idx_strategizer_predicament_status", "status"),
         Index("idx_strategizer_predicament_type", "predicament_type"),
     )
+
+
+class CoherenceRunStatus(str, PyEnum):
+    """Lifecycle status of a background deep-coherence analysis."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class StrategizerCoherenceRun(Base):
+    """
+    One background deep-coherence analysis (Opus + extended thinking).
+
+    The run's event log (status, coalesced thinking, predicaments, final result)
+    is checkpointed here as it progresses, so SSE clients can reconnect with the
+    last event id they saw and a finished run can be replayed.
+
+    The worker executing a run refreshes heartbeat_at; a running row whose
+    heartbeat is stale belongs to a worker that died. At most one run per
+    project is running (partial unique index).
+    """
+    __tablename__ = "strategizer_coherence_runs"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    project_id = Column(String(36), ForeignKey("strategizer_projects.id", ondelete="CASCADE"), nullable=False)
+
+    status = Column(Enum(CoherenceRunStatus), default=CoherenceRunStatus.RUNNING, nullable=False)
+    focus_unit_ids = Column(JSON, default=list)
+
+    # [{"id": 1, "type": "thinking", "data": {...}}, ...] - ids are 1-based and contiguous
+    events = Column(JSON, default=list)
+    result = Column(JSON)  # Same shape as CoherenceMonitor.deep_coherence_analysis()
+    error = Column(Text)
+    thinking_tokens_used = Column(Integer)
+
+    # Timestamps
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now())  # executing worker's lease
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    project = relationship("StrategizerProject", backref="coherence_runs")
+
+    # Indices
+    __table_args__ = (
+        Index("idx_strategizer_coherence_run_project", "project_id", "created_at"),
+        Index(
+            "uq_strategizer_coherence_run_running", "project_id",
+            unique=True, postgresql_where=text("status = 'RUNNING'"),
+        ),
+    )
@@ -0,0 +1,261 @@
+"""
+Strategizer UI Render Cache
+
+The Jinja pages in ui_router are pure functions of a project's rows, so they
+are rendered once per project revision and then served from memory:
+
+- Project revisions are counted per aspect ("project", "units", "evidence",
+  "coherence") by a write_tracking.ScopeRevisions: any flushed or
+  bulk-written row is attributed to its project (walking grid -> unit,
+  fragment -> source, ... through the session's identity map) and bumps that
+  project's aspect, at flush time and again when the transaction ends. Writes
+  that can't be attributed bump the aspect for every project.
+- @cached_page(*aspects) caches a page's rendered HTML under its path params
+  and the revisions of the aspects it shows. Hits skip the database entirely.
+- Responses carry a weak ETag (hash of the HTML) and Last-Modified, answer
+  If-None-Match / If-Modified-Since with 304, and are compressed once per
+  entry (brotli if installed, else gzip) according to Accept-Encoding.
+- fragment_cache holds expensive partials (e.g. the units sidebar) whose
+  inputs are narrower than their page's, so a page re-render after an
+  evidence change doesn't re-query and re-render them.
+
+Writes from other processes are picked up after STRATEGIZER_RENDER_TTL_SECONDS.
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import logging
+import functools
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..write_tracking import ScopeRevisions
+from .models import (
+    StrategizerProject, StrategizerDomain, StrategizerUnit, StrategizerGridInstance,
+    StrategizerEvidenceSource, StrategizerEvidenceFragment, StrategizerEvidenceInterpretation,
+    StrategizerEvidenceDecision, StrategizerPredicament,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+STRATEGIZER_RENDER_TTL_SECONDS = float(os.getenv("STRATEGIZER_RENDER_TTL_SECONDS", "60"))
+STRATEGIZER_RENDER_CACHE_SIZE = int(os.getenv("STRATEGIZER_RENDER_CACHE_SIZE", "256"))
+# Bodies smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+PROJECT = "project"
+UNITS = "units"
+EVIDENCE = "evidence"
+COHERENCE = "coherence"
+
+# (model, aspect, path from the row to its project id; see ScopeRevisions)
+_TRACKED = (
+    (StrategizerProject, PROJECT, ("id",)),
+    (StrategizerDomain, PROJECT, ("project_id",)),
+    (StrategizerUnit, UNITS, ("project_id",)),
+    (StrategizerGridInstance, UNITS, ("unit_id", StrategizerUnit, "project_id")),
+    (StrategizerEvidenceSource, EVIDENCE, ("project_id",)),
+    (StrategizerEvidenceFragment, EVIDENCE, ("source_id", StrategizerEvidenceSource, "project_id")),
+    (StrategizerEvidenceInterpretation, EVIDENCE, (
+        "fragment_id", StrategizerEvidenceFragment, "source_id", StrategizerEvidenceSource, "project_id"
+    )),
+    (StrategizerEvidenceDecision, EVIDENCE, (
+        "fragment_id", StrategizerEvidenceFragment, "source_id", StrategizerEvidenceSource, "project_id"
+    )),
+    (StrategizerPredicament, COHERENCE, ("project_id",)),
+)
+
+
+# =============================================================================
+# REVISIONS
+# =============================================================================
+
+class ProjectRevisions(ScopeRevisions):
+    """Write counters per (project, aspect)."""
+
+    def __init__(self):
+        super().__init__("render_cache")
+        for model, aspect, path in _TRACKED:
+            self.track(model, aspect, path)
+
+    def project_revision(self, project_id: Optional[str], aspects: Tuple[str, ...]) -> tuple:
+        """Revision of one project's aspects, or of every project's when project_id is None."""
+        return tuple(self.revision(aspect, project_id) for aspect in aspects)
+
+
+project_revisions = ProjectRevisions()
+
+
+# =============================================================================
+# CACHES
+# =============================================================================
+
+class RevisionCache:
+    """LRU of values, each valid for one revision and at most the TTL."""
+
+    def __init__(self, max_entries: int = STRATEGIZER_RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[tuple, float, Any]]" = OrderedDict()
+
+    def lookup(self, key: Any, revision: tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != revision or time.monotonic() - entry[1] >= STRATEGIZER_RENDER_TTL_SECONDS:
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def previous(self, key: Any) -> Optional[Any]:
+        """The last stored value, however stale."""
+        entry = self._entries.get(key)
+        return entry[2] if entry is not None else None
+
+    def store(self, key: Any, revision: tuple, value: Any):
+        self._entries[key] = (revision, time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        key: Any,
+        project_id: Optional[str],
+        aspects: Tuple[str, ...],
+        render: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Cached value for the project's current revision, or render() it."""
+        revision = project_revisions.project_revision(project_id, aspects)
+        value = self.lookup(key, revision)
+        if value is None:
+            value = await render()
+            # Don't cache what may already be stale
+            if project_revisions.project_revision(project_id, aspects) == revision:
+                self.store(key, revision, value)
+        return value
+
+
+fragment_cache = RevisionCache()
+page_cache = RevisionCache()
+
+
+class RenderedPage:
+    """A page's HTML with its validators and compressed variants."""
+
+    def __init__(self, body: bytes, last_modified: Optional[float] = None, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.last_modified = last_modified or time.time()
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        if encoding not in self._encoded:
+            if encoding == "br":
+                self._encoded[encoding] = brotli.compress(self.body, quality=5)
+            else:
+                self._encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+        return self._encoded[encoding]
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+def _accepted_encoding(request: Request, size: int) -> Optional[str]:
+    """br or gzip if the client accepts it (q > 0) and the body is worth it."""
+    if size < COMPRESS_MIN_BYTES:
+        return None
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    if BROTLI_AVAILABLE and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _not_modified(request: Request, page: RenderedPage) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return page.etag.removeprefix("W/") in candidates or "*" in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(page.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def page_response(request: Request, page: RenderedPage) -> Response:
+    """Serve a rendered page, honouring conditional and Accept-Encoding headers."""
+    headers = {
+        "ETag": page.etag,
+        "Last-Modified": formatdate(page.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+
+    encoding = _accepted_encoding(request, len(page.body))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=page.encoded(encoding), media_type="text/html", headers=headers)
+
+
+def cached_page(*aspects: str):
+    """
+    Cache a ui_router page under its path params and its project's revision.
+
+    The handler runs only on a miss; a page that isn't a 200 isn't cached.
+    Pages without a project_id param depend on every project's `aspects`.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(**kwargs):
+            request: Request = kwargs["request"]
+            project_id = kwargs.get("project_id")
+            key = (handler.__name__,) + tuple(
+                sorted((name, value) for name, value in kwargs.items() if name not in ("request", "db"))
+            )
+
+            revision = project_revisions.project_revision(project_id, aspects)
+            page = page_cache.lookup(key, revision)
+            if page is None:
+                response = await handler(**kwargs)
+                if response.status_code != 200:
+                    return response
+                page = RenderedPage(response.body)
+                previous = page_cache.previous(key)
+                if previous is not None and previous.etag == page.etag:
+                    # Same HTML as before: keep its validators (and compressed copies)
+                    page = previous
+                if project_revisions.project_revision(project_id, aspects) == revision:
+                    page_cache.store(key, revision, page)
+
+            return page_response(request, page)
+        return wrapper
+    return decorator
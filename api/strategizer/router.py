@@ -15,7 +15,7 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
 
-from ..database import get_db
+from ..database import get_db, release_connection
 from .models import (
     StrategizerProject, StrategizerDomain, StrategizerSeedContent,
     StrategizerUnit, StrategizerGridInstance, StrategizerDialogueTurn,
@@ -36,6 +36,7 @@ from .schemas import (
 )
 from .services.llm import StrategizerLLM
 from .services.coherence_monitor import run_background_coherence_check
+from .services.dialogue import load_dialogue_page, recent_turns, count_turns, load_question_context
 from .grids import get_grid_definition, get_applicable_grids, TIER_1_GRIDS, TIER_2_GRIDS
 
 router = APIRouter(prefix="/api/strategizer", tags=["strategizer"])
@@ -1164,14 +1165,14 @@ async def ask_question(
 ):
     """
     Ask a question and get a framework-aware response.
+
+    The LLM sees the units most relevant to the question, within
+    DIALOGUE_CONTEXT_TOKEN_BUDGET, rather than the whole framework.
     """
-    # Get project with domain and units
+    # Get project with domain (units are ranked and loaded separately)
     result = await db.execute(
         select(StrategizerProject)
-        .options(
-            selectinload(StrategizerProject.domain),
-            selectinload(StrategizerProject.units)
-        )
+        .options(selectinload(StrategizerProject.domain))
         .where(StrategizerProject.id == project_id)
     )
     project = result.scalar_one_or_none()
@@ -1189,17 +1190,11 @@ async def ask_question(
     db.add(user_turn)
     await db.flush()
 
-    # Get recent dialogue history
-    history_result = await db.execute(
-        select(StrategizerDialogueTurn)
-        .where(StrategizerDialogueTurn.project_id == project_id)
-        .order_by(StrategizerDialogueTurn.created_at.desc())
-        .limit(10)
+    # Recent dialogue history and the units worth showing for this question
+    dialogue_history = await recent_turns(db, project_id)
+    units, unit_totals = await load_question_context(
+        db, project_id, request.question, dialogue_history[:-1]
     )
-    dialogue_history = [
-        {"turn_type": t.turn_type.value, "content": t.content}
-        for t in reversed(history_result.scalars().all())
-    ]
 
     # Build context for LLM
     domain_context = {}
@@ -1210,14 +1205,8 @@ async def ask_question(
             "vocabulary": project.domain.vocabulary or {}
         }
 
-    units = [
-        {
-            "unit_type": u.unit_type.value,
-            "name": u.name,
-            "definition": u.definition
-        }
-        for u in project.units
-    ]
+    # Keep the question, but don't hold a connection through the LLM call
+    await release_connection(db)
 
     # Call LLM
     try:
@@ -1226,7 +1215,8 @@ async def ask_question(
             request.question,
             domain_context,
             units,
-            dialogue_history
+            dialogue_history,
+            unit_totals
         )
         response_text = qa_result.get("response", "No response generated")
         implications = qa_result.get("implications")
@@ -1270,26 +1260,32 @@ async def ask_question(
 async def get_dialogue_history(
     project_id: str,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    before: Optional[str] = Query(None, description="Turn id: return the turns just older than this one"),
+    after: Optional[str] = Query(None, description="Turn id: return the turns just newer than this one"),
+    offset: Optional[int] = Query(None, ge=0, description="Deprecated: use before/after cursors"),
+    include_total: bool = Query(False, description="Also COUNT the project's turns"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get dialogue history for a project."""
-    # Count total
-    count_result = await db.execute(
-        select(func.count(StrategizerDialogueTurn.id))
-        .where(StrategizerDialogueTurn.project_id == project_id)
-    )
-    total_count = count_result.scalar() or 0
+    """
+    Get dialogue history for a project, newest page first, turns in chronological order.
 
-    # Get turns
-    result = await db.execute(
-        select(StrategizerDialogueTurn)
-        .where(StrategizerDialogueTurn.project_id == project_id)
-        .order_by(StrategizerDialogueTurn.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-    )
-    turns = result.scalars().all()
+    Page backwards with before=<turns[0].id> while has_older is set.
+    """
+    if offset is not None:
+        # Legacy offset paging, kept for existing clients
+        result = await db.execute(
+            select(StrategizerDialogueTurn)
+            .where(StrategizerDialogueTurn.project_id == project_id)
+            .order_by(StrategizerDialogueTurn.created_at.desc(), StrategizerDialogueTurn.id.desc())
+            .limit(limit + 1)
+            .offset(offset)
+        )
+        rows = result.scalars().all()
+        turns = list(reversed(rows[:limit]))
+        has_older, has_newer = len(rows) > limit, offset > 0
+    else:
+        page = await load_dialogue_page(db, project_id, before=before, after=after, limit=limit)
+        turns, has_older, has_newer = page.turns, page.has_older, page.has_newer
 
     return DialogueHistoryResponse(
         turns=[
@@ -1302,9 +1298,11 @@ async def get_dialogue_history(
                 actions_taken=turn.actions_taken or [],
                 created_at=turn.created_at
             )
-            for turn in reversed(turns)  # Chronological order
+            for turn in turns
         ],
-        total_count=total_count
+        total_count=await count_turns(db, project_id) if include_total or offset is not None else None,
+        has_older=has_older,
+        has_newer=has_newer
     )
 
 
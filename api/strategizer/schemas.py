@@ -272,9 +272,11 @@ class DialogueTurnResponse(BaseModel):
 
 
 class DialogueHistoryResponse(BaseModel):
-    """Dialogue history for a project."""
+    """Dialogue history for a project (one page, chronological)."""
     turns: List[DialogueTurnResponse]
-    total_count: int
+    total_count: Optional[int] = None  # only with include_total (or legacy offset paging)
+    has_older: bool = False
+    has_newer: bool = False
 
 
 # =============================================================================
@@ -456,6 +458,20 @@ class PendingDecisionResponse(BaseModel):
     interpretations: List[InterpretationResponse]
 
 
+class DecisionQueueResponse(BaseModel):
+    """A window of the pending-decision queue: the current decision plus prefetched ones."""
+    decisions: List[PendingDecisionResponse]
+    total_pending: int
+    position: int  # 1-based position of decisions[0] ("Decision X of Y"); 0 when empty
+    next_cursor: Optional[str] = None  # Pass as ?after= for the following decisions
+    previous_cursor: Optional[str] = None  # Pass as ?before= for the preceding decisions
+
+
+class PendingDecisionCountResponse(BaseModel):
+    """Number of decisions awaiting review."""
+    total_pending: int
+
+
 class DecisionRequest(BaseModel):
     """Request to resolve a decision."""
     interpretation_id: Optional[str] = None  # None if rejecting all
@@ -610,6 +626,25 @@ class CoherenceCheckResponse(BaseModel):
     thinking_tokens_used: Optional[int] = None
 
 
+class CoherenceRunStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class DeepAnalysisRunResponse(BaseModel):
+    """A background deep-coherence analysis and where to stream its events."""
+    run_id: str
+    project_id: str
+    status: CoherenceRunStatus
+    event_count: int
+    events_url: str
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+
 class PredicamentResolveRequest(BaseModel):
     """Request to resolve a predicament into a dialectic."""
     resolution_approach: str = Field(
@@ -12,14 +12,21 @@ Predicament lifecycle: DETECTED → ANALYZING → RESOLVED → DIALECTIC (or DEF
 
 import os
 import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import threading
+import contextvars
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
-from anthropic import Anthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from ...database import release_connection
+from ...llm_clients import get_llm_client, tier_for_model, SONNET, OPUS
+from ...llm_scheduler import run_llm_call, llm_priority, BACKGROUND
+from ...single_flight import SingleFlight, fingerprint
+from ...structured_output import JsonItemScanner, extract_json
 from ..models import (
     StrategizerProject,
     StrategizerDomain,
@@ -65,6 +72,10 @@ SONNET_MODEL = os.getenv("STRATEGIZER_MODEL", "claude-sonnet-4-5-20250929")
 OPUS_MODEL = "claude-opus-4-5-20251101"
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+# Several framework edits in a row trigger background checks that scan the
+# same framework concurrently; those run once
+_quick_scan_flights = SingleFlight("coherence.quick-scan")
+
 
 class CoherenceMonitor:
     """
@@ -77,7 +88,8 @@ class CoherenceMonitor:
     def __init__(self):
         if not ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        self.client = Anthropic(api_key=ANTHROPIC_API_KEY)
+        self.client = get_llm_client(SONNET)
+        self.opus_client = get_llm_client(OPUS)
         self.sonnet_model = SONNET_MODEL
         self.opus_model = OPUS_MODEL
 
@@ -112,8 +124,23 @@ class CoherenceMonitor:
             evidence_summary=context["evidence_summary"]
         )
 
+        # An identical scan already running (same project, same framework
+        # state) is joined rather than repeated, and saves its predicaments once
+        return await _quick_scan_flights.run(
+            fingerprint(project_id, prompt),
+            lambda: self._run_quick_scan(db, project_id, prompt, context["unit_name_to_id"]),
+        )
+
+    async def _run_quick_scan(
+        self,
+        db: AsyncSession,
+        project_id: str,
+        prompt: str,
+        unit_name_to_id: Dict[str, str]
+    ) -> Dict[str, Any]:
         # Call Sonnet (fast, minimal thinking)
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.sonnet_model,
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
@@ -124,7 +151,7 @@ class CoherenceMonitor:
 
         # Save new predicaments to database
         new_predicaments = await self._save_predicaments(
-            db, project_id, predicaments, context["unit_name_to_id"]
+            db, project_id, predicaments, unit_name_to_id
         )
 
         return {
@@ -162,10 +189,41 @@ class CoherenceMonitor:
         Returns:
             Dict with full coherence report including predicaments
         """
+        async for event in self.deep_coherence_events(db, project_id, focus_unit_ids):
+            if event["type"] == "error":
+                return {"error": event["message"]}
+            if event["type"] == "result":
+                return event["result"]
+        return {"error": "Deep analysis produced no result"}
+
+    async def deep_coherence_events(
+        self,
+        db: AsyncSession,
+        project_id: str,
+        focus_unit_ids: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Deep coherence analysis as a stream of events, for background runs.
+
+        Yields, in order:
+        - {"type": "status", "message": ...}
+        - {"type": "thinking", "content": ...} - raw thinking deltas
+        - {"type": "predicament", "index": n, "predicament": {...}} - each
+          predicament as soon as its JSON object is complete in the response
+        - {"type": "result", "result": {...}} - same dict deep_coherence_analysis returns
+        or a single {"type": "error", "message": ...} if the project can't be analyzed.
+
+        The Opus stream runs in a worker thread, and the session's connection is
+        released while it does.
+        """
+        yield {"type": "status", "message": "Gathering framework context..."}
+
         # Gather detailed framework context
         context = await self._gather_framework_context(db, project_id, full_detail=True)
         if "error" in context:
-            return context
+            yield {"type": "error", "message": context["error"]}
+            return
+        await release_connection(db)
 
         # Build comprehensive prompt
         prompt = DEEP_ANALYSIS_PROMPT.format(
@@ -183,12 +241,16 @@ class CoherenceMonitor:
             evidence_detail=context["evidence_detail"]
         )
 
+        yield {"type": "status", "message": "Analyzing framework coherence..."}
+
         # Use streaming for Opus 4.5 with extended thinking
         thinking_content = ""
         response_text = ""
         thinking_tokens = 0
+        scanner = JsonItemScanner("predicaments")
+        streamed_count = 0
 
-        with self.client.messages.stream(
+        async for kind, payload in self._stream_in_thread(
             model=self.opus_model,
             max_tokens=16000,
             thinking={
@@ -196,20 +258,20 @@ class CoherenceMonitor:
                 "budget_tokens": 10000  # Generous thinking budget
             },
             messages=[{"role": "user", "content": prompt}]
-        ) as stream:
-            for event in stream:
-                if hasattr(event, 'type'):
-                    if event.type == 'content_block_delta':
-                        if hasattr(event.delta, 'thinking'):
-                            thinking_content += event.delta.thinking
-                        elif hasattr(event.delta, 'text'):
-                            response_text += event.delta.text
-
-            # Get final message for usage stats
-            final_message = stream.get_final_message()
-            if hasattr(final_message, 'usage'):
+        ):
+            if kind == "thinking":
+                thinking_content += payload
+                yield {"type": "thinking", "content": payload}
+            elif kind == "text":
+                response_text += payload
+                for _, predicament in scanner.feed(payload):
+                    if not isinstance(predicament, dict):
+                        continue
+                    yield {"type": "predicament", "index": streamed_count, "predicament": predicament}
+                    streamed_count += 1
+            elif kind == "final_message" and hasattr(payload, 'usage'):
                 # Extended thinking tokens are tracked separately
-                thinking_tokens = getattr(final_message.usage, 'thinking_tokens', 0)
+                thinking_tokens = getattr(payload.usage, 'thinking_tokens', 0)
 
         # Parse the analysis
         analysis = self._parse_json_response(response_text, {
@@ -223,11 +285,14 @@ class CoherenceMonitor:
 
         # Save predicaments
         predicaments = analysis.get("predicaments", [])
+        for predicament in predicaments[streamed_count:]:
+            yield {"type": "predicament", "index": streamed_count, "predicament": predicament}
+            streamed_count += 1
         new_predicaments = await self._save_predicaments(
             db, project_id, predicaments, context["unit_name_to_id"]
         )
 
-        return {
+        yield {"type": "result", "result": {
             "analysis_depth": "deep",
             "overall_coherence": analysis.get("overall_coherence", 0.5),
             "coherence_assessment": analysis.get("coherence_assessment", ""),
@@ -239,7 +304,53 @@ class CoherenceMonitor:
             "priority_issues": analysis.get("priority_issues", []),
             "thinking_tokens_used": thinking_tokens,
             "thinking_summary": thinking_content[:500] if thinking_content else None
-        }
+        }}
+
+    async def _stream_in_thread(self, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run a blocking messages.stream() call in a worker thread, yielding
+        ("thinking" | "text", delta) pairs and finally ("final_message", message)
+        without blocking the event loop. Closing the iterator early stops the
+        worker at its next event.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def worker():
+            try:
+                client = self.opus_client if tier_for_model(kwargs.get("model")) == OPUS else self.client
+                with client.messages.stream(**kwargs) as stream:
+                    for event in stream:
+                        if stop.is_set():
+                            return
+                        if getattr(event, 'type', None) == 'content_block_delta':
+                            if hasattr(event.delta, 'thinking'):
+                                put(("thinking", event.delta.thinking))
+                            elif hasattr(event.delta, 'text'):
+                                put(("text", event.delta.text))
+                    put(("final_message", stream.get_final_message()))
+            except Exception as e:
+                put(("error", e))
+            finally:
+                put(done)
+
+        # Carry the caller's context (LLM priority) into the worker
+        loop.run_in_executor(None, contextvars.copy_context().run, worker)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                if item[0] == "error":
+                    raise item[1]
+                yield item
+        finally:
+            stop.set()
 
     # =========================================================================
     # PREDICAMENT GRID GENERATION
@@ -378,7 +489,8 @@ class CoherenceMonitor:
             prompt = prompt + refinement_instruction
 
         # Generate grid (Sonnet is fine for this)
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.sonnet_model,
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
@@ -481,7 +593,8 @@ class CoherenceMonitor:
         )
 
         # Get LLM guidance on dialectic structure
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.sonnet_model,
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
@@ -597,7 +710,8 @@ class CoherenceMonitor:
             other_slots_context=other_slots_context
         )
 
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.sonnet_model,
             max_tokens=2048,
             messages=[{"role": "user", "content": prompt}]
@@ -770,7 +884,7 @@ class CoherenceMonitor:
             thinking_content = ""
             text_content = ""
 
-            with self.client.messages.stream(
+            with self.opus_client.messages.stream(
                 model=self.opus_model,
                 max_tokens=16000,
                 thinking={
@@ -905,7 +1019,8 @@ Content: {cell.get('content', 'No analysis provided')}
 
         try:
             # Use Sonnet for fast action generation
-            response = self.client.messages.create(
+            response = await run_llm_call(
+                self.client.messages.create,
                 model=self.sonnet_model,
                 max_tokens=2000,
                 messages=[{"role": "user", "content": prompt}]
@@ -1017,7 +1132,7 @@ Content: {cell.get('content', 'No analysis provided')}
             text_content = ""
 
             # Use Opus 4.5 with extended thinking
-            with self.client.messages.stream(
+            with self.opus_client.messages.stream(
                 model=self.opus_model,
                 max_tokens=16000,
                 thinking={
@@ -1108,7 +1223,8 @@ Content: {cell.get('content', 'No analysis provided')}
 
         try:
             # Use Sonnet for fast generation
-            response = self.client.messages.create(
+            response = await run_llm_call(
+                self.client.messages.create,
                 model=self.sonnet_model,
                 max_tokens=2000,
                 messages=[{"role": "user", "content": prompt}]
@@ -1429,18 +1545,10 @@ Content: {cell.get('content', 'No analysis provided')}
         response_text: str,
         fallback: Any
     ) -> Any:
-        """Parse JSON response with fallback."""
+        """Parse JSON response (wherever it sits in the text) with fallback."""
         try:
-            text = response_text.strip()
-            # Remove markdown code blocks if present
-            if text.startswith("```"):
-                lines = text.split("\n")
-                start = 1 if lines[0].startswith("```") else 0
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                text = "\n".join(lines[start:end])
-
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return extract_json(response_text)
+        except ValueError:
             return fallback
 
 
@@ -1472,7 +1580,8 @@ async def run_background_coherence_check(project_id: str, trigger_reason: str) -
 
         async with AsyncSessionLocal() as db:
             monitor = CoherenceMonitor()
-            result = await monitor.quick_coherence_scan(db, project_id)
+            with llm_priority(BACKGROUND, project=project_id):
+                result = await monitor.quick_coherence_scan(db, project_id)
 
             if "error" in result:
                 logger.warning(f"Background coherence check failed: {result['error']}")
@@ -0,0 +1,415 @@
+"""
+Background Deep-Coherence Runs
+
+Deep analysis (Opus + 10K thinking) takes minutes, so instead of holding a
+request open it runs as a background task, at most one per project. Each run
+keeps an ordered event log:
+
+    status       {"message": ...}
+    thinking     {"content": ...}            - deltas coalesced to ~THINKING_FLUSH_CHARS
+    predicament  {"index": n, "predicament": {...}}
+    complete     {"result": {...}}            - terminal
+    error        {"message": ...}             - terminal
+
+Subscribers stream the log over SSE starting after any event id, so a client
+that reconnects resumes where it left off instead of starting a new Opus run.
+The log is checkpointed to strategizer_coherence_runs every
+DEEP_ANALYSIS_CHECKPOINT_SECONDS (and on every predicament / terminal event),
+so finished runs can be replayed after they leave memory.
+
+Runs can be read from any worker. The executing worker holds a lease: it
+refreshes heartbeat_at every COHERENCE_RUN_HEARTBEAT_SECONDS. Another worker
+asked about a running run follows it from its checkpoints, and only reports
+it failed once the lease is older than COHERENCE_RUN_STALE_SECONDS (the
+executing worker died or restarted). One run per project is enforced by a
+partial unique index, so a second start on another worker returns the run
+already in progress.
+
+Configuration (env):
+    DEEP_ANALYSIS_CHECKPOINT_SECONDS  checkpoint interval, and how often other workers re-read it (default 3)
+    COHERENCE_RUN_STALE_SECONDS       lease age after which a running run is failed (default 60)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import session_scope, AsyncSessionLocal
+from ...llm_scheduler import set_llm_priority, BATCH
+from ..models import StrategizerCoherenceRun, CoherenceRunStatus, generate_uuid
+from .coherence_monitor import CoherenceMonitor
+
+logger = logging.getLogger(__name__)
+
+DEEP_ANALYSIS_CHECKPOINT_SECONDS = float(os.getenv("DEEP_ANALYSIS_CHECKPOINT_SECONDS", "3"))
+COHERENCE_RUN_STALE_SECONDS = float(os.getenv("COHERENCE_RUN_STALE_SECONDS", "60"))
+COHERENCE_RUN_HEARTBEAT_SECONDS = 15.0
+THINKING_FLUSH_CHARS = 400
+THINKING_FLUSH_SECONDS = 0.5
+# Finished runs stay in memory this long for late subscribers, then replay from the DB
+FINISHED_RUN_TTL_SECONDS = 300
+
+
+class DeepAnalysisRun:
+    """In-memory state of one run: its event log and a condition to wake subscribers."""
+
+    def __init__(
+        self,
+        run_id: str,
+        project_id: str,
+        status: CoherenceRunStatus = CoherenceRunStatus.RUNNING,
+        events: Optional[List[Dict[str, Any]]] = None,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ):
+        self.run_id = run_id
+        self.project_id = project_id
+        self.status = status
+        self.events: List[Dict[str, Any]] = list(events or [])
+        self.started_at = started_at
+        self.completed_at = completed_at
+        self.error = error
+        self.result = result
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @classmethod
+    def from_row(cls, row: StrategizerCoherenceRun) -> "DeepAnalysisRun":
+        return cls(
+            row.id, row.project_id, row.status, row.events,
+            started_at=row.started_at, completed_at=row.completed_at,
+            error=row.error, result=row.result,
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status != CoherenceRunStatus.RUNNING
+
+    async def append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        event = {"id": len(self.events) + 1, "type": event_type, "data": data}
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+        return event
+
+    async def finish(self, status: CoherenceRunStatus, error: Optional[str] = None):
+        async with self._changed:
+            self.status = status
+            self.error = error
+            self.completed_at = datetime.utcnow()
+            self._changed.notify_all()
+
+    async def iter_events(self, after: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Events with id > after, then live ones until the run finishes. Yields
+        None every `heartbeat` seconds of silence so the caller can keep the
+        connection alive.
+        """
+        while True:
+            for event in self.events[after:]:
+                yield event
+                after = event["id"]
+
+            async with self._changed:
+                if len(self.events) > after:
+                    continue
+                if self.finished:
+                    return
+                try:
+                    await asyncio.wait_for(self._changed.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    pass
+            if len(self.events) <= after and not self.finished:
+                yield None
+
+
+# run_id -> run, for runs executing or followed here and recently finished ones
+_runs: Dict[str, DeepAnalysisRun] = {}
+# project_id -> run_id of the analysis this process is executing
+_running_by_project: Dict[str, str] = {}
+
+INTERRUPTED_MESSAGE = "Deep analysis was interrupted: the server running it stopped"
+
+
+# =============================================================================
+# CHECKPOINTS
+# =============================================================================
+
+async def _checkpoint(run: DeepAnalysisRun):
+    """Persist the run's event log and status."""
+    values = {
+        "events": list(run.events),
+        "status": run.status,
+        "error": run.error,
+        "completed_at": run.completed_at,
+        "heartbeat_at": func.now(),
+    }
+    if run.result is not None:
+        values["result"] = run.result
+        values["thinking_tokens_used"] = run.result.get("thinking_tokens_used")
+    try:
+        async with session_scope() as db:
+            await db.execute(
+                update(StrategizerCoherenceRun)
+                .where(StrategizerCoherenceRun.id == run.run_id)
+                .values(**values)
+            )
+    except Exception as e:
+        # A missed checkpoint only costs replay granularity; the run carries on
+        logger.warning(f"Coherence run {run.run_id} checkpoint failed: {e}")
+
+
+async def _heartbeat(run: DeepAnalysisRun):
+    """Renew the run's lease while it executes, including quiet stretches (e.g. queued for admission)."""
+    while True:
+        await asyncio.sleep(COHERENCE_RUN_HEARTBEAT_SECONDS)
+        try:
+            async with session_scope() as db:
+                await db.execute(
+                    update(StrategizerCoherenceRun)
+                    .where(StrategizerCoherenceRun.id == run.run_id)
+                    .values(heartbeat_at=func.now())
+                )
+        except Exception as e:
+            logger.warning(f"Coherence run {run.run_id} heartbeat failed: {e}")
+
+
+def _lease_expired():
+    return or_(
+        StrategizerCoherenceRun.heartbeat_at.is_(None),
+        StrategizerCoherenceRun.heartbeat_at < func.now() - timedelta(seconds=COHERENCE_RUN_STALE_SECONDS),
+    )
+
+
+async def _load_row(
+    db: AsyncSession, project_id: str, run_id: str
+) -> Optional[Tuple[StrategizerCoherenceRun, bool]]:
+    """The run's row and whether it is running with an expired lease."""
+    loaded = (await db.execute(
+        select(
+            StrategizerCoherenceRun,
+            (StrategizerCoherenceRun.status == CoherenceRunStatus.RUNNING) & _lease_expired(),
+        ).where(
+            StrategizerCoherenceRun.id == run_id,
+            StrategizerCoherenceRun.project_id == project_id,
+        )
+    )).first()
+    return (loaded[0], bool(loaded[1])) if loaded is not None else None
+
+
+async def _fail_interrupted(db: AsyncSession, run: DeepAnalysisRun) -> bool:
+    """
+    Record a run whose lease expired as failed. Returns False (and leaves the
+    run as it was) if its worker renewed the lease in the meantime.
+    """
+    events = run.events + [{"id": len(run.events) + 1, "type": "error", "data": {"message": INTERRUPTED_MESSAGE}}]
+    completed_at = datetime.utcnow()
+    result = await db.execute(
+        update(StrategizerCoherenceRun)
+        .where(
+            StrategizerCoherenceRun.id == run.run_id,
+            StrategizerCoherenceRun.status == CoherenceRunStatus.RUNNING,
+            _lease_expired(),
+        )
+        .values(
+            events=events, status=CoherenceRunStatus.FAILED,
+            error=INTERRUPTED_MESSAGE, completed_at=completed_at,
+        )
+    )
+    if result.rowcount == 0:
+        return False
+    await run.append("error", {"message": INTERRUPTED_MESSAGE})
+    await run.finish(CoherenceRunStatus.FAILED, INTERRUPTED_MESSAGE)
+    run.completed_at = completed_at
+    return True
+
+
+async def _follow_remote(run: DeepAnalysisRun):
+    """Mirror a run executing on another worker from its checkpoints."""
+    try:
+        while not run.finished:
+            await asyncio.sleep(DEEP_ANALYSIS_CHECKPOINT_SECONDS)
+            try:
+                async with session_scope() as db:
+                    loaded = await _load_row(db, run.project_id, run.run_id)
+                    if loaded is None:
+                        await run.append("error", {"message": "Deep analysis run was deleted"})
+                        await run.finish(CoherenceRunStatus.FAILED, "Deleted")
+                        return
+                    row, expired = loaded
+                    for event in (row.events or [])[len(run.events):]:
+                        await run.append(event["type"], event["data"])
+                    if row.status != CoherenceRunStatus.RUNNING:
+                        run.result = row.result
+                        run.completed_at = row.completed_at
+                        await run.finish(row.status, row.error)
+                    elif expired:
+                        await _fail_interrupted(db, run)
+            except Exception as e:
+                logger.warning(f"Following coherence run {run.run_id} failed: {e}")
+    finally:
+        asyncio.get_running_loop().call_later(FINISHED_RUN_TTL_SECONDS, _runs.pop, run.run_id, None)
+
+
+# =============================================================================
+# EXECUTION
+# =============================================================================
+
+async def _execute(run: DeepAnalysisRun, focus_unit_ids: Optional[List[str]]):
+    """Drive CoherenceMonitor.deep_coherence_events() into the run's event log."""
+    set_llm_priority(BATCH, project=run.project_id)
+    thinking_buffer = ""
+    last_flush = last_checkpoint = time.monotonic()
+
+    async def flush_thinking():
+        nonlocal thinking_buffer, last_flush
+        if thinking_buffer:
+            await run.append("thinking", {"content": thinking_buffer})
+            thinking_buffer = ""
+        last_flush = time.monotonic()
+
+    heartbeat = asyncio.create_task(_heartbeat(run))
+    try:
+        monitor = CoherenceMonitor()
+        async with AsyncSessionLocal() as db:
+            async for event in monitor.deep_coherence_events(db, run.project_id, focus_unit_ids):
+                event_type = event.pop("type")
+
+                if event_type == "thinking":
+                    thinking_buffer += event["content"]
+                    if len(thinking_buffer) >= THINKING_FLUSH_CHARS or time.monotonic() - last_flush >= THINKING_FLUSH_SECONDS:
+                        await flush_thinking()
+                else:
+                    await flush_thinking()
+                    if event_type == "result":
+                        run.result = event["result"]
+                        await run.append("complete", {"result": run.result})
+                    else:
+                        await run.append(event_type, event)
+
+                if event_type in ("predicament", "result", "error") or \
+                        time.monotonic() - last_checkpoint >= DEEP_ANALYSIS_CHECKPOINT_SECONDS:
+                    await _checkpoint(run)
+                    last_checkpoint = time.monotonic()
+
+                if event_type == "error":
+                    await run.finish(CoherenceRunStatus.FAILED, event.get("message"))
+                    return
+
+        await flush_thinking()
+        if run.result is None:
+            await run.append("error", {"message": "Deep analysis produced no result"})
+            await run.finish(CoherenceRunStatus.FAILED, "Deep analysis produced no result")
+        else:
+            await run.finish(CoherenceRunStatus.COMPLETED)
+
+    except asyncio.CancelledError:
+        await run.append("error", {"message": "Deep analysis was cancelled"})
+        await run.finish(CoherenceRunStatus.FAILED, "Cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"Deep coherence run {run.run_id} failed: {e}", exc_info=True)
+        await flush_thinking()
+        await run.append("error", {"message": str(e)})
+        await run.finish(CoherenceRunStatus.FAILED, str(e))
+    finally:
+        heartbeat.cancel()
+        await _checkpoint(run)
+        if _running_by_project.get(run.project_id) == run.run_id:
+            del _running_by_project[run.project_id]
+        asyncio.get_running_loop().call_later(
+            FINISHED_RUN_TTL_SECONDS, _runs.pop, run.run_id, None
+        )
+
+
+async def start_deep_analysis(project_id: str, focus_unit_ids: Optional[List[str]] = None) -> DeepAnalysisRun:
+    """Start a background deep analysis, or return the project's run already in progress (on any worker)."""
+    running_id = _running_by_project.get(project_id)
+    if running_id and running_id in _runs and not _runs[running_id].finished:
+        return _runs[running_id]
+
+    for _ in range(2):
+        run = DeepAnalysisRun(generate_uuid(), project_id, started_at=datetime.utcnow())
+        try:
+            async with session_scope() as db:
+                db.add(StrategizerCoherenceRun(
+                    id=run.run_id,
+                    project_id=project_id,
+                    status=CoherenceRunStatus.RUNNING,
+                    focus_unit_ids=focus_unit_ids or [],
+                    events=[],
+                    started_at=run.started_at,
+                ))
+            break
+        except IntegrityError:
+            # The unique index: a run is already marked running for this project
+            async with session_scope() as db:
+                running_id = await db.scalar(
+                    select(StrategizerCoherenceRun.id).where(
+                        StrategizerCoherenceRun.project_id == project_id,
+                        StrategizerCoherenceRun.status == CoherenceRunStatus.RUNNING,
+                    )
+                )
+            existing = await get_run(project_id, running_id) if running_id else None
+            if existing is not None and not existing.finished:
+                return existing
+            # It finished or its lease had expired and it was just failed: start ours
+    else:
+        raise RuntimeError(f"Could not start a deep analysis run for project {project_id}")
+
+    _runs[run.run_id] = run
+    _running_by_project[project_id] = run.run_id
+    run.task = asyncio.create_task(_execute(run, focus_unit_ids))
+    logger.info(f"Deep coherence run {run.run_id} started for project {project_id}")
+    return run
+
+
+async def get_run(project_id: str, run_id: str) -> Optional[DeepAnalysisRun]:
+    """
+    The run from memory, or replayed from its last checkpoint. A run still
+    executing on another worker is followed from its checkpoints; one whose
+    lease expired is recorded as failed.
+    """
+    run = _runs.get(run_id)
+    if run is not None:
+        return run if run.project_id == project_id else None
+
+    async with session_scope() as db:
+        loaded = await _load_row(db, project_id, run_id)
+        if loaded is None:
+            return None
+        row, expired = loaded
+
+        run = DeepAnalysisRun.from_row(row)
+        if not run.finished and not (expired and await _fail_interrupted(db, run)):
+            # Executing on another worker: follow its checkpoints
+            following = _runs.setdefault(run.run_id, run)
+            if following is not run:
+                return following
+            run.task = asyncio.create_task(_follow_remote(run))
+    return run
+
+
+async def latest_run(project_id: str) -> Optional[DeepAnalysisRun]:
+    """The project's most recent run (running or not)."""
+    in_memory = [run for run in _runs.values() if run.project_id == project_id]
+    if in_memory:
+        return max(in_memory, key=lambda run: run.started_at or datetime.min)
+
+    async with session_scope() as db:
+        run_id = await db.scalar(
+            select(StrategizerCoherenceRun.id)
+            .where(StrategizerCoherenceRun.project_id == project_id)
+            .order_by(StrategizerCoherenceRun.created_at.desc())
+            .limit(1)
+        )
+    return await get_run(project_id, run_id) if run_id else None
@@ -0,0 +1,241 @@
+"""
+Dialogue - History Paging and Bounded Q&A Context
+
+Dialogue history is read newest-first in pages addressed by cursor: the id of
+a turn, resolved to its (created_at, id) sort key, served by the
+(project_id, created_at, id) index. Paging doesn't COUNT the project's turns;
+callers that want a total ask for it.
+
+For /ask, the framework context sent to the LLM is no longer every unit in the
+project. Units are ranked lexically (BM25 over name and definition) against
+the question plus the recent turns, and packed most relevant first until
+DIALOGUE_CONTEXT_TOKEN_BUDGET is spent. Units that share no terms with the
+question only fill whatever budget is left, so a small framework is still
+sent whole. There is no embedding store in this service, hence lexical ranking.
+
+Configuration (env):
+    DIALOGUE_CONTEXT_TOKEN_BUDGET  estimated tokens of unit context per question (default 1500)
+"""
+
+import os
+import re
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...evidence_chunking import estimate_tokens
+from ..models import StrategizerDialogueTurn, StrategizerUnit
+
+DIALOGUE_CONTEXT_TOKEN_BUDGET = int(os.getenv("DIALOGUE_CONTEXT_TOKEN_BUDGET", "1500"))
+# Turns fed to the prompt (and to ranking) alongside the question
+DIALOGUE_HISTORY_TURNS = 10
+
+# The Q&A prompt shows at most this much of each definition (see _format_units)
+UNIT_DEFINITION_PROMPT_CHARS = 100
+
+# BM25 parameters; names count twice as much as definitions
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_WEIGHT = 2
+# Terms from earlier turns count for less than the question itself
+HISTORY_TERM_WEIGHT = 0.3
+
+_TERM_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has him his how its "
+    "may new now old see two who did get let put say she too use what when where which while "
+    "with this that from they them their there these those then than into over such only "
+    "also been being have does doing would could should about after before between through "
+    "more most other some very just your will shall each much many why whom".split()
+)
+
+
+class DialoguePage:
+    """One window of a project's dialogue, in chronological order."""
+
+    def __init__(self, turns: List[StrategizerDialogueTurn], has_older: bool, has_newer: bool):
+        self.turns = turns
+        self.has_older = has_older
+        self.has_newer = has_newer
+
+
+# =============================================================================
+# HISTORY
+# =============================================================================
+
+def _sort_key():
+    return tuple_(StrategizerDialogueTurn.created_at, StrategizerDialogueTurn.id)
+
+
+async def count_turns(db: AsyncSession, project_id: str) -> int:
+    return await db.scalar(
+        select(func.count())
+        .select_from(StrategizerDialogueTurn)
+        .where(StrategizerDialogueTurn.project_id == project_id)
+    ) or 0
+
+
+async def load_dialogue_page(
+    db: AsyncSession,
+    project_id: str,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = 50,
+) -> DialoguePage:
+    """
+    Up to `limit` turns, returned oldest first.
+
+    With no cursor, the latest turns. `before` / `after` are turn ids: the
+    turns just older / newer than that one. An unknown cursor falls back to
+    the latest page.
+    """
+    Turn = StrategizerDialogueTurn
+    cursor = after if after is not None else before
+
+    anchor = None
+    if cursor is not None:
+        anchor = (await db.execute(
+            select(Turn.created_at, Turn.id).where(Turn.id == cursor, Turn.project_id == project_id)
+        )).first()
+
+    stmt = select(Turn).where(Turn.project_id == project_id)
+    forward = anchor is not None and after is not None
+    if forward:
+        stmt = stmt.where(_sort_key() > tuple(anchor)).order_by(Turn.created_at, Turn.id)
+    else:
+        if anchor is not None:
+            stmt = stmt.where(_sort_key() < tuple(anchor))
+        stmt = stmt.order_by(Turn.created_at.desc(), Turn.id.desc())
+
+    # One extra row tells us whether there is more beyond this page
+    turns = list((await db.execute(stmt.limit(limit + 1))).scalars().all())
+    more = len(turns) > limit
+    turns = turns[:limit]
+
+    if forward:
+        return DialoguePage(turns, has_older=True, has_newer=more)
+    turns.reverse()
+    return DialoguePage(turns, has_older=more, has_newer=anchor is not None)
+
+
+async def recent_turns(db: AsyncSession, project_id: str, limit: int = DIALOGUE_HISTORY_TURNS) -> List[Dict[str, Any]]:
+    """The last `limit` turns as prompt dicts, oldest first."""
+    rows = (await db.execute(
+        select(StrategizerDialogueTurn.turn_type, StrategizerDialogueTurn.content)
+        .where(StrategizerDialogueTurn.project_id == project_id)
+        .order_by(StrategizerDialogueTurn.created_at.desc(), StrategizerDialogueTurn.id.desc())
+        .limit(limit)
+    )).all()
+    return [
+        {"turn_type": turn_type.value, "content": content}
+        for turn_type, content in reversed(rows)
+    ]
+
+
+# =============================================================================
+# CONTEXT ASSEMBLY
+# =============================================================================
+
+def _terms(text: Optional[str]) -> List[str]:
+    return [
+        term for term in _TERM_RE.findall((text or "").lower())
+        if len(term) > 2 and term not in _STOPWORDS
+    ]
+
+
+def _prompt_tokens(unit: Dict[str, Any]) -> int:
+    """Estimated cost of one unit's line in the Q&A prompt."""
+    definition = (unit.get("definition") or "")[:UNIT_DEFINITION_PROMPT_CHARS]
+    return estimate_tokens(f"- {unit.get('name', '')}: {definition}...\n")
+
+
+def rank_units(
+    question: str,
+    units: List[Dict[str, Any]],
+    dialogue_history: Optional[List[Dict[str, Any]]] = None,
+) -> List[Tuple[float, Dict[str, Any]]]:
+    """(BM25 score, unit) pairs, best first; ties keep the units' original order."""
+    query: Dict[str, float] = {}
+    for turn in dialogue_history or []:
+        for term in _terms(turn.get("content")):
+            query[term] = max(query.get(term, 0.0), HISTORY_TERM_WEIGHT)
+    for term in _terms(question):
+        query[term] = 1.0
+
+    docs = [
+        Counter(_terms(u.get("name")) * NAME_WEIGHT + _terms(u.get("definition")))
+        for u in units
+    ]
+    if not docs or not query:
+        return [(0.0, u) for u in units]
+
+    avg_length = sum(sum(doc.values()) for doc in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for doc in docs for term in doc if term in query)
+
+    scored = []
+    for index, (unit, doc) in enumerate(zip(units, docs)):
+        length = sum(doc.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = doc.get(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += weight * idf * tf * (BM25_K1 + 1) / (
+                tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            )
+        scored.append((score, index, unit))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(score, unit) for score, _, unit in scored]
+
+
+def select_context_units(
+    question: str,
+    units: List[Dict[str, Any]],
+    dialogue_history: Optional[List[Dict[str, Any]]] = None,
+    token_budget: int = DIALOGUE_CONTEXT_TOKEN_BUDGET,
+) -> List[Dict[str, Any]]:
+    """
+    The units to show the LLM for this question, most relevant first, within
+    token_budget. Relevant units are packed first; the rest fill what's left.
+    """
+    selected = []
+    spent = 0
+    for _, unit in rank_units(question, units, dialogue_history):
+        cost = _prompt_tokens(unit)
+        if spent + cost > token_budget:
+            continue
+        selected.append(unit)
+        spent += cost
+    return selected
+
+
+async def load_question_context(
+    db: AsyncSession,
+    project_id: str,
+    question: str,
+    dialogue_history: List[Dict[str, Any]],
+    token_budget: int = DIALOGUE_CONTEXT_TOKEN_BUDGET,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Budgeted unit context for /ask: (selected units, project unit count per type).
+
+    Only the columns the prompt uses are loaded; the counts let the prompt say
+    how much of the framework it is seeing.
+    """
+    rows = (await db.execute(
+        select(StrategizerUnit.unit_type, StrategizerUnit.name, StrategizerUnit.definition)
+        .where(StrategizerUnit.project_id == project_id)
+        .order_by(StrategizerUnit.created_at, StrategizerUnit.id)
+    )).all()
+
+    units = [
+        {"unit_type": unit_type.value, "name": name, "definition": definition}
+        for unit_type, name, definition in rows
+    ]
+    totals = Counter(u["unit_type"] for u in units)
+    return select_context_units(question, units, dialogue_history, token_budget), dict(totals)
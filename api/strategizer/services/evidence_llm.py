@@ -5,12 +5,19 @@ LLM functions for evidence extraction, analysis, and interpretation.
 Following the LLM-first philosophy: Python gathers → LLM judges → Python executes.
 """
 
-import json
 import logging
-from typing import List, Dict, Optional
-from anthropic import Anthropic
-import os
-
+from typing import List, Dict
+
+from ...llm_clients import get_llm_client, SONNET
+from ...structured_output import create_structured, StructuredOutputError
+from ...llm_schemas import (
+    FragmentExtraction,
+    FragmentAnalysis,
+    InterpretationSet,
+    CommitmentForeclosure,
+    UnitSuggestion,
+)
+from ...evidence_chunking import SourceChunk, extract_chunked
 from ..prompts.evidence_prompts import (
     EVIDENCE_EXTRACTION_PROMPT,
     EVIDENCE_ANALYSIS_PROMPT,
@@ -26,47 +33,9 @@ logger = logging.getLogger(__name__)
 MODEL = "claude-sonnet-4-5-20250929"
 MAX_TOKENS = 4000
 
-_client = None
-
-
 def get_claude_client():
-    """Get Claude client, raising helpful error if API key missing."""
-    global _client
-    if _client is None:
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        _client = Anthropic(api_key=api_key)
-    return _client
-
-
-def _parse_json_response(content: str) -> Optional[Dict]:
-    """Parse JSON from LLM response, handling markdown code blocks."""
-    # Try to find JSON in response
-    # First check for ```json blocks
-    if "```json" in content:
-        start = content.find("```json") + 7
-        end = content.find("```", start)
-        if end > start:
-            json_str = content[start:end].strip()
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                pass
-
-    # Try to find raw JSON
-    json_start = content.find('{')
-    json_end = content.rfind('}') + 1
-
-    if json_start >= 0 and json_end > json_start:
-        json_str = content[json_start:json_end]
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON: {e}")
-            return None
-
-    return None
+    """Get the shared Claude client, raising helpful error if API key missing."""
+    return get_llm_client(SONNET)
 
 
 async def extract_fragments_from_source(
@@ -86,32 +55,41 @@ async def extract_fragments_from_source(
     - likely_unit_type: concept/dialectic/actor
     - likely_unit_name: Related unit if obvious
     - extraction_note: Why it's relevant
-    """
-    prompt = EVIDENCE_EXTRACTION_PROMPT.format(
-        domain_name=domain_name or "Strategic Analysis",
-        core_question=core_question or "General strategic analysis",
-        units_summary=format_units_for_prompt(units),
-        source_name=source_name,
-        source_type=source_type,
-        source_content=source_content[:15000]  # Limit content length
-    )
 
-    client = get_claude_client()
+    Sources longer than one chunk are split (see evidence_chunking), extracted
+    concurrently and deduplicated; fragments then also carry "chunks", the
+    chunk indexes they were found in.
 
-    try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=MAX_TOKENS,
-            messages=[{"role": "user", "content": prompt}]
+    A chunk whose output is unusable fails the whole extraction (raises
+    StructuredOutputError), so the source is marked failed, not short.
+    """
+    client = get_claude_client()
+    units_summary = format_units_for_prompt(units)
+
+    async def extract_chunk(chunk: SourceChunk) -> List[Dict]:
+        prompt = EVIDENCE_EXTRACTION_PROMPT.format(
+            domain_name=domain_name or "Strategic Analysis",
+            core_question=core_question or "General strategic analysis",
+            units_summary=units_summary,
+            source_name=source_name if chunk.total == 1 else f"{source_name} ({chunk.label})",
+            source_type=source_type,
+            source_content=chunk.text
         )
+        try:
+            result = await create_structured(
+                client,
+                FragmentExtraction,
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except StructuredOutputError as e:
+            # Fail the whole source (it stays retryable) rather than drop the chunk
+            raise StructuredOutputError(f"Unusable extraction response ({chunk.label}): {e}", e.raw) from e
+        return [fragment.model_dump() for fragment in result.fragments]
 
-        result = _parse_json_response(response.content[0].text)
-        if result:
-            return result.get("fragments", [])
-        else:
-            logger.error(f"No JSON found in extraction response")
-            return []
-
+    try:
+        return await extract_chunked(source_content, extract_chunk)
     except Exception as e:
         logger.error(f"Extraction failed: {e}")
         raise
@@ -152,23 +130,24 @@ async def analyze_fragment(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            FragmentAnalysis,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
-
-        result = _parse_json_response(response.content[0].text)
-        if result:
-            return result
-        else:
-            return {
-                "relationship_type": "new_insight",
-                "target_grid_slot": None,
-                "confidence": 0.3,
-                "is_ambiguous": True,
-                "why_needs_decision": "Failed to parse analysis response"
-            }
+        return result.model_dump()
+
+    except StructuredOutputError as e:
+        logger.warning(f"Unusable analysis response: {e}")
+        return {
+            "relationship_type": "new_insight",
+            "target_grid_slot": None,
+            "confidence": 0.3,
+            "is_ambiguous": True,
+            "why_needs_decision": "Failed to parse analysis response"
+        }
 
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
@@ -208,20 +187,21 @@ async def generate_interpretations(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            InterpretationSet,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
+        return result.model_dump()
 
-        result = _parse_json_response(response.content[0].text)
-        if result:
-            return result
-        else:
-            return {
-                "interpretations": [],
-                "decision_context": "Failed to generate interpretations"
-            }
+    except StructuredOutputError as e:
+        logger.warning(f"Unusable interpretation generation response: {e}")
+        return {
+            "interpretations": [],
+            "decision_context": "Failed to generate interpretations"
+        }
 
     except Exception as e:
         logger.error(f"Interpretation generation failed: {e}")
@@ -257,22 +237,23 @@ async def add_commitment_foreclosure(
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            CommitmentForeclosure,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
+        return result.model_dump()
 
-        result = _parse_json_response(response.content[0].text)
-        if result:
-            return result
-        else:
-            return {
-                "commitment_statement": "Accepting this interpretation",
-                "foreclosure_statements": [],
-                "risk_level": "medium",
-                "reversibility": "Unknown"
-            }
+    except StructuredOutputError as e:
+        logger.warning(f"Unusable commitment/foreclosure analysis response: {e}")
+        return {
+            "commitment_statement": "Accepting this interpretation",
+            "foreclosure_statements": [],
+            "risk_level": "medium",
+            "reversibility": "Unknown"
+        }
 
     except Exception as e:
         logger.error(f"Commitment/foreclosure analysis failed: {e}")
@@ -337,24 +318,25 @@ suggest creating a new unit with `should_create_new: true`.
     client = get_claude_client()
 
     try:
-        response = client.messages.create(
+        result = await create_structured(
+            client,
+            UnitSuggestion,
             model=MODEL,
             max_tokens=MAX_TOKENS,
             messages=[{"role": "user", "content": prompt}]
         )
-
-        result = _parse_json_response(response.content[0].text)
-        if result:
-            return result
-        else:
-            return {
-                "unit_name": None,
-                "confidence": 0.0,
-                "rationale": "Failed to suggest unit",
-                "alternative_units": [],
-                "should_create_new": True,
-                "new_unit_suggestion": None
-            }
+        return result.model_dump()
+
+    except StructuredOutputError as e:
+        logger.warning(f"Unusable unit suggestion response: {e}")
+        return {
+            "unit_name": None,
+            "confidence": 0.0,
+            "rationale": "Failed to suggest unit",
+            "alternative_units": [],
+            "should_create_new": True,
+            "new_unit_suggestion": None
+        }
 
     except Exception as e:
         logger.error(f"Unit suggestion failed: {e}")
@@ -7,9 +7,15 @@ Uses the LLM-First Philosophy: Python gathers → LLM judges → Python executes
 
 import os
 import json
-from typing import Dict, Any, List, Optional
+import logging
+from typing import Dict, Any, List, Optional, Type
 
-from anthropic import Anthropic
+from pydantic import BaseModel
+
+from ...llm_clients import get_llm_client, SONNET
+from ...llm_scheduler import run_llm_call
+from ...structured_output import create_structured, extract_json, StructuredOutputError
+from ...llm_schemas import DomainBootstrap, GridFill, GridFriction, GridCompatibility, GridSelection
 
 from ..prompts.grid_prompts import (
     GRID_FILL_PROMPT,
@@ -18,6 +24,7 @@ from ..prompts.grid_prompts import (
     GRID_AUTO_APPLY_PROMPT,
 )
 
+logger = logging.getLogger(__name__)
 
 # Claude configuration
 CLAUDE_MODEL = os.getenv("STRATEGIZER_MODEL", "claude-sonnet-4-5-20250929")
@@ -30,7 +37,7 @@ class StrategizerLLM:
     def __init__(self):
         if not ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        self.client = Anthropic(api_key=ANTHROPIC_API_KEY)
+        self.client = get_llm_client(SONNET)
         self.model = CLAUDE_MODEL
 
     async def bootstrap_domain(
@@ -56,24 +63,22 @@ class StrategizerLLM:
         """
         prompt = self._build_bootstrap_prompt(project_name, project_brief)
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        # Extract JSON from response
-        response_text = response.content[0].text
-        return self._parse_bootstrap_response(response_text)
+        try:
+            return await self._create_structured(DomainBootstrap, prompt, max_tokens=4096)
+        except StructuredOutputError as e:
+            # Return error structure
+            return {
+                "error": f"Failed to parse LLM response: {e}",
+                "raw_response": e.raw[:500]
+            }
 
     async def answer_question(
         self,
         question: str,
         domain_context: Dict[str, Any],
         units: List[Dict[str, Any]],
-        dialogue_history: List[Dict[str, Any]]
+        dialogue_history: List[Dict[str, Any]],
+        unit_totals: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
         """
         Answer a strategic question using the framework context.
@@ -83,13 +88,16 @@ class StrategizerLLM:
             domain_context: Domain info (name, vocabulary, core question)
             units: List of existing units (concepts, dialectics, actors)
             dialogue_history: Recent dialogue turns
+            unit_totals: Units per type in the whole project, when `units`
+                is only the most relevant subset
 
         Returns:
             Dict with response, implications, and suggested actions
         """
-        prompt = self._build_qa_prompt(question, domain_context, units, dialogue_history)
+        prompt = self._build_qa_prompt(question, domain_context, units, dialogue_history, unit_totals)
 
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.model,
             max_tokens=4096,
             messages=[
@@ -119,7 +127,8 @@ class StrategizerLLM:
         """
         prompt = self._build_suggestion_prompt(domain_context, units, focus)
 
-        response = self.client.messages.create(
+        response = await run_llm_call(
+            self.client.messages.create,
             model=self.model,
             max_tokens=2048,
             messages=[
@@ -170,16 +179,7 @@ class StrategizerLLM:
             slots_list=slots_list
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        response_text = response.content[0].text
-        return self._parse_json_response(response_text, {"slots": {}})
+        return await self._create_structured(GridFill, prompt, max_tokens=4096, fallback={"slots": {}})
 
     async def detect_grid_friction(
         self,
@@ -223,16 +223,7 @@ class StrategizerLLM:
             grids_json=grids_json
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        response_text = response.content[0].text
-        return self._parse_json_response(response_text, {
+        return await self._create_structured(GridFriction, prompt, max_tokens=4096, fallback={
             "friction_events": [],
             "overall_coherence": 0.5,
             "summary": "Unable to assess coherence"
@@ -273,16 +264,7 @@ class StrategizerLLM:
             slots_list=slots_list
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        response_text = response.content[0].text
-        return self._parse_json_response(response_text, {
+        return await self._create_structured(GridCompatibility, prompt, max_tokens=2048, fallback={
             "compatible": True,
             "compatibility_score": 0.5,
             "rationale": "Unable to assess",
@@ -328,37 +310,36 @@ class StrategizerLLM:
             existing_grids=", ".join(existing_grids) if existing_grids else "(none)"
         )
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
-
-        response_text = response.content[0].text
-        return self._parse_json_response(response_text, {
+        return await self._create_structured(GridSelection, prompt, max_tokens=2048, fallback={
             "grids_to_apply": [],
             "grids_to_skip": []
         })
 
-    def _parse_json_response(
+    async def _create_structured(
         self,
-        response_text: str,
-        fallback: Dict[str, Any]
+        response_model: Type[BaseModel],
+        prompt: str,
+        max_tokens: int,
+        fallback: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Parse JSON response with fallback."""
+        """
+        Run a prompt whose output is response_model (a forced tool call, repaired
+        if invalid). Returns fallback if given and the output is unusable,
+        otherwise raises StructuredOutputError.
+        """
         try:
-            text = response_text.strip()
-            # Remove markdown code blocks if present
-            if text.startswith("```"):
-                lines = text.split("\n")
-                start = 1 if lines[0].startswith("```") else 0
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                text = "\n".join(lines[start:end])
-
-            return json.loads(text)
-        except json.JSONDecodeError:
+            result = await create_structured(
+                self.client,
+                response_model,
+                model=self.model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return result.model_dump()
+        except StructuredOutputError as e:
+            if fallback is None:
+                raise
+            logger.warning(f"{response_model.__name__} output unusable, using fallback: {e}")
             return fallback
 
     def _build_bootstrap_prompt(self, project_name: str, project_brief: str) -> str:
@@ -433,7 +414,8 @@ Example structure:
         question: str,
         domain_context: Dict[str, Any],
         units: List[Dict[str, Any]],
-        dialogue_history: List[Dict[str, Any]]
+        dialogue_history: List[Dict[str, Any]],
+        unit_totals: Optional[Dict[str, int]] = None
     ) -> str:
         """Build the Q&A prompt."""
         # Format units by type
@@ -453,6 +435,13 @@ Example structure:
                 role = "User" if turn.get("turn_type") == "user_question" else "System"
                 recent_dialogue += f"{role}: {turn.get('content', '')}\n\n"
 
+        # "(12)" or, when only the most relevant units were passed, "(12 of 140, most relevant)"
+        def count(unit_type: str, shown: List[Dict[str, Any]]) -> str:
+            total = (unit_totals or {}).get(unit_type, len(shown))
+            if total > len(shown):
+                return f"{len(shown)} of {total}, most relevant"
+            return str(len(shown))
+
         return f"""You are a strategic thinking assistant working within a specific domain framework.
 
 DOMAIN: {domain_context.get('name', 'Unknown')}
@@ -460,13 +449,13 @@ CORE QUESTION: {domain_context.get('core_question', 'Unknown')}
 
 CURRENT FRAMEWORK:
 
-{concept_term}s ({len(concepts)}):
+{concept_term}s ({count('concept', concepts)}):
 {self._format_units(concepts)}
 
-{dialectic_term}s ({len(dialectics)}):
+{dialectic_term}s ({count('dialectic', dialectics)}):
 {self._format_units(dialectics)}
 
-{actor_term}s ({len(actors)}):
+{actor_term}s ({count('actor', actors)}):
 {self._format_units(actors)}
 
 {f"RECENT DIALOGUE:{chr(10)}{recent_dialogue}" if recent_dialogue else ""}
@@ -560,40 +549,11 @@ Return ONLY valid JSON."""
                 lines.append(f"- {name}")
         return "\n".join(lines)
 
-    def _parse_bootstrap_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse bootstrap response JSON."""
-        try:
-            # Try to find JSON in the response
-            text = response_text.strip()
-
-            # Remove markdown code blocks if present
-            if text.startswith("```"):
-                lines = text.split("\n")
-                # Find start and end of code block
-                start = 1 if lines[0].startswith("```") else 0
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                text = "\n".join(lines[start:end])
-
-            return json.loads(text)
-        except json.JSONDecodeError as e:
-            # Return error structure
-            return {
-                "error": f"Failed to parse LLM response: {str(e)}",
-                "raw_response": response_text[:500]
-            }
-
     def _parse_qa_response(self, response_text: str) -> Dict[str, Any]:
         """Parse Q&A response JSON."""
         try:
-            text = response_text.strip()
-            if text.startswith("```"):
-                lines = text.split("\n")
-                start = 1 if lines[0].startswith("```") else 0
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                text = "\n".join(lines[start:end])
-
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return extract_json(response_text, objects_only=True)
+        except ValueError:
             # Fallback: return raw response as text
             return {
                 "response": response_text,
@@ -604,15 +564,8 @@ Return ONLY valid JSON."""
     def _parse_suggestion_response(self, response_text: str) -> Dict[str, Any]:
         """Parse suggestion response JSON."""
         try:
-            text = response_text.strip()
-            if text.startswith("```"):
-                lines = text.split("\n")
-                start = 1 if lines[0].startswith("```") else 0
-                end = len(lines) - 1 if lines[-1].strip() == "```" else len(lines)
-                text = "\n".join(lines[start:end])
-
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return extract_json(response_text, objects_only=True)
+        except ValueError:
             return {
                 "suggestions": ["Unable to generate suggestions at this time"],
                 "priority_actions": []
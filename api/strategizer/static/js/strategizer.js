@@ -146,6 +146,8 @@ const API = {
     // Coherence Monitoring
     quickCoherenceScan: (projectId) => API.request('POST', `/projects/${projectId}/coherence/quick-scan`, {}),
     deepCoherenceAnalysis: (projectId, options = {}) => API.request('POST', `/projects/${projectId}/coherence/deep-analysis`, options),
+    startDeepAnalysisRun: (projectId, options = {}) => API.request('POST', `/projects/${projectId}/coherence/deep-analysis/runs`, options),
+    getLatestDeepAnalysisRun: (projectId) => API.request('GET', `/projects/${projectId}/coherence/deep-analysis/runs/latest`),
     getCoherenceStats: (projectId) => API.request('GET', `/projects/${projectId}/coherence/stats`),
 
     // Predicaments
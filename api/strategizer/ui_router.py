@@ -11,11 +11,14 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from markupsafe import Markup
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
-from ..database import get_db
+from ..database import get_read_db
+from ..project_stats import evidence_stats, coherence_stats
+from .render_cache import cached_page, fragment_cache, PROJECT, UNITS, EVIDENCE, COHERENCE
 from .models import (
     StrategizerProject, StrategizerDomain, StrategizerUnit,
     StrategizerGridInstance, StrategizerEvidenceSource,
@@ -35,13 +38,10 @@ router = APIRouter(tags=["strategizer-ui"])
 # =============================================================================
 
 async def get_project_context(project_id: str, db: AsyncSession):
-    """Load project with all related data for templates."""
+    """Load project with its domain for templates."""
     result = await db.execute(
         select(StrategizerProject)
-        .options(
-            selectinload(StrategizerProject.domain),
-            selectinload(StrategizerProject.units)
-        )
+        .options(selectinload(StrategizerProject.domain))
         .where(StrategizerProject.id == project_id)
     )
     project = result.scalar_one_or_none()
@@ -50,50 +50,20 @@ async def get_project_context(project_id: str, db: AsyncSession):
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Get evidence stats
-    pending_decisions_result = await db.execute(
-        select(func.count(StrategizerEvidenceFragment.id))
-        .join(StrategizerEvidenceSource)
-        .where(
-            StrategizerEvidenceSource.project_id == project_id,
-            StrategizerEvidenceFragment.analysis_status == AnalysisStatus.NEEDS_DECISION
-        )
-    )
-    pending_decisions = pending_decisions_result.scalar() or 0
+    pending_decisions = (await evidence_stats(db, project_id)).pending_decisions
 
     return project, pending_decisions
 
 
 async def get_coherence_stats(project_id: str, db: AsyncSession) -> dict:
     """Get coherence statistics for a project."""
-    # Count active predicaments (not resolved or deferred)
-    active_result = await db.execute(
-        select(func.count(StrategizerPredicament.id))
-        .where(
-            StrategizerPredicament.project_id == project_id,
-            StrategizerPredicament.status.in_([PredicamentStatus.DETECTED, PredicamentStatus.ANALYZING])
-        )
-    )
-    active_predicaments = active_result.scalar() or 0
-
-    # Count by severity (only active)
-    severity_counts = {}
-    for severity in [PredicamentSeverity.CRITICAL, PredicamentSeverity.HIGH, PredicamentSeverity.MEDIUM, PredicamentSeverity.LOW]:
-        count_result = await db.execute(
-            select(func.count(StrategizerPredicament.id))
-            .where(
-                StrategizerPredicament.project_id == project_id,
-                StrategizerPredicament.status.in_([PredicamentStatus.DETECTED, PredicamentStatus.ANALYZING]),
-                StrategizerPredicament.severity == severity
-            )
-        )
-        severity_counts[severity.value] = count_result.scalar() or 0
-
+    stats = await coherence_stats(db, project_id)
     return {
-        "active_predicaments": active_predicaments,
-        "critical_count": severity_counts.get("critical", 0),
-        "high_count": severity_counts.get("high", 0),
-        "medium_count": severity_counts.get("medium", 0),
-        "low_count": severity_counts.get("low", 0)
+        "active_predicaments": stats.active_predicaments,
+        "critical_count": stats.by_severity.get("critical", 0),
+        "high_count": stats.by_severity.get("high", 0),
+        "medium_count": stats.by_severity.get("medium", 0),
+        "low_count": stats.by_severity.get("low", 0)
     }
 
 
@@ -102,9 +72,10 @@ async def get_coherence_stats(project_id: str, db: AsyncSession) -> dict:
 # =============================================================================
 
 @router.get("/ui/", response_class=HTMLResponse)
+@cached_page(PROJECT, UNITS)
 async def projects_page(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Project list page."""
     result = await db.execute(
@@ -115,13 +86,14 @@ async def projects_page(
     projects = result.scalars().all()
 
     # Enrich with unit counts
+    unit_counts = dict((await db.execute(
+        select(StrategizerUnit.project_id, func.count(StrategizerUnit.id))
+        .group_by(StrategizerUnit.project_id)
+    )).all())
+
     projects_data = []
     for project in projects:
-        unit_count_result = await db.execute(
-            select(func.count(StrategizerUnit.id))
-            .where(StrategizerUnit.project_id == project.id)
-        )
-        unit_count = unit_count_result.scalar() or 0
+        unit_count = unit_counts.get(project.id, 0)
 
         projects_data.append({
             "id": str(project.id),
@@ -145,55 +117,73 @@ async def projects_page(
 # =============================================================================
 
 @router.get("/ui/projects/{project_id}", response_class=HTMLResponse)
+@cached_page(PROJECT, UNITS, EVIDENCE, COHERENCE)
 async def project_detail_page(
     request: Request,
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Main project workspace page."""
     project, pending_decisions = await get_project_context(project_id, db)
 
-    # Group units by type
-    units_by_type = {
-        "concept": [],
-        "dialectic": [],
-        "actor": []
+    project_ctx = {
+        "id": str(project.id),
+        "name": project.name,
+        "brief": project.brief,
+        "domain": {
+            "name": project.domain.name,
+            "core_question": project.domain.core_question,
+            "vocabulary": project.domain.vocabulary
+        } if project.domain else None
     }
 
-    for unit in project.units:
-        unit_type = unit.unit_type.value
-        if unit_type in units_by_type:
-            units_by_type[unit_type].append({
-                "id": str(unit.id),
-                "name": unit.name,
-                "definition": unit.definition[:100] + "..." if len(unit.definition) > 100 else unit.definition,
-                "status": unit.status.value,
-                "tier": unit.tier
-            })
+    # Units sidebar: depends only on the domain and the units, so it survives
+    # evidence and coherence changes that invalidate the rest of the page
+    async def render_unit_list():
+        units_result = await db.execute(
+            select(StrategizerUnit)
+            .where(StrategizerUnit.project_id == project_id)
+            .order_by(StrategizerUnit.created_at)
+        )
 
-    # Get source count
-    source_count_result = await db.execute(
-        select(func.count(StrategizerEvidenceSource.id))
-        .where(StrategizerEvidenceSource.project_id == project_id)
+        # Group units by type
+        units_by_type = {
+            "concept": [],
+            "dialectic": [],
+            "actor": []
+        }
+
+        for unit in units_result.scalars().all():
+            unit_type = unit.unit_type.value
+            if unit_type in units_by_type:
+                units_by_type[unit_type].append({
+                    "id": str(unit.id),
+                    "name": unit.name,
+                    "definition": unit.definition[:100] + "..." if len(unit.definition) > 100 else unit.definition,
+                    "status": unit.status.value,
+                    "tier": unit.tier
+                })
+
+        html = templates.get_template("partials/unit_list.html").render(
+            project=project_ctx, units_by_type=units_by_type
+        )
+        return Markup(html), sum(len(units) for units in units_by_type.values())
+
+    unit_list_html, unit_count = await fragment_cache.get(
+        ("unit_list", project_id), project_id, (PROJECT, UNITS), render_unit_list
     )
-    source_count = source_count_result.scalar() or 0
+
+    # Get source count
+    source_count = (await evidence_stats(db, project_id)).sources_count
 
     # Get coherence stats
     coherence_stats = await get_coherence_stats(project_id, db)
 
     return templates.TemplateResponse("project_detail.html", {
         "request": request,
-        "project": {
-            "id": str(project.id),
-            "name": project.name,
-            "brief": project.brief,
-            "domain": {
-                "name": project.domain.name,
-                "core_question": project.domain.core_question,
-                "vocabulary": project.domain.vocabulary
-            } if project.domain else None
-        },
-        "units_by_type": units_by_type,
+        "project": project_ctx,
+        "unit_list_html": unit_list_html,
+        "unit_count": unit_count,
         "source_count": source_count,
         "pending_decisions": pending_decisions,
         "coherence_stats": coherence_stats,
@@ -206,11 +196,12 @@ async def project_detail_page(
 # =============================================================================
 
 @router.get("/ui/projects/{project_id}/units/{unit_id}", response_class=HTMLResponse)
+@cached_page(PROJECT, UNITS, EVIDENCE)
 async def unit_detail_page(
     request: Request,
     project_id: str,
     unit_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Unit detail page with grid editing."""
     project, pending_decisions = await get_project_context(project_id, db)
@@ -301,10 +292,11 @@ async def unit_detail_page(
 # =============================================================================
 
 @router.get("/ui/projects/{project_id}/evidence", response_class=HTMLResponse)
+@cached_page(PROJECT, EVIDENCE)
 async def evidence_page(
     request: Request,
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Evidence sources and fragments page."""
     project, pending_decisions = await get_project_context(project_id, db)
@@ -317,18 +309,12 @@ async def evidence_page(
     )
     sources = sources_result.scalars().all()
 
+    # Fragment counts by status, for every source at once
+    stats = await evidence_stats(db, project_id)
+
     sources_data = []
     for source in sources:
-        # Count fragments by status
-        fragment_counts_result = await db.execute(
-            select(
-                StrategizerEvidenceFragment.analysis_status,
-                func.count(StrategizerEvidenceFragment.id)
-            )
-            .where(StrategizerEvidenceFragment.source_id == source.id)
-            .group_by(StrategizerEvidenceFragment.analysis_status)
-        )
-        counts = {row[0].value: row[1] for row in fragment_counts_result.fetchall()}
+        counts = stats.fragments_by_source.get(source.id, {})
 
         sources_data.append({
             "id": str(source.id),
@@ -380,10 +366,11 @@ async def evidence_page(
 # =============================================================================
 
 @router.get("/ui/projects/{project_id}/decisions", response_class=HTMLResponse)
+@cached_page(PROJECT, EVIDENCE)
 async def decisions_page(
     request: Request,
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Pending decisions page."""
     project, pending_decisions = await get_project_context(project_id, db)
@@ -444,10 +431,11 @@ async def decisions_page(
 # =============================================================================
 
 @router.get("/ui/projects/{project_id}/coherence", response_class=HTMLResponse)
+@cached_page(PROJECT, COHERENCE)
 async def coherence_page(
     request: Request,
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Coherence monitoring page with predicaments list."""
     project, pending_decisions = await get_project_context(project_id, db)
@@ -532,11 +520,12 @@ async def coherence_page(
 
 
 @router.get("/ui/projects/{project_id}/predicaments/{predicament_id}", response_class=HTMLResponse)
+@cached_page(PROJECT, UNITS, EVIDENCE, COHERENCE)
 async def predicament_detail_page(
     request: Request,
     project_id: str,
     predicament_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Predicament detail page with analytical grid."""
     project, pending_decisions = await get_project_context(project_id, db)
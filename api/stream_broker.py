@@ -0,0 +1,561 @@
+"""
+SSE Stream Broker
+
+Streaming endpoints used to tie their LLM generation to one HTTP connection on
+one worker: if the client reconnected, or another worker got the next request,
+the in-flight generation was lost and paid for again. With the broker:
+
+- stream_response(kind, chunks) runs the endpoint's SSE generator as a
+  background producer and returns a response that follows it. The stream id is
+  in the X-Stream-Id header and every event carries an `id:` line.
+- The producer appends each event to an in-memory log and, every
+  STREAM_FLUSH_SECONDS, persists the new ones to event_stream_events and
+  publishes NOTIFY event_streams '<stream id>'. Logs keep the last
+  STREAM_LOG_MAX_EVENTS events; consecutive thinking/text deltas arriving
+  within STREAM_COALESCE_SECONDS are merged into one event.
+- GET /streams/{id}?last_event_id=N (or Last-Event-ID) replays after event N
+  and follows the stream: from memory on the producing worker, otherwise from
+  the table, woken by LISTEN (and polling every STREAM_POLL_SECONDS, so a lost
+  notification only delays). Any worker can serve it, so clients can reconnect
+  or multiplex and uvicorn can run --workers N.
+
+Identical requests are multicast: stream_response(kind, chunks, key=request)
+fingerprints kind and the request body (see single_flight). While a stream
+with that fingerprint is running, on this worker or (via
+event_streams.flight_key) another one, a duplicate request doesn't start its
+generator; its response follows the running stream from the first event, so
+double-clicks and client retries don't pay for the generation twice.
+
+A running stream whose producer stops heart-beating for STREAM_STALE_SECONDS
+(its worker died) is ended for readers with an error event. Finished streams
+are deleted after STREAM_RETENTION_SECONDS.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, delete, insert, func
+
+from .database import session_scope, DATABASE_URL
+from .instrumentation import SINGLE_FLIGHT_COALESCED
+from .models import EventStream, EventStreamEvent, EventStreamStatus
+from .single_flight import SINGLE_FLIGHT_ENABLED, fingerprint
+
+logger = logging.getLogger(__name__)
+
+STREAM_LOG_MAX_EVENTS = int(os.getenv("STREAM_LOG_MAX_EVENTS", "2000"))
+STREAM_FLUSH_SECONDS = float(os.getenv("STREAM_FLUSH_SECONDS", "0.25"))
+STREAM_COALESCE_SECONDS = float(os.getenv("STREAM_COALESCE_SECONDS", "0.1"))
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "2"))
+STREAM_STALE_SECONDS = float(os.getenv("STREAM_STALE_SECONDS", "60"))
+STREAM_RETENTION_SECONDS = float(os.getenv("STREAM_RETENTION_SECONDS", "3600"))
+STREAM_HEARTBEAT_SECONDS = 15.0
+# Finished streams stay in memory this long for late readers, then read from the DB
+FINISHED_STREAM_TTL_SECONDS = 300
+# Events read from the table per query
+REPLAY_BATCH = 500
+
+STREAM_CHANNEL = "event_streams"
+DONE = "[DONE]"
+
+# Delta events that may be merged: {"type": <one of these>, "content": str}
+_COALESCABLE = ("thinking", "text")
+
+router = APIRouter(prefix="/streams", tags=["streams"])
+
+
+def _format(event_id: int, data: str) -> str:
+    lines = "\n".join(f"data: {line}" for line in data.split("\n"))
+    return f"id: {event_id}\n{lines}\n\n"
+
+
+def _parse_chunk(chunk: str) -> List[str]:
+    """The data payloads of the SSE events in a generator chunk."""
+    payloads = []
+    for block in chunk.split("\n\n"):
+        lines = [line[5:].removeprefix(" ") for line in block.split("\n") if line.startswith("data:")]
+        if lines:
+            payloads.append("\n".join(lines))
+    return payloads
+
+
+def _delta(data: str) -> Optional[Tuple[str, str]]:
+    """(type, content) if the payload is a mergeable delta event."""
+    if not data.startswith("{"):
+        return None
+    try:
+        event = json.loads(data)
+    except ValueError:
+        return None
+    if isinstance(event, dict) and event.keys() == {"type", "content"} \
+            and event["type"] in _COALESCABLE and isinstance(event["content"], str):
+        return event["type"], event["content"]
+    return None
+
+
+# =============================================================================
+# LOCAL STREAMS (producer side)
+# =============================================================================
+
+class LocalStream:
+    """A stream produced in this process: its bounded log and a condition for readers."""
+
+    def __init__(self, stream_id: str, kind: str):
+        self.id = stream_id
+        self.kind = kind
+        self.events: Deque[Tuple[int, str]] = deque(maxlen=STREAM_LOG_MAX_EVENTS)
+        self.last_event_id = 0
+        self.persisted_event_id = 0
+        self.status = EventStreamStatus.RUNNING
+        self.task: Optional[asyncio.Task] = None
+        self.flight_key: Optional[str] = None
+        self.flight: Optional[asyncio.Future] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def first_event_id(self) -> int:
+        return self.events[0][0] if self.events else self.last_event_id + 1
+
+    @property
+    def finished(self) -> bool:
+        return self.status != EventStreamStatus.RUNNING
+
+    async def append(self, data: str):
+        async with self._changed:
+            self.last_event_id += 1
+            self.events.append((self.last_event_id, data))
+            self._changed.notify_all()
+
+    async def finish(self, status: EventStreamStatus):
+        async with self._changed:
+            self.status = status
+            self._changed.notify_all()
+
+    def unpersisted(self) -> List[Tuple[int, str]]:
+        start = max(self.persisted_event_id + 1, self.first_event_id)
+        return list(islice(self.events, start - self.first_event_id, None))
+
+    async def iter_sse(self, after: int) -> AsyncIterator[str]:
+        while True:
+            if after < self.first_event_id - 1:
+                yield f": events up to {self.first_event_id - 1} were trimmed\n\n"
+                after = self.first_event_id - 1
+            for event_id, data in list(islice(self.events, after - self.first_event_id + 1, None)):
+                yield _format(event_id, data)
+                after = event_id
+
+            async with self._changed:
+                if self.last_event_id > after:
+                    continue
+                if self.finished:
+                    return
+                try:
+                    await asyncio.wait_for(self._changed.wait(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            if self.last_event_id <= after and not self.finished:
+                yield ": keepalive\n\n"
+
+
+_local: Dict[str, LocalStream] = {}
+_last_cleanup = 0.0
+
+# Flight key -> the id of the stream running for it (None if it couldn't be
+# registered), resolved once the stream is registered; removed when it ends
+_flights: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+
+
+def _end_flight(flight_key: Optional[str], flight: Optional[asyncio.Future], stream_id: Optional[str]):
+    if flight is None:
+        return
+    if _flights.get(flight_key) is flight:
+        del _flights[flight_key]
+    if not flight.done():
+        flight.set_result(stream_id)
+
+
+async def _persist(stream: LocalStream, finished: bool = False):
+    """Write the stream's new events and state, and NOTIFY readers on other workers."""
+    events = stream.unpersisted()
+    values = {
+        "last_event_id": stream.last_event_id,
+        "first_event_id": stream.first_event_id,
+        "heartbeat_at": func.now(),
+    }
+    if finished:
+        values["status"] = stream.status.value
+        values["finished_at"] = func.now()
+    try:
+        async with session_scope() as db:
+            if events:
+                await db.execute(insert(EventStreamEvent), [
+                    {"stream_id": stream.id, "event_id": event_id, "data": data}
+                    for event_id, data in events
+                ])
+                if stream.first_event_id > 1:
+                    # Trim the persisted log to what the in-memory one retains
+                    await db.execute(
+                        delete(EventStreamEvent).where(
+                            EventStreamEvent.stream_id == stream.id,
+                            EventStreamEvent.event_id < stream.first_event_id,
+                        )
+                    )
+            await db.execute(update(EventStream).where(EventStream.id == stream.id).values(**values))
+            await db.execute(select(func.pg_notify(STREAM_CHANNEL, stream.id)))
+        stream.persisted_event_id = stream.last_event_id
+    except Exception as e:
+        # Readers on this worker are unaffected; the events are retried next flush
+        logger.warning(f"Stream {stream.id} persist failed: {e}")
+
+
+async def _produce(stream: LocalStream, chunks: AsyncIterator[str]):
+    """Drive the endpoint's SSE generator into the stream's log."""
+    held: Optional[Tuple[str, str]] = None  # delta being coalesced
+    held_since = 0.0
+    last_flush = time.monotonic()
+
+    async def release():
+        nonlocal held
+        if held is not None:
+            await stream.append(json.dumps({"type": held[0], "content": held[1]}))
+            held = None
+
+    iterator = chunks.__aiter__()
+    next_chunk = None
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(iterator.__anext__())
+            timeout = STREAM_HEARTBEAT_SECONDS
+            if held is not None:
+                timeout = max(0.0, held_since + STREAM_COALESCE_SECONDS - time.monotonic())
+            done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+
+            if not done:
+                # Nothing new in time: release the held delta, or heartbeat
+                if held is not None:
+                    await release()
+                else:
+                    await _persist(stream)
+                    last_flush = time.monotonic()
+                continue
+
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_chunk = None
+
+            for data in _parse_chunk(chunk):
+                delta = _delta(data)
+                if delta is not None and held is not None and held[0] == delta[0]:
+                    held = (held[0], held[1] + delta[1])
+                    continue
+                await release()
+                if delta is not None:
+                    held, held_since = delta, time.monotonic()
+                else:
+                    await stream.append(data)
+
+            if time.monotonic() - last_flush >= STREAM_FLUSH_SECONDS:
+                await _persist(stream)
+                last_flush = time.monotonic()
+
+        await release()
+        await stream.finish(EventStreamStatus.COMPLETED)
+
+    except asyncio.CancelledError:
+        if next_chunk is not None:
+            next_chunk.cancel()
+        await release()
+        await stream.append(json.dumps({"type": "error", "message": "Stream interrupted by a server restart"}))
+        await stream.append(DONE)
+        await stream.finish(EventStreamStatus.FAILED)
+        raise
+    except Exception as e:
+        logger.error(f"Stream {stream.id} ({stream.kind}) failed: {e}", exc_info=True)
+        await release()
+        await stream.append(json.dumps({"type": "error", "message": str(e)}))
+        await stream.append(DONE)
+        await stream.finish(EventStreamStatus.FAILED)
+    finally:
+        _end_flight(stream.flight_key, stream.flight, stream.id)
+        await _persist(stream, finished=True)
+        asyncio.get_running_loop().call_later(FINISHED_STREAM_TTL_SECONDS, _local.pop, stream.id, None)
+
+
+async def _cleanup_finished_streams():
+    """Delete streams finished more than STREAM_RETENTION_SECONDS ago (at most every tenth of it)."""
+    global _last_cleanup
+    if time.monotonic() - _last_cleanup < STREAM_RETENTION_SECONDS / 10:
+        return
+    _last_cleanup = time.monotonic()
+    try:
+        async with session_scope() as db:
+            await db.execute(
+                delete(EventStream).where(
+                    EventStream.finished_at < datetime.now(timezone.utc) - timedelta(seconds=STREAM_RETENTION_SECONDS)
+                )
+            )
+    except Exception as e:
+        logger.warning(f"Stream cleanup failed: {e}")
+
+
+def _sse_response(stream_id: str, events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"X-Stream-Id": stream_id, "Cache-Control": "no-cache"},
+    )
+
+
+async def _find_running(flight_key: str) -> Optional[str]:
+    """A live stream with this flight key produced by another worker."""
+    try:
+        async with session_scope() as db:
+            return await db.scalar(
+                select(EventStream.id)
+                .where(
+                    EventStream.flight_key == flight_key,
+                    EventStream.status == EventStreamStatus.RUNNING.value,
+                    EventStream.heartbeat_at > func.now() - timedelta(seconds=STREAM_STALE_SECONDS),
+                )
+                .order_by(EventStream.created_at)
+                .limit(1)
+            )
+    except Exception as e:
+        logger.warning(f"Running stream lookup failed: {e}")
+        return None
+
+
+async def _attach(kind: str, stream_id: str, chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Follow the running stream instead of starting the duplicate request's generator."""
+    aclose = getattr(chunks, "aclose", None)
+    if aclose is not None:
+        await aclose()
+    SINGLE_FLIGHT_COALESCED.inc(("stream",))
+    logger.info(f"Attached duplicate {kind} request to running stream {stream_id}")
+    local = _local.get(stream_id)
+    return _sse_response(stream_id, local.iter_sse(0) if local is not None else _iter_remote(stream_id, 0))
+
+
+async def stream_response(kind: str, chunks: AsyncIterator[str], key: Any = None) -> StreamingResponse:
+    """
+    Run an SSE generator as a brokered background stream and follow it.
+
+    key identifies the request (usually its body model). If a stream of the
+    same kind and key is already running, the response follows that one and
+    chunks is closed without being started.
+
+    Falls back to streaming the generator directly if the stream can't be
+    registered (e.g. the database is unreachable).
+    """
+    flight_key = fingerprint(kind, key) if key is not None and SINGLE_FLIGHT_ENABLED else None
+    flight = None
+    if flight_key is not None:
+        running = _flights.get(flight_key)
+        if running is not None:
+            stream_id = await asyncio.shield(running)
+            if stream_id is not None:
+                return await _attach(kind, stream_id, chunks)
+        else:
+            # Claimed before the first await, so a duplicate arriving meanwhile waits for this one
+            flight = asyncio.get_running_loop().create_future()
+            _flights[flight_key] = flight
+
+    stream = LocalStream(str(uuid.uuid4()), kind)
+    try:
+        if flight is not None:
+            remote_id = await _find_running(flight_key)
+            if remote_id is not None:
+                _end_flight(flight_key, flight, remote_id)
+                return await _attach(kind, remote_id, chunks)
+        try:
+            async with session_scope() as db:
+                db.add(EventStream(
+                    id=stream.id, kind=kind, status=EventStreamStatus.RUNNING.value,
+                    flight_key=flight_key if flight is not None else None,
+                ))
+        except Exception as e:
+            logger.warning(f"Could not register {kind} stream, serving it unbrokered: {e}")
+            return StreamingResponse(chunks, media_type="text/event-stream")
+
+        stream.flight_key, stream.flight = flight_key, flight
+        _local[stream.id] = stream
+        stream.task = asyncio.create_task(_produce(stream, chunks))
+    finally:
+        if stream.task is None:
+            # Not producing (attached, unbrokered or cancelled): duplicates start their own
+            _end_flight(flight_key, flight, None)
+        elif flight is not None:
+            flight.set_result(stream.id)
+    asyncio.create_task(_cleanup_finished_streams())
+
+    return _sse_response(stream.id, stream.iter_sse(0))
+
+
+# =============================================================================
+# NOTIFICATIONS (reader side, other workers)
+# =============================================================================
+
+class StreamNotifications:
+    """One LISTEN connection per process, waking readers of the notified stream."""
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    def _on_notify(self, conn, pid, channel, stream_id):
+        for waiter in self._waiters.get(stream_id, ()):
+            waiter.set()
+
+    async def _ensure_listening(self):
+        if self._conn is not None and not self._conn.is_closed():
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            try:
+                import asyncpg
+                self._conn = await asyncpg.connect(DATABASE_URL)
+                await self._conn.add_listener(STREAM_CHANNEL, self._on_notify)
+            except Exception as e:
+                # Readers still poll every STREAM_POLL_SECONDS
+                logger.warning(f"LISTEN {STREAM_CHANNEL} unavailable, polling: {e}")
+                self._conn = None
+                self._retry_at = time.monotonic() + 30
+
+    async def subscribe(self, stream_id: str) -> asyncio.Event:
+        await self._ensure_listening()
+        waiter = asyncio.Event()
+        self._waiters.setdefault(stream_id, set()).add(waiter)
+        return waiter
+
+    def unsubscribe(self, stream_id: str, waiter: asyncio.Event):
+        waiters = self._waiters.get(stream_id)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[stream_id]
+
+    async def close(self):
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+notifications = StreamNotifications()
+
+
+async def _iter_remote(stream_id: str, after: int) -> AsyncIterator[str]:
+    """Follow a stream produced elsewhere through its persisted log."""
+    waiter = await notifications.subscribe(stream_id)
+    last_sent = time.monotonic()
+    try:
+        while True:
+            waiter.clear()
+            async with session_scope() as db:
+                row = (await db.execute(
+                    select(
+                        EventStream.status, EventStream.first_event_id, EventStream.last_event_id,
+                        (func.extract("epoch", func.now() - EventStream.heartbeat_at)).label("silent_for"),
+                    ).where(EventStream.id == stream_id)
+                )).first()
+                if row is None:
+                    return
+                events = (await db.execute(
+                    select(EventStreamEvent.event_id, EventStreamEvent.data)
+                    .where(EventStreamEvent.stream_id == stream_id, EventStreamEvent.event_id > after)
+                    .order_by(EventStreamEvent.event_id)
+                    .limit(REPLAY_BATCH)
+                )).all()
+
+            if after < row.first_event_id - 1:
+                yield f": events up to {row.first_event_id - 1} were trimmed\n\n"
+            for event_id, data in events:
+                yield _format(event_id, data)
+                after = event_id
+                last_sent = time.monotonic()
+            if len(events) == REPLAY_BATCH:
+                continue
+
+            if row.status != EventStreamStatus.RUNNING.value:
+                if after >= row.last_event_id:
+                    return
+                continue
+            if row.silent_for is not None and float(row.silent_for) > STREAM_STALE_SECONDS:
+                message = "Stream producer stopped responding"
+                yield _format(after + 1, json.dumps({"type": "error", "message": message}))
+                yield _format(after + 2, DONE)
+                return
+
+            try:
+                await asyncio.wait_for(waiter.wait(), STREAM_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                if time.monotonic() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+                    yield ": keepalive\n\n"
+                    last_sent = time.monotonic()
+    finally:
+        notifications.unsubscribe(stream_id, waiter)
+
+
+async def close_stream_broker():
+    """Stop this process's producers (readers see an error event) and the LISTEN connection."""
+    tasks = [stream.task for stream in _local.values() if stream.task and not stream.task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    await notifications.close()
+
+
+# =============================================================================
+# ENDPOINT
+# =============================================================================
+
+@router.get("/{stream_id}")
+async def follow_stream(
+    stream_id: str,
+    last_event_id: Optional[int] = Query(None, ge=0, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    SSE stream of a brokered stream's events, from any worker.
+
+    Reconnect with ?last_event_id=N (or the Last-Event-ID header EventSource
+    sends automatically) to resume after event N; finished streams replay
+    their retained events.
+    """
+    after = last_event_id
+    if after is None and last_event_id_header and last_event_id_header.isdigit():
+        after = int(last_event_id_header)
+
+    local = _local.get(stream_id)
+    if local is not None:
+        events = local.iter_sse(after or 0)
+    else:
+        async with session_scope() as db:
+            exists = await db.scalar(select(EventStream.id).where(EventStream.id == stream_id))
+        if not exists:
+            raise HTTPException(status_code=404, detail="Stream not found")
+        events = _iter_remote(stream_id, after or 0)
+
+    return _sse_response(stream_id, events)
@@ -0,0 +1,389 @@
+"""
+Structured LLM Outputs
+
+LLM consumers used to scrape JSON out of free text (code-fence slicing,
+find('{')..rfind('}'), regexes) and fall back to {"raw_response": ...} or empty
+results when that failed, so users re-ran whole generations. Here an operation
+declares a Pydantic model for its output (see llm_schemas) and:
+
+- create_structured() asks for it as a forced tool call whose input_schema is
+  the model's JSON schema, so the API returns parsed arguments instead of
+  prose, then validates them;
+- parse_structured() validates text from calls that can't force a tool
+  (streamed generations, extended thinking), extracting the JSON with
+  extract_json();
+- JsonStreamValidator follows a streamed response delta by delta and
+  validates as soon as the top-level JSON value closes, so a malformed reply
+  is known (and repaired) before the stream's trailing prose finishes.
+
+Output that fails validation is not thrown away: one repair call on
+STRUCTURED_REPAIR_MODEL (a cheap model) gets the raw output plus the
+validation errors and returns the corrected data through the same tool. Only
+if that also fails does the caller see StructuredOutputError and use its
+fallback.
+"""
+
+import os
+import re
+import json
+import logging
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from .llm_clients import get_llm_client, tier_for_model
+from .llm_scheduler import run_llm_call
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_REPAIR_MODEL = os.getenv("STRUCTURED_REPAIR_MODEL", "claude-haiku-4-5-20251001")
+STRUCTURED_REPAIR_MAX_TOKENS = int(os.getenv("STRUCTURED_REPAIR_MAX_TOKENS", "8192"))
+STRUCTURED_REPAIR_ENABLED = os.getenv("STRUCTURED_REPAIR_ENABLED", "1") == "1"
+
+# Raw output sent to the repair model is capped (characters)
+REPAIR_INPUT_LIMIT = 60000
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class StructuredOutputError(Exception):
+    """An LLM output that could not be parsed or validated, even after repair."""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+# =============================================================================
+# JSON EXTRACTION
+# =============================================================================
+
+class JsonScanner:
+    """
+    Incrementally finds the first complete top-level JSON object (or, unless
+    objects_only, array) in text fed to it: prose, code fences and anything
+    after the value are ignored.
+    """
+
+    def __init__(self, objects_only: bool = False):
+        self.text = ""
+        self._openers = "{" if objects_only else "{["
+        self.value: Any = None
+        self.complete = False
+        self._start = -1
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, delta: str) -> bool:
+        """Add text; True once the value is complete (and parsed into .value)."""
+        self.text += delta
+        while not self.complete and self._pos < len(self.text):
+            self._scan()
+        return self.complete
+
+    def _scan(self):
+        text = self.text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            self._pos += 1
+            if self._start < 0:
+                if ch in self._openers:
+                    self._start = self._pos - 1
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close()
+                    return
+
+    def _close(self):
+        candidate = self.text[self._start:self._pos]
+        try:
+            self.value = json.loads(candidate)
+        except ValueError:
+            try:
+                # Most common near-miss: trailing commas
+                self.value = json.loads(re.sub(r",\s*([}\]])", r"\1", candidate))
+            except ValueError:
+                # Not JSON after all (e.g. "[1]" in prose): look again after it
+                self._pos = self._start + 1
+                self._start = -1
+                self._in_string = self._escape = False
+                return
+        self.complete = True
+
+
+class JsonItemScanner:
+    """
+    Pulls completed elements out of arrays in a streaming JSON object, e.g.
+    each entry of {"generated_cases": [...]} as soon as its closing brace
+    arrives, so consumers can show the first card while the rest generate.
+
+        scanner = JsonItemScanner("generated_cases", "generation_note")
+        for key, item in scanner.feed(delta): ...
+
+    Only arrays that are values of the named keys of the top-level object are
+    watched (structurally, not by searching for the key text). Text before the
+    object (prose, an opening code fence) is skipped.
+    """
+
+    def __init__(self, *keys: str):
+        self.keys = set(keys)
+        self.text = ""
+        self._pos = 0
+        # One frame per open container: [opener, start, expecting_key, last_key]
+        self._stack: List[list] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._done = False
+
+    def feed(self, delta: str) -> List[tuple]:
+        """Add text; returns (key, item) for each element it completed."""
+        self.text += delta
+        items = []
+        text, stack = self.text, self._stack
+        while self._pos < len(text) and not self._done:
+            ch = text[self._pos]
+            pos = self._pos
+            self._pos += 1
+            if not stack:
+                if ch == "{":
+                    stack.append(["{", pos, True, None])
+                continue
+            frame = stack[-1]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if frame[0] == "{" and frame[2]:
+                        try:
+                            frame[3] = json.loads(text[self._string_start:pos + 1])
+                        except ValueError:
+                            frame[3] = None
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch == ":" and frame[0] == "{":
+                frame[2] = False
+            elif ch == "," and frame[0] == "{":
+                frame[2] = True
+            elif ch in "{[":
+                stack.append([ch, pos, ch == "{", None])
+            elif ch in "}]":
+                stack.pop()
+                if not stack:
+                    self._done = True
+                elif len(stack) == 2 and stack[1][0] == "[" and stack[0][3] in self.keys:
+                    try:
+                        items.append((stack[0][3], json.loads(text[frame[1]:pos + 1])))
+                    except ValueError:
+                        pass
+        return items
+
+
+def extract_json(text: str, objects_only: bool = False) -> Any:
+    """The first complete JSON object or array in an LLM reply; ValueError if none."""
+    scanner = JsonScanner(objects_only)
+    if not scanner.feed(text or ""):
+        raise ValueError("No complete JSON value in response")
+    return scanner.value
+
+
+# =============================================================================
+# VALIDATION AND REPAIR
+# =============================================================================
+
+_tools: Dict[type, Dict[str, Any]] = {}
+
+
+def response_tool(response_model: Type[BaseModel]) -> Dict[str, Any]:
+    """The tool definition whose input is response_model (cached per model)."""
+    tool = _tools.get(response_model)
+    if tool is None:
+        name = re.sub(r"(?<!^)(?=[A-Z])", "_", response_model.__name__).lower()
+        tool = _tools[response_model] = {
+            "name": f"submit_{name}"[:64],
+            "description": (response_model.__doc__ or f"Submit the {name} result.").strip(),
+            "input_schema": response_model.model_json_schema(),
+        }
+    return tool
+
+
+def _describe_errors(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "\n".join(
+            f"- {'.'.join(str(part) for part in e['loc']) or '(root)'}: {e['msg']}"
+            for e in error.errors()[:20]
+        )
+    return f"- {error}"
+
+
+def _tool_input(response, tool_name: str) -> Optional[Any]:
+    for block in response.content:
+        if getattr(block, "type", None) == "tool_use" and block.name == tool_name:
+            return block.input
+    return None
+
+
+def _response_text(response) -> str:
+    return "".join(getattr(block, "text", "") for block in response.content)
+
+
+REPAIR_PROMPT = """The output below was produced for a structured task but does not match the required schema.
+
+## Problems
+{problems}
+
+## Output
+{raw}
+
+Call the tool with the corrected data. Keep all of the output's content and wording; only fix structure, types and missing or malformed fields. If the output was cut off, complete the structure minimally."""
+
+
+async def repair_structured(raw: str, response_model: Type[T], problems: str) -> T:
+    """One cheap call to turn invalid output into a valid response_model instance."""
+    if not STRUCTURED_REPAIR_ENABLED:
+        raise StructuredOutputError(f"Invalid {response_model.__name__} output:\n{problems}", raw)
+
+    tool = response_tool(response_model)
+    client = get_llm_client(tier_for_model(STRUCTURED_REPAIR_MODEL))
+    logger.info(f"Repairing {response_model.__name__} output ({len(raw)} chars)")
+    try:
+        response = await run_llm_call(
+            client.messages.create,
+            model=STRUCTURED_REPAIR_MODEL,
+            max_tokens=STRUCTURED_REPAIR_MAX_TOKENS,
+            tools=[tool],
+            tool_choice={"type": "tool", "name": tool["name"]},
+            messages=[{"role": "user", "content": REPAIR_PROMPT.format(
+                problems=problems, raw=raw[:REPAIR_INPUT_LIMIT]
+            )}]
+        )
+        return response_model.model_validate(_tool_input(response, tool["name"]))
+    except ValidationError as e:
+        raise StructuredOutputError(
+            f"Repaired {response_model.__name__} output still invalid:\n{_describe_errors(e)}", raw
+        ) from e
+    except Exception as e:
+        raise StructuredOutputError(f"Repair of {response_model.__name__} output failed: {e}", raw) from e
+
+
+async def validate_structured(data: Any, response_model: Type[T], raw: Optional[str] = None) -> T:
+    """Validate already-parsed data, repairing it on failure."""
+    try:
+        return response_model.model_validate(data)
+    except ValidationError as e:
+        problems = _describe_errors(e)
+        logger.warning(f"{response_model.__name__} output invalid:\n{problems}")
+        return await repair_structured(raw if raw is not None else json.dumps(data), response_model, problems)
+
+
+async def parse_structured(text: str, response_model: Type[T]) -> T:
+    """Extract and validate response_model from free text, repairing it on failure."""
+    try:
+        data = extract_json(text, objects_only=True)
+    except ValueError as e:
+        logger.warning(f"{response_model.__name__} output has no JSON ({len(text or '')} chars)")
+        return await repair_structured(text or "", response_model, _describe_errors(e))
+    return await validate_structured(data, response_model, raw=text)
+
+
+async def create_structured(
+    client,
+    response_model: Type[T],
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    max_tokens: int = 4096,
+    **kwargs
+) -> T:
+    """
+    messages.create() with the output forced through response_model's tool.
+
+    Runs the (synchronous) client in a thread. Extra kwargs (system,
+    temperature, ...) are passed through; extended thinking can't be combined
+    with a forced tool, so thinking calls should stream text into
+    JsonStreamValidator or parse_structured() instead.
+    """
+    tool = response_tool(response_model)
+    response = await run_llm_call(
+        client.messages.create,
+        model=model,
+        max_tokens=max_tokens,
+        tools=[tool],
+        tool_choice={"type": "tool", "name": tool["name"]},
+        messages=messages,
+        **kwargs
+    )
+    data = _tool_input(response, tool["name"])
+    if data is None:
+        return await parse_structured(_response_text(response), response_model)
+    if getattr(response, "stop_reason", None) == "max_tokens":
+        logger.warning(f"{response_model.__name__} output hit max_tokens ({max_tokens})")
+    return await validate_structured(data, response_model)
+
+
+class JsonStreamValidator:
+    """
+    Validates a streamed response as it arrives.
+
+        validator = JsonStreamValidator(Model)
+        for delta in text_deltas:
+            validator.feed(delta)
+        result = await validator.result()
+
+    feed() returns True once the top-level JSON value has closed; .error then
+    holds the validation error (None if valid), available before the stream
+    ends. result() returns the validated model, repairing if needed.
+    """
+
+    def __init__(self, response_model: Type[T]):
+        self.response_model = response_model
+        self.scanner = JsonScanner(objects_only=True)
+        self.parsed: Optional[T] = None
+        self.error: Optional[ValidationError] = None
+
+    @property
+    def text(self) -> str:
+        return self.scanner.text
+
+    def feed(self, delta: str) -> bool:
+        if self.scanner.complete:
+            self.scanner.text += delta
+            return True
+        if self.scanner.feed(delta):
+            try:
+                self.parsed = self.response_model.model_validate(self.scanner.value)
+            except ValidationError as e:
+                self.error = e
+                logger.warning(f"{self.response_model.__name__} stream invalid:\n{_describe_errors(e)}")
+            return True
+        return False
+
+    async def result(self) -> T:
+        if self.parsed is not None:
+            return self.parsed
+        if self.error is not None:
+            return await repair_structured(self.text, self.response_model, _describe_errors(self.error))
+        return await repair_structured(
+            self.text, self.response_model, "- (root): response ended before the JSON value was complete"
+        )
@@ -14,20 +14,24 @@ Population Flow:
 3. Creates AnalyzedConcept + ConceptAnalysis + AnalysisItem records
 4. Sets provenance_type=WIZARD, created_via='initial_wizard'
 5. Later: Evidence enrichment adds more items with provenance_type=EVIDENCE
+
+Writes are batched: the processors only build rows in memory (BridgeBatch),
+the dimension -> operation map comes from the cached schema catalogue, and
+analyses, items and scaffolds are each written with one INSERT ... RETURNING.
+A finalisation is a handful of statements however many cards the wizard made.
 """
 
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert
 
 from .concept_analysis_models import (
     AnalyzedConcept, ConceptAnalysis, AnalysisItem, ItemReasoningScaffold,
-    ItemRelationship, AnalyticalOperation, AnalyticalDimension,
-    DimensionType, ProvenanceType, ItemRelationType, RelationshipSource,
-    WebCentrality, InferenceType, SourceType
+    DimensionType, ProvenanceType, WebCentrality, InferenceType, SourceType
 )
+from .schema_catalogue import schema_catalogue
 
 logger = logging.getLogger(__name__)
 
@@ -86,33 +90,6 @@ CONFIDENCE_MAP = {
 # HELPER FUNCTIONS
 # =====================================================================
 
-async def get_or_create_operation(
-    db: AsyncSession,
-    dimension_type: DimensionType,
-    operation_name: str
-) -> Optional[AnalyticalOperation]:
-    """Get an operation by dimension and name, or return None if not found."""
-    # First get the dimension
-    dim_result = await db.execute(
-        select(AnalyticalDimension).where(AnalyticalDimension.dimension_type == dimension_type)
-    )
-    dimension = dim_result.scalar_one_or_none()
-
-    if not dimension:
-        logger.warning(f"Dimension {dimension_type} not found in database")
-        return None
-
-    # Then find an operation in that dimension
-    op_result = await db.execute(
-        select(AnalyticalOperation).where(
-            AnalyticalOperation.dimension_id == dimension.id
-        ).limit(1)  # Get any operation in this dimension for now
-    )
-    operation = op_result.scalar_one_or_none()
-
-    return operation
-
-
 def map_confidence(wizard_confidence: str) -> float:
     """Convert wizard confidence strings to floats."""
     if isinstance(wizard_confidence, (int, float)):
@@ -128,6 +105,126 @@ def extract_source_passage(card: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+async def get_dimension_operations(db: AsyncSession) -> Dict[DimensionType, int]:
+    """
+    The operation each dimension's wizard items are filed under (its first
+    operation), from the cached schema catalogue.
+    """
+    catalogue = await schema_catalogue.get(db)
+    operations = {}
+    for dimension_type in DimensionType:
+        operation_ids = catalogue.operation_ids_by_dimension.get(dimension_type.value)
+        if operation_ids:
+            operations[dimension_type] = operation_ids[0]
+    return operations
+
+
+# =====================================================================
+# BATCH WRITER
+# =====================================================================
+
+class BridgeBatch:
+    """
+    Analysis items (and their reasoning scaffolds) for one concept, built in
+    memory by the processors and written with one INSERT per table.
+
+    Every item row carries the same keys so each table is a single
+    executemany (SQLAlchemy splits bulk inserts by key set).
+    """
+
+    def __init__(self, wizard_session_id: Optional[int] = None):
+        self.wizard_session_id = wizard_session_id
+        self.dimensions: List[DimensionType] = []
+        self.items: List[Dict[str, Any]] = []
+        self.scaffolds: Dict[int, Dict[str, Any]] = {}  # item index -> scaffold row
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add_item(
+        self,
+        dimension_type: DimensionType,
+        item_type: str,
+        content: str,
+        strength: Optional[float] = None,
+        subtype: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None,
+        web_centrality: Optional[WebCentrality] = None,
+        scaffold: Optional[Dict[str, Any]] = None,
+    ):
+        if scaffold is not None:
+            self.scaffolds[len(self.items)] = {
+                "derivation_trigger": scaffold.get("derivation_trigger"),
+                "source_passage": scaffold.get("source_passage"),
+                "reasoning_trace": scaffold.get("reasoning_trace"),
+                "premise_confidence": scaffold.get("premise_confidence"),
+                "inference_type": scaffold.get("inference_type"),
+            }
+        self.dimensions.append(dimension_type)
+        self.items.append({
+            "item_type": item_type,
+            "content": content,
+            "strength": strength,
+            "subtype": subtype,
+            "extra_data": extra_data,
+            "web_centrality": web_centrality,
+            "provenance_type": ProvenanceType.WIZARD,
+            "provenance_source_id": self.wizard_session_id,
+            "created_via": "initial_wizard",
+            "is_active": True,
+        })
+
+    async def write(self, db: AsyncSession, concept_id: int) -> Dict[str, int]:
+        """
+        Insert one ConceptAnalysis per dimension used, then the items and
+        scaffolds, each with a single INSERT ... RETURNING. Items whose
+        dimension has no operation in the catalogue are dropped.
+        """
+        operations = await get_dimension_operations(db)
+
+        used = [d for d in dict.fromkeys(self.dimensions) if d in operations]
+        for dimension_type in dict.fromkeys(self.dimensions):
+            if dimension_type not in operations:
+                logger.warning(f"Could not find operation for dimension {dimension_type}")
+        if not used:
+            return {"analyses": 0, "items": 0}
+
+        analysis_ids = (await db.execute(
+            insert(ConceptAnalysis).returning(ConceptAnalysis.id, sort_by_parameter_order=True),
+            [
+                {
+                    "concept_id": concept_id,
+                    "operation_id": operations[dimension_type],
+                    "source_type": SourceType.LLM_GENERATED,
+                }
+                for dimension_type in used
+            ],
+        )).scalars().all()
+        analysis_by_dimension = dict(zip(used, analysis_ids))
+
+        indices = [i for i, d in enumerate(self.dimensions) if d in analysis_by_dimension]
+        if not indices:
+            return {"analyses": len(analysis_ids), "items": 0}
+
+        item_ids = (await db.execute(
+            insert(AnalysisItem).returning(AnalysisItem.id, sort_by_parameter_order=True),
+            [
+                {**self.items[i], "analysis_id": analysis_by_dimension[self.dimensions[i]]}
+                for i in indices
+            ],
+        )).scalars().all()
+
+        scaffold_rows = [
+            {**self.scaffolds[i], "item_id": item_id}
+            for i, item_id in zip(indices, item_ids)
+            if i in self.scaffolds
+        ]
+        if scaffold_rows:
+            await db.execute(insert(ItemReasoningScaffold), scaffold_rows)
+
+        return {"analyses": len(analysis_ids), "items": len(item_ids)}
+
+
 # =====================================================================
 # CORE BRIDGE FUNCTIONS
 # =====================================================================
@@ -183,69 +280,23 @@ async def bridge_wizard_to_schema(
         await db.flush()  # Get the ID
         result["analyzed_concept_id"] = analyzed_concept.id
 
-        # Track created items for relationship inference
-        created_items: List[AnalysisItem] = []
-
-        # 2. Process hypothesis cards
-        items = await process_hypothesis_cards(
-            db, analyzed_concept.id,
-            wizard_data.get("hypothesis_cards", []),
-            wizard_session_id
-        )
-        created_items.extend(items)
-        result["items_created"] += len(items)
-
-        # 3. Process genealogy cards
-        items = await process_genealogy_cards(
-            db, analyzed_concept.id,
-            wizard_data.get("genealogy_cards", []),
-            wizard_session_id
-        )
-        created_items.extend(items)
-        result["items_created"] += len(items)
-
-        # 4. Process differentiation cards
-        items = await process_differentiation_cards(
-            db, analyzed_concept.id,
-            wizard_data.get("differentiation_cards", []),
-            wizard_session_id
-        )
-        created_items.extend(items)
-        result["items_created"] += len(items)
-
-        # 5. Process dimensional signals
-        items = await process_dimensional_signals(
-            db, analyzed_concept.id,
-            wizard_data.get("dimensional_signals", {}),
-            wizard_session_id
-        )
-        created_items.extend(items)
-        result["items_created"] += len(items)
-
-        # 6. Process stage answers (core_definition, problem_addressed, etc.)
-        items = await process_stage_answers(
-            db, analyzed_concept.id,
-            wizard_data,
-            wizard_session_id
-        )
-        created_items.extend(items)
-        result["items_created"] += len(items)
-
-        # 7. Process epistemic blind spots as items to revisit
-        items = await process_epistemic_blind_spots(
-            db, analyzed_concept.id,
+        # 2-7. Build every item in memory
+        batch = BridgeBatch(wizard_session_id)
+        process_hypothesis_cards(batch, wizard_data.get("hypothesis_cards", []))
+        process_genealogy_cards(batch, wizard_data.get("genealogy_cards", []))
+        process_differentiation_cards(batch, wizard_data.get("differentiation_cards", []))
+        process_dimensional_signals(batch, wizard_data.get("dimensional_signals", {}))
+        process_stage_answers(batch, wizard_data)
+        process_epistemic_blind_spots(
+            batch,
             wizard_data.get("epistemic_blind_spots",
-                          wizard_data.get("gaps_tensions_questions", [])),
-            wizard_session_id
+                            wizard_data.get("gaps_tensions_questions", []))
         )
-        created_items.extend(items)
-        result["items_created"] += len(items)
 
-        # Count analyses created
-        analysis_result = await db.execute(
-            select(ConceptAnalysis).where(ConceptAnalysis.concept_id == analyzed_concept.id)
-        )
-        result["analyses_created"] = len(analysis_result.scalars().all())
+        # 8. Write analyses, items and scaffolds in bulk
+        written = await batch.write(db, analyzed_concept.id)
+        result["analyses_created"] = written["analyses"]
+        result["items_created"] = written["items"]
 
         await db.commit()
 
@@ -257,65 +308,19 @@ async def bridge_wizard_to_schema(
     return result
 
 
-async def get_or_create_analysis(
-    db: AsyncSession,
-    concept_id: int,
-    dimension_type: DimensionType,
-) -> Optional[ConceptAnalysis]:
-    """Get or create a ConceptAnalysis record for the given concept and dimension."""
-    # Get operation for this dimension
-    operation = await get_or_create_operation(db, dimension_type, "default")
-
-    if not operation:
-        logger.warning(f"Could not find operation for dimension {dimension_type}")
-        return None
-
-    # Check if analysis exists
-    result = await db.execute(
-        select(ConceptAnalysis).where(
-            ConceptAnalysis.concept_id == concept_id,
-            ConceptAnalysis.operation_id == operation.id
-        )
-    )
-    analysis = result.scalar_one_or_none()
-
-    if not analysis:
-        analysis = ConceptAnalysis(
-            concept_id=concept_id,
-            operation_id=operation.id,
-            source_type=SourceType.LLM_GENERATED,
-        )
-        db.add(analysis)
-        await db.flush()
-
-    return analysis
-
-
 # =====================================================================
 # CARD PROCESSORS
 # =====================================================================
 
-async def process_hypothesis_cards(
-    db: AsyncSession,
-    concept_id: int,
-    cards: List[Dict[str, Any]],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
+def process_hypothesis_cards(batch: BridgeBatch, cards: List[Dict[str, Any]]):
     """Process wizard hypothesis cards into AnalysisItems."""
-    items = []
-
     for card in cards:
         card_type = card.get("type", "thesis")
         mapping = HYPOTHESIS_TYPE_TO_DIMENSION.get(card_type, (DimensionType.POSITIONAL, "forward_inference"))
         dimension_type, item_type = mapping
 
-        analysis = await get_or_create_analysis(db, concept_id, dimension_type)
-        if not analysis:
-            continue
-
-        # Create the item
-        item = AnalysisItem(
-            analysis_id=analysis.id,
+        batch.add_item(
+            dimension_type,
             item_type=item_type,
             content=card.get("content", ""),
             strength=map_confidence(card.get("confidence", "medium")),
@@ -325,48 +330,23 @@ async def process_hypothesis_cards(
                 "source_excerpts": card.get("source_excerpts", []),
                 "rationale": card.get("rationale"),
             },
-            provenance_type=ProvenanceType.WIZARD,
-            provenance_source_id=wizard_session_id,
-            created_via="initial_wizard",
-            is_active=True,
-        )
-        db.add(item)
-        await db.flush()
-
-        # Create reasoning scaffold
-        scaffold = ItemReasoningScaffold(
-            item_id=item.id,
-            derivation_trigger="user_notes",
-            source_passage=extract_source_passage(card),
-            reasoning_trace=card.get("rationale"),
-            premise_confidence=map_confidence(card.get("confidence", "medium")),
+            scaffold={
+                "derivation_trigger": "user_notes",
+                "source_passage": extract_source_passage(card),
+                "reasoning_trace": card.get("rationale"),
+                "premise_confidence": map_confidence(card.get("confidence", "medium")),
+            },
         )
-        db.add(scaffold)
 
-        items.append(item)
 
-    return items
-
-
-async def process_genealogy_cards(
-    db: AsyncSession,
-    concept_id: int,
-    cards: List[Dict[str, Any]],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
+def process_genealogy_cards(batch: BridgeBatch, cards: List[Dict[str, Any]]):
     """Process wizard genealogy cards into AnalysisItems."""
-    items = []
-
-    analysis = await get_or_create_analysis(db, concept_id, DimensionType.GENEALOGICAL)
-    if not analysis:
-        return items
-
     for card in cards:
         # Create item for thinker influence
         content = f"{card.get('thinker', 'Unknown')} ({card.get('tradition', '')}): {card.get('connection', '')}"
 
-        item = AnalysisItem(
-            analysis_id=analysis.id,
+        batch.add_item(
+            DimensionType.GENEALOGICAL,
             item_type="theoretical_lineage",
             content=content,
             strength=map_confidence(card.get("confidence", "medium")),
@@ -378,48 +358,23 @@ async def process_genealogy_cards(
                 "why_relevant": card.get("why_relevant"),
                 "source_excerpts": card.get("source_excerpts", []),
             },
-            provenance_type=ProvenanceType.WIZARD,
-            provenance_source_id=wizard_session_id,
-            created_via="initial_wizard",
-            is_active=True,
-        )
-        db.add(item)
-        await db.flush()
-
-        # Create reasoning scaffold
-        scaffold = ItemReasoningScaffold(
-            item_id=item.id,
-            derivation_trigger="user_notes",
-            source_passage=extract_source_passage(card),
-            reasoning_trace=card.get("why_relevant"),
-            inference_type=InferenceType.ABDUCTIVE,
+            scaffold={
+                "derivation_trigger": "user_notes",
+                "source_passage": extract_source_passage(card),
+                "reasoning_trace": card.get("why_relevant"),
+                "inference_type": InferenceType.ABDUCTIVE,
+            },
         )
-        db.add(scaffold)
 
-        items.append(item)
 
-    return items
-
-
-async def process_differentiation_cards(
-    db: AsyncSession,
-    concept_id: int,
-    cards: List[Dict[str, Any]],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
+def process_differentiation_cards(batch: BridgeBatch, cards: List[Dict[str, Any]]):
     """Process wizard differentiation cards into AnalysisItems."""
-    items = []
-
-    analysis = await get_or_create_analysis(db, concept_id, DimensionType.POSITIONAL)
-    if not analysis:
-        return items
-
     for card in cards:
         # Create incompatibility/differentiation item
         content = f"Not {card.get('contrasted_with', 'unknown')}: {card.get('difference', '')}"
 
-        item = AnalysisItem(
-            analysis_id=analysis.id,
+        batch.add_item(
+            DimensionType.POSITIONAL,
             item_type="incompatibility",
             content=content,
             strength=map_confidence(card.get("confidence", "medium")),
@@ -432,28 +387,11 @@ async def process_differentiation_cards(
                 "difference": card.get("difference"),
                 "source_excerpts": card.get("source_excerpts", []),
             },
-            provenance_type=ProvenanceType.WIZARD,
-            provenance_source_id=wizard_session_id,
-            created_via="initial_wizard",
-            is_active=True,
         )
-        db.add(item)
-        await db.flush()
 
-        items.append(item)
 
-    return items
-
-
-async def process_dimensional_signals(
-    db: AsyncSession,
-    concept_id: int,
-    signals: Dict[str, Any],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
+def process_dimensional_signals(batch: BridgeBatch, signals: Dict[str, Any]):
     """Process wizard dimensional signals into AnalysisItems."""
-    items = []
-
     for signal_name, signal_data in signals.items():
         if not signal_data or not isinstance(signal_data, dict):
             continue
@@ -462,430 +400,146 @@ async def process_dimensional_signals(
         if not dimension_type:
             continue
 
-        analysis = await get_or_create_analysis(db, concept_id, dimension_type)
-        if not analysis:
-            continue
-
         confidence = map_confidence(signal_data.get("confidence", "low"))
 
         # Create items based on signal type
-        items.extend(await _process_signal_by_type(
-            db, analysis.id, signal_name, signal_data,
-            confidence, wizard_session_id
-        ))
-
-    return items
+        _process_signal_by_type(batch, dimension_type, signal_name, signal_data, confidence)
+
+
+# Signals whose list entries each become an item: signal -> [(list key, item_type)]
+SIGNAL_LIST_ITEMS = {
+    "sellarsian": [("hidden_assumptions", "hidden_assumption")],
+    "brandomian": [("implicit_commitments", "commitment")],
+    "kuhnian": [("exemplars", "paradigm_exemplar"), ("incommensurabilities", "incommensurability")],
+    "foucauldian": [("subjectification_effects", "subjectification_effect"), ("resistance_points", "resistance_point")],
+    "pragmatist": [
+        ("practical_consequences", "practical_consequence"),
+        ("performative_effects", "performative_effect"),
+        ("habit_formations", "habit_formation"),
+    ],
+}
 
 
-async def _process_signal_by_type(
-    db: AsyncSession,
-    analysis_id: int,
+def _process_signal_by_type(
+    batch: BridgeBatch,
+    dimension_type: DimensionType,
     signal_name: str,
     signal_data: Dict[str, Any],
     confidence: float,
-    wizard_session_id: Optional[int]
-) -> List[AnalysisItem]:
+):
     """Process individual signal type into items."""
-    items = []
+
+    def add(item_type: str, content: str, **fields):
+        batch.add_item(dimension_type, item_type=item_type, content=content, strength=confidence, **fields)
 
     # Quinean signals
     if signal_name == "quinean":
+        centrality_hint = signal_data.get("centrality_hint")
+        web_centrality = (
+            WebCentrality(centrality_hint.lower())
+            if centrality_hint in ["core", "high", "medium", "peripheral"]
+            else WebCentrality.MEDIUM
+        )
         for inference in signal_data.get("inferences_detected", []):
             if inference:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="forward_inference",
-                    content=inference,
-                    strength=confidence,
-                    web_centrality=WebCentrality(signal_data.get("centrality_hint", "medium").lower())
-                        if signal_data.get("centrality_hint") in ["core", "high", "medium", "peripheral"]
-                        else WebCentrality.MEDIUM,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-    # Sellarsian signals (givenness)
-    elif signal_name == "sellarsian":
-        for assumption in signal_data.get("hidden_assumptions", []):
-            if assumption:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="hidden_assumption",
-                    content=assumption,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-    # Brandomian signals (commitments)
-    elif signal_name == "brandomian":
-        for commitment in signal_data.get("implicit_commitments", []):
-            if commitment:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="commitment",
-                    content=commitment,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
+                add("forward_inference", inference, web_centrality=web_centrality)
 
     # Deleuzian signals (transformations)
     elif signal_name == "deleuzian":
         problem = signal_data.get("problem_addressed")
         if problem:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="tension",
-                content=problem,
-                strength=confidence,
-                extra_data={
-                    "tension_poles": signal_data.get("tension_poles", []),
-                    "becomings_enabled": signal_data.get("becomings_enabled", []),
-                    "becomings_blocked": signal_data.get("becomings_blocked", []),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
+            add("tension", problem, extra_data={
+                "tension_poles": signal_data.get("tension_poles", []),
+                "becomings_enabled": signal_data.get("becomings_enabled", []),
+                "becomings_blocked": signal_data.get("becomings_blocked", []),
+            })
 
     # Bachelardian signals (breaks)
     elif signal_name == "bachelardian":
         breaking_from = signal_data.get("breaking_from")
         if breaking_from:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="epistemological_break",
-                content=f"Breaking from: {breaking_from}",
-                strength=confidence,
-                extra_data={
-                    "why_inadequate": signal_data.get("why_inadequate"),
-                    "obstacle_risk": signal_data.get("obstacle_risk"),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
+            add("epistemological_break", f"Breaking from: {breaking_from}", extra_data={
+                "why_inadequate": signal_data.get("why_inadequate"),
+                "obstacle_risk": signal_data.get("obstacle_risk"),
+            })
 
     # Canguilhem signals (norms)
     elif signal_name == "canguilhem":
         for value in signal_data.get("values_embedded", []):
             if value:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="embedded_norm",
-                    content=value,
-                    strength=confidence,
-                    extra_data={
-                        "whose_interests": signal_data.get("whose_interests"),
-                        "what_excluded": signal_data.get("what_excluded"),
-                    },
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
+                add("embedded_norm", value, extra_data={
+                    "whose_interests": signal_data.get("whose_interests"),
+                    "what_excluded": signal_data.get("what_excluded"),
+                })
 
     # Davidson signals (reasoning styles)
     elif signal_name == "davidson":
         style = signal_data.get("reasoning_style")
         if style:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="reasoning_style",
-                content=f"Reasoning style: {style}",
-                strength=confidence,
-                extra_data={
-                    "makes_visible": signal_data.get("makes_visible", []),
-                    "makes_invisible": signal_data.get("makes_invisible", []),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
+            add("reasoning_style", f"Reasoning style: {style}", extra_data={
+                "makes_visible": signal_data.get("makes_visible", []),
+                "makes_invisible": signal_data.get("makes_invisible", []),
+            })
 
     # Blumenberg signals (metaphors)
     elif signal_name == "blumenberg":
         metaphor = signal_data.get("root_metaphor")
         if metaphor:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="root_metaphor",
-                content=metaphor,
-                strength=confidence,
-                extra_data={
-                    "source_domain": signal_data.get("source_domain"),
-                    "metaphor_work": signal_data.get("metaphor_work"),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
+            add("root_metaphor", metaphor, extra_data={
+                "source_domain": signal_data.get("source_domain"),
+                "metaphor_work": signal_data.get("metaphor_work"),
+            })
 
     # Carey signals (component concepts)
     elif signal_name == "carey":
         for component in signal_data.get("component_concepts", []):
             if component:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="component_concept",
-                    content=component,
-                    strength=confidence,
-                    extra_data={
-                        "combination_type": signal_data.get("combination_type"),
-                        "what_emerges": signal_data.get("what_emerges"),
-                    },
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
+                add("component_concept", component, extra_data={
+                    "combination_type": signal_data.get("combination_type"),
+                    "what_emerges": signal_data.get("what_emerges"),
+                })
 
     # Kuhnian signals (paradigm structure, anomalies, incommensurability)
     elif signal_name == "kuhnian":
-        # Paradigm position
         position = signal_data.get("paradigm_position")
         if position:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="paradigm_position",
-                content=f"Paradigm status: {position}",
-                strength=confidence,
-                extra_data={
-                    "paradigm_position": position,
-                    "disciplinary_matrix": signal_data.get("disciplinary_matrix"),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
-
-        # Exemplars
-        for exemplar in signal_data.get("exemplars", []):
-            if exemplar:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="paradigm_exemplar",
-                    content=exemplar,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-        # Incommensurabilities
-        for incomm in signal_data.get("incommensurabilities", []):
-            if incomm:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="incommensurability",
-                    content=incomm if isinstance(incomm, str) else str(incomm),
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
+            add("paradigm_position", f"Paradigm status: {position}", extra_data={
+                "paradigm_position": position,
+                "disciplinary_matrix": signal_data.get("disciplinary_matrix"),
+            })
 
     # Foucauldian signals (power-knowledge, governmentality, subjectification)
     elif signal_name == "foucauldian":
-        # Power-knowledge nexus
         power_knowledge = signal_data.get("power_knowledge_nexus")
         if power_knowledge:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="power_knowledge",
-                content=power_knowledge,
-                strength=confidence,
-                extra_data={
-                    "governmentality_mode": signal_data.get("governmentality_mode"),
-                    "discourse_formation": signal_data.get("discourse_formation"),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
-
-        # Subjectification effects
-        for effect in signal_data.get("subjectification_effects", []):
-            if effect:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="subjectification_effect",
-                    content=effect,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-        # Resistance points
-        for point in signal_data.get("resistance_points", []):
-            if point:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="resistance_point",
-                    content=point,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
+            add("power_knowledge", power_knowledge, extra_data={
+                "governmentality_mode": signal_data.get("governmentality_mode"),
+                "discourse_formation": signal_data.get("discourse_formation"),
+            })
 
     # Pragmatist signals (practical consequences, performativity, habits)
     elif signal_name == "pragmatist":
-        # Cash value
         cash_value = signal_data.get("cash_value")
         if cash_value:
-            item = AnalysisItem(
-                analysis_id=analysis_id,
-                item_type="practical_meaning",
-                content=cash_value,
-                strength=confidence,
-                extra_data={
-                    "inquiry_context": signal_data.get("inquiry_context"),
-                },
-                provenance_type=ProvenanceType.WIZARD,
-                provenance_source_id=wizard_session_id,
-                created_via="initial_wizard",
-                is_active=True,
-            )
-            db.add(item)
-            await db.flush()
-            items.append(item)
-
-        # Practical consequences
-        for consequence in signal_data.get("practical_consequences", []):
-            if consequence:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="practical_consequence",
-                    content=consequence,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-        # Performative effects
-        for effect in signal_data.get("performative_effects", []):
-            if effect:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="performative_effect",
-                    content=effect,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-        # Habit formations
-        for habit in signal_data.get("habit_formations", []):
-            if habit:
-                item = AnalysisItem(
-                    analysis_id=analysis_id,
-                    item_type="habit_formation",
-                    content=habit,
-                    strength=confidence,
-                    provenance_type=ProvenanceType.WIZARD,
-                    provenance_source_id=wizard_session_id,
-                    created_via="initial_wizard",
-                    is_active=True,
-                )
-                db.add(item)
-                await db.flush()
-                items.append(item)
-
-    return items
-
-
-async def process_stage_answers(
-    db: AsyncSession,
-    concept_id: int,
-    wizard_data: Dict[str, Any],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
-    """Process wizard stage answers into AnalysisItems."""
-    items = []
+            add("practical_meaning", cash_value, extra_data={
+                "inquiry_context": signal_data.get("inquiry_context"),
+            })
+
+    # Plain lists (sellarsian, brandomian, and the rest of kuhnian/foucauldian/pragmatist)
+    for key, item_type in SIGNAL_LIST_ITEMS.get(signal_name, []):
+        for entry in signal_data.get(key, []):
+            if entry:
+                add(item_type, entry if isinstance(entry, str) else str(entry))
+
 
+def process_stage_answers(batch: BridgeBatch, wizard_data: Dict[str, Any]):
+    """Process wizard stage answers into AnalysisItems."""
     for answer_key, mapping in STAGE_ANSWER_MAPPINGS.items():
         value = wizard_data.get(answer_key)
         if not value:
             continue
 
         dimension_type, item_subtype, item_type = mapping
-        analysis = await get_or_create_analysis(db, concept_id, dimension_type)
-        if not analysis:
-            continue
 
         # Handle dict values (like paradigmatic_case)
         if isinstance(value, dict):
@@ -895,38 +549,17 @@ async def process_stage_answers(
             content = str(value)
             extra = {"wizard_answer_key": answer_key}
 
-        item = AnalysisItem(
-            analysis_id=analysis.id,
+        batch.add_item(
+            dimension_type,
             item_type=item_type,
             content=content,
             subtype=item_subtype,
             extra_data=extra,
-            provenance_type=ProvenanceType.WIZARD,
-            provenance_source_id=wizard_session_id,
-            created_via="initial_wizard",
-            is_active=True,
         )
-        db.add(item)
-        await db.flush()
-        items.append(item)
-
-    return items
 
 
-async def process_epistemic_blind_spots(
-    db: AsyncSession,
-    concept_id: int,
-    blind_spots: List[Dict[str, Any]],
-    wizard_session_id: Optional[int] = None
-) -> List[AnalysisItem]:
+def process_epistemic_blind_spots(batch: BridgeBatch, blind_spots: List[Dict[str, Any]]):
     """Process epistemic blind spots as items to revisit."""
-    items = []
-
-    # Blind spots go to PRESUPPOSITIONAL dimension as areas to clarify
-    analysis = await get_or_create_analysis(db, concept_id, DimensionType.PRESUPPOSITIONAL)
-    if not analysis:
-        return items
-
     for spot in blind_spots:
         if not spot:
             continue
@@ -937,8 +570,9 @@ async def process_epistemic_blind_spots(
         if not description:
             continue
 
-        item = AnalysisItem(
-            analysis_id=analysis.id,
+        # Blind spots go to PRESUPPOSITIONAL dimension as areas to clarify
+        batch.add_item(
+            DimensionType.PRESUPPOSITIONAL,
             item_type="epistemic_blind_spot",
             content=description,
             subtype=category,
@@ -948,16 +582,7 @@ async def process_epistemic_blind_spots(
                 "source": spot.get("source"),
                 "needs_resolution": True,
             },
-            provenance_type=ProvenanceType.WIZARD,
-            provenance_source_id=wizard_session_id,
-            created_via="initial_wizard",
-            is_active=True,
         )
-        db.add(item)
-        await db.flush()
-        items.append(item)
-
-    return items
 
 
 # =====================================================================
@@ -0,0 +1,180 @@
+"""
+Write Tracking - Shared Session Listeners and Scope Revisions
+
+Several in-process caches have to notice this process's writes: project
+statistics (project_stats), rendered strategizer pages (strategizer.render_cache)
+and the concept similarity index (concept_dedup). Each used to install its own
+after_flush / do_orm_execute / after_commit / after_soft_rollback listeners,
+so every flush walked session.new / dirty / deleted once per cache.
+
+Here one set of Session listeners walks each flush once and hands the rows to
+the subscribers registered for their model:
+
+- WriteSubscriber.flushed(session, obj, deleted) for each flushed row,
+- WriteSubscriber.bulk_written(session, model, rows) for ORM bulk statements
+  (rows are the inserted parameter dicts, or None for UPDATE / DELETE, whose
+  rows can't be told without a query),
+- WriteSubscriber.ended(session, committed) once the transaction that wrote
+  them commits or rolls back.
+
+ScopeRevisions is the subscriber both caches use: write counters per (kind,
+scope), where a tracked row is attributed to its scope (a project, a concept)
+by following a path of foreign keys through the session's identity map. A
+row's scope is bumped at flush time and again when the transaction ends, so a
+value computed mid-transaction is never served after it commits or rolls
+back. Writes that can't be attributed bump the kind for every scope.
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+logger = logging.getLogger(__name__)
+
+
+class WriteSubscriber:
+    """Receives this process's ORM writes to the models it subscribed for."""
+
+    def flushed(self, session: Session, obj: Any, deleted: bool):
+        pass
+
+    def bulk_written(self, session: Session, model: type, rows: Optional[List[Dict[str, Any]]]):
+        pass
+
+    def ended(self, session: Session, committed: bool):
+        pass
+
+
+# model -> subscribers, in subscription order
+_subscribers: Dict[type, List[WriteSubscriber]] = {}
+
+
+def subscribe(subscriber: WriteSubscriber, *models: type):
+    for model in models:
+        subscribers = _subscribers.setdefault(model, [])
+        if subscriber not in subscribers:
+            subscribers.append(subscriber)
+
+
+def _touched(session: Session) -> Set[WriteSubscriber]:
+    return session.info.setdefault("write_subscribers", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session, flush_context):
+    deleted = session.deleted
+    for obj in (*session.new, *session.dirty, *deleted):
+        subscribers = _subscribers.get(type(obj))
+        if subscribers:
+            is_deleted = obj in deleted
+            for subscriber in subscribers:
+                subscriber.flushed(session, obj, is_deleted)
+                _touched(session).add(subscriber)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    subscribers = _subscribers.get(mapper.class_) if mapper is not None else None
+    if not subscribers:
+        return
+
+    session = orm_execute_state.session
+    params = orm_execute_state.parameters
+    rows = None
+    if orm_execute_state.is_insert and params:
+        rows = params if isinstance(params, list) else [params]
+    for subscriber in subscribers:
+        subscriber.bulk_written(session, mapper.class_, rows)
+        _touched(session).add(subscriber)
+
+
+def _on_end(session: Session, committed: bool):
+    for subscriber in session.info.pop("write_subscribers", ()):
+        subscriber.ended(session, committed)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    _on_end(session, True)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _on_rollback(session, previous_transaction):
+    _on_end(session, False)
+
+
+# =============================================================================
+# SCOPE REVISIONS
+# =============================================================================
+
+class ScopeRevisions(WriteSubscriber):
+    """
+    Write counters per (kind, scope), kept by the rows registered with track().
+
+    A path is an attribute of the row holding the scope id, optionally followed
+    by (parent model, attribute of the parent) hops, e.g. ("source_id",
+    EvidenceSource, "project_id") for a fragment scoped by its source's project.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tracked: Dict[type, List[Tuple[str, tuple]]] = {}
+        self._any: Counter = Counter()           # kind -> writes to any scope
+        self._unattributed: Counter = Counter()  # kind -> writes to an unknown scope
+        self._scopes: Counter = Counter()        # (kind, scope) -> writes
+
+    def track(self, model: type, kind: str, path: tuple):
+        self._tracked.setdefault(model, []).append((kind, path))
+        subscribe(self, model)
+
+    def bump(self, kind: str, scope: Any = None):
+        """Invalidate one scope's kind, or every scope's when scope is None."""
+        self._any[kind] += 1
+        if scope is None:
+            self._unattributed[kind] += 1
+        else:
+            self._scopes[(kind, scope)] += 1
+
+    def revision(self, kind: str, scope: Any = None) -> tuple:
+        """Revision of one scope's kind, or of every scope's when scope is None."""
+        if scope is None:
+            return (self._any[kind],)
+        return (self._unattributed[kind], self._scopes[(kind, scope)])
+
+    @staticmethod
+    def scope_of(session: Session, values: Dict[str, Any], path: tuple) -> Optional[Any]:
+        """Follow path from a row's values; None when a hop isn't loaded in the session."""
+        value = values.get(path[0])
+        for model, attribute in zip(path[1::2], path[2::2]):
+            if value is None:
+                return None
+            parent = session.identity_map.get(identity_key(model, value))
+            value = parent.__dict__.get(attribute) if parent is not None else None
+        return value
+
+    def _record(self, session: Session, kind: str, scope: Any):
+        self.bump(kind, scope)
+        session.info.setdefault(("scope_revisions", self.name), set()).add((kind, scope))
+
+    def flushed(self, session: Session, obj: Any, deleted: bool):
+        for kind, path in self._tracked[type(obj)]:
+            self._record(session, kind, self.scope_of(session, obj.__dict__, path))
+
+    def bulk_written(self, session: Session, model: type, rows: Optional[List[Dict[str, Any]]]):
+        for kind, path in self._tracked[model]:
+            if rows is None:
+                self._record(session, kind, None)
+            else:
+                for row in rows:
+                    self._record(session, kind, self.scope_of(session, row, path))
+
+    def ended(self, session: Session, committed: bool):
+        for kind, scope in session.info.pop(("scope_revisions", self.name), ()):
+            self.bump(kind, scope)
@@ -3,15 +3,26 @@
 Run database migrations for Theory Service.
 Can be run manually or as part of deploy process.
 
+Applies the migrations in db/migrations that aren't recorded in the
+schema_migrations ledger yet (see api/migrations.py), then reruns the
+idempotent steps in db/migrations/repeatable.
+
 Usage:
-    python db/migrate.py
+    python db/migrate.py                     # apply pending migrations
+    python db/migrate.py --status            # list migrations and their state
+    python db/migrate.py --accept-checksums  # record edited, already-applied files as-is
 """
 
 import os
 import sys
+import logging
+import argparse
 from pathlib import Path
 
-import psycopg2
+# Run as a script from the repo root or anywhere else
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.migrations import MigrationError, apply_migrations, migration_status  # noqa: E402
 
 # Database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/theory_db")
@@ -21,42 +32,50 @@ if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
 
-def run_migrations():
-    """Run all SQL migrations in order."""
-    migrations_dir = Path(__file__).parent / "migrations"
-
-    if not migrations_dir.exists():
-        print("No migrations directory found")
-        return
-
-    # Get all .sql files sorted by name
-    migration_files = sorted(migrations_dir.glob("*.sql"))
-
-    if not migration_files:
+def print_status():
+    rows = migration_status(DATABASE_URL)
+    if not rows:
         print("No migration files found")
         return
+    for row in rows:
+        applied = f"  {row['applied_at']} ({row['execution_ms']} ms)" if row["applied_at"] else ""
+        print(f"  {row['state']:<8} {row['name']}{applied}")
 
-    print(f"Found {len(migration_files)} migration(s)")
-    print(f"Database: {DATABASE_URL[:50]}...")
-
-    conn = psycopg2.connect(DATABASE_URL)
-    conn.autocommit = True
 
+def run_migrations(accept_checksums: bool = False):
+    """Apply pending migrations in order."""
+    print(f"Database: {DATABASE_URL[:50]}...")
     try:
-        with conn.cursor() as cur:
-            for migration_file in migration_files:
-                print(f"\nRunning: {migration_file.name}")
-                sql = migration_file.read_text()
-                cur.execute(sql)
-                print(f"  ✓ {migration_file.name} completed")
-    except Exception as e:
+        run = apply_migrations(DATABASE_URL, accept_checksums=accept_checksums)
+    except MigrationError as e:
         print(f"Migration error: {e}")
         sys.exit(1)
-    finally:
-        conn.close()
 
-    print("\n✓ All migrations completed!")
+    # Progress is logged by the runner as it goes
+    for name in run.accepted:
+        print(f"  ✓ {name} checksum updated")
+
+    if run.applied:
+        print(f"\n✓ Applied {len(run.applied)} migration(s)")
+    else:
+        print("\n✓ Database is up to date")
+    for name, rows in run.repeated.items():
+        print(f"  ✓ {name}: {rows} row(s) changed")
+    if run.deferred:
+        print(f"  ({len(run.deferred)} deferred until their tables exist)")
 
 
 if __name__ == "__main__":
-    run_migrations()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Apply Theory Service database migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations and their state")
+    parser.add_argument(
+        "--accept-checksums", action="store_true",
+        help="record the current checksum of applied migrations that were edited, without rerunning them",
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+    else:
+        run_migrations(accept_checksums=args.accept_checksums)
@@ -0,0 +1,18 @@
+-- Migration: Pending-Decision Queue Indexes
+-- Date: 2026-10-18
+-- Description: Composite indexes backing the keyset-paginated decision queue
+--              (GET .../evidence/decisions/queue). Pending fragments are read in
+--              (created_at, id) order filtered by analysis_status.
+--
+-- Built concurrently so fragment writes continue during the build. Both tables
+-- are created by the app (create_all) rather than by a migration, so on a fresh
+-- database they may not exist yet; create_all then builds the indexes from the
+-- model definitions, and this migration is a no-op once the tables appear.
+-- migrate:no-transaction
+-- migrate:requires-table strategizer_evidence_fragments ca_evidence_fragments
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_strategizer_fragment_status_created
+    ON strategizer_evidence_fragments (analysis_status, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ca_evidence_fragment_status_created
+    ON ca_evidence_fragments (analysis_status, created_at, id);
@@ -0,0 +1,19 @@
+-- Migration: Dialogue History Index
+-- Date: 2026-10-18
+-- Description: Composite index backing keyset-paginated dialogue history
+--              (GET .../projects/{id}/dialogue?before=...) and the recent-turns
+--              lookup in /ask. Turns are read per project in (created_at, id)
+--              order. It replaces the single-column project index, which it
+--              covers as a prefix.
+--
+-- Built concurrently so dialogue writes continue during the build. The table is
+-- created by the app (create_all) rather than by a migration, so on a fresh
+-- database it may not exist yet; create_all then builds the index from the
+-- model definition instead.
+-- migrate:no-transaction
+-- migrate:requires-table strategizer_dialogue_turns
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_strategizer_dialogue_project_created
+    ON strategizer_dialogue_turns (project_id, created_at, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_strategizer_dialogue_project;
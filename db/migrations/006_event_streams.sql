@@ -0,0 +1,29 @@
+-- Migration: Event Streams
+-- Date: 2026-10-18
+-- Description: Bounded per-stream SSE event logs, so a stream produced on one
+--              worker can be read (and resumed with last_event_id) from any
+--              worker via GET /streams/{id}. Producers publish new events with
+--              NOTIFY event_streams, '<stream id>'.
+
+CREATE TABLE IF NOT EXISTS event_streams (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(100) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',   -- running, completed, failed
+
+    -- Retained events are first_event_id..last_event_id
+    first_event_id INTEGER NOT NULL DEFAULT 1,
+    last_event_id INTEGER NOT NULL DEFAULT 0,
+
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    heartbeat_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_event_streams_finished_at ON event_streams(finished_at);
+
+CREATE TABLE IF NOT EXISTS event_stream_events (
+    stream_id VARCHAR(36) NOT NULL REFERENCES event_streams(id) ON DELETE CASCADE,
+    event_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (stream_id, event_id)
+);
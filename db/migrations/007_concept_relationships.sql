@@ -0,0 +1,79 @@
+-- Migration: External Concepts and Concept Relationships
+-- Date: 2026-10-18
+-- Description: Tables for concepts from outside the corpus and typed
+--              relationships between concepts (internal or external), with a
+--              column per analytical framework. Previously created by
+--              POST /admin/migrate.
+--
+-- Both tables are also ORM models, so create_all creates them (with its own
+-- indexes) on a fresh database; the indexes below only accompany tables
+-- created here. concept_relationships references concepts, which the app
+-- creates itself.
+-- migrate:requires-table concepts
+
+DO $$
+BEGIN
+    IF to_regclass('external_concepts') IS NULL THEN
+        CREATE TABLE external_concepts (
+            id SERIAL PRIMARY KEY,
+            term VARCHAR(255) NOT NULL,
+            author VARCHAR(255),
+            source_work VARCHAR(500),
+            year INTEGER,
+            brief_definition TEXT,
+            extended_definition TEXT,
+            paradigm VARCHAR(255),
+            research_program VARCHAR(255),
+            disciplinary_home VARCHAR(255),
+            key_claims JSONB,
+            dimensional_analysis JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX idx_external_concepts_term ON external_concepts(term);
+        CREATE INDEX idx_external_concepts_author ON external_concepts(author);
+        CREATE INDEX idx_external_concepts_paradigm ON external_concepts(paradigm);
+    END IF;
+END $$;
+
+DO $$
+BEGIN
+    IF to_regclass('concept_relationships') IS NULL THEN
+        CREATE TABLE concept_relationships (
+            id SERIAL PRIMARY KEY,
+            concept_id INTEGER REFERENCES concepts(id) ON DELETE CASCADE,
+            external_concept_id INTEGER REFERENCES external_concepts(id) ON DELETE CASCADE,
+            related_concept_id INTEGER REFERENCES concepts(id) ON DELETE CASCADE,
+            related_external_concept_id INTEGER REFERENCES external_concepts(id) ON DELETE CASCADE,
+            relationship_type VARCHAR(50) NOT NULL,
+            description TEXT,
+            strength VARCHAR(20),
+            bidirectional BOOLEAN DEFAULT FALSE,
+            sellarsian JSONB,
+            brandomian JSONB,
+            deleuzian JSONB,
+            hacking JSONB,
+            bachelardian JSONB,
+            quinean JSONB,
+            carey JSONB,
+            blumenberg JSONB,
+            canguilhem JSONB,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT chk_source_concept CHECK (
+                (concept_id IS NOT NULL AND external_concept_id IS NULL) OR
+                (concept_id IS NULL AND external_concept_id IS NOT NULL)
+            ),
+            CONSTRAINT chk_target_concept CHECK (
+                (related_concept_id IS NOT NULL AND related_external_concept_id IS NULL) OR
+                (related_concept_id IS NULL AND related_external_concept_id IS NOT NULL)
+            )
+        );
+        CREATE INDEX idx_concept_relationships_concept ON concept_relationships(concept_id);
+        CREATE INDEX idx_concept_relationships_external ON concept_relationships(external_concept_id);
+        CREATE INDEX idx_concept_relationships_related ON concept_relationships(related_concept_id);
+        CREATE INDEX idx_concept_relationships_related_ext ON concept_relationships(related_external_concept_id);
+        CREATE INDEX idx_concept_relationships_type ON concept_relationships(relationship_type);
+    END IF;
+END $$;
@@ -0,0 +1,40 @@
+-- Migration: Unbounded evidence_strength, [MOCK] Project Labels
+-- Date: 2026-10-18
+-- Description: evidence_strength on emerging concepts and dialectics becomes
+--              TEXT (it held free-text assessments longer than the VARCHAR
+--              allowed), and items from the synthetic test projects (3 and 4)
+--              get a "[MOCK] " prefix on their source_project_name. Previously
+--              re-checked by POST /admin/migrate on every call.
+--
+-- The tables are created by the app (create_all).
+-- migrate:requires-table challenges emerging_concepts emerging_dialectics
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'emerging_concepts' AND column_name = 'evidence_strength'
+          AND data_type <> 'text'
+    ) THEN
+        ALTER TABLE emerging_concepts ALTER COLUMN evidence_strength TYPE TEXT;
+        ALTER TABLE emerging_dialectics ALTER COLUMN evidence_strength TYPE TEXT;
+    END IF;
+END $$;
+
+UPDATE challenges
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
+
+UPDATE emerging_concepts
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
+
+UPDATE emerging_dialectics
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
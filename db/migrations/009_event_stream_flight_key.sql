@@ -0,0 +1,10 @@
+-- Migration: Event Stream Flight Keys
+-- Date: 2026-10-18
+-- Description: A running stream records the fingerprint of the request that
+--              started it (its kind and request body), so an identical request
+--              arriving on any worker follows that stream instead of starting
+--              the same LLM generation again. See api/stream_broker.py.
+
+ALTER TABLE event_streams ADD COLUMN IF NOT EXISTS flight_key VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS ix_event_streams_flight_key ON event_streams(flight_key);
@@ -0,0 +1,29 @@
+-- Migration: Coherence Run Leases
+-- Date: 2026-10-18
+-- Description: Background deep-coherence runs become safe to serve from several
+--              workers. The executing worker refreshes heartbeat_at; other
+--              workers only fail a running run once its heartbeat is stale
+--              (COHERENCE_RUN_STALE_SECONDS). A partial unique index allows one
+--              running run per project across all workers.
+--
+-- The table is created by the app (create_all).
+-- migrate:requires-table strategizer_coherence_runs
+
+ALTER TABLE strategizer_coherence_runs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ DEFAULT NOW();
+
+-- Older duplicates left running by restarts would violate the index
+UPDATE strategizer_coherence_runs r
+SET status = 'FAILED',
+    error = 'Deep analysis was interrupted by a server restart',
+    completed_at = NOW() AT TIME ZONE 'UTC'
+WHERE r.status = 'RUNNING'
+  AND EXISTS (
+      SELECT 1 FROM strategizer_coherence_runs newer
+      WHERE newer.project_id = r.project_id
+        AND newer.status = 'RUNNING'
+        AND (newer.created_at, newer.id) > (r.created_at, r.id)
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_strategizer_coherence_run_running
+    ON strategizer_coherence_runs (project_id)
+    WHERE status = 'RUNNING';
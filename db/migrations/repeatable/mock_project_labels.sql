@@ -0,0 +1,26 @@
+-- Repeatable: [MOCK] Project Labels
+-- Description: items from the synthetic test projects (3 and 4) get a
+--              "[MOCK] " prefix on their source_project_name. Runs on every
+--              migrate, so rows written since the last deploy are labelled
+--              too (008 did this once, for the rows that existed then).
+--
+-- The tables are created by the app (create_all).
+-- migrate:requires-table challenges emerging_concepts emerging_dialectics
+
+UPDATE challenges
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
+
+UPDATE emerging_concepts
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
+
+UPDATE emerging_dialectics
+SET source_project_name = '[MOCK] ' || source_project_name
+WHERE source_project_id IN (3, 4)
+  AND source_project_name IS NOT NULL
+  AND source_project_name NOT LIKE '[MOCK]%';
@@ -1122,6 +1122,9 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
                 handlers.onThinking?.(event.content)
               } else if (event.type === 'text') {
                 handlers.onText?.(event.content)
+              } else if (event.type === 'item') {
+                // A completed array element, ahead of the authoritative 'complete'
+                handlers.onItem?.(event)
               } else if (event.type === 'interim_complete') {
                 setInterimAnalysis(event.data)
                 handlers.onInterimComplete?.(event.data)
@@ -1209,10 +1212,10 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
           setStage(STAGES.BLIND_SPOTS_QUESTIONING)
           setIsCurating(false)
 
-          // Pre-generate options for first 2 questions immediately (illusion of spontaneity)
+          // Pre-generate options for the whole queue in one batched request (illusion of spontaneity)
           // Pass queue directly since state won't be updated yet
-          console.log('[PreGen] Starting initial pre-generation for first 2 slots')
-          triggerPreGeneration(0, 2, normalizedQueue)
+          console.log('[PreGen] Starting batched pre-generation for all slots')
+          preGenerateOptionsBatch(normalizedQueue)
         }
       }
     )
@@ -1391,6 +1394,74 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
     }
   }
 
+  /**
+   * Pre-generate options for every pending slot with one batched SSE request.
+   * Options arrive per question as soon as each is ready and go straight into the cache.
+   */
+  const preGenerateOptionsBatch = async (queueSnapshot) => {
+    const indexBySlotId = {}
+    const questions = []
+    queueSnapshot.slots.forEach((slot, idx) => {
+      if (slot?.status === 'pending' && !preGeneratedOptionsCache[idx] && !preGeneratingSlots.has(idx)) {
+        indexBySlotId[slot.slot_id] = idx
+        questions.push({ question_id: slot.slot_id, question: slot.question, category: slot.category })
+      }
+    })
+    if (questions.length === 0) return
+
+    const pendingIndices = Object.values(indexBySlotId)
+    setPreGeneratingSlots(prev => new Set([...prev, ...pendingIndices]))
+    const markDone = (idx) => setPreGeneratingSlots(prev => {
+      const next = new Set(prev)
+      next.delete(idx)
+      return next
+    })
+
+    try {
+      const response = await fetch(`${API_URL}/concepts/wizard/generate-answer-options-batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          questions,
+          concept_name: conceptName,
+          notes_context: notes,
+          previous_answers: []
+        })
+      })
+      if (!response.ok) throw new Error('Failed to pre-generate options')
+
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+
+        buffer += decoder.decode(value, { stream: true })
+        const lines = buffer.split('\n')
+        buffer = lines.pop() || ''
+
+        for (const line of lines) {
+          if (!line.startsWith('data: ') || line === 'data: [DONE]') continue
+          const event = JSON.parse(line.slice(6))
+          if (event.type === 'answer_options' && event.question_id in indexBySlotId) {
+            const idx = indexBySlotId[event.question_id]
+            setPreGeneratedOptionsCache(prev => ({ ...prev, [idx]: event.data }))
+            markDone(idx)
+            console.log('[PreGen] Cached options for slot', idx)
+          } else if (event.type === 'error') {
+            throw new Error(event.error)
+          }
+        }
+      }
+    } catch (err) {
+      console.error('[PreGen] Batched pre-generation failed', err)
+    } finally {
+      pendingIndices.forEach(markDone)
+    }
+  }
+
   /**
    * Trigger pre-generation for multiple upcoming slots
    * Called after curator completes and after each answer submission
@@ -2261,6 +2332,10 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
         onThinking: (content) => {
           setThinking(prev => prev + content)
         },
+        onItem: (item) => {
+          // Show cases as they finish; the first one replaces any previous set
+          setGeneratedCases(prev => item.index === 0 ? [item.data] : [...prev, item.data])
+        },
         onComplete: (data) => {
           setGeneratedCases(data.generated_cases || [])
           setIsGeneratingExamples(false)
@@ -2299,6 +2374,9 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
         onThinking: (content) => {
           setThinking(prev => prev + content)
         },
+        onItem: (item) => {
+          setGeneratedMarkers(prev => item.index === 0 ? [item.data] : [...prev, item.data])
+        },
         onComplete: (data) => {
           setGeneratedMarkers(data.generated_markers || [])
           setIsGeneratingExamples(false)
@@ -3394,6 +3472,9 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
    * Called after Stage 3 when enough context has accumulated
    */
   const generateDeepCommitments = async () => {
+    // Sharded mode streams one dimension at a time; the user starts answering
+    // as soon as the first dimension arrives and later ones are appended.
+    let streamedAny = false
     setIsGeneratingCommitments(true)
     setStage(STAGES.ANALYZING_COMMITMENTS)
     setProgress({ stage: 9, total: 11, label: 'Generating philosophical dimension questions...' })
@@ -3411,7 +3492,8 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
           user_approved_genealogy: stageData.genealogy || genealogyHypotheses.filter(h => h.status === 'approved'),
           stage1_answers: stageData.stage1?.answers || [],
           stage2_answers: stageData.stage2?.answers || [],
-          dimensional_extraction: dimensionalExtraction
+          dimensional_extraction: dimensionalExtraction,
+          generation_mode: 'sharded'
         })
       })
 
@@ -3444,6 +3526,19 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
                 setThinking(prev => prev + parsed.content)
               } else if (parsed.type === 'text') {
                 setThinking(prev => prev + parsed.content)
+              } else if (parsed.type === 'dimension_questions') {
+                if (parsed.questions?.length) {
+                  const append = streamedAny
+                  setDeepCommitmentQuestions(prev => append ? [...prev, ...parsed.questions] : parsed.questions)
+                  if (!append) {
+                    streamedAny = true
+                    setCurrentCommitmentIndex(0)
+                    setStage(STAGES.DEEP_COMMITMENTS)
+                  }
+                }
+                setProgress({ stage: 9, total: 11, label: `Deep Commitments: Philosophical Dimensions (${parsed.completed}/${parsed.total} ready)` })
+              } else if (parsed.type === 'dimension_error') {
+                console.warn(`[generateDeepCommitments] ${parsed.dimension} failed:`, parsed.message)
               } else if (parsed.type === 'complete') {
                 questionsData = parsed.data
               } else if (parsed.type === 'error') {
@@ -3456,7 +3551,11 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
         }
       }
 
-      if (questionsData?.deep_commitment_questions) {
+      if (streamedAny) {
+        // Questions were appended as they arrived; keep that order so the
+        // current index still points at the question being answered
+        setProgress({ stage: 9, total: 11, label: 'Deep Commitments: Philosophical Dimensions' })
+      } else if (questionsData?.deep_commitment_questions?.length) {
         setDeepCommitmentQuestions(questionsData.deep_commitment_questions)
         setCurrentCommitmentIndex(0)
         setProgress({ stage: 9, total: 11, label: 'Deep Commitments: Philosophical Dimensions' })
@@ -3470,7 +3569,9 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
     } catch (error) {
       const errorMsg = typeof error === 'string' ? error : (error?.message || JSON.stringify(error))
       setError(errorMsg)
-      setStage(STAGES.STAGE3)  // Go back to Stage 3 on error
+      if (!streamedAny) {
+        setStage(STAGES.STAGE3)  // Go back to Stage 3 on error
+      }
     } finally {
       setIsGeneratingCommitments(false)
       setThinking('')
@@ -6740,8 +6841,11 @@ export default function ConceptSetupWizard({ sourceId, onComplete, onCancel, add
                 <button
                   className="btn btn-primary"
                   onClick={nextCommitmentQuestion}
+                  disabled={isGeneratingCommitments && currentCommitmentIndex >= deepCommitmentQuestions.length - 1}
                 >
-                  {currentCommitmentIndex < deepCommitmentQuestions.length - 1 ? 'Next →' : 'Continue to Phase 2 →'}
+                  {currentCommitmentIndex < deepCommitmentQuestions.length - 1
+                    ? 'Next →'
+                    : isGeneratingCommitments ? 'More questions loading…' : 'Continue to Phase 2 →'}
                 </button>
               </div>
             </div>
@@ -15,32 +15,75 @@ function EvidenceDecisionView({ conceptId, onClose, onDecisionMade, apiUrl }) {
   const [submitting, setSubmitting] = useState(false)
   const [error, setError] = useState(null)
   const [selectedInterpretation, setSelectedInterpretation] = useState(null)
-  const [currentIndex, setCurrentIndex] = useState(0)
+  // Decisions prefetched after the current one, for instant "Next"
+  const [ahead, setAhead] = useState([])
 
-  const loadDecision = async (index = 0) => {
+  const PREFETCH = 3
+
+  /**
+   * Load a window of the decision queue by cursor (after / before a fragment id).
+   * Returns the number of pending decisions, or null on error.
+   */
+  const loadDecisions = async ({ after = null, before = null } = {}) => {
     setLoading(true)
     setError(null)
     try {
-      const response = await fetch(`${apiUrl}/concepts/${conceptId}/evidence/decisions/pending?index=${index}`)
+      const params = new URLSearchParams({ prefetch: before ? 0 : PREFETCH })
+      if (after) params.set('after', after)
+      if (before) params.set('before', before)
+      const response = await fetch(`${apiUrl}/concepts/${conceptId}/evidence/decisions/queue?${params}`)
       if (!response.ok) {
         const err = await response.json()
         throw new Error(err.detail || 'Failed to load decision')
       }
       const data = await response.json()
-      setDecision(data)
-      setCurrentIndex(index)
+      // Nothing after the cursor but earlier decisions remain: wrap to the start
+      if (after && data.decisions.length === 0 && data.total_pending > 0) {
+        return loadDecisions()
+      }
+      setDecision(data.decisions[0] || null)
+      setAhead(data.decisions.slice(1))
       setSelectedInterpretation(null)
+      return data.total_pending
     } catch (err) {
       setError(err.message)
+      return null
     } finally {
       setLoading(false)
     }
   }
 
+  const goNext = () => {
+    if (ahead.length > 0) {
+      setDecision(ahead[0])
+      setAhead(ahead.slice(1))
+      setSelectedInterpretation(null)
+      // Top up the prefetch buffer once it runs out
+      if (ahead.length === 1 && ahead[0].decision_index < ahead[0].total_pending) {
+        fetch(`${apiUrl}/concepts/${conceptId}/evidence/decisions/queue?after=${ahead[0].fragment.id}&prefetch=${PREFETCH - 1}`)
+          .then(r => r.ok ? r.json() : null)
+          .then(data => data && setAhead(data.decisions))
+          .catch(() => {})
+      }
+    } else {
+      loadDecisions({ after: decision.fragment.id })
+    }
+  }
+
+  const goPrev = () => loadDecisions({ before: decision.fragment.id })
+
   useEffect(() => {
-    loadDecision(0)
+    loadDecisions()
   }, [conceptId])
 
+  // After resolving or skipping, continue from the decided fragment
+  const advancePast = async (fragmentId) => {
+    const remaining = await loadDecisions({ after: fragmentId })
+    if (remaining === 0) {
+      onClose()
+    }
+  }
+
   const handleSubmit = async () => {
     if (!selectedInterpretation) return
 
@@ -70,11 +113,7 @@ function EvidenceDecisionView({ conceptId, onClose, onDecisionMade, apiUrl }) {
       onDecisionMade()
 
       // Load next decision or close if done
-      if (decision.decision_index < decision.total_pending) {
-        loadDecision(currentIndex)
-      } else {
-        onClose()
-      }
+      await advancePast(decision.fragment.id)
     } catch (err) {
       setError(err.message)
     } finally {
@@ -89,8 +128,9 @@ function EvidenceDecisionView({ conceptId, onClose, onDecisionMade, apiUrl }) {
         method: 'POST',
       })
 
+      // Skipped decisions stay pending; move past this one
       if (decision.decision_index < decision.total_pending) {
-        loadDecision(currentIndex)
+        await loadDecisions({ after: decision.fragment.id })
       } else {
         onClose()
       }
@@ -203,21 +243,21 @@ function EvidenceDecisionView({ conceptId, onClose, onDecisionMade, apiUrl }) {
           </div>
           <div style={{ display: 'flex', gap: '0.5rem', alignItems: 'center' }}>
             <button
-              onClick={() => loadDecision(Math.max(0, currentIndex - 1))}
-              disabled={currentIndex === 0}
+              onClick={goPrev}
+              disabled={decision.decision_index <= 1}
               style={{
                 padding: '0.5rem 1rem',
                 borderRadius: '6px',
                 border: '1px solid #ddd',
                 backgroundColor: '#fff',
-                cursor: currentIndex === 0 ? 'not-allowed' : 'pointer',
-                opacity: currentIndex === 0 ? 0.5 : 1,
+                cursor: decision.decision_index <= 1 ? 'not-allowed' : 'pointer',
+                opacity: decision.decision_index <= 1 ? 0.5 : 1,
               }}
             >
               Prev
             </button>
             <button
-              onClick={() => loadDecision(currentIndex + 1)}
+              onClick={goNext}
               disabled={decision.decision_index >= decision.total_pending}
               style={{
                 padding: '0.5rem 1rem',
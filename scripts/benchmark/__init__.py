@@ -0,0 +1,7 @@
+"""
+Offline benchmark and load-test suite.
+
+Runs the FastAPI app in-process against a local Postgres seeded with scaled
+copies of scripts/sample_data, with Anthropic replaced by a deterministic stub.
+See scripts/benchmark/run.py for usage.
+"""
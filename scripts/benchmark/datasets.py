@@ -0,0 +1,167 @@
+"""
+Scaled benchmark datasets built from scripts/sample_data.
+
+Each scale unit is one copy of every sample project: the Strategizer project
+itself (via seed_strategizer_samples.seed_project) plus theory-service rows
+derived from it, so the core theory endpoints (/sync, /concepts, challenges,
+clustering) have realistic volume too:
+- a TheorySource per project copy
+- a Concept per concept unit, a Dialectic per dialectic unit
+- a Claim per LOGICAL grid claim
+- a Challenge per evidence fragment (round-robin over the copy's concepts)
+- an EmergingConcept per actor unit
+
+Scale 10 / 100 / 1000 therefore means 10x / 100x / 1000x the sample volume.
+"""
+
+import io
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from sqlalchemy import select, func, text
+
+from api.database import AsyncSessionLocal, async_engine, init_db
+from api.models import (
+    Base, TheorySource, Concept, Dialectic, Claim, Challenge, EmergingConcept,
+    ConceptStatus, DialecticStatus, ChallengeStatus, ChallengeType, EmergingStatus
+)
+from api.concept_analysis_models import Base as ConceptAnalysisBase, AnalyticalDimension
+from api.strategizer.models import Base as StrategizerBase, StrategizerUnit, UnitType
+from scripts.sample_data import ALL_PROJECTS
+from scripts.seed_strategizer_samples import seed_project
+
+
+@dataclass
+class BenchDataset:
+    """Ids the load scenarios pick targets from."""
+    scale: int
+    project_ids: List[str] = field(default_factory=list)
+    unit_ids: List[Tuple[str, str]] = field(default_factory=list)  # (project_id, unit_id)
+    concept_count: int = 0
+    challenge_count: int = 0
+
+
+async def reset_database():
+    """Drop and recreate every table. Only ever run against a dedicated bench DB."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(StrategizerBase.metadata.drop_all)
+        await conn.run_sync(ConceptAnalysisBase.metadata.drop_all)
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS schema_fingerprints"))
+    await init_db()
+
+
+async def _seed_reference_schema():
+    """Seed dimensions/operations/influences once (sync seeder, run in a thread)."""
+    async with AsyncSessionLocal() as session:
+        if await session.scalar(select(func.count(AnalyticalDimension.id))):
+            return
+
+    def _run():
+        from scripts import seed_concept_analysis
+        seed_concept_analysis.engine.echo = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_concept_analysis.seed_database()
+
+    await asyncio.to_thread(_run)
+
+
+def _theory_rows(project_data: dict, copy_index: int, project_index: int):
+    """Derive theory-service rows for one project copy."""
+    label = f"{project_data['name']} [bench {copy_index}]"
+    source_project_id = copy_index * 100 + project_index
+
+    source = TheorySource(title=label, short_name=f"bench-{copy_index}-{project_index}", source_type="notes")
+    concepts, dialectics, claims, emerging = [], [], [], []
+
+    for unit in project_data["units"]:
+        definition = unit.get("definition") or unit["name"]
+        if unit["unit_type"] == UnitType.CONCEPT:
+            concepts.append(Concept(
+                term=f"{unit['name']} #{copy_index}",
+                definition=definition,
+                category="bench",
+                status=ConceptStatus.ACTIVE,
+                source=source,
+            ))
+        elif unit["unit_type"] == UnitType.DIALECTIC:
+            content = unit.get("content") or {}
+            dialectics.append(Dialectic(
+                name=f"{unit['name']} #{copy_index}",
+                tension_a=content.get("pole_a") or definition,
+                tension_b=content.get("pole_b") or definition,
+                description=definition,
+                category="bench",
+                status=DialecticStatus.ACTIVE,
+                source=source,
+            ))
+        elif unit["unit_type"] == UnitType.ACTOR:
+            emerging.append(EmergingConcept(
+                source_project_id=source_project_id,
+                source_project_name=label,
+                proposed_name=f"{unit['name']} #{copy_index}",
+                proposed_definition=definition,
+                emergence_rationale=definition,
+                status=EmergingStatus.PROPOSED,
+            ))
+
+        claim_text = (unit.get("grids") or {}).get("LOGICAL", {}).get("claim")
+        if claim_text:
+            claims.append(Claim(statement=claim_text, claim_type="thesis", category="bench", source=source))
+
+    challenges = []
+    fragments = [f for s in project_data.get("evidence_sources", []) for f in s.get("fragments", [])]
+    for i, fragment in enumerate(fragments):
+        challenges.append(Challenge(
+            source_project_id=source_project_id,
+            source_project_name=label,
+            concept=concepts[i % len(concepts)] if concepts else None,
+            dialectic=dialectics[i % len(dialectics)] if dialectics and not concepts else None,
+            challenge_type=ChallengeType.CHALLENGES if i % 2 else ChallengeType.SUPPORTS,
+            impact_summary=fragment["content"],
+            key_evidence=fragment.get("source_location"),
+            status=ChallengeStatus.PENDING,
+        ))
+
+    return [source, *concepts, *dialectics, *claims, *challenges, *emerging], len(concepts), len(challenges)
+
+
+async def build_dataset(scale: int, reset: bool = False, verbose: bool = True) -> BenchDataset:
+    """Seed `scale` copies of every sample project and return target ids."""
+    if reset:
+        await reset_database()
+    else:
+        await init_db()
+    await _seed_reference_schema()
+
+    dataset = BenchDataset(scale=scale)
+
+    for copy_index in range(scale):
+        async with AsyncSessionLocal() as session:
+            for project_index, project_data in enumerate(ALL_PROJECTS):
+                copy = {**project_data, "name": f"{project_data['name']} [bench {copy_index}]"}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    project = await seed_project(session, copy)
+                dataset.project_ids.append(project.id)
+
+                rows, concept_count, challenge_count = _theory_rows(project_data, copy_index, project_index)
+                session.add_all(rows)
+                dataset.concept_count += concept_count
+                dataset.challenge_count += challenge_count
+
+            # One commit per copy keeps memory flat at large scales
+            await session.commit()
+
+        if verbose and (copy_index + 1) % max(1, scale // 10) == 0:
+            print(f"  seeded {copy_index + 1}/{scale} copies")
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(StrategizerUnit.project_id, StrategizerUnit.id)
+            .where(StrategizerUnit.project_id.in_(dataset.project_ids[:500]))
+        )
+        dataset.unit_ids = [(row[0], row[1]) for row in result.all()]
+
+    return dataset
@@ -0,0 +1,312 @@
+"""
+Deterministic local stand-in for the Anthropic client.
+
+Implements the subset of the SDK surface the service uses:
+- client.messages.create(...)  -> message with .content, .usage, .model; when
+  tool_choice forces a tool, the content is a tool_use block whose input is a
+  minimal valid instance of the tool's input_schema
+- client.messages.stream(...)  -> context manager yielding content_block_start /
+  content_block_delta events, plus text_stream, get_final_message() and
+  current_message_snapshot
+
+Like the real synchronous client, calls block the calling thread; latency is
+simulated with time.sleep so event-loop blocking shows up in the numbers.
+
+Configuration (env or StubConfig):
+    BENCH_LLM_LATENCY_MS      time to first token / full create() latency (default 200)
+    BENCH_LLM_TOKEN_DELAY_MS  delay between streamed deltas (default 2)
+    BENCH_LLM_TOKENS          number of text deltas per streamed response (default 200)
+    BENCH_LLM_THINKING_TOKENS number of thinking deltas when thinking is enabled (default 50)
+"""
+
+import os
+import json
+import time
+import hashlib
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+class StubConfig:
+    """Latency and token-stream shape of the stub."""
+
+    def __init__(
+        self,
+        latency_ms: float = None,
+        token_delay_ms: float = None,
+        tokens: int = None,
+        thinking_tokens: int = None,
+    ):
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv("BENCH_LLM_LATENCY_MS", "200"))
+        self.token_delay_ms = token_delay_ms if token_delay_ms is not None else float(os.getenv("BENCH_LLM_TOKEN_DELAY_MS", "2"))
+        self.tokens = tokens if tokens is not None else int(os.getenv("BENCH_LLM_TOKENS", "200"))
+        self.thinking_tokens = thinking_tokens if thinking_tokens is not None else int(os.getenv("BENCH_LLM_THINKING_TOKENS", "50"))
+
+
+CONFIG = StubConfig()
+
+
+def _canned_payload(seed: str) -> Dict[str, Any]:
+    """
+    One JSON object that satisfies the common parsers: every consumer reads the
+    keys it needs and falls back on missing ones.
+    """
+    tag = seed[:8]
+    types = ["assertive", "exploratory", "qualified", "provocative"]
+    return {
+        "response": f"Stubbed response {tag}.",
+        "implications": None,
+        "framework_references": [],
+        "suggested_actions": [],
+        "suggestions": [f"Stub suggestion {tag}"],
+        "priority_actions": [],
+        "clusters": [],
+        "questions": [],
+        "deep_commitment_questions": [
+            {
+                "id": f"stub_{tag}",
+                "dimension": "stub",
+                "question": f"Stub question {tag}?",
+                "options": [{"value": f"opt_{t}", "label": t.upper(), "description": f"A {t} stance"} for t in types],
+                "rationale": "Stub rationale",
+                "allow_multiple": False,
+            }
+        ],
+        "fragments": [],
+        "predicaments": [],
+        "friction_events": [],
+        "overall_coherence": 0.8,
+        "summary": f"Stub summary {tag}",
+        "slots": {},
+        "grids_to_apply": [],
+        "grids_to_skip": [],
+        "selected_types": [
+            {"type_key": t, "label": t.upper(), "tailored_description": f"A {t} stance"} for t in types
+        ],
+        "options": [
+            {"id": f"opt_{i + 1}", "text": f"Stub {t} option {tag}", "stance": t, "label": t.upper()}
+            for i, t in enumerate(types)
+        ],
+        "guidance": "Choose the option that best resonates with your thinking.",
+        "mutually_exclusive": False,
+    }
+
+
+# Nesting depth past which optional / list-valued fields are left empty, so
+# recursive schemas terminate
+_MAX_SCHEMA_DEPTH = 6
+
+
+def _schema_instance(schema: Dict[str, Any], defs: Dict[str, Any], tag: str, name: str = "value", depth: int = 0) -> Any:
+    """A minimal instance of a JSON schema (as produced by pydantic's model_json_schema)."""
+    if "$ref" in schema:
+        return _schema_instance(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, tag, name, depth)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            if not options or (depth >= _MAX_SCHEMA_DEPTH and len(options) < len(schema[key])):
+                return None
+            return _schema_instance(options[0], defs, tag, name, depth)
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+
+    if kind == "object":
+        required = set(schema.get("required", ()))
+        value = {}
+        for prop, prop_schema in schema.get("properties", {}).items():
+            if "default" in prop_schema:
+                value[prop] = prop_schema["default"]
+            elif prop in required or depth < _MAX_SCHEMA_DEPTH:
+                value[prop] = _schema_instance(prop_schema, defs, tag, prop, depth + 1)
+        return value
+    if kind == "array":
+        count = schema.get("minItems", 0 if depth >= _MAX_SCHEMA_DEPTH else 1)
+        if "maxItems" in schema:
+            count = min(count, schema["maxItems"])
+        items = schema.get("items", {})
+        return [_schema_instance(items, defs, tag, name, depth + 1) for _ in range(count)]
+    if kind in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum"))
+        high = schema.get("maximum", schema.get("exclusiveMaximum"))
+        if low is not None and high is not None:
+            value = (low + high) / 2
+        elif low is not None:
+            value = low + 1
+        elif high is not None:
+            value = high - 1
+        else:
+            value = 0
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+
+    if schema.get("format") == "date-time":
+        return "2026-01-01T00:00:00Z"
+    text = f"Stub {name} {tag}"
+    text = text.ljust(schema.get("minLength", 0), "x")
+    return text[:schema["maxLength"]] if "maxLength" in schema else text
+
+
+def _forced_tool(kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The tool tool_choice forces the model to call, if any."""
+    tools = kwargs.get("tools") or []
+    choice = kwargs.get("tool_choice") or {}
+    if not tools or choice.get("type") not in ("tool", "any"):
+        return None
+    if choice["type"] == "tool":
+        return next((tool for tool in tools if tool["name"] == choice.get("name")), tools[0])
+    return tools[0]
+
+
+def _prompt_text(kwargs: Dict[str, Any]) -> str:
+    parts = [str(kwargs.get("system") or "")]
+    for message in kwargs.get("messages", []):
+        content = message.get("content")
+        parts.append(content if isinstance(content, str) else json.dumps(content, default=str))
+    return "\n".join(parts)
+
+
+def _build_message(kwargs: Dict[str, Any]) -> SimpleNamespace:
+    prompt = _prompt_text(kwargs)
+    seed = hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+    tool = _forced_tool(kwargs)
+
+    content = []
+    if kwargs.get("thinking"):
+        content.append(SimpleNamespace(type="thinking", thinking=f"Stub thinking {seed[:8]}. " * CONFIG.thinking_tokens))
+    if tool is not None:
+        schema = tool.get("input_schema", {})
+        tool_input = _schema_instance(schema, schema.get("$defs", {}), seed[:8])
+        text = json.dumps(tool_input)
+        content.append(SimpleNamespace(type="tool_use", id=f"toolu_stub_{seed[:12]}", name=tool["name"], input=tool_input))
+    else:
+        text = json.dumps(_canned_payload(seed))
+        content.append(SimpleNamespace(type="text", text=text))
+
+    return SimpleNamespace(
+        id=f"msg_stub_{seed[:12]}",
+        type="message",
+        role="assistant",
+        model=kwargs.get("model", "stub"),
+        content=content,
+        stop_reason="tool_use" if tool is not None else "end_turn",
+        usage=SimpleNamespace(
+            input_tokens=max(1, len(prompt) // 4),
+            output_tokens=max(1, len(text) // 4),
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+def _chunks(text: str, n: int) -> List[str]:
+    n = max(1, min(n, len(text)))
+    size = -(-len(text) // n)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class StubMessageStream:
+    """Iterates SDK-shaped streaming events with simulated per-token delay."""
+
+    def __init__(self, kwargs: Dict[str, Any]):
+        self._message = _build_message(kwargs)
+        self._thinking = bool(kwargs.get("thinking"))
+
+    @property
+    def current_message_snapshot(self):
+        return self._message
+
+    def get_final_message(self):
+        return self._message
+
+    def _events(self):
+        time.sleep(CONFIG.latency_ms / 1000)
+        delay = CONFIG.token_delay_ms / 1000
+        for index, block in enumerate(self._message.content):
+            yield SimpleNamespace(
+                type="content_block_start",
+                index=index,
+                content_block=SimpleNamespace(type=block.type),
+            )
+            if block.type == "thinking":
+                pieces = _chunks(block.thinking, CONFIG.thinking_tokens)
+                make_delta = lambda p: SimpleNamespace(type="thinking_delta", thinking=p)
+            elif block.type == "tool_use":
+                pieces = _chunks(json.dumps(block.input), CONFIG.tokens)
+                make_delta = lambda p: SimpleNamespace(type="input_json_delta", partial_json=p)
+            else:
+                pieces = _chunks(block.text, CONFIG.tokens)
+                make_delta = lambda p: SimpleNamespace(type="text_delta", text=p)
+            for piece in pieces:
+                if delay:
+                    time.sleep(delay)
+                yield SimpleNamespace(type="content_block_delta", index=index, delta=make_delta(piece))
+            yield SimpleNamespace(type="content_block_stop", index=index)
+        yield SimpleNamespace(type="message_stop")
+
+    def __iter__(self):
+        return self._events()
+
+    @property
+    def text_stream(self):
+        for event in self._events():
+            if event.type == "content_block_delta" and hasattr(event.delta, "text"):
+                yield event.delta.text
+
+    def until_done(self):
+        for _ in self._events():
+            pass
+
+
+class StubMessageStreamManager:
+    def __init__(self, kwargs: Dict[str, Any]):
+        self._stream = StubMessageStream(kwargs)
+
+    def __enter__(self):
+        return self._stream
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+class StubMessages:
+    def create(self, **kwargs):
+        message = _build_message(kwargs)
+        # Non-streamed calls pay first-token latency plus generation time
+        time.sleep((CONFIG.latency_ms + CONFIG.token_delay_ms * CONFIG.tokens) / 1000)
+        return message
+
+    def stream(self, **kwargs):
+        return StubMessageStreamManager(kwargs)
+
+
+class StubAnthropic:
+    """Drop-in for anthropic.Anthropic."""
+
+    def __init__(self, *args, **kwargs):
+        self.messages = StubMessages()
+
+    def close(self):
+        pass
+
+
+def install_llm_stub(config: StubConfig = None):
+    """
+    Replace anthropic.Anthropic with the stub. Must run before any `api` module
+    is imported, since they bind `from anthropic import Anthropic` at import time.
+    """
+    global CONFIG
+    import anthropic
+
+    if config is not None:
+        CONFIG = config
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub-key")
+    anthropic.Anthropic = StubAnthropic
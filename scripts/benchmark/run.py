@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark / load test for the Theory Service.
+
+Runs the FastAPI app in-process (httpx ASGI transport, full lifespan) against a
+dedicated local Postgres, with Anthropic replaced by the deterministic stub in
+llm_stub.py. Reports p50/p95/p99 latency, throughput and SQL queries per request
+(from api.instrumentation) for each scenario.
+
+The database URL is taken from BENCH_DATABASE_URL / --database-url only, never
+from DATABASE_URL, so a benchmark can't be pointed at production by accident.
+
+Usage:
+    createdb theory_bench
+    python scripts/benchmark/run.py --database-url postgresql:///theory_bench --scale 10 --reset
+    python scripts/benchmark/run.py --database-url postgresql:///theory_bench --scale 100 --reset \\
+        --requests 500 --concurrency 20 --scenario sync --scenario concepts
+    python scripts/benchmark/run.py ... --skip-seed --llm-latency-ms 800 --output results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.benchmark.llm_stub import StubConfig, install_llm_stub
+
+
+NOTES = (
+    "Infrastructural sovereignty names the capacity of a polity to shape the technical "
+    "layers its public life depends on, rather than merely regulating their outputs."
+)
+
+
+class Scenario:
+    """One endpoint under load. build(dataset, rng) returns (method, path, json_body)."""
+
+    def __init__(self, name: str, build: Callable, description: str):
+        self.name = name
+        self.build = build
+        self.description = description
+
+
+def _project(dataset, rng):
+    return rng.choice(dataset.project_ids)
+
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in [
+    Scenario("sync", lambda d, r: ("GET", "/sync", None), "GET /sync (full theory state)"),
+    Scenario("concepts", lambda d, r: ("GET", "/concepts", None), "GET /concepts"),
+    Scenario("challenges", lambda d, r: ("GET", "/challenges?limit=200", None), "GET /challenges"),
+    Scenario(
+        "project_page",
+        lambda d, r: ("GET", f"/api/strategizer/ui/projects/{_project(d, r)}", None),
+        "Strategizer project HTML page",
+    ),
+    Scenario(
+        "unit_page",
+        lambda d, r: ("GET", "/api/strategizer/ui/projects/{}/units/{}".format(*r.choice(d.unit_ids)), None),
+        "Strategizer unit HTML page",
+    ),
+    Scenario(
+        "evidence_page",
+        lambda d, r: ("GET", f"/api/strategizer/ui/projects/{_project(d, r)}/evidence", None),
+        "Strategizer evidence HTML page",
+    ),
+    Scenario(
+        "wizard_sse",
+        lambda d, r: ("POST", "/concepts/wizard/analyze-notes", {"concept_name": "Bench Concept", "notes": NOTES}),
+        "SSE wizard stream (analyze-notes, thinking enabled)",
+    ),
+    Scenario(
+        "answer_options",
+        lambda d, r: ("POST", "/concepts/wizard/generate-answer-options", {
+            "question": f"What does the concept foreclose? ({r.randint(0, 10**6)})",
+            "category": "boundary",
+            "concept_name": "Bench Concept",
+            "notes_context": NOTES,
+        }),
+        "Two-stage answer option generation",
+    ),
+    Scenario(
+        "answer_options_batch",
+        lambda d, r: ("POST", "/concepts/wizard/generate-answer-options-batch", {
+            "questions": [
+                {"question_id": f"slot_{i + 1:02d}", "question": f"What does the concept foreclose? ({r.randint(0, 10**6)})",
+                 "category": "boundary"}
+                for i in range(12)
+            ],
+            "concept_name": "Bench Concept",
+            "notes_context": NOTES,
+        }),
+        "Batched answer options for a 12-question blind-spots queue (SSE)",
+    ),
+    Scenario(
+        "deep_commitments_sharded",
+        lambda d, r: ("POST", "/concepts/wizard/generate-deep-commitments", {
+            "concept_name": f"Bench Concept {r.randint(0, 10**6)}",
+            "notes_summary": NOTES,
+            "genealogy": {},
+            "stage1_answers": [],
+            "generation_mode": "sharded",
+        }),
+        "Deep-commitment questions, one concurrent call per dimension (SSE)",
+    ),
+    Scenario(
+        "clustering",
+        lambda d, r: ("POST", "/challenges/cluster", {}),
+        "Challenge clustering run",
+    ),
+]}
+
+DEFAULT_SCENARIOS = ["sync", "concepts", "challenges", "project_page", "unit_page", "wizard_sse", "answer_options"]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def run_scenario(client, scenario: Scenario, dataset, requests: int, concurrency: int,
+                       warmup: int, seed: int) -> dict:
+    from api.instrumentation import HTTP_REQUEST_QUERIES
+
+    rng = random.Random(seed)
+
+    async def one(record: Optional[list]):
+        method, path, body = scenario.build(dataset, rng)
+        start = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        await response.aread()
+        elapsed = time.perf_counter() - start
+        if record is not None:
+            record.append((elapsed, response.status_code))
+
+    for _ in range(warmup):
+        await one(None)
+
+    samples: List[tuple] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await one(samples)
+
+    queries_before = HTTP_REQUEST_QUERIES.totals()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    queries_after = HTTP_REQUEST_QUERIES.totals()
+
+    latencies = sorted(s[0] for s in samples)
+    errors = sum(1 for s in samples if s[1] >= 400)
+    observed = queries_after[0] - queries_before[0]
+    return {
+        "scenario": scenario.name,
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "queries_per_request": (queries_after[1] - queries_before[1]) / observed if observed else 0.0,
+    }
+
+
+def print_report(results: List[dict], scale: int, stub: StubConfig):
+    print()
+    print("=" * 100)
+    print(f"BENCHMARK RESULTS  scale={scale}x  llm_latency={stub.latency_ms}ms  "
+          f"token_delay={stub.token_delay_ms}ms  tokens={stub.tokens}")
+    print("=" * 100)
+    header = f"{'scenario':<16}{'reqs':>7}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'q/req':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<16}{r['requests']:>7}{r['errors']:>8}{r['throughput_rps']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}"
+            f"{r['queries_per_request']:>9.1f}"
+        )
+    print("=" * 100)
+
+
+async def main_async(args):
+    import httpx
+    from api.main import app
+    from scripts.benchmark.datasets import build_dataset, BenchDataset
+
+    async with app.router.lifespan_context(app):
+        if args.skip_seed:
+            from sqlalchemy import select
+            from api.database import AsyncSessionLocal
+            from api.strategizer.models import StrategizerProject, StrategizerUnit
+
+            dataset = BenchDataset(scale=args.scale)
+            async with AsyncSessionLocal() as session:
+                dataset.project_ids = list((await session.execute(select(StrategizerProject.id))).scalars())
+                dataset.unit_ids = [tuple(r) for r in (await session.execute(
+                    select(StrategizerUnit.project_id, StrategizerUnit.id).limit(5000)
+                )).all()]
+        else:
+            print(f"Seeding {args.scale}x dataset...")
+            seed_start = time.perf_counter()
+            dataset = await build_dataset(args.scale, reset=args.reset)
+            print(f"  done in {time.perf_counter() - seed_start:.1f}s "
+                  f"({len(dataset.project_ids)} projects, {dataset.concept_count} concepts, "
+                  f"{dataset.challenge_count} challenges)")
+
+        if not dataset.project_ids:
+            raise SystemExit("No projects in the bench database; run without --skip-seed first.")
+
+        transport = httpx.ASGITransport(app=app)
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in args.scenario or DEFAULT_SCENARIOS:
+                scenario = SCENARIOS[name]
+                print(f"Running {name}: {scenario.description} ...")
+                results.append(await run_scenario(
+                    client, scenario, dataset,
+                    requests=args.requests, concurrency=args.concurrency,
+                    warmup=args.warmup, seed=args.seed,
+                ))
+
+    return dataset, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Theory Service with a stubbed LLM")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="Dedicated benchmark database (or BENCH_DATABASE_URL)")
+    parser.add_argument("--scale", type=int, default=10, help="Copies of the sample data (10, 100, 1000)")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables before seeding")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse data already in the bench database")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all but clustering)")
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured warm-up requests per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for target selection")
+    parser.add_argument("--llm-latency-ms", type=float, help="Stub time to first token")
+    parser.add_argument("--llm-token-delay-ms", type=float, help="Stub delay between streamed deltas")
+    parser.add_argument("--llm-tokens", type=int, help="Stub deltas per streamed response")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+
+    # Must happen before any `api` import: database.py reads DATABASE_URL and the
+    # LLM modules bind anthropic.Anthropic at import time.
+    os.environ["DATABASE_URL"] = args.database_url
+    stub = StubConfig(
+        latency_ms=args.llm_latency_ms,
+        token_delay_ms=args.llm_token_delay_ms,
+        tokens=args.llm_tokens,
+    )
+    install_llm_stub(stub)
+
+    dataset, results = asyncio.run(main_async(args))
+    print_report(results, args.scale, stub)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "scale": args.scale,
+                "projects": len(dataset.project_ids),
+                "llm_stub": vars(stub),
+                "concurrency": args.concurrency,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()